@@ -0,0 +1,4 @@
+"""
+성능 측정 도구
+업스트림 대역(stand-in) 서버, 부하 생성기, 마이크로 벤치마크, 합성 데이터셋 생성기
+"""
@@ -0,0 +1,652 @@
+"""
+합성 데이터셋 생성기
+규모 테스트용 사용자, 코스/모듈/레슨, 수강 데이터를 시드 기반으로 결정적으로 생성
+
+Usage: python -m benchmarks.dataset --scale 10 [--seed 42]
+                                    (--postgres [URL] | --sqlite out.db | --parquet out_dir)
+                                    [--zipf 1.1] [--ko-ratio 0.6] [--enrollments-per-user 8]
+                                    [--completion-rate 0.2] [--truncate] [--no-triggers]
+
+- scale 1 = 사용자 10,000명, 코스 200개(모듈 3~8개, 레슨 3~10개), 수강 약 80,000건
+- 같은 시드와 파라미터면 대상(Postgres/SQLite/Parquet)과 관계없이 같은 행을 생성합니다.
+  (테이블별 체크섬을 출력하므로 실행 간 비교 가능)
+- 코스 인기도는 Zipf 분포, 사용자당 수강 수는 지수 분포를 따릅니다.
+- 수강 행의 completed_lessons/quiz_scores는 해당 코스의 실제 레슨 ID로 채워집니다.
+- ID는 (시드, 테이블, 번호)의 해시로 만들어 참조용 ID 목록을 메모리에 두지 않습니다.
+
+컬럼은 001_initial_schema.sql과 src/models에 모두 있는 컬럼만 사용합니다.
+"""
+import argparse
+import asyncio
+import bisect
+import functools
+import hashlib
+import itertools
+import math
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import orjson
+
+Row = Tuple[Any, ...]
+Columns = Tuple[Tuple[str, str], ...]  # (컬럼, 타입: uuid|text|integer|numeric|boolean|timestamptz|jsonb)
+
+# ============================================================================
+# 텍스트 재료
+# ============================================================================
+
+KO_SURNAMES = "김 이 박 최 정 강 조 윤 장 임 한 오 서 신 권 황 안 송 류 홍".split()
+KO_GIVEN = "민준 서연 도윤 지우 하준 서윤 시우 하은 주원 지유 지호 수아 예준 지민 유준 채원 건우 윤서 현우 다은".split()
+EN_FIRST = "James Olivia Liam Emma Noah Ava Ethan Mia Lucas Sophia Mason Amelia Logan Harper Elijah Ella".split()
+EN_LAST = "Smith Johnson Brown Lee Garcia Miller Davis Wilson Moore Taylor Anderson Thomas Martin Clark".split()
+
+KO_TOPICS = [
+    "파이썬 기초", "머신러닝 입문", "딥러닝 실전", "데이터 분석", "자연어 처리", "컴퓨터 비전",
+    "웹 개발", "리액트 프로그래밍", "알고리즘", "자료구조", "통계학", "선형대수",
+    "클라우드 컴퓨팅", "데이터베이스 설계", "강화학습", "추천 시스템", "생성형 AI", "프롬프트 엔지니어링",
+]
+EN_TOPICS = [
+    "Python Basics", "Machine Learning", "Deep Learning", "Data Analysis", "NLP", "Computer Vision",
+    "Web Development", "React", "Algorithms", "Data Structures", "Statistics", "Linear Algebra",
+    "Cloud Computing", "Database Design", "Reinforcement Learning", "Recommender Systems",
+    "Generative AI", "Prompt Engineering",
+]
+KO_SUFFIXES = ["완전 정복", "첫걸음", "핵심 정리", "실무 프로젝트", "심화 과정", "부트캠프"]
+EN_SUFFIXES = ["from Scratch", "Crash Course", "in Practice", "Masterclass", "Fundamentals", "Bootcamp"]
+KO_WORDS = (
+    "모델 학습 데이터 함수 변수 예제 구현 결과 분석 개념 이해 실습 코드 문제 해결 방법 "
+    "성능 최적화 평가 정확도 손실 그래디언트 배치 레이어 네트워크 벡터 행렬 확률 분포 "
+    "입력 출력 파라미터 알고리즘 구조 설계 테스트 배포 서비스 사용자 요청 응답 캐시"
+).split()
+EN_WORDS = (
+    "model training data function variable example implementation result analysis concept "
+    "practice code problem solution method performance optimization evaluation accuracy loss "
+    "gradient batch layer network vector matrix probability distribution input output parameter "
+    "algorithm structure design test deploy service user request response cache"
+).split()
+TAGS = ["python", "ai", "machine_learning", "deep_learning", "data", "web", "nlp", "vision",
+        "statistics", "cloud", "database", "algorithms", "llm", "beginner_friendly"]
+CATEGORIES = ["Computer Science", "Data Science", "AI", "Software Engineering", "Mathematics"]
+SKILL_LEVELS = ["beginner", "intermediate", "advanced", "expert"]
+LESSON_TYPES = ["text", "video", "interactive", "quiz"]
+LESSON_TYPE_WEIGHTS = [45, 35, 10, 10]
+
+
+# ============================================================================
+# 생성 파라미터 및 코스 구조
+# ============================================================================
+
+@dataclass
+class DatasetConfig:
+    scale: float = 1.0
+    seed: int = 42
+    users_per_scale: int = 10_000
+    courses_per_scale: int = 200
+    modules_per_course: Tuple[int, int] = (3, 8)
+    lessons_per_module: Tuple[int, int] = (3, 10)
+    enrollments_per_user: float = 8.0   # 평균 (1 + 지수 분포)
+    zipf: float = 1.1                   # 코스 인기도 지수 (클수록 소수 코스에 집중)
+    completion_rate: float = 0.2
+    not_started_rate: float = 0.25
+    ko_ratio: float = 0.6               # 한국어 텍스트 비율
+    content_chars: int = 1500           # 레슨 본문 길이 중앙값 (로그정규)
+    start: datetime = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    days: int = 365
+
+    @property
+    def users(self) -> int:
+        return max(1, int(self.users_per_scale * self.scale))
+
+    @property
+    def courses(self) -> int:
+        return max(1, int(self.courses_per_scale * self.scale))
+
+    @property
+    def instructors(self) -> int:
+        return max(1, self.courses // 5)
+
+
+@dataclass
+class CoursePlan:
+    """코스별 레슨 범위 (레슨은 전역 번호로 연속 배치)"""
+    module_start: int
+    module_count: int
+    lesson_start: int
+    lesson_counts: List[int]  # 모듈별 레슨 수
+
+    @property
+    def lesson_count(self) -> int:
+        return sum(self.lesson_counts)
+
+
+class Dataset:
+    """결정적 데이터 생성기 (테이블별로 독립된 난수 스트림 사용)"""
+
+    def __init__(self, config: DatasetConfig):
+        self.config = config
+        rng = self._rng("plan")
+        self.plans: List[CoursePlan] = []
+        module, lesson = 0, 0
+        for _ in range(config.courses):
+            modules = rng.randint(*config.modules_per_course)
+            counts = [rng.randint(*config.lessons_per_module) for _ in range(modules)]
+            self.plans.append(CoursePlan(module, modules, lesson, counts))
+            module += modules
+            lesson += sum(counts)
+        self.module_total, self.lesson_total = module, lesson
+        self.lesson_types = bytes(
+            rng.choices(range(len(LESSON_TYPES)), weights=LESSON_TYPE_WEIGHTS, k=lesson)
+        )
+        self.lesson_minutes = bytes(rng.randint(5, 30) for _ in range(lesson))
+
+        # Zipf 인기도 (순위는 코스 번호와 무관하게 섞음)
+        ranks = list(range(1, config.courses + 1))
+        rng.shuffle(ranks)
+        self.popularity = list(itertools.accumulate(1 / rank ** config.zipf for rank in ranks))
+
+    def _rng(self, stream: str) -> random.Random:
+        return random.Random(f"{self.config.seed}:{stream}")
+
+    def entity_id(self, kind: str, index: int) -> uuid.UUID:
+        digest = hashlib.blake2b(f"{self.config.seed}:{kind}:{index}".encode(), digest_size=16).digest()
+        return uuid.UUID(bytes=digest, version=4)
+
+    def _timestamp(self, rng: random.Random, after: Optional[datetime] = None) -> datetime:
+        start = after or self.config.start
+        end = self.config.start + timedelta(days=self.config.days)
+        span = max((end - start).total_seconds(), 1)
+        return start + timedelta(seconds=int(rng.random() * span))
+
+    def _korean(self, rng: random.Random) -> bool:
+        return rng.random() < self.config.ko_ratio
+
+    def _sentence(self, rng: random.Random, korean: bool, words: int) -> str:
+        text = " ".join(rng.choices(KO_WORDS if korean else EN_WORDS, k=words))
+        return text[0].upper() + text[1:] + "."
+
+    def _paragraphs(self, rng: random.Random, korean: bool, chars: int) -> str:
+        # 문단 단위로 단어를 한 번에 뽑음 (문장마다 뽑으면 긴 레슨 본문 생성이 병목)
+        pool = KO_WORDS if korean else EN_WORDS
+        parts, length = [], 0
+        while length < chars:
+            words = rng.choices(pool, k=rng.randint(20, 60))
+            step = rng.randint(6, 14)
+            for end in range(step - 1, len(words), step):
+                words[end] += "."
+            if not words[-1].endswith("."):
+                words[-1] += "."
+            paragraph = " ".join(words)
+            parts.append(paragraph)
+            length += len(paragraph)
+        return "\n\n".join(parts)
+
+    # ------------------------------------------------------------------
+    # 테이블
+    # ------------------------------------------------------------------
+
+    USER_COLUMNS: Columns = (
+        ("id", "uuid"), ("email", "text"), ("username", "text"), ("hashed_password", "text"),
+        ("first_name", "text"), ("last_name", "text"), ("full_name", "text"), ("bio", "text"),
+        ("timezone", "text"), ("is_active", "boolean"), ("is_verified", "boolean"),
+        ("is_premium", "boolean"), ("role", "text"), ("current_skill_level", "text"),
+        ("learning_goals", "jsonb"), ("language", "text"), ("total_study_hours", "integer"),
+        ("courses_completed", "integer"), ("last_login_at", "timestamptz"),
+        ("created_at", "timestamptz"), ("updated_at", "timestamptz"),
+    )
+
+    def users(self) -> Iterator[Row]:
+        rng = self._rng("users")
+        for index in range(self.config.users):
+            korean = self._korean(rng)
+            if korean:
+                first, last = rng.choice(KO_GIVEN), rng.choice(KO_SURNAMES)
+                full_name = f"{last}{first}"
+            else:
+                first, last = rng.choice(EN_FIRST), rng.choice(EN_LAST)
+                full_name = f"{first} {last}"
+            username = f"user{index:07d}"
+            created = self._timestamp(rng)
+            yield (
+                self.entity_id("user", index), f"{username}@synthetic.test", username, "!synthetic",
+                first, last, full_name,
+                self._sentence(rng, korean, rng.randint(4, 12)) if rng.random() < 0.3 else None,
+                "Asia/Seoul" if korean else rng.choice(["UTC", "America/New_York", "Europe/London"]),
+                rng.random() > 0.02, rng.random() < 0.7, rng.random() < 0.1,
+                "instructor" if index < self.config.instructors else "student",
+                rng.choices(SKILL_LEVELS, weights=[50, 30, 15, 5])[0],
+                rng.sample(TAGS, rng.randint(1, 3)) if rng.random() < 0.6 else None,
+                "ko" if korean else "en",
+                int(rng.expovariate(1 / 20)), int(rng.expovariate(1 / 2)),
+                self._timestamp(rng, created), created, created,
+            )
+
+    COURSE_COLUMNS: Columns = (
+        ("id", "uuid"), ("title", "text"), ("slug", "text"), ("description", "text"),
+        ("short_description", "text"), ("tags", "jsonb"), ("categories", "jsonb"), ("status", "text"),
+        ("difficulty_level", "text"), ("estimated_duration_hours", "integer"),
+        ("learning_objectives", "jsonb"), ("instructor_id", "uuid"), ("rating", "numeric"),
+        ("total_ratings", "integer"), ("is_ai_generated", "boolean"), ("is_free", "boolean"),
+        ("price", "numeric"), ("currency", "text"), ("published_at", "timestamptz"),
+        ("created_at", "timestamptz"), ("updated_at", "timestamptz"),
+    )
+
+    def courses(self) -> Iterator[Row]:
+        rng = self._rng("courses")
+        for index, plan in enumerate(self.plans):
+            korean = self._korean(rng)
+            topic = rng.randrange(len(KO_TOPICS))
+            if korean:
+                title = f"{KO_TOPICS[topic]} {rng.choice(KO_SUFFIXES)}"
+            else:
+                title = f"{EN_TOPICS[topic]} {rng.choice(EN_SUFFIXES)}"
+            created = self._timestamp(rng)
+            status = rng.choices(["published", "draft", "archived"], weights=[85, 10, 5])[0]
+            is_free = rng.random() < 0.6
+            minutes = sum(self.lesson_minutes[plan.lesson_start:plan.lesson_start + plan.lesson_count])
+            yield (
+                self.entity_id("course", index), title, f"synthetic-{index:06d}",
+                self._paragraphs(rng, korean, rng.randint(200, 800)),
+                self._sentence(rng, korean, rng.randint(8, 16))[:500],
+                [EN_TOPICS[topic].lower().replace(" ", "_"), *rng.sample(TAGS, rng.randint(1, 4))],
+                rng.sample(CATEGORIES, rng.randint(1, 2)), status,
+                rng.choices(SKILL_LEVELS, weights=[40, 35, 20, 5])[0], max(1, minutes // 60),
+                [self._sentence(rng, korean, rng.randint(4, 8)) for _ in range(rng.randint(3, 6))],
+                self.entity_id("user", rng.randrange(self.config.instructors)),
+                round(rng.uniform(3.0, 5.0), 2), int(rng.expovariate(1 / 50)),
+                rng.random() < 0.3, is_free, 0.0 if is_free else float(rng.choice([19, 29, 49, 99])),
+                "USD", self._timestamp(rng, created) if status == "published" else None,
+                created, created,
+            )
+
+    MODULE_COLUMNS: Columns = (
+        ("id", "uuid"), ("course_id", "uuid"), ("title", "text"), ("description", "text"),
+        ("order_index", "integer"), ("estimated_duration_minutes", "integer"),
+        ("is_published", "boolean"), ("created_at", "timestamptz"), ("updated_at", "timestamptz"),
+    )
+
+    def modules(self) -> Iterator[Row]:
+        rng = self._rng("modules")
+        for course, plan in enumerate(self.plans):
+            lesson = plan.lesson_start
+            for order, count in enumerate(plan.lesson_counts):
+                korean = self._korean(rng)
+                created = self._timestamp(rng)
+                yield (
+                    self.entity_id("module", plan.module_start + order), self.entity_id("course", course),
+                    (f"{order + 1}장. " if korean else f"Chapter {order + 1}. ")
+                    + self._sentence(rng, korean, rng.randint(2, 5))[:-1],
+                    self._sentence(rng, korean, rng.randint(8, 20)), order,
+                    sum(self.lesson_minutes[lesson:lesson + count]), rng.random() < 0.9, created, created,
+                )
+                lesson += count
+
+    LESSON_COLUMNS: Columns = (
+        ("id", "uuid"), ("module_id", "uuid"), ("title", "text"), ("content", "text"),
+        ("order_index", "integer"), ("lesson_type", "text"), ("content_url", "text"),
+        ("estimated_duration_minutes", "integer"), ("difficulty_points", "integer"),
+        ("is_ai_generated", "boolean"), ("is_published", "boolean"), ("is_free_preview", "boolean"),
+        ("created_at", "timestamptz"), ("updated_at", "timestamptz"),
+    )
+
+    def lessons(self) -> Iterator[Row]:
+        rng = self._rng("lessons")
+        sigma = 0.8
+        for plan in self.plans:
+            lesson = plan.lesson_start
+            for module_offset, count in enumerate(plan.lesson_counts):
+                module_id = self.entity_id("module", plan.module_start + module_offset)
+                for order in range(count):
+                    korean = self._korean(rng)
+                    lesson_type = LESSON_TYPES[self.lesson_types[lesson]]
+                    chars = int(rng.lognormvariate(math.log(self.config.content_chars), sigma))
+                    created = self._timestamp(rng)
+                    yield (
+                        self.entity_id("lesson", lesson), module_id,
+                        self._sentence(rng, korean, rng.randint(2, 6))[:-1],
+                        "# " + self._sentence(rng, korean, 4) + "\n\n" + self._paragraphs(rng, korean, min(chars, 50_000)),
+                        order, lesson_type,
+                        f"https://www.youtube.com/watch?v={rng.getrandbits(64):016x}" if lesson_type == "video" else None,
+                        self.lesson_minutes[lesson], rng.randint(0, 10), rng.random() < 0.4,
+                        rng.random() < 0.9, order == 0, created, created,
+                    )
+                    lesson += 1
+
+    ENROLLMENT_COLUMNS: Columns = (
+        ("id", "uuid"), ("user_id", "uuid"), ("course_id", "uuid"), ("progress_percentage", "numeric"),
+        ("completed_lessons", "jsonb"), ("current_lesson_id", "uuid"),
+        ("total_study_time_minutes", "integer"), ("quiz_scores", "jsonb"), ("is_completed", "boolean"),
+        ("completed_at", "timestamptz"), ("rating", "integer"), ("review", "text"),
+        ("created_at", "timestamptz"), ("updated_at", "timestamptz"),
+    )
+
+    @functools.lru_cache(maxsize=4096)
+    def _lesson_ids(self, course: int) -> Tuple[str, ...]:
+        """코스의 레슨 ID 문자열 (인기 코스에 수강이 몰리므로 캐시 적중률이 높음)"""
+        plan = self.plans[course]
+        return tuple(str(self.entity_id("lesson", plan.lesson_start + i)) for i in range(plan.lesson_count))
+
+    def _pick_courses(self, rng: random.Random, count: int) -> List[int]:
+        chosen: Dict[int, None] = {}
+        total = self.popularity[-1]
+        attempts = 0
+        while len(chosen) < count and attempts < count * 20:
+            chosen[bisect.bisect(self.popularity, rng.random() * total)] = None
+            attempts += 1
+        return list(chosen)
+
+    def enrollments(self) -> Iterator[Row]:
+        rng = self._rng("enrollments")
+        config = self.config
+        extra_mean = max(config.enrollments_per_user - 1, 0.0)
+        serial = 0
+        for user in range(config.users):
+            user_id = self.entity_id("user", user)
+            count = 1 + (int(rng.expovariate(1 / extra_mean)) if extra_mean else 0)
+            for course in self._pick_courses(rng, min(count, config.courses)):
+                plan = self.plans[course]
+                total = plan.lesson_count
+                draw = rng.random()
+                if draw < config.not_started_rate:
+                    done = 0
+                elif draw < config.not_started_rate + config.completion_rate:
+                    done = total
+                else:
+                    done = rng.randint(1, max(total - 1, 1))
+
+                lesson_ids = list(self._lesson_ids(course)[:done])
+                quiz_scores = {
+                    lesson_ids[i]: max(0, min(100, int(rng.gauss(75, 15))))
+                    for i in range(done) if LESSON_TYPES[self.lesson_types[plan.lesson_start + i]] == "quiz"
+                }
+                minutes = sum(self.lesson_minutes[plan.lesson_start:plan.lesson_start + done])
+                created = self._timestamp(rng)
+                completed = done == total
+                completed_at = self._timestamp(rng, created) if completed else None
+                rated = completed and rng.random() < 0.3
+                korean = self._korean(rng)
+                yield (
+                    self.entity_id("enrollment", serial), user_id, self.entity_id("course", course),
+                    round(done / total * 100, 2), lesson_ids or None,
+                    self._lesson_ids(course)[done] if 0 < done < total else None,
+                    int(minutes * rng.uniform(0.8, 1.6)), quiz_scores or None, completed, completed_at,
+                    rng.choices([1, 2, 3, 4, 5], weights=[2, 3, 10, 35, 50])[0] if rated else None,
+                    self._sentence(rng, korean, rng.randint(5, 15)) if rated and rng.random() < 0.5 else None,
+                    created, completed_at or created,
+                )
+                serial += 1
+
+    def tables(self) -> List[Tuple[str, Columns, Iterator[Row]]]:
+        """FK 순서의 (테이블, 컬럼, 행 스트림)"""
+        return [
+            ("users", self.USER_COLUMNS, self.users()),
+            ("courses", self.COURSE_COLUMNS, self.courses()),
+            ("modules", self.MODULE_COLUMNS, self.modules()),
+            ("lessons", self.LESSON_COLUMNS, self.lessons()),
+            ("enrollments", self.ENROLLMENT_COLUMNS, self.enrollments()),
+        ]
+
+
+# ============================================================================
+# 출력 대상
+# ============================================================================
+
+FINALIZE_SQL = [
+    # 비정규화 카운터 (코스 수강 인원)
+    """UPDATE courses SET enrolled_count = counts.n
+       FROM (SELECT course_id, COUNT(*) AS n FROM enrollments GROUP BY course_id) AS counts
+       WHERE courses.id = counts.course_id""",
+]
+
+
+class PostgresWriter:
+    """asyncpg COPY (binary)"""
+
+    def __init__(self, url: str, truncate: bool, triggers: bool):
+        self.url, self.truncate, self.triggers = url, truncate, triggers
+        self.conn = None
+
+    async def open(self) -> None:
+        import asyncpg
+
+        self.conn = await asyncpg.connect(self.url, server_settings={"application_name": "synthetic-dataset"})
+        if self.truncate:
+            await self.conn.execute("TRUNCATE users, courses, modules, lessons, enrollments CASCADE")
+        if not self.triggers:
+            # 트리거(검색 벡터, 분석 변경 로그)와 FK 검사를 건너뜀 - 슈퍼유저 필요, finish()에서 재계산
+            await self.conn.execute("SET session_replication_role = replica")
+
+    async def write(self, table: str, columns: Columns, rows: List[Row]) -> None:
+        json_positions = [i for i, (_, type_) in enumerate(columns) if type_ == "jsonb"]
+        if json_positions:
+            rows = [
+                tuple(orjson.dumps(v).decode() if i in json_positions and v is not None else v
+                      for i, v in enumerate(row))
+                for row in rows
+            ]
+        await self.conn.copy_records_to_table(table, records=rows, columns=[name for name, _ in columns])
+
+    async def finish(self) -> None:
+        if not self.triggers:
+            await self.conn.execute("SET session_replication_role = DEFAULT")
+            # 트리거가 채우는 값 재계산 (해당 마이그레이션이 적용된 경우에만)
+            for table in ("courses", "lessons"):
+                has_vector = await self.conn.fetchval(
+                    "SELECT 1 FROM information_schema.columns WHERE table_name = $1 AND column_name = 'search_vector'",
+                    table,
+                )
+                if has_vector:
+                    await self.conn.execute(f"UPDATE {table} SET title = title WHERE search_vector IS NULL")
+            if await self.conn.fetchval("SELECT to_regproc('rebuild_analytics_rollups') IS NOT NULL"):
+                await self.conn.execute("SELECT rebuild_analytics_rollups()")
+        for sql in FINALIZE_SQL:
+            await self.conn.execute(sql)
+        await self.conn.execute("ANALYZE users, courses, modules, lessons, enrollments")
+
+    async def close(self) -> None:
+        if self.conn is not None:
+            await self.conn.close()
+
+
+class SQLiteWriter:
+    """src/models 스키마로 만든 SQLite 파일"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.engine = None
+
+    async def open(self) -> None:
+        from sqlalchemy import create_engine, event
+        from src.models import Base
+
+        self.path.unlink(missing_ok=True)
+        self.engine = create_engine(f"sqlite:///{self.path}")
+
+        @event.listens_for(self.engine, "connect")
+        def _pragmas(dbapi_connection, _):
+            dbapi_connection.execute("PRAGMA journal_mode = OFF")
+            dbapi_connection.execute("PRAGMA synchronous = OFF")
+
+        Base.metadata.create_all(self.engine)
+        self.tables = Base.metadata.tables
+
+    def _converters(self, table: str, columns: Columns):
+        from sqlalchemy import Enum
+
+        converters = []
+        for name, type_ in columns:
+            column_type = self.tables[table].c[name].type
+            if isinstance(column_type, Enum) and column_type.enum_class is not None:
+                enum_class = column_type.enum_class
+                converters.append(lambda v, e=enum_class: e(v) if v is not None else None)
+            elif type_ == "uuid":
+                converters.append(lambda v: str(v) if v is not None else None)
+            else:
+                converters.append(None)
+        return converters
+
+    async def write(self, table: str, columns: Columns, rows: List[Row]) -> None:
+        converters = self._converters(table, columns)
+        names = [name for name, _ in columns]
+        params = [
+            {name: (convert(value) if convert else value)
+             for name, convert, value in zip(names, converters, row)}
+            for row in rows
+        ]
+        with self.engine.begin() as conn:
+            conn.execute(self.tables[table].insert(), params)
+
+    async def finish(self) -> None:
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            for sql in FINALIZE_SQL:
+                conn.execute(text(sql))
+
+    async def close(self) -> None:
+        if self.engine is not None:
+            self.engine.dispose()
+
+
+class ParquetWriter:
+    """테이블별 Parquet 파일 (pyarrow 필요, 청크마다 row group)"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.writers: Dict[str, Any] = {}
+
+    async def open(self) -> None:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("❌ Parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _schema(columns: Columns):
+        import pyarrow as pa
+
+        types = {
+            "uuid": pa.string(), "text": pa.string(), "jsonb": pa.string(), "integer": pa.int32(),
+            "numeric": pa.float64(), "boolean": pa.bool_(), "timestamptz": pa.timestamp("us", tz="UTC"),
+        }
+        return pa.schema([(name, types[type_]) for name, type_ in columns])
+
+    async def write(self, table: str, columns: Columns, rows: List[Row]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = self.writers.get(table)
+        if writer is None:
+            writer = pq.ParquetWriter(self.directory / f"{table}.parquet", self._schema(columns), compression="zstd")
+            self.writers[table] = writer
+        data = {}
+        for position, (name, type_) in enumerate(columns):
+            values = [row[position] for row in rows]
+            if type_ == "uuid":
+                values = [str(v) if v is not None else None for v in values]
+            elif type_ == "jsonb":
+                values = [orjson.dumps(v).decode() if v is not None else None for v in values]
+            data[name] = values
+        writer.write_table(pa.Table.from_pydict(data, schema=writer.schema))
+
+    async def finish(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        for writer in self.writers.values():
+            writer.close()
+
+
+# ============================================================================
+# 실행
+# ============================================================================
+
+def _chunks(rows: Iterator[Row], size: int) -> Iterator[List[Row]]:
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def generate(dataset: Dataset, writer, chunk_size: int) -> Dict[str, Dict[str, Any]]:
+    summary: Dict[str, Dict[str, Any]] = {}
+    await writer.open()
+    try:
+        for table, columns, rows in dataset.tables():
+            started = time.perf_counter()
+            digest = hashlib.blake2b(digest_size=8)
+            count = 0
+            for chunk in _chunks(rows, chunk_size):
+                digest.update(orjson.dumps(chunk, default=str))
+                await writer.write(table, columns, chunk)
+                count += len(chunk)
+                print(f"\r  {table:<12} {count:>12,} rows", end="")
+                sys.stdout.flush()
+            elapsed = time.perf_counter() - started
+            summary[table] = {"rows": count, "seconds": round(elapsed, 2), "checksum": digest.hexdigest()}
+            print(f"\r  {table:<12} {count:>12,} rows  {elapsed:6.1f}s  "
+                  f"({count / max(elapsed, 1e-9):,.0f} rows/s)  checksum {digest.hexdigest()}")
+        await writer.finish()
+    finally:
+        await writer.close()
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """메인 실행 함수"""
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser(description="Deterministic synthetic dataset for scale tests")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--postgres", nargs="?", const="", metavar="URL", help="PostgreSQL (기본값: DATABASE_URL)")
+    target.add_argument("--sqlite", type=Path, metavar="FILE", help="SQLite 파일 (src/models 스키마, 기존 파일 덮어씀)")
+    target.add_argument("--parquet", type=Path, metavar="DIR", help="테이블별 Parquet 파일 디렉터리")
+    parser.add_argument("--scale", type=float, default=defaults.scale,
+                        help="1 = 사용자 10,000 / 코스 200 / 수강 약 80,000")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--zipf", type=float, default=defaults.zipf, help="코스 인기도 Zipf 지수")
+    parser.add_argument("--enrollments-per-user", type=float, default=defaults.enrollments_per_user)
+    parser.add_argument("--completion-rate", type=float, default=defaults.completion_rate)
+    parser.add_argument("--ko-ratio", type=float, default=defaults.ko_ratio, help="한국어 텍스트 비율 (0~1)")
+    parser.add_argument("--content-chars", type=int, default=defaults.content_chars, help="레슨 본문 길이 중앙값")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--truncate", action="store_true", help="Postgres: 적재 전 대상 테이블 비우기")
+    parser.add_argument("--no-triggers", action="store_true",
+                        help="Postgres: 적재 중 트리거/FK 검사 생략 후 일괄 재계산 (슈퍼유저 필요)")
+    args = parser.parse_args(argv)
+
+    config = DatasetConfig(
+        scale=args.scale, seed=args.seed, zipf=args.zipf, enrollments_per_user=args.enrollments_per_user,
+        completion_rate=args.completion_rate, ko_ratio=args.ko_ratio, content_chars=args.content_chars,
+    )
+    if args.postgres is not None:
+        url = args.postgres
+        if not url:
+            from src.core.config import settings
+            url = settings.DATABASE_URL or ""
+        if not url:
+            parser.error("--postgres URL 또는 DATABASE_URL이 필요합니다")
+        from src.core.database import plain_url
+        writer = PostgresWriter(plain_url(url), args.truncate, triggers=not args.no_triggers)
+    elif args.sqlite:
+        writer = SQLiteWriter(args.sqlite)
+    else:
+        writer = ParquetWriter(args.parquet)
+
+    dataset = Dataset(config)
+    print(f"🧪 scale={config.scale} seed={config.seed}: users {config.users:,}, courses {config.courses:,}, "
+          f"modules {dataset.module_total:,}, lessons {dataset.lesson_total:,}")
+    started = time.perf_counter()
+    asyncio.run(generate(dataset, writer, args.chunk_size))
+    print(f"🎉 완료 ({time.perf_counter() - started:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,483 @@
+"""
+부하 테스트 실행기
+대역 서버와 백엔드를 로컬에서 띄우고 시나리오별 처리량 및 p50/p95/p99 지연 시간 측정
+
+Usage: python -m benchmarks.load [--concurrency 20] [--duration 10] [--scenario ai_evaluate ...]
+                                 [--workers 1] [--baseline benchmarks/baseline.json]
+                                 [--max-regression 0.2] [--max-error-rate 0.01] [--update-baseline]
+
+- 대역 서버(benchmarks.standins)와 백엔드(uvicorn 또는 src.server)를 별도 프로세스로 실행
+- 검색 색인용 합성 데이터셋(benchmarks.dataset)을 SQLite로 만들어 DATABASE_URL로 전달
+- 시나리오마다 고정 동시성의 closed-loop 부하를 duration초 동안 인가
+- 결과는 JSON으로 저장되며, 기준선과 비교해 p95 증가 또는 처리량 감소가
+  max-regression 비율을 넘으면 종료 코드 1을 반환합니다.
+- 시나리오의 2xx 외 응답 비율이 max-error-rate를 넘으면 기준선과 무관하게 실패하며,
+  그런 결과는 기준선으로 저장하지 않습니다.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from . import standins
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+DEFAULT_BASELINE = BACKEND_DIR / "benchmarks" / "baseline.json"
+
+# 대역 서버용 가짜 Supabase anon 키 (JWT 형식만 맞춤)
+_BENCH_SUPABASE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.benchmark"
+
+
+# ============================================================================
+# 시나리오
+# ============================================================================
+
+@dataclass
+class Scenario:
+    """요청 하나를 만드는 시나리오 (인자: 요청 순번, 공유 컨텍스트)"""
+    name: str
+    method: str
+    path: str
+    body: Optional[Callable[[int, Dict[str, Any]], Any]] = None
+    headers: Optional[Callable[[Dict[str, Any]], Dict[str, str]]] = None
+    expected_status: tuple = (200,)
+
+
+def _bearer(context: Dict[str, Any]) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {context['access_token']}"}
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("root", "GET", "/api/v1/"),
+    Scenario("status", "GET", "/api/v1/status"),
+    Scenario("ai_generate_course", "POST", "/api/v1/ai/generate-course", body=lambda i, _: {
+        "topic": f"Machine Learning {i % 50}",
+        "skill_level": "beginner",
+        "duration_hours": 10,
+        "learning_goals": ["regression", "classification"],
+    }),
+    Scenario("ai_evaluate", "POST", "/api/v1/ai/evaluate", body=lambda i, _: {
+        "question": "What is overfitting?",
+        "user_answer": f"When a model memorizes training data ({i})",
+        "expected_answer": "Model fits noise and generalizes poorly",
+    }),
+    Scenario("youtube_search", "POST", "/api/v1/youtube/search", body=lambda i, _: {
+        "query": f"python {i % 100}",
+        "max_results": 10,
+    }),
+    Scenario("youtube_recommend", "GET", "/api/v1/youtube/recommend/python"),
+    Scenario("search", "GET", "/api/v1/search?q=%EB%AA%A8%EB%8D%B8%20api&limit=20"),
+    Scenario("auth_signin", "POST", "/api/v1/auth/signin", body=lambda i, context: {
+        "email": context["email"],
+        "password": context["password"],
+    }),
+    Scenario("auth_signup", "POST", "/api/v1/auth/signup", body=lambda i, context: {
+        "email": f"load-{context['run_id']}-{i}@example.com",
+        "password": "benchmark-password",
+        "username": f"load{i}",
+    }),
+    Scenario("auth_me", "GET", "/api/v1/auth/me", headers=_bearer),
+    Scenario("auth_verify_token", "GET", "/api/v1/auth/verify-token", headers=_bearer),
+    Scenario("auth_refresh", "POST", "/api/v1/auth/refresh", body=lambda i, context: {
+        "refresh_token": context["refresh_token"],
+    }),
+]
+
+
+# ============================================================================
+# 측정
+# ============================================================================
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """선형 보간 백분위수 (정렬된 값, q는 0~100)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+@dataclass
+class ScenarioResult:
+    """시나리오 측정 결과"""
+    name: str
+    latencies_ms: List[float] = field(default_factory=list)
+    status_codes: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    elapsed_seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        values = sorted(self.latencies_ms)
+        requests = len(values)
+        non_2xx = sum(count for code, count in self.status_codes.items() if not code.startswith("2"))
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / requests, 4) if requests else 0.0,
+            "non_2xx_rate": round(non_2xx / requests, 4) if requests else 0.0,
+            "throughput_rps": round(requests / self.elapsed_seconds, 2) if self.elapsed_seconds else 0.0,
+            "latency_ms": {
+                "mean": round(sum(values) / requests, 2) if requests else 0.0,
+                "p50": round(percentile(values, 50), 2),
+                "p95": round(percentile(values, 95), 2),
+                "p99": round(percentile(values, 99), 2),
+                "max": round(values[-1], 2) if values else 0.0,
+            },
+            "status_codes": self.status_codes,
+        }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    context: Dict[str, Any],
+    concurrency: int,
+    duration: float,
+    warmup: float = 1.0
+) -> ScenarioResult:
+    """고정 동시성 closed-loop 부하 (워밍업 구간은 집계하지 않음)"""
+    result = ScenarioResult(scenario.name)
+    sequence = itertools.count()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def user() -> None:
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            index = next(sequence)
+            request_started = time.perf_counter()
+            try:
+                response = await client.request(
+                    scenario.method,
+                    scenario.path,
+                    json=scenario.body(index, context) if scenario.body else None,
+                    headers=scenario.headers(context) if scenario.headers else None,
+                )
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            finished = time.perf_counter()
+
+            if request_started < measure_from:
+                continue
+            key = str(status) if status is not None else "transport_error"
+            result.status_codes[key] = result.status_codes.get(key, 0) + 1
+            if status not in scenario.expected_status:
+                result.errors += 1
+            result.latencies_ms.append((finished - request_started) * 1000)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    result.elapsed_seconds = max(time.perf_counter() - measure_from, 1e-9)
+    return result
+
+
+async def prepare_context(client: httpx.AsyncClient, standin_url: str) -> Dict[str, Any]:
+    """로그인 토큰 및 /auth/me용 프로필 준비"""
+    context = {
+        "run_id": int(time.time()),
+        "email": "loadtest@example.com",
+        "password": "benchmark-password",
+    }
+    response = await client.post("/api/v1/auth/signin", json={
+        "email": context["email"], "password": context["password"]
+    })
+    response.raise_for_status()
+    payload = response.json()
+    context["access_token"] = payload["access_token"]
+    context["refresh_token"] = payload["refresh_token"]
+
+    async with httpx.AsyncClient(base_url=standin_url) as standin:
+        await standin.post("/_seed/users", json={
+            "id": payload["user"]["id"],
+            "email": context["email"],
+            "username": "loadtest",
+            "created_at": payload["user"]["created_at"],
+        })
+    return context
+
+
+# ============================================================================
+# 프로세스 관리
+# ============================================================================
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(
+    url: str,
+    process: subprocess.Popen,
+    timeout: float = 30.0,
+    ok_status: Optional[int] = None
+) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process exited early with code {process.returncode}: {url}")
+        try:
+            status = httpx.get(url, timeout=1.0).status_code
+            if status == ok_status if ok_status is not None else status < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def backend_env(standin_url: str, database_url: str) -> Dict[str, str]:
+    """대역 서버와 합성 데이터셋을 가리키는 백엔드 환경 변수"""
+    env = dict(os.environ)
+    env.update({
+        "ENVIRONMENT": "production",
+        "DEBUG": "false",
+        "LOG_LEVEL": "WARNING",
+        "DEEPSEEK_API_KEY": "benchmark",
+        "DEEPSEEK_BASE_URL": f"{standin_url}/deepseek",
+        "YOUTUBE_API_KEY": "benchmark",
+        "YOUTUBE_API_URL": f"{standin_url}/youtube/v3",
+        "SUPABASE_URL": f"{standin_url}/supabase",
+        "SUPABASE_KEY": _BENCH_SUPABASE_KEY,
+        "SUPABASE_SERVICE_KEY": _BENCH_SUPABASE_KEY,  # production은 서비스 키 없이 시작하지 않음
+        "SUPABASE_READ_REPLICA_URL": "",
+        "DATABASE_URL": database_url,
+        "SEARCH_BACKEND": "memory",
+        "ANALYTICS_REFRESH_INTERVAL_SECONDS": "0",
+        # 요청 제한/일일 토큰 할당량은 측정 대상이 아님 (켜 두면 대부분 빠른 429를 측정하게 됨)
+        "RATE_LIMIT_ENABLED": "false",
+        "AI_ROLE_DAILY_TOKEN_QUOTAS": json.dumps(
+            {"anonymous": 0, "student": 0, "instructor": 0, "admin": 0}),
+        "ALLOWED_HOSTS": '["127.0.0.1", "localhost"]',
+    })
+    return env
+
+
+def start_processes(args: argparse.Namespace) -> Dict[str, Any]:
+    """대역 서버와 백엔드 프로세스 시작"""
+    standin_port, backend_port = _free_port(), _free_port()
+    standin_url = f"http://127.0.0.1:{standin_port}"
+    backend_url = f"http://127.0.0.1:{backend_port}"
+
+    standin_argv = [sys.executable, "-m", "benchmarks.standins", "--port", str(standin_port)]
+    for key, value in vars(args).items():
+        if key.split("_")[0] in ("deepseek", "youtube", "supabase", "stream", "seed"):
+            standin_argv += [f"--{key.replace('_', '-')}", str(value)]
+    # 검색 색인 원본 (모든 워커가 시작 시 같은 데이터로 색인 구성)
+    dataset_path = RESULTS_DIR / "load-dataset.db"
+    dataset_path.parent.mkdir(parents=True, exist_ok=True)
+    subprocess.run([sys.executable, "-m", "benchmarks.dataset", "--sqlite", str(dataset_path),
+                    "--scale", str(args.dataset_scale)], cwd=BACKEND_DIR, check=True,
+                   stdout=subprocess.DEVNULL)
+
+    standin = subprocess.Popen(standin_argv, cwd=BACKEND_DIR)
+
+    if args.workers > 1:
+        backend_argv = [sys.executable, "-m", "src.server", "--workers", str(args.workers),
+                        "--bind", f"127.0.0.1:{backend_port}"]
+    else:
+        backend_argv = [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1",
+                        "--port", str(backend_port), "--no-access-log", "--log-level", "warning"]
+    backend = subprocess.Popen(backend_argv, cwd=BACKEND_DIR,
+                               env=backend_env(standin_url, f"sqlite:///{dataset_path}"))
+
+    processes = {"standin": standin, "backend": backend,
+                 "standin_url": standin_url, "backend_url": backend_url}
+    try:
+        _wait_until_ready(f"{standin_url}/_stats", standin)
+        _wait_until_ready(f"{backend_url}/health", backend)
+        # 색인 구성 전 검색은 503이므로 준비될 때까지 대기
+        _wait_until_ready(f"{backend_url}/api/v1/search?q=ready", backend, ok_status=200)
+    except Exception:
+        stop_processes(processes)
+        raise
+    return processes
+
+
+def stop_processes(processes: Dict[str, Any]) -> None:
+    for name in ("backend", "standin"):
+        process: subprocess.Popen = processes[name]
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+# ============================================================================
+# 기준선 비교
+# ============================================================================
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def failed_scenarios(report: Dict[str, Any], max_error_rate: float) -> List[str]:
+    """2xx 외 응답 비율이 한도를 넘은 시나리오 목록 (요청 제한/할당량/대역 서버 설정 오류 등)"""
+    failures = []
+    for name, current in report["scenarios"].items():
+        if not current["requests"]:
+            failures.append(f"{name}: no requests completed")
+        elif current["non_2xx_rate"] > max_error_rate:
+            codes = ", ".join(f"{code}×{count}" for code, count in sorted(current["status_codes"].items()))
+            failures.append(f"{name}: non-2xx {current['non_2xx_rate']:.2%} ({codes})")
+    return failures
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_regression: float
+) -> List[str]:
+    """기준선 대비 회귀 목록 (p95 증가, 처리량 감소, 오류율 증가)"""
+    regressions = []
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not previous.get("requests"):
+            continue
+
+        old_p95, new_p95 = previous["latency_ms"]["p95"], current["latency_ms"]["p95"]
+        if old_p95 and new_p95 > old_p95 * (1 + max_regression):
+            regressions.append(f"{name}: p95 {old_p95:.1f} → {new_p95:.1f} ms")
+
+        old_rps, new_rps = previous["throughput_rps"], current["throughput_rps"]
+        if old_rps and new_rps < old_rps * (1 - max_regression):
+            regressions.append(f"{name}: throughput {old_rps:.1f} → {new_rps:.1f} rps")
+
+        if current["error_rate"] > previous["error_rate"] + 0.01:
+            regressions.append(
+                f"{name}: error rate {previous['error_rate']:.2%} → {current['error_rate']:.2%}")
+    return regressions
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+async def run_load(args: argparse.Namespace, backend_url: str, standin_url: str) -> Dict[str, Any]:
+    """선택된 시나리오를 순서대로 실행"""
+    selected = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=backend_url, limits=limits, timeout=args.timeout) as client:
+        context = await prepare_context(client, standin_url)
+        scenarios: Dict[str, Any] = {}
+        for scenario in selected:
+            result = await run_scenario(client, scenario, context, args.concurrency,
+                                        args.duration, args.warmup)
+            scenarios[scenario.name] = result.summary()
+            latency = scenarios[scenario.name]["latency_ms"]
+            print(f"   {scenario.name:<20} {scenarios[scenario.name]['throughput_rps']:8.1f} rps  "
+                  f"p50 {latency['p50']:7.1f}  p95 {latency['p95']:7.1f}  p99 {latency['p99']:7.1f} ms  "
+                  f"errors {result.errors}")
+
+    async with httpx.AsyncClient(base_url=standin_url) as standin:
+        upstream_calls = (await standin.get("/_stats")).json()
+
+    return {"scenarios": scenarios, "upstream": upstream_calls}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="Local load test with upstream stand-ins")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="시나리오당 측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="시나리오당 워밍업 시간 (초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--workers", type=int, default=1, help="2 이상이면 src.server(Gunicorn)로 실행")
+    parser.add_argument("--scenario", action="append", choices=[s.name for s in SCENARIOS],
+                        help="실행할 시나리오 (반복 지정 가능, 기본값: 전체)")
+    parser.add_argument("--dataset-scale", type=float, default=0.05,
+                        help="검색 색인용 합성 데이터셋 규모 (benchmarks.dataset --scale)")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 경로")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="허용 회귀 비율 (p95 증가 / 처리량 감소)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="시나리오별 허용 2xx 외 응답 비율 (넘으면 실패, 기준선 저장 안 함)")
+    parser.add_argument("--update-baseline", action="store_true", help="결과를 기준선으로 저장")
+    standins.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    print(f"🚀 Starting stand-ins and backend (workers={args.workers})...")
+    processes = start_processes(args)
+    try:
+        print(f"📈 Load: concurrency={args.concurrency}, duration={args.duration}s per scenario")
+        measured = asyncio.run(run_load(args, processes["backend_url"], processes["standin_url"]))
+    finally:
+        stop_processes(processes)
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "workers": args.workers,
+            "dataset_scale": args.dataset_scale,
+            "standins": {key: value for key, value in vars(args).items()
+                         if key.split("_")[0] in ("deepseek", "youtube", "supabase", "stream", "seed")},
+        },
+        **measured,
+    }
+
+    output = args.output or RESULTS_DIR / f"load-{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"💾 Results written to {output}")
+
+    failures = failed_scenarios(report, args.max_error_rate)
+    if failures:
+        print(f"\n❌ Non-2xx responses over {args.max_error_rate:.2%}:", file=sys.stderr)
+        for line in failures:
+            print(f"   {line}", file=sys.stderr)
+        if args.update_baseline:
+            print("   Baseline not updated.", file=sys.stderr)
+        return 1
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(report, baseline, args.max_regression)
+        if regressions:
+            print(f"\n❌ Regressions vs baseline ({baseline['meta'].get('commit')}):", file=sys.stderr)
+            for line in regressions:
+                print(f"   {line}", file=sys.stderr)
+            return 1
+        print(f"✅ No regressions vs baseline ({baseline['meta'].get('commit')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
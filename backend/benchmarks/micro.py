@@ -0,0 +1,336 @@
+"""
+마이크로 벤치마크
+요청마다 실행되는 순수 Python 경로의 호출당 처리량(ops/sec)과 메모리 할당 측정
+
+Usage: python -m benchmarks.micro [--filter youtube] [--min-time 0.2] [--repeat 5]
+                                  [--baseline benchmarks/micro_baseline.json]
+                                  [--max-regression 0.15] [--update-baseline]
+
+- ops/sec: min-time초 이상 걸리도록 반복 횟수를 보정한 뒤 repeat회 측정한 최선값
+- alloc_peak_bytes: 호출 한 번 동안 tracemalloc 기준 최대 임시 할당량
+- alloc_retained_bytes: 호출 후에도 남아 있는 할당량 (누수 탐지용, 정상이면 0 근처)
+- 결과는 커밋별 JSON과 누적 이력(micro-history.jsonl)으로 저장되며,
+  기준선 대비 ops/sec 감소 또는 할당량 증가가 max-regression을 넘으면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .load import RESULTS_DIR, git_commit
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "micro_baseline.json"
+
+# 이름 → 측정 대상 함수를 만드는 설정 함수
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str):
+    """벤치마크 등록 데코레이터 (설정 함수는 인자 없는 호출 대상을 반환)"""
+    def decorator(setup: Callable[[], Callable[[], Any]]):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+# ============================================================================
+# 벤치마크 대상
+# ============================================================================
+
+def _youtube_items(count: int = 10) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """YouTube 검색 응답 항목 및 상세 정보 (대역 서버와 같은 형식)"""
+    items = [
+        {
+            "id": {"kind": "youtube#video", "videoId": f"vid{index:08d}"},
+            "snippet": {
+                "title": f"Python tutorial #{index}",
+                "description": "Learn Python step by step " * 4,
+                "thumbnails": {"medium": {"url": f"https://i.ytimg.com/vi/vid{index:08d}/mqdefault.jpg"}},
+                "channelTitle": "Education Channel",
+                "publishedAt": "2024-01-01T00:00:00Z",
+            },
+        }
+        for index in range(count)
+    ]
+    details = [
+        {"duration": f"PT{index}M13S", "view_count": 1000 * index, "like_count": index, "comment_count": index}
+        for index in range(count)
+    ]
+    return items, details
+
+
+@benchmark("youtube.parse_duration")
+def _parse_duration():
+    from src.services.youtube_service import youtube_service
+    return lambda: youtube_service.parse_duration("PT1H4M13S")
+
+
+@benchmark("youtube.shape_videos[10]")
+def _shape_videos():
+    from src.services.youtube_service import youtube_service
+    items, details = _youtube_items(10)
+    return lambda: youtube_service.shape_videos(items, details)
+
+
+@benchmark("youtube.shape_videos[50]")
+def _shape_videos_large():
+    from src.services.youtube_service import youtube_service
+    items, details = _youtube_items(50)
+    return lambda: youtube_service.shape_videos(items, details)
+
+
+@benchmark("ai.build_course_outline_messages")
+def _course_outline_messages():
+    from src.services.ai_service import ai_service
+    goals = ["regression", "classification", "model evaluation"]
+    return lambda: ai_service.build_course_outline_messages("Machine Learning", "beginner", 10, goals)
+
+
+@benchmark("ai.build_lesson_content_messages")
+def _lesson_content_messages():
+    from src.services.ai_service import ai_service
+    objectives = ["Understand gradients", "Implement backpropagation"]
+    return lambda: ai_service.build_lesson_content_messages("Backpropagation", objectives, "intermediate", 45)
+
+
+@benchmark("ai.build_learning_path_messages")
+def _learning_path_messages():
+    from src.services.ai_service import ai_service
+    profile = {"skill_level": "beginner", "completed_courses": 2, "total_study_hours": 40}
+    courses = [{"id": str(index), "title": f"Course {index}", "tags": ["ai", "python"]} for index in range(20)]
+    return lambda: ai_service.build_learning_path_messages(profile, courses, ["deep learning"])
+
+
+@benchmark("ai.build_evaluation_messages")
+def _evaluation_messages():
+    from src.services.ai_service import ai_service
+    return lambda: ai_service.build_evaluation_messages(
+        "What is overfitting?",
+        "When a model memorizes the training data",
+        "Model fits noise and generalizes poorly",
+        "Lesson 3: model evaluation",
+    )
+
+
+def _course():
+    from src.models.course import Course, CourseStatus, DifficultyLevel
+    return Course(
+        id=str(uuid.uuid4()), title="Machine Learning", slug="machine-learning",
+        description="A course " * 20, short_description="ML basics",
+        tags=["ai", "python"], categories=["Data Science"],
+        status=CourseStatus.PUBLISHED, difficulty_level=DifficultyLevel.BEGINNER,
+        estimated_duration_hours=10, rating=4.5, total_ratings=120, enrolled_count=3400,
+        is_free=True, price=0.0, currency="USD",
+        created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 6, 1),
+    )
+
+
+def _user():
+    from src.models.user import SkillLevel, User, UserRole
+    return User(
+        id=str(uuid.uuid4()), email="student@example.com", username="student",
+        hashed_password="x", first_name="Min", last_name="Kim", bio="Learner",
+        role=UserRole.STUDENT, current_skill_level=SkillLevel.BEGINNER,
+        total_study_hours=40, courses_completed=2,
+        created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 6, 1),
+    )
+
+
+@benchmark("model.Course.to_dict")
+def _course_to_dict():
+    course = _course()
+    return course.to_dict
+
+
+@benchmark("model.Course.to_summary_dict")
+def _course_to_summary_dict():
+    course = _course()
+    return course.to_summary_dict
+
+
+@benchmark("model.Course.to_summary_list[100]")
+def _course_to_summary_list():
+    from src.models.course import Course
+    courses = [_course() for _ in range(100)]
+    return lambda: Course.to_summary_list(courses)
+
+
+@benchmark("model.User.to_dict")
+def _user_to_dict():
+    user = _user()
+    return user.to_dict
+
+
+@benchmark("model.User.to_public_dict")
+def _user_to_public_dict():
+    user = _user()
+    return user.to_public_dict
+
+
+# ============================================================================
+# 측정
+# ============================================================================
+
+def measure_ops(func: Callable[[], Any], min_time: float, repeat: int) -> Dict[str, Any]:
+    """반복 횟수를 보정한 뒤 최선의 ops/sec 측정 (GC 비활성화 상태)"""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 10:
+            break
+        number *= 10
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    best = min(timings)
+    return {
+        "ops_per_sec": round(1 / best, 1),
+        "ns_per_op": round(best * 1e9, 1),
+        "ns_per_op_median": round(sorted(timings)[len(timings) // 2] * 1e9, 1),
+        "iterations": number,
+    }
+
+
+def measure_allocations(func: Callable[[], Any], calls: int = 50) -> Dict[str, int]:
+    """tracemalloc 기반 호출당 최대 임시 할당량 및 잔여 할당량"""
+    func()  # 지연 초기화/캐시 채우기는 측정에서 제외
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peaks = [0] * calls  # 측정용 리스트 증가가 잔여 할당량에 섞이지 않도록 미리 할당
+        baseline_size, _ = tracemalloc.get_traced_memory()
+        for index in range(calls):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks[index] = peak - before
+        gc.collect()
+        final_size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    peaks.sort()
+    return {
+        "alloc_peak_bytes": peaks[len(peaks) // 2],
+        "alloc_retained_bytes": max(0, (final_size - baseline_size) // calls),
+    }
+
+
+def run_benchmarks(names: List[str], min_time: float, repeat: int) -> Dict[str, Any]:
+    results = {}
+    for name in names:
+        func = BENCHMARKS[name]()
+        result = measure_ops(func, min_time, repeat)
+        result.update(measure_allocations(func))
+        results[name] = result
+        print(f"   {name:<40} {result['ops_per_sec']:>14,.0f} ops/s  {result['ns_per_op']:>10,.0f} ns/op  "
+              f"peak {result['alloc_peak_bytes']:>7,} B  retained {result['alloc_retained_bytes']:>5,} B")
+    return results
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_regression: float
+) -> List[str]:
+    """기준선 대비 회귀 목록 (ops/sec 감소, 임시 할당량 증가)"""
+    regressions = []
+    for name, current in report["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - max_regression):
+            regressions.append(
+                f"{name}: {previous['ops_per_sec']:,.0f} → {current['ops_per_sec']:,.0f} ops/s")
+        # 작은 할당량의 흔들림은 무시 (64바이트 여유)
+        if current["alloc_peak_bytes"] > previous["alloc_peak_bytes"] * (1 + max_regression) + 64:
+            regressions.append(
+                f"{name}: peak alloc {previous['alloc_peak_bytes']:,} → {current['alloc_peak_bytes']:,} B")
+    return regressions
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for hot pure-Python paths")
+    parser.add_argument("--filter", action="append", help="이름에 포함된 문자열로 선택 (반복 지정 가능)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="측정 1회당 최소 시간 (초)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 경로")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--max-regression", type=float, default=0.15,
+                        help="허용 회귀 비율 (ops/sec 감소 / 할당량 증가)")
+    parser.add_argument("--update-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--list", action="store_true", help="벤치마크 목록 출력")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS
+             if not args.filter or any(pattern in name for pattern in args.filter)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    print(f"⏱️  Running {len(names)} micro-benchmarks (min_time={args.min_time}s, repeat={args.repeat})")
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "benchmarks": run_benchmarks(names, args.min_time, args.repeat),
+    }
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = args.output or RESULTS_DIR / f"micro-{commit or 'local'}.json"
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    with open(RESULTS_DIR / "micro-history.jsonl", "a", encoding="utf-8") as history:
+        history.write(json.dumps(report, ensure_ascii=False) + "\n")
+    print(f"💾 Results written to {output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(report, baseline, args.max_regression)
+        if regressions:
+            print(f"\n❌ Regressions vs baseline ({baseline['meta'].get('commit')}):", file=sys.stderr)
+            for line in regressions:
+                print(f"   {line}", file=sys.stderr)
+            return 1
+        print(f"✅ No regressions vs baseline ({baseline['meta'].get('commit')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
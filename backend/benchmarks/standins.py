@@ -0,0 +1,548 @@
+"""
+업스트림 대역 서버
+Deepseek / YouTube Data API / Supabase(GoTrue + PostgREST) / S3 / GitHub Contents API를 흉내내는 로컬 ASGI 앱
+
+Usage: python -m benchmarks.standins --port 9100 [--deepseek-latency-ms 800 ...]
+
+한 포트에서 경로 접두사로 구분합니다.
+- Deepseek:  {base}/deepseek/chat/completions   (DEEPSEEK_BASE_URL={base}/deepseek)
+- YouTube:   {base}/youtube/v3/search, /videos   (YOUTUBE_API_URL={base}/youtube/v3)
+- Supabase:  {base}/supabase/auth/v1/*, /rest/v1/* (SUPABASE_URL={base}/supabase)
+- S3/R2:     {base}/s3/{bucket}/{key} (+multipart)  (R2_ENDPOINT_URL={base}/s3)
+- GitHub:    {base}/github/repos/{repo}/contents/* (GITHUB_API_URL={base}/github)
+
+지연 시간(고정 + 지터), 429 비율, 스트리밍 청크 간격을 설정할 수 있어
+실제 API 키나 네트워크 없이 재현 가능한 부하 테스트가 가능합니다.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+
+@dataclass
+class UpstreamProfile:
+    """업스트림 하나의 응답 특성"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_limit_ratio: float = 0.0  # 429 응답 비율 (0.0 ~ 1.0)
+    retry_after_seconds: int = 1
+
+    async def delay(self, rng: random.Random) -> None:
+        """고정 지연 + 균등 분포 지터"""
+        seconds = (self.latency_ms + rng.uniform(0, self.jitter_ms)) / 1000
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def rate_limited(self, rng: random.Random) -> Optional[JSONResponse]:
+        """설정된 비율로 429 응답 반환"""
+        if self.rate_limit_ratio and rng.random() < self.rate_limit_ratio:
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+                status_code=429,
+                headers={"Retry-After": str(self.retry_after_seconds)},
+            )
+        return None
+
+
+@dataclass
+class StandinConfig:
+    """대역 서버 전체 설정"""
+    deepseek: UpstreamProfile = field(
+        default_factory=lambda: UpstreamProfile(latency_ms=800, jitter_ms=400)
+    )
+    youtube: UpstreamProfile = field(
+        default_factory=lambda: UpstreamProfile(latency_ms=120, jitter_ms=60)
+    )
+    supabase: UpstreamProfile = field(
+        default_factory=lambda: UpstreamProfile(latency_ms=25, jitter_ms=15)
+    )
+    storage: UpstreamProfile = field(  # S3 / GitHub 객체 저장소
+        default_factory=lambda: UpstreamProfile(latency_ms=30, jitter_ms=20)
+    )
+    stream_chunk_interval_ms: float = 20.0  # 스트리밍 응답 청크 간격
+    stream_chunks: int = 40
+    seed: int = 42
+
+
+# ============================================================================
+# 응답 본문
+# ============================================================================
+
+_COURSE_OUTLINE = {
+    "title": "Introduction to Machine Learning",
+    "description": "A hands-on course covering the fundamentals of machine learning.",
+    "learning_objectives": ["Understand supervised learning", "Train and evaluate models"],
+    "prerequisites": ["Basic Python"],
+    "modules": [
+        {
+            "title": f"Module {index}",
+            "estimated_hours": 2,
+            "lessons": [{"title": f"Lesson {index}.{lesson}", "minutes": 30} for lesson in range(1, 5)],
+        }
+        for index in range(1, 6)
+    ],
+}
+
+_EVALUATION = {
+    "score": 82,
+    "feedback": "The answer covers the key idea but misses an edge case.",
+    "strengths": ["Clear explanation"],
+    "improvements": ["Mention overfitting"],
+}
+
+
+def _completion_content(messages: List[Dict[str, Any]]) -> str:
+    """프롬프트 종류에 맞는 JSON 문자열 (서비스의 json.loads가 성공하도록)"""
+    prompt = " ".join(str(message.get("content", "")) for message in messages).lower()
+    if "evaluat" in prompt:
+        return json.dumps(_EVALUATION)
+    return json.dumps(_COURSE_OUTLINE)
+
+
+def _auth_user(user_id: str, email: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """GoTrue User 객체"""
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": user_id,
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": email,
+        "app_metadata": {"provider": "email"},
+        "user_metadata": metadata or {},
+        "created_at": now,
+        "updated_at": now,
+        "email_confirmed_at": now,
+    }
+
+
+# ============================================================================
+# 앱 생성
+# ============================================================================
+
+def create_app(config: Optional[StandinConfig] = None) -> FastAPI:
+    """대역 서버 ASGI 앱 생성"""
+    config = config or StandinConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI(title="Upstream stand-ins", docs_url=None, redoc_url=None)
+
+    # 인메모리 상태 (토큰 → 사용자, 테이블 이름 → 행 목록)
+    sessions: Dict[str, Dict[str, Any]] = {}
+    refresh_tokens: Dict[str, Dict[str, Any]] = {}
+    users_by_email: Dict[str, Dict[str, Any]] = {}
+    tables: Dict[str, List[Dict[str, Any]]] = {"users": []}
+    objects: Dict[str, bytes] = {}  # 객체 저장소 경로 → 내용
+    multipart: Dict[str, Dict[int, Any]] = {}  # upload ID → 파트 번호 → (ETag, 내용)
+    counters: Dict[str, int] = {}
+
+    def count(name: str) -> None:
+        counters[name] = counters.get(name, 0) + 1
+
+    def issue_session(user: Dict[str, Any]) -> Dict[str, Any]:
+        token = f"bench-{uuid.uuid4().hex}"
+        refresh_token = uuid.uuid4().hex
+        sessions[token] = user
+        refresh_tokens[refresh_token] = user
+        return {
+            "access_token": token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": 3600,
+            "expires_at": int(datetime.now(timezone.utc).timestamp()) + 3600,
+            "user": user,
+        }
+
+    def bearer(request: Request) -> Optional[str]:
+        header = request.headers.get("authorization", "")
+        return header[7:] if header.lower().startswith("bearer ") else None
+
+    # ---------------------------------------------------------------- Deepseek
+
+    @app.post("/deepseek/chat/completions")
+    async def chat_completions(request: Request):
+        count("deepseek.chat")
+        limited = config.deepseek.rate_limited(rng)
+        if limited:
+            return limited
+
+        payload = await request.json()
+        content = _completion_content(payload.get("messages", []))
+        model = payload.get("model", "deepseek-chat")
+        usage = {
+            "prompt_tokens": sum(len(str(m.get("content", ""))) // 4 for m in payload.get("messages", [])),
+            "completion_tokens": len(content) // 4,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if payload.get("stream"):
+            # 첫 토큰까지의 지연 후 청크 간격으로 SSE 전송
+            await config.deepseek.delay(rng)
+            chunk_size = max(1, len(content) // max(1, config.stream_chunks))
+
+            async def events():
+                for start in range(0, len(content), chunk_size):
+                    chunk = {"model": model, "choices": [
+                        {"index": 0, "delta": {"content": content[start:start + chunk_size]}}
+                    ]}
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    await asyncio.sleep(config.stream_chunk_interval_ms / 1000)
+                final = {"model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                         "usage": usage}
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await config.deepseek.delay(rng)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }
+
+    # ----------------------------------------------------------------- YouTube
+
+    @app.get("/youtube/v3/search")
+    async def youtube_search(q: str = "", maxResults: int = 10):
+        count("youtube.search")
+        limited = config.youtube.rate_limited(rng)
+        if limited:
+            return limited
+        await config.youtube.delay(rng)
+        return {"items": [
+            {
+                "id": {"kind": "youtube#video", "videoId": f"vid{index:08d}"},
+                "snippet": {
+                    "title": f"{q[:40]} #{index}",
+                    "description": "Stand-in video description " * 4,
+                    "thumbnails": {"medium": {"url": f"https://i.ytimg.com/vi/vid{index:08d}/mqdefault.jpg"}},
+                    "channelTitle": "Stand-in Channel",
+                    "publishedAt": "2024-01-01T00:00:00Z",
+                },
+            }
+            for index in range(min(maxResults, 50))
+        ]}
+
+    @app.get("/youtube/v3/videos")
+    async def youtube_videos(id: str = ""):
+        count("youtube.videos")
+        limited = config.youtube.rate_limited(rng)
+        if limited:
+            return limited
+        await config.youtube.delay(rng)
+        return {"items": [
+            {
+                "id": video_id,
+                "contentDetails": {"duration": f"PT{4 + index % 20}M{index % 60}S"},
+                "statistics": {"viewCount": str(1000 * (index + 1)), "likeCount": str(50 + index),
+                               "commentCount": str(index)},
+            }
+            for index, video_id in enumerate(filter(None, id.split(",")))
+        ]}
+
+    # --------------------------------------------------------- Supabase Auth
+
+    @app.post("/supabase/auth/v1/signup")
+    async def auth_signup(request: Request):
+        count("supabase.signup")
+        limited = config.supabase.rate_limited(rng)
+        if limited:
+            return limited
+        body = await request.json()
+        await config.supabase.delay(rng)
+        email = body.get("email", "")
+        if email in users_by_email:
+            return JSONResponse({"code": 422, "msg": "User already registered"}, status_code=422)
+        user = _auth_user(str(uuid.uuid4()), email, (body.get("data") or {}))
+        users_by_email[email] = {"user": user, "password": body.get("password")}
+        return issue_session(user)
+
+    @app.post("/supabase/auth/v1/token")
+    async def auth_token(request: Request, grant_type: str = "password"):
+        count(f"supabase.token.{grant_type}")
+        limited = config.supabase.rate_limited(rng)
+        if limited:
+            return limited
+        body = await request.json()
+        await config.supabase.delay(rng)
+
+        if grant_type == "refresh_token":
+            user = refresh_tokens.get(body.get("refresh_token", ""))
+            if user is None:
+                return JSONResponse({"error": "invalid_grant"}, status_code=400)
+            return issue_session(user)
+
+        email = body.get("email", "")
+        account = users_by_email.get(email)
+        if account is None:
+            # 등록되지 않은 이메일은 자동 생성 (부하 테스트용 계정 준비 생략)
+            account = {"user": _auth_user(str(uuid.uuid4()), email), "password": body.get("password")}
+            users_by_email[email] = account
+        elif account["password"] != body.get("password"):
+            return JSONResponse(
+                {"error": "invalid_grant", "error_description": "Invalid login credentials"},
+                status_code=400,
+            )
+        return issue_session(account["user"])
+
+    @app.post("/supabase/auth/v1/admin/users")
+    async def auth_admin_create_user(request: Request):
+        count("supabase.admin.create_user")
+        limited = config.supabase.rate_limited(rng)
+        if limited:
+            return limited
+        body = await request.json()
+        await config.supabase.delay(rng)
+        email = body.get("email", "")
+        if email in users_by_email:
+            return JSONResponse({"code": 422, "msg": "A user with this email address has already been registered"},
+                                status_code=422)
+        user = _auth_user(body.get("id") or str(uuid.uuid4()), email, body.get("user_metadata") or {})
+        user["app_metadata"].update(body.get("app_metadata") or {})
+        users_by_email[email] = {"user": user, "password": body.get("password")}
+        return user
+
+    @app.put("/supabase/auth/v1/admin/users/{user_id}")
+    async def auth_admin_update_user(user_id: str, request: Request):
+        count("supabase.admin.update_user")
+        body = await request.json()
+        await config.supabase.delay(rng)
+        for account in users_by_email.values():
+            if account["user"]["id"] == user_id:
+                account["user"]["app_metadata"].update(body.get("app_metadata") or {})
+                return account["user"]
+        return JSONResponse({"code": 404, "msg": "User not found"}, status_code=404)
+
+    @app.get("/supabase/auth/v1/user")
+    async def auth_user(request: Request):
+        count("supabase.user")
+        await config.supabase.delay(rng)
+        user = sessions.get(bearer(request) or "")
+        if user is None:
+            return JSONResponse({"code": 401, "msg": "invalid JWT"}, status_code=401)
+        return user
+
+    @app.post("/supabase/auth/v1/logout")
+    async def auth_logout(request: Request):
+        count("supabase.logout")
+        await config.supabase.delay(rng)
+        sessions.pop(bearer(request) or "", None)
+        return Response(status_code=204)
+
+    # ---------------------------------------------------------- PostgREST
+
+    @app.api_route("/supabase/rest/v1/{table}", methods=["GET", "HEAD"])
+    async def rest_select(table: str, request: Request):
+        count(f"supabase.rest.{table}.select")
+        limited = config.supabase.rate_limited(rng)
+        if limited:
+            return limited
+        await config.supabase.delay(rng)
+
+        rows = tables.get(table, [])
+        for column, condition in request.query_params.items():
+            if column in ("select", "limit", "offset", "order") or not condition.startswith("eq."):
+                continue
+            value = condition[3:]
+            rows = [row for row in rows if str(row.get(column)) == value]
+
+        total = len(rows)
+        limit = request.query_params.get("limit")
+        if limit is not None:
+            rows = rows[:int(limit)]
+
+        headers = {"Content-Range": f"0-{max(0, len(rows) - 1)}/{total}"}
+        return JSONResponse(rows, headers=headers)
+
+    @app.post("/supabase/rest/v1/{table}")
+    async def rest_insert(table: str, request: Request):
+        count(f"supabase.rest.{table}.insert")
+        limited = config.supabase.rate_limited(rng)
+        if limited:
+            return limited
+        body = await request.json()
+        await config.supabase.delay(rng)
+        rows = body if isinstance(body, list) else [body]
+        tables.setdefault(table, []).extend(rows)
+        return JSONResponse(rows, status_code=201)
+
+    @app.post("/supabase/rest/v1/rpc/{function}")
+    async def rest_rpc(function: str, request: Request):
+        """RPC: 아웃박스 기록만 보관하고 (처리 워커가 가져갈 이벤트는 없음) 나머지는 빈 결과"""
+        count(f"supabase.rpc.{function}")
+        limited = config.supabase.rate_limited(rng)
+        if limited:
+            return limited
+        body = await request.json()
+        await config.supabase.delay(rng)
+        if function == "enqueue_outbox_events":
+            events = tables.setdefault("outbox_events", [])
+            events.extend(body.get("events") or [])
+            return JSONResponse(len(body.get("events") or []))
+        if function == "claim_outbox_events":
+            return JSONResponse([])
+        return JSONResponse(None)
+
+    # ------------------------------------------------------- 객체 저장소
+
+    @app.api_route("/s3/{bucket}/{key:path}", methods=["GET", "HEAD", "PUT", "POST", "DELETE"])
+    async def s3_object(bucket: str, key: str, request: Request):
+        """S3 호환 객체 + multipart upload (SigV4 형식만 확인하고 서명은 검증하지 않음)"""
+        params = request.query_params
+        operation = "multipart" if ("uploads" in params or "uploadId" in params) else "object"
+        count(f"s3.{operation}.{request.method.lower()}")
+        if not request.headers.get("authorization", "").startswith("AWS4-HMAC-SHA256 "):
+            return Response(status_code=403)
+        limited = config.storage.rate_limited(rng)
+        if limited:
+            return limited
+        await config.storage.delay(rng)
+
+        path = f"s3/{bucket}/{key}"
+        if request.method == "POST" and "uploads" in params:
+            upload_id = uuid.uuid4().hex
+            multipart[upload_id] = {}
+            return Response(
+                f"<InitiateMultipartUploadResult><Bucket>{bucket}</Bucket><Key>{key}</Key>"
+                f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>",
+                media_type="application/xml",
+            )
+        if "uploadId" in params:
+            parts = multipart.get(params["uploadId"])
+            if parts is None:
+                return Response("<Error><Code>NoSuchUpload</Code></Error>", status_code=404)
+            if request.method == "PUT":
+                data = await request.body()
+                if len(data) != int(request.headers.get("content-length", -1)):
+                    return Response("<Error><Code>IncompleteBody</Code></Error>", status_code=400)
+                etag = f'"{uuid.uuid4().hex}"'
+                parts[int(params["partNumber"])] = (etag, data)
+                return Response(status_code=200, headers={"ETag": etag})
+            if request.method == "POST":
+                body = (await request.body()).decode()
+                numbers = [int(n) for n in re.findall(r"<PartNumber>(\d+)</PartNumber>", body)]
+                etags = re.findall(r"<ETag>([^<]+)</ETag>", body)
+                if any(parts.get(n, ("",))[0] != etag for n, etag in zip(numbers, etags)):
+                    return Response("<Error><Code>InvalidPart</Code></Error>", status_code=400)
+                objects[path] = b"".join(parts[n][1] for n in numbers)
+                del multipart[params["uploadId"]]
+                return Response("<CompleteMultipartUploadResult/>", media_type="application/xml")
+            if request.method == "DELETE":
+                del multipart[params["uploadId"]]
+                return Response(status_code=204)
+
+        if request.method == "PUT":
+            objects[path] = await request.body()
+            return Response(status_code=200)
+        if path not in objects:
+            return Response(status_code=404)
+        data = objects[path]
+        if request.method == "HEAD":
+            return Response(status_code=200, headers={"Content-Length": str(len(data))})
+        return Response(data, media_type="application/octet-stream")
+
+    @app.api_route("/github/repos/{owner}/{repo}/contents/{path:path}", methods=["GET", "HEAD", "PUT"])
+    async def github_contents(owner: str, repo: str, path: str, request: Request):
+        """GitHub Contents API (raw 조회, 생성만 지원 - 기존 파일 덮어쓰기는 422)"""
+        count(f"github.contents.{request.method.lower()}")
+        limited = config.storage.rate_limited(rng)
+        if limited:
+            return limited
+        await config.storage.delay(rng)
+
+        full_path = f"github/{owner}/{repo}/{path}"
+        if request.method == "PUT":
+            if full_path in objects:
+                return JSONResponse({"message": '"sha" wasn\'t supplied.'}, status_code=422)
+            body = await request.json()
+            objects[full_path] = base64.b64decode(body["content"])
+            return JSONResponse({"content": {"path": path}}, status_code=201)
+        if full_path not in objects:
+            return JSONResponse({"message": "Not Found"}, status_code=404)
+        if request.method == "HEAD":
+            return Response(status_code=200)
+        return Response(objects[full_path], media_type="application/vnd.github.raw")
+
+    # ------------------------------------------------------------ 관리용
+
+    @app.get("/_stats")
+    async def stats():
+        """업스트림별 호출 횟수 (부하 테스트 결과에 첨부)"""
+        return {"calls": counters, "sessions": len(sessions), "users": len(users_by_email),
+                "objects": len(objects)}
+
+    @app.post("/_seed/users")
+    async def seed_user(request: Request):
+        """프로필 행 추가 (/auth/me 시나리오용)"""
+        body = await request.json()
+        tables["users"].append(body)
+        return {"ok": True}
+
+    return app
+
+
+def _profile(args: argparse.Namespace, name: str) -> UpstreamProfile:
+    return UpstreamProfile(
+        latency_ms=getattr(args, f"{name}_latency_ms"),
+        jitter_ms=getattr(args, f"{name}_jitter_ms"),
+        rate_limit_ratio=getattr(args, f"{name}_429_rate"),
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """대역 서버 설정 CLI 인자 (부하 테스트 CLI와 공유)"""
+    defaults = StandinConfig()
+    for name in ("deepseek", "youtube", "supabase", "storage"):
+        profile: UpstreamProfile = getattr(defaults, name)
+        parser.add_argument(f"--{name}-latency-ms", type=float, default=profile.latency_ms)
+        parser.add_argument(f"--{name}-jitter-ms", type=float, default=profile.jitter_ms)
+        parser.add_argument(f"--{name}-429-rate", type=float, default=profile.rate_limit_ratio)
+    parser.add_argument("--stream-chunk-interval-ms", type=float, default=defaults.stream_chunk_interval_ms)
+    parser.add_argument("--stream-chunks", type=int, default=defaults.stream_chunks)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_args(args: argparse.Namespace) -> StandinConfig:
+    """CLI 인자 → StandinConfig"""
+    return StandinConfig(
+        deepseek=_profile(args, "deepseek"),
+        youtube=_profile(args, "youtube"),
+        supabase=_profile(args, "supabase"),
+        storage=_profile(args, "storage"),
+        stream_chunk_interval_ms=args.stream_chunk_interval_ms,
+        stream_chunks=args.stream_chunks,
+        seed=args.seed,
+    )
+
+
+def main(argv=None) -> None:
+    """CLI 진입점"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Upstream stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port,
+                log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+대량 가져오기 도구
+CSV/JSONL 파일의 사용자, 코스/모듈/레슨, 수강 정보를 PostgreSQL에 직접 적재
+"""
@@ -0,0 +1,124 @@
+"""
+로그인 계정 연결
+users 배치의 각 행을 Supabase Auth 계정 ID로 적재 (없으면 GoTrue 관리 API로 생성)
+
+public.users의 id는 auth.users의 id와 같아야 합니다. 다르면 나중에 같은 이메일로 로그인한
+사용자의 프로필 생성이 email UNIQUE 제약에 막히고, 가져온 수강 정보도 로그인할 수 없는 ID에 남습니다.
+- 이미 있는 계정(auth.users, 이메일 기준)은 그 ID를 사용하고, 원본에 role이 있으면 app_metadata.role을 맞춥니다.
+- 없는 계정은 확인된 이메일로 생성합니다 (원본에 id가 있으면 그 ID로).
+  app_metadata.bulk_import 표시로 auth.users 트리거의 가입 후속 작업(환영 알림, 기본 수강 등록,
+  프로필 생성) 이벤트를 건너뜁니다 (008_skip_imported_signup_events.sql).
+- 원본 id나 기존 프로필 id가 계정 ID와 다르면 그 행은 거부합니다.
+"""
+import asyncio
+from typing import Any, Dict, List, Sequence, Tuple
+from uuid import UUID
+
+Record = Tuple[Any, ...]
+
+
+class AuthAccounts:
+    """users 배치 레코드의 id를 로그인 계정 ID로 교체"""
+
+    def __init__(self, columns: Sequence[str], present: Sequence[str], concurrency: int):
+        self.index = {column: position for position, column in enumerate(columns)}
+        self.sync_role = "role" in present
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @staticmethod
+    async def check(conn) -> None:
+        """대상 DB에 Supabase Auth 스키마가 있는지 확인"""
+        if await conn.fetchval("SELECT to_regclass('auth.users')") is None:
+            raise RuntimeError(
+                "auth.users 테이블이 없습니다. Supabase DB가 아니면 --auth-accounts skip으로 프로필만 적재하세요")
+        source = await conn.fetchval(
+            "SELECT prosrc FROM pg_proc WHERE proname = 'enqueue_signup_events' AND pronamespace = 'public'::regnamespace")
+        if source is not None and "bulk_import" not in source:
+            # 가입 트리거가 가져온 계정마다 환영 알림/기본 수강 등록/프로필 이벤트를 기록하게 됨
+            raise RuntimeError(
+                "가입 트리거가 가져온 계정을 구분하지 못합니다. 008_skip_imported_signup_events.sql을 먼저 적용하세요")
+
+    def _value(self, record: Record, column: str) -> Any:
+        return record[self.index[column]]
+
+    async def _create(self, record: Record) -> str:
+        from src.services.session_service import session_service
+
+        user_id = self._value(record, "id")
+        async with self._semaphore:
+            user = await session_service.admin_create_user(
+                email=self._value(record, "email"),
+                user_metadata={
+                    "username": self._value(record, "username"),
+                    "first_name": self._value(record, "first_name"),
+                    "last_name": self._value(record, "last_name"),
+                },
+                app_metadata={"role": self._value(record, "role"), "bulk_import": True},
+                user_id=str(user_id) if user_id else None,
+            )
+        return user["id"]
+
+    async def _sync_role(self, user_id: str, role: str) -> None:
+        from src.services.session_service import session_service
+
+        async with self._semaphore:
+            await session_service.admin_update_app_metadata(user_id, {"role": role})
+
+    async def link(self, conn, records: List[Record]) -> Tuple[List[Record], List[Tuple[int, str]]]:
+        """(계정 ID로 바꾼 레코드, 거부 (행 번호, 사유)) 반환"""
+        from src.services.session_service import SessionError
+
+        emails = [self._value(record, "email").lower() for record in records]
+        accounts = {
+            row["email"]: row for row in await conn.fetch(
+                "SELECT id::text, lower(email) AS email, raw_app_meta_data->>'role' AS role "
+                "FROM auth.users WHERE lower(email) = ANY($1::text[])", emails)
+        }
+        profiles = {
+            row["email"]: row["id"] for row in await conn.fetch(
+                "SELECT id::text, lower(email) AS email FROM users WHERE lower(email) = ANY($1::text[])", emails)
+        }
+
+        async def resolve(record: Record, email: str) -> str:
+            account = accounts.get(email)
+            if account is None:
+                return await self._create(record)
+            if self.sync_role and account["role"] != self._value(record, "role"):
+                await self._sync_role(account["id"], self._value(record, "role"))
+            return account["id"]
+
+        # 같은 배치의 중복 이메일은 upsert와 같이 뒤쪽 행 기준으로 한 번만 처리
+        latest = {email: record for record, email in zip(records, emails)}
+        outcomes = await asyncio.gather(
+            *(resolve(record, email) for email, record in latest.items()), return_exceptions=True
+        )
+        resolved: Dict[str, Any] = dict(zip(latest, outcomes))
+
+        # 다른 워커/이전 실행이 먼저 만든 계정 (422)은 다시 조회해 연결
+        conflicted = [
+            email for email, outcome in resolved.items()
+            if isinstance(outcome, SessionError) and outcome.status_code == 422
+        ]
+        if conflicted:
+            for row in await conn.fetch(
+                "SELECT id::text, lower(email) AS email FROM auth.users WHERE lower(email) = ANY($1::text[])",
+                conflicted
+            ):
+                resolved[row["email"]] = row["id"]
+
+        linked: List[Record] = []
+        rejected: List[Tuple[int, str]] = []
+        position = self.index["id"]
+        for record, email in zip(records, emails):
+            line, source_id, result = record[0], self._value(record, "id"), resolved[email]
+            if isinstance(result, SessionError) and result.status_code < 500:
+                rejected.append((line, f"로그인 계정 생성 실패 ({result.status_code}): {result}"))
+            elif isinstance(result, BaseException):
+                raise result  # 인증 서비스 장애 등은 배치 실패 (재실행 시 체크포인트부터)
+            elif source_id and str(source_id) != result:
+                rejected.append((line, f"원본 id가 로그인 계정 ID({result})와 다릅니다"))
+            elif profiles.get(email, result) != result:
+                rejected.append((line, f"기존 프로필 id({profiles[email]})가 로그인 계정 ID({result})와 다릅니다"))
+            else:
+                linked.append(record[:position] + (UUID(result),) + record[position + 1:])
+        return linked, rejected
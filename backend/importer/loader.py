@@ -0,0 +1,467 @@
+"""
+대량 가져오기 실행기
+파일을 스트리밍으로 읽어 검증한 뒤 테이블별 병렬 워커가 COPY + 배치 upsert로 적재
+
+Usage: python -m importer [--users users.csv] [--courses courses.jsonl] [--modules ...]
+                          [--lessons ...] [--enrollments ...] [--batch-size 5000]
+                          [--workers 4] [--state-dir .import-state] [--validate-only]
+                          [--auth-accounts create|skip] [--auth-concurrency 8]
+
+- 메모리 사용량은 배치 크기 × (워커 수 + 대기 큐) 행으로 제한됩니다.
+- 테이블은 FK 순서를 따르며, 서로 독립인 테이블(modules와 enrollments 등)은 동시에 적재됩니다.
+- 배치는 각자 하나의 트랜잭션이며, 실패한 배치는 반으로 나누어 다시 시도해 문제 행만 거부합니다.
+- 체크포인트(<state-dir>/checkpoint.json)에는 연속으로 완료된 배치까지의 행 수가 기록되므로
+  중단 후 같은 명령을 다시 실행하면 그 지점부터 이어서 적재합니다 (upsert이므로 재적재되어도 안전).
+- 검증 실패, 참조 해석 실패, DB 오류 행은 <state-dir>/<table>.rejects.jsonl에 기록됩니다.
+- users는 로그인 계정(auth.users) ID로 적재하며, 계정이 없으면 GoTrue 관리 API로 생성합니다 (accounts.py).
+"""
+import argparse
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+from pydantic import ValidationError
+
+from .accounts import AuthAccounts
+from .tables import TABLES, TableSpec
+
+Record = Tuple[Any, ...]
+
+
+# ============================================================================
+# 원본 파일 읽기
+# ============================================================================
+
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def _format_of(path: Path) -> str:
+    suffixes = [suffix for suffix in path.suffixes if suffix != ".gz"]
+    extension = suffixes[-1] if suffixes else ""
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"지원하지 않는 파일 형식입니다 (csv, jsonl): {path}")
+
+
+def read_rows(path: Path) -> Iterator[Tuple[int, Any]]:
+    """(행 번호, dict 또는 파싱 오류 문자열) 스트림"""
+    with _open_text(path) as handle:
+        if _format_of(path) == "csv":
+            for line, row in enumerate(csv.DictReader(handle), start=1):
+                yield line, row
+            return
+        for line, text in enumerate(handle, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, orjson.loads(text)
+            except orjson.JSONDecodeError as e:
+                yield line, f"JSON 파싱 실패: {e}"
+
+
+def present_columns(path: Path) -> Tuple[str, ...]:
+    """원본에 있는 컬럼 (CSV 헤더 또는 JSONL 첫 행의 키)"""
+    for _, row in read_rows(path):
+        if isinstance(row, dict):
+            return tuple(row)
+    return ()
+
+
+def source_signature(path: Path) -> Dict[str, Any]:
+    stat = path.stat()
+    return {"path": str(path.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+# ============================================================================
+# 체크포인트 및 거부 행 기록
+# ============================================================================
+
+class Checkpoint:
+    """테이블별 진행 상태 (원본 파일이 바뀌면 처음부터)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.state: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            self.state = json.loads(path.read_text(encoding="utf-8"))
+
+    def table(self, name: str, source: Dict[str, Any]) -> Dict[str, Any]:
+        state = self.state.get(name)
+        if state is None or state.get("source") != source:
+            state = {"source": source, "rows": 0, "loaded": 0, "rejected": 0, "done": False}
+            self.state[name] = state
+        return state
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.state, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporary, self.path)
+
+
+class Rejects:
+    """거부 행 기록 (JSONL, 이어서 실행하면 뒤에 추가)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._handle = None
+
+    def write(self, line: int, reason: Any, row: Any = None) -> None:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, "ab")
+        self._handle.write(orjson.dumps({"line": line, "reason": reason, "row": row}) + b"\n")
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+# ============================================================================
+# 테이블 적재
+# ============================================================================
+
+@dataclass
+class Batch:
+    seq: int
+    end_row: int                    # 이 배치까지 원본에서 소비한 행 수
+    records: List[Record]
+    loaded: int = 0
+    rejected: int = 0
+    rows: Dict[int, Any] = field(default_factory=dict)  # 행 번호 → 원본 (거부 기록용)
+
+
+@dataclass
+class TableProgress:
+    spec: TableSpec
+    rows: int = 0
+    loaded: int = 0
+    rejected: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    status: str = "waiting"
+
+
+class TableLoader:
+    """한 테이블의 읽기(검증) → 병렬 적재 → 체크포인트 갱신"""
+
+    def __init__(self, spec: TableSpec, path: Path, args: argparse.Namespace,
+                 checkpoint: Checkpoint, progress: TableProgress):
+        self.spec = spec
+        self.path = path
+        self.args = args
+        self.checkpoint = checkpoint
+        self.progress = progress
+        self.rejects = Rejects(args.state_dir / f"{spec.name}.rejects.jsonl")
+        self.state = checkpoint.table(spec.name, source_signature(path))
+        present = present_columns(path)
+        self.upsert_sql = spec.upsert_sql(present)
+        self.unresolved_sql = spec.unresolved_sql()
+        self.accounts: Optional[AuthAccounts] = None
+        if spec.name == "users" and args.auth_accounts == "create":
+            self.accounts = AuthAccounts(spec.column_names, present, args.auth_concurrency)
+        # 레슨 본문이 바뀌면 앱의 레슨 → 본문 해시 캐시를 비움
+        self.invalidates_lessons = spec.name == "lessons" and "content" in present
+        self._finished: Dict[int, Batch] = {}
+        self._next_seq = 0
+
+    def batches(self) -> Iterator[Batch]:
+        """체크포인트 이후 행을 검증해 배치로 묶음"""
+        skip = self.state["rows"]
+        columns = self.spec.column_names
+        batch = Batch(seq=0, end_row=skip, records=[])
+        consumed = 0
+        for line, row in read_rows(self.path):
+            consumed += 1
+            if consumed <= skip:
+                continue
+            batch.end_row = consumed
+            try:
+                if isinstance(row, str):
+                    raise ValueError(row)
+                batch.records.append(self.spec.row_model.model_validate(row).to_record(line, columns))
+                batch.rows[line] = row
+            except ValidationError as e:
+                batch.rejected += 1
+                self.rejects.write(line, e.errors(include_url=False, include_context=False), row)
+            except ValueError as e:
+                batch.rejected += 1
+                self.rejects.write(line, str(e), row)
+
+            if len(batch.records) >= self.args.batch_size:
+                yield batch
+                batch = Batch(seq=batch.seq + 1, end_row=consumed, records=[])
+        if batch.records or batch.rejected or batch.end_row > skip:
+            yield batch
+
+    async def _write(self, conn, batch: Batch, records: List[Record]) -> int:
+        """배치 반영 (실패하면 반으로 나누어 재시도, 한 행짜리 실패는 거부)"""
+        import asyncpg
+
+        try:
+            async with conn.transaction():
+                await conn.copy_records_to_table(
+                    self.spec.stage_table, records=records, columns=self.spec.column_names
+                )
+                unresolved = await conn.fetch(self.unresolved_sql) if self.unresolved_sql else []
+                loaded = await conn.fetchval(self.upsert_sql)
+        except (asyncpg.PostgresError, asyncpg.DataError) as e:
+            if len(records) == 1:
+                batch.rejected += 1
+                self.rejects.write(records[0][0], f"{type(e).__name__}: {e}", batch.rows.get(records[0][0]))
+                return 0
+            middle = len(records) // 2
+            return (await self._write(conn, batch, records[:middle])
+                    + await self._write(conn, batch, records[middle:]))
+
+        for row in unresolved:
+            batch.rejected += 1
+            self.rejects.write(row["line"], "참조 대상을 찾을 수 없습니다", batch.rows.get(row["line"]))
+        return loaded
+
+    def _complete(self, batch: Batch) -> None:
+        """연속으로 완료된 배치까지 체크포인트 전진"""
+        batch.rows = {}
+        batch.records = []
+        self.progress.loaded += batch.loaded
+        self.progress.rejected += batch.rejected
+        self._finished[batch.seq] = batch
+        advanced = False
+        while self._next_seq in self._finished:
+            done = self._finished.pop(self._next_seq)
+            self.state["rows"] = done.end_row
+            self.state["loaded"] += done.loaded
+            self.state["rejected"] += done.rejected
+            self._next_seq += 1
+            advanced = True
+        if advanced:
+            self.checkpoint.save()
+
+    async def _link_accounts(self, conn, batch: Batch) -> None:
+        """users 레코드의 id를 로그인 계정 ID로 교체 (연결할 수 없는 행은 거부)"""
+        batch.records, rejected = await self.accounts.link(conn, batch.records)
+        for line, reason in rejected:
+            batch.rejected += 1
+            self.rejects.write(line, reason, batch.rows.get(line))
+
+    async def _invalidate_lessons(self, batch: Batch) -> None:
+        from src.services.render_service import render_service
+
+        position = self.spec.column_names.index("id")
+        await render_service.invalidate_lessons(*(record[position] for record in batch.records))
+
+    async def _worker(self, pool, queue: "asyncio.Queue[Optional[Batch]]") -> None:
+        async with pool.acquire() as conn:
+            await conn.execute(self.spec.create_stage_sql())
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                if batch.records and self.accounts:
+                    await self._link_accounts(conn, batch)
+                if batch.records:
+                    batch.loaded = await self._write(conn, batch, batch.records)
+                    if self.invalidates_lessons:
+                        await self._invalidate_lessons(batch)
+                self._complete(batch)
+
+    async def run(self, pool) -> None:
+        if self.state["done"]:
+            self.progress.status = "skipped (done)"
+            return
+        self.progress.status = "loading"
+        self.progress.started_at = time.monotonic()
+        if self.accounts:
+            async with pool.acquire() as conn:
+                await AuthAccounts.check(conn)
+
+        queue: "asyncio.Queue[Optional[Batch]]" = asyncio.Queue(maxsize=self.args.workers * 2)
+
+        async def produce() -> None:
+            for batch in self.batches():
+                self.progress.rows = batch.end_row
+                await queue.put(batch)
+                await asyncio.sleep(0)  # 검증은 CPU 작업이므로 배치마다 다른 테이블 적재에 양보
+            for _ in range(self.args.workers):
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(self._worker(pool, queue)) for _ in range(self.args.workers)]
+        try:
+            # 워커가 실패하면 즉시 전파되어 읽기도 중단됨
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.progress.status = "failed"
+            raise
+        finally:
+            self.rejects.close()
+
+        self.state["done"] = True
+        self.checkpoint.save()
+        self.progress.status = "done"
+
+    def validate_only(self) -> None:
+        """DB 없이 검증만 (체크포인트 미사용)"""
+        self.state = {"rows": 0}
+        self.progress.status = "validating"
+        try:
+            for batch in self.batches():
+                self.progress.rows = batch.end_row
+                self.progress.loaded += len(batch.records)
+                self.progress.rejected += batch.rejected
+        finally:
+            self.rejects.close()
+        self.progress.status = "validated"
+
+
+# ============================================================================
+# 실행
+# ============================================================================
+
+def database_url(url: Optional[str]) -> str:
+    """SQLAlchemy 형식 URL을 asyncpg용으로 변환"""
+    from src.core.database import plain_url
+
+    if not url:
+        from src.core.config import settings
+        url = settings.DATABASE_URL
+    if not url:
+        raise SystemExit("DATABASE_URL이 설정되지 않았습니다 (--database-url 또는 환경 변수)")
+    return plain_url(url)
+
+
+def print_progress(progress: Dict[str, TableProgress]) -> None:
+    for name, item in progress.items():
+        elapsed = max(time.monotonic() - item.started_at, 1e-6)
+        rate = item.rows / elapsed if item.status == "loading" else 0
+        print(f"  {name:<12} {item.status:<15} rows={item.rows:>10,} loaded={item.loaded:>10,} "
+              f"rejected={item.rejected:>8,}" + (f" ({rate:,.0f} rows/s)" if rate else ""))
+    sys.stdout.flush()
+
+
+async def _report(progress: Dict[str, TableProgress], interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        print(f"⏳ {time.strftime('%H:%M:%S')}")
+        print_progress(progress)
+
+
+async def run_import(args: argparse.Namespace, sources: Dict[str, Path]) -> Dict[str, TableProgress]:
+    checkpoint = Checkpoint(args.state_dir / "checkpoint.json")
+    progress = {name: TableProgress(TABLES[name]) for name in sources}
+    loaders = {
+        name: TableLoader(TABLES[name], path, args, checkpoint, progress[name])
+        for name, path in sources.items()
+    }
+
+    if args.validate_only:
+        for loader in loaders.values():
+            loader.validate_only()
+        return progress
+
+    import asyncpg
+
+    pool = await asyncpg.create_pool(
+        database_url(args.database_url),
+        min_size=1,
+        max_size=args.workers * len(sources),
+        server_settings={"application_name": "bulk-import", "statement_timeout": "0"},
+    )
+    finished = {name: asyncio.Event() for name in TABLES}
+    for name in TABLES:
+        if name not in sources:
+            finished[name].set()  # 이번 실행에 없는 테이블은 이미 적재된 것으로 간주
+
+    async def run_table(name: str) -> None:
+        for dependency in TABLES[name].depends:
+            await finished[dependency].wait()
+        await loaders[name].run(pool)
+        finished[name].set()
+
+    reporter = asyncio.create_task(_report(progress, args.progress_interval))
+    try:
+        await asyncio.gather(*(run_table(name) for name in sources))
+    finally:
+        reporter.cancel()
+        await pool.close()
+        if any(loader.accounts for loader in loaders.values()):
+            from src.services.session_service import session_service
+            await session_service.aclose()
+        if any(loader.invalidates_lessons for loader in loaders.values()):
+            from src.core.redis import close_redis
+            await close_redis()
+    return progress
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import users, courses and enrollments")
+    for name in TABLES:
+        parser.add_argument(f"--{name}", type=Path, metavar="FILE", help=f"{name} CSV/JSONL (.gz 가능)")
+    parser.add_argument("--database-url", default=None, help="기본값: DATABASE_URL")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4, help="테이블당 병렬 워커(커넥션) 수")
+    parser.add_argument("--state-dir", type=Path, default=Path(".import-state"),
+                        help="체크포인트 및 거부 행 기록 디렉터리")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+    parser.add_argument("--validate-only", action="store_true", help="DB에 쓰지 않고 검증만")
+    parser.add_argument("--auth-accounts", choices=("create", "skip"), default="create",
+                        help="users 로그인 계정 처리 (create: 없으면 생성해 그 ID로 적재, "
+                             "skip: 프로필만 적재 - Supabase가 아닌 DB용, 가져온 사용자는 로그인할 수 없음)")
+    parser.add_argument("--auth-concurrency", type=int, default=8, help="계정 생성 동시 호출 수")
+    parser.add_argument("--progress-interval", type=float, default=2.0, help="진행 상황 출력 간격 (초)")
+    args = parser.parse_args(argv)
+
+    sources = {name: getattr(args, name) for name in TABLES if getattr(args, name)}
+    if not sources:
+        parser.error("가져올 파일을 하나 이상 지정하세요 (--users, --courses, ...)")
+    for path in sources.values():
+        if not path.exists():
+            parser.error(f"파일을 찾을 수 없습니다: {path}")
+        _format_of(path)
+    if "users" in sources and args.auth_accounts == "create" and not args.validate_only:
+        from src.core.config import settings
+        if not (settings.SUPABASE_URL and settings.SUPABASE_SERVICE_KEY):
+            parser.error("users 계정 생성에는 SUPABASE_URL과 SUPABASE_SERVICE_KEY가 필요합니다 "
+                         "(Supabase가 아닌 DB면 --auth-accounts skip)")
+    if args.restart:
+        (args.state_dir / "checkpoint.json").unlink(missing_ok=True)
+
+    started = time.monotonic()
+    print(f"🚀 가져오기 시작: {', '.join(f'{name}={path}' for name, path in sources.items())}")
+    try:
+        progress = asyncio.run(run_import(args, sources))
+    except KeyboardInterrupt:
+        print("⏸️  중단됨 - 같은 명령으로 다시 실행하면 체크포인트부터 이어서 적재합니다")
+        return 130
+    except Exception as e:
+        print(f"❌ 가져오기 실패: {type(e).__name__}: {e}")
+        print("💡 원인을 해결한 뒤 같은 명령으로 다시 실행하면 체크포인트부터 이어서 적재합니다")
+        return 1
+
+    print(f"🎉 완료 ({time.monotonic() - started:.1f}s)")
+    print_progress(progress)
+    if any(item.rejected for item in progress.values()):
+        print(f"⚠️  거부된 행: {args.state_dir}/<table>.rejects.jsonl")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
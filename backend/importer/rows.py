@@ -0,0 +1,177 @@
+"""
+가져오기 행 모델
+CSV/JSONL 한 행을 검증하고 스테이징 테이블 COPY 레코드로 변환
+
+- 빈 문자열(CSV의 빈 칸)은 값이 없는 것으로 보고 기본값을 적용합니다.
+- JSON 컬럼은 CSV에서는 JSON 문자열, JSONL에서는 배열/객체로 받습니다.
+- 다른 테이블 참조는 ID 또는 자연 키(이메일, 슬러그) 중 하나로 지정합니다.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple, Union
+from uuid import UUID
+import orjson
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, StringConstraints, model_validator
+from typing_extensions import Annotated
+
+
+def _parse_json(value: Any) -> Any:
+    return orjson.loads(value) if isinstance(value, str) else value
+
+
+# 형식만 확인 (EmailStr의 email-validator는 행당 수백 µs로 대량 가져오기에는 느림)
+Email = Annotated[str, StringConstraints(
+    strip_whitespace=True, max_length=255, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+)]
+
+JsonValue = Annotated[Optional[Union[List[Any], Dict[str, Any]]], BeforeValidator(_parse_json)]
+
+SkillLevel = Literal["beginner", "intermediate", "advanced", "expert"]
+
+
+class ImportRow(BaseModel):
+    """가져오기 행 기본 클래스"""
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+    # JSONB로 적재할 필드
+    json_fields: ClassVar[Tuple[str, ...]] = ()
+
+    @model_validator(mode="before")
+    @classmethod
+    def _drop_empty(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value != "" and value is not None}
+        return data
+
+    def to_record(self, line: int, columns: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """스테이징 테이블 컬럼 순서의 레코드 (첫 컬럼은 원본 행 번호)"""
+        values = []
+        for column in columns[1:]:
+            value = getattr(self, column)
+            if column in self.json_fields and value is not None:
+                value = orjson.dumps(value).decode()
+            values.append(value)
+        return (line, *values)
+
+
+class UserRow(ImportRow):
+    """users 행 (이메일 기준 upsert, username이 없으면 이메일 앞부분)"""
+    json_fields: ClassVar[Tuple[str, ...]] = ("learning_goals",)
+
+    id: Optional[UUID] = None
+    email: Email
+    username: Optional[str] = Field(default=None, max_length=50)
+    first_name: Optional[str] = Field(default=None, max_length=50)
+    last_name: Optional[str] = Field(default=None, max_length=50)
+    full_name: Optional[str] = Field(default=None, max_length=100)
+    bio: Optional[str] = None
+    avatar_url: Optional[str] = Field(default=None, max_length=500)
+    phone: Optional[str] = Field(default=None, max_length=20)
+    location: Optional[str] = Field(default=None, max_length=100)
+    timezone: str = Field(default="UTC", max_length=50)
+    language: str = Field(default="ko", max_length=10)
+    role: Literal["student", "instructor", "admin"] = "student"
+    current_skill_level: SkillLevel = "beginner"
+    learning_goals: JsonValue = None
+    is_active: bool = True
+    is_verified: bool = False
+    is_premium: bool = False
+
+    @model_validator(mode="after")
+    def _derive_names(self) -> "UserRow":
+        if not self.username:
+            self.username = self.email.split("@")[0][:50]
+        if not self.full_name and (self.first_name or self.last_name):
+            self.full_name = f"{self.first_name or ''} {self.last_name or ''}".strip()
+        return self
+
+
+class CourseRow(ImportRow):
+    """courses 행 (슬러그 기준 upsert, 강사는 instructor_id 또는 instructor_email)"""
+    json_fields: ClassVar[Tuple[str, ...]] = (
+        "tags", "categories", "prerequisites", "learning_objectives", "target_audience",
+    )
+
+    id: Optional[UUID] = None
+    title: str = Field(min_length=1, max_length=200)
+    slug: str = Field(min_length=1, max_length=100)
+    description: Optional[str] = None
+    short_description: Optional[str] = Field(default=None, max_length=500)
+    thumbnail_url: Optional[str] = Field(default=None, max_length=500)
+    banner_url: Optional[str] = Field(default=None, max_length=500)
+    tags: JsonValue = None
+    categories: JsonValue = None
+    status: Literal["draft", "published", "archived"] = "draft"
+    difficulty_level: SkillLevel = "beginner"
+    estimated_duration_hours: Optional[int] = Field(default=None, ge=0)
+    prerequisites: JsonValue = None
+    learning_objectives: JsonValue = None
+    target_audience: JsonValue = None
+    instructor_id: Optional[UUID] = None
+    instructor_email: Optional[Email] = None
+    is_free: bool = True
+    price: Decimal = Field(default=Decimal("0"), ge=0, max_digits=10, decimal_places=2)
+    currency: str = Field(default="USD", min_length=3, max_length=3)
+    published_at: Optional[datetime] = None
+
+
+class ModuleRow(ImportRow):
+    """modules 행 (ID 기준 upsert, 코스는 course_id 또는 course_slug)"""
+    json_fields: ClassVar[Tuple[str, ...]] = ("learning_objectives",)
+
+    id: UUID
+    course_id: Optional[UUID] = None
+    course_slug: Optional[str] = None
+    title: str = Field(min_length=1, max_length=200)
+    description: Optional[str] = None
+    order_index: int = 0
+    estimated_duration_minutes: Optional[int] = Field(default=None, ge=0)
+    learning_objectives: JsonValue = None
+    is_published: bool = False
+
+    @model_validator(mode="after")
+    def _require_course(self) -> "ModuleRow":
+        if self.course_id is None and not self.course_slug:
+            raise ValueError("course_id 또는 course_slug가 필요합니다")
+        return self
+
+
+class LessonRow(ImportRow):
+    """lessons 행 (ID 기준 upsert)"""
+    json_fields: ClassVar[Tuple[str, ...]] = ("resources",)
+
+    id: UUID
+    module_id: UUID
+    title: str = Field(min_length=1, max_length=200)
+    content: Optional[str] = None
+    order_index: int = 0
+    lesson_type: Literal["text", "video", "interactive", "quiz"] = "text"
+    content_url: Optional[str] = Field(default=None, max_length=500)
+    resources: JsonValue = None
+    estimated_duration_minutes: Optional[int] = Field(default=None, ge=0)
+    difficulty_points: int = 0
+    is_published: bool = False
+    is_free_preview: bool = False
+
+
+class EnrollmentRow(ImportRow):
+    """enrollments 행 ((user_id, course_id) 기준 upsert, 참조는 ID 또는 이메일/슬러그)"""
+
+    user_id: Optional[UUID] = None
+    user_email: Optional[Email] = None
+    course_id: Optional[UUID] = None
+    course_slug: Optional[str] = None
+    progress_percentage: Decimal = Field(default=Decimal("0"), ge=0, le=100, decimal_places=2)
+    total_study_time_minutes: int = Field(default=0, ge=0)
+    is_completed: bool = False
+    completed_at: Optional[datetime] = None
+    rating: Optional[int] = Field(default=None, ge=1, le=5)
+    review: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _require_refs(self) -> "EnrollmentRow":
+        if self.user_id is None and not self.user_email:
+            raise ValueError("user_id 또는 user_email이 필요합니다")
+        if self.course_id is None and not self.course_slug:
+            raise ValueError("course_id 또는 course_slug가 필요합니다")
+        return self
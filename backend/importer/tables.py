@@ -0,0 +1,213 @@
+"""
+가져오기 테이블 정의
+스테이징 컬럼, 참조 해석(JOIN), 충돌 키, 적재 순서(FK 의존성)
+
+배치마다 임시 스테이징 테이블에 COPY한 뒤 한 번의 INSERT ... SELECT ... ON CONFLICT로 반영합니다.
+- 같은 배치 안의 중복 키는 뒤쪽 행이 적용됩니다 (DISTINCT ON + 행 번호 역순).
+- 충돌 시에는 원본 파일에 있는 컬럼만 갱신하고, 나머지 컬럼은 기존 값을 유지합니다.
+- 자연 키 참조(이메일, 슬러그)를 찾지 못한 행은 건너뛰고 거부 파일에 기록합니다.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple, Type
+from .rows import CourseRow, EnrollmentRow, ImportRow, LessonRow, ModuleRow, UserRow
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """테이블별 적재 규칙"""
+    name: str
+    row_model: Type[ImportRow]
+    stage_columns: Tuple[Tuple[str, str], ...]  # (컬럼, 타입), 첫 컬럼은 line
+    targets: Dict[str, str]                     # 대상 컬럼 → 스테이징 기준 식
+    conflict: Tuple[str, ...]
+    joins: str = ""
+    resolved: Optional[str] = None              # 참조가 모두 해석되었는지 판단하는 조건
+    depends: Tuple[str, ...] = ()
+    sources: Dict[str, Tuple[str, ...]] = None  # 대상 컬럼 → 이 값을 채우는 원본 컬럼 (기본: 같은 이름)
+
+    @property
+    def stage_table(self) -> str:
+        return f"import_stage_{self.name}"
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        return tuple(column for column, _ in self.stage_columns)
+
+    def create_stage_sql(self) -> str:
+        columns = ", ".join(f"{column} {type_}" for column, type_ in self.stage_columns)
+        return f"CREATE TEMP TABLE IF NOT EXISTS {self.stage_table} ({columns}) ON COMMIT DELETE ROWS"
+
+    def updatable(self, present: Iterable[str]) -> Tuple[str, ...]:
+        """충돌 시 갱신할 대상 컬럼 (원본에 있는 컬럼만, 충돌 키와 id 제외)"""
+        present = set(present)
+        sources = self.sources or {}
+        return tuple(
+            target for target in self.targets
+            if target not in self.conflict and target != "id"
+            and present & set(sources.get(target, (target,)))
+        )
+
+    def upsert_sql(self, present: Iterable[str]) -> str:
+        """배치 반영 SQL (반영된 행 수 반환)"""
+        targets = ", ".join(self.targets)
+        expressions = ", ".join(f"{expression} AS {target}" for target, expression in self.targets.items())
+        key = ", ".join(self.conflict)
+        where = f"WHERE {self.resolved}" if self.resolved else ""
+        updates = self.updatable(present)
+        if updates:
+            action = "DO UPDATE SET " + ", ".join(f"{column} = EXCLUDED.{column}" for column in updates)
+        else:
+            action = "DO NOTHING"
+        return f"""
+            WITH src AS (
+                SELECT DISTINCT ON ({key}) {targets}
+                FROM (
+                    SELECT s.line, {expressions}
+                    FROM {self.stage_table} s {self.joins}
+                    {where}
+                ) resolved
+                ORDER BY {key}, line DESC
+            ), written AS (
+                INSERT INTO {self.name} ({targets})
+                SELECT {targets} FROM src
+                ON CONFLICT ({key}) {action}
+                RETURNING 1
+            )
+            SELECT count(*) FROM written
+        """
+
+    def unresolved_sql(self) -> Optional[str]:
+        """참조를 찾지 못한 행 번호"""
+        if not self.resolved:
+            return None
+        return f"SELECT s.line FROM {self.stage_table} s {self.joins} WHERE NOT ({self.resolved})"
+
+
+def _passthrough(*columns: str) -> Dict[str, str]:
+    return {column: f"s.{column}" for column in columns}
+
+
+USERS = TableSpec(
+    name="users",
+    row_model=UserRow,
+    stage_columns=(
+        ("line", "bigint"), ("id", "uuid"), ("email", "text"), ("username", "text"),
+        ("first_name", "text"), ("last_name", "text"), ("full_name", "text"), ("bio", "text"),
+        ("avatar_url", "text"), ("phone", "text"), ("location", "text"), ("timezone", "text"),
+        ("language", "text"), ("role", "text"), ("current_skill_level", "text"),
+        ("learning_goals", "jsonb"), ("is_active", "boolean"), ("is_verified", "boolean"),
+        ("is_premium", "boolean"),
+    ),
+    targets={
+        "id": "COALESCE(s.id, gen_random_uuid())",
+        **_passthrough(
+            "email", "username", "first_name", "last_name", "full_name", "bio", "avatar_url",
+            "phone", "location", "timezone", "language", "role", "current_skill_level",
+            "learning_goals", "is_active", "is_verified", "is_premium",
+        ),
+    },
+    conflict=("email",),
+    sources={"username": ("username", "email"), "full_name": ("full_name", "first_name", "last_name")},
+)
+
+COURSES = TableSpec(
+    name="courses",
+    row_model=CourseRow,
+    stage_columns=(
+        ("line", "bigint"), ("id", "uuid"), ("title", "text"), ("slug", "text"),
+        ("description", "text"), ("short_description", "text"), ("thumbnail_url", "text"),
+        ("banner_url", "text"), ("tags", "jsonb"), ("categories", "jsonb"), ("status", "text"),
+        ("difficulty_level", "text"), ("estimated_duration_hours", "integer"),
+        ("prerequisites", "jsonb"), ("learning_objectives", "jsonb"), ("target_audience", "jsonb"),
+        ("instructor_id", "uuid"), ("instructor_email", "text"), ("is_free", "boolean"),
+        ("price", "numeric"), ("currency", "text"), ("published_at", "timestamptz"),
+    ),
+    targets={
+        "id": "COALESCE(s.id, gen_random_uuid())",
+        **_passthrough(
+            "title", "slug", "description", "short_description", "thumbnail_url", "banner_url",
+            "tags", "categories", "status", "difficulty_level", "estimated_duration_hours",
+            "prerequisites", "learning_objectives", "target_audience",
+        ),
+        "instructor_id": "COALESCE(s.instructor_id, instructor.id)",
+        **_passthrough("is_free", "price", "currency", "published_at"),
+    },
+    conflict=("slug",),
+    joins="LEFT JOIN users instructor ON instructor.email = s.instructor_email",
+    resolved="s.instructor_email IS NULL OR s.instructor_id IS NOT NULL OR instructor.id IS NOT NULL",
+    depends=("users",),
+    sources={"instructor_id": ("instructor_id", "instructor_email")},
+)
+
+MODULES = TableSpec(
+    name="modules",
+    row_model=ModuleRow,
+    stage_columns=(
+        ("line", "bigint"), ("id", "uuid"), ("course_id", "uuid"), ("course_slug", "text"),
+        ("title", "text"), ("description", "text"), ("order_index", "integer"),
+        ("estimated_duration_minutes", "integer"), ("learning_objectives", "jsonb"),
+        ("is_published", "boolean"),
+    ),
+    targets={
+        "id": "s.id",
+        "course_id": "COALESCE(s.course_id, course.id)",
+        **_passthrough(
+            "title", "description", "order_index", "estimated_duration_minutes",
+            "learning_objectives", "is_published",
+        ),
+    },
+    conflict=("id",),
+    joins="LEFT JOIN courses course ON course.slug = s.course_slug",
+    resolved="COALESCE(s.course_id, course.id) IS NOT NULL",
+    depends=("courses",),
+    sources={"course_id": ("course_id", "course_slug")},
+)
+
+LESSONS = TableSpec(
+    name="lessons",
+    row_model=LessonRow,
+    stage_columns=(
+        ("line", "bigint"), ("id", "uuid"), ("module_id", "uuid"), ("title", "text"),
+        ("content", "text"), ("order_index", "integer"), ("lesson_type", "text"),
+        ("content_url", "text"), ("resources", "jsonb"), ("estimated_duration_minutes", "integer"),
+        ("difficulty_points", "integer"), ("is_published", "boolean"), ("is_free_preview", "boolean"),
+    ),
+    targets=_passthrough(
+        "id", "module_id", "title", "content", "order_index", "lesson_type", "content_url",
+        "resources", "estimated_duration_minutes", "difficulty_points", "is_published",
+        "is_free_preview",
+    ),
+    conflict=("id",),
+    depends=("modules",),
+)
+
+ENROLLMENTS = TableSpec(
+    name="enrollments",
+    row_model=EnrollmentRow,
+    stage_columns=(
+        ("line", "bigint"), ("user_id", "uuid"), ("user_email", "text"), ("course_id", "uuid"),
+        ("course_slug", "text"), ("progress_percentage", "numeric"),
+        ("total_study_time_minutes", "integer"), ("is_completed", "boolean"),
+        ("completed_at", "timestamptz"), ("rating", "integer"), ("review", "text"),
+    ),
+    targets={
+        "user_id": "COALESCE(s.user_id, enrolled_user.id)",
+        "course_id": "COALESCE(s.course_id, course.id)",
+        **_passthrough(
+            "progress_percentage", "total_study_time_minutes", "is_completed", "completed_at",
+            "rating", "review",
+        ),
+    },
+    conflict=("user_id", "course_id"),
+    joins=(
+        "LEFT JOIN users enrolled_user ON enrolled_user.email = s.user_email "
+        "LEFT JOIN courses course ON course.slug = s.course_slug"
+    ),
+    resolved="COALESCE(s.user_id, enrolled_user.id) IS NOT NULL AND COALESCE(s.course_id, course.id) IS NOT NULL",
+    depends=("users", "courses"),
+)
+
+# FK 순서 (앞 테이블이 끝나야 뒤 테이블 시작, 서로 독립인 테이블은 동시에 적재)
+TABLES: Dict[str, TableSpec] = {
+    spec.name: spec for spec in (USERS, COURSES, MODULES, LESSONS, ENROLLMENTS)
+}
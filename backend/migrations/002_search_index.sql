@@ -0,0 +1,143 @@
+-- AI University System - Full-text Search Index
+-- Created: 2026-10-19
+-- Description: 코스/레슨 전문 검색을 위한 tsvector 컬럼, GIN 인덱스, 트리거 및 검색 함수
+
+-- 한국어는 PostgreSQL 기본 사전이 없으므로 'simple' 설정을 사용하고,
+-- 형태소 단위 불일치와 오타는 pg_trgm 유사도 검색으로 보완합니다.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ============================================================================
+-- 1. SEARCH VECTOR COLUMNS - 검색 벡터 컬럼
+-- ============================================================================
+ALTER TABLE courses ADD COLUMN IF NOT EXISTS search_vector tsvector;
+ALTER TABLE lessons ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+-- ============================================================================
+-- 2. FUNCTIONS & TRIGGERS - 검색 벡터 자동 갱신
+-- ============================================================================
+
+-- JSONB 문자열 배열(tags 등)을 공백으로 연결
+CREATE OR REPLACE FUNCTION jsonb_array_to_text(value JSONB)
+RETURNS TEXT AS $$
+    SELECT COALESCE(string_agg(elem, ' '), '')
+    FROM jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(value) = 'array' THEN value ELSE '[]'::jsonb END
+    ) AS elem;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 코스: 제목/태그(A) > 요약(B) > 설명(C)
+CREATE OR REPLACE FUNCTION courses_search_vector_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('simple', jsonb_array_to_text(NEW.tags)), 'A') ||
+        setweight(to_tsvector('simple', COALESCE(NEW.short_description, '')), 'B') ||
+        setweight(to_tsvector('simple', COALESCE(NEW.description, '')), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 레슨: 제목(A) > 본문 마크다운(C)
+CREATE OR REPLACE FUNCTION lessons_search_vector_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('simple', COALESCE(NEW.content, '')), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS courses_search_vector_trigger ON courses;
+CREATE TRIGGER courses_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, tags, short_description, description ON courses
+    FOR EACH ROW EXECUTE FUNCTION courses_search_vector_update();
+
+DROP TRIGGER IF EXISTS lessons_search_vector_trigger ON lessons;
+CREATE TRIGGER lessons_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON lessons
+    FOR EACH ROW EXECUTE FUNCTION lessons_search_vector_update();
+
+-- 기존 행 백필 (트리거가 search_vector를 다시 계산)
+UPDATE courses SET title = title WHERE search_vector IS NULL;
+UPDATE lessons SET title = title WHERE search_vector IS NULL;
+
+-- ============================================================================
+-- 3. INDEXES - GIN 인덱스
+-- ============================================================================
+CREATE INDEX IF NOT EXISTS idx_courses_search_vector ON courses USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_lessons_search_vector ON lessons USING GIN (search_vector);
+
+-- 오타 허용 및 부분 일치용 트라이그램 인덱스
+CREATE INDEX IF NOT EXISTS idx_courses_title_trgm ON courses USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_lessons_title_trgm ON lessons USING GIN (title gin_trgm_ops);
+
+-- ============================================================================
+-- 4. SEARCH FUNCTION - Supabase RPC 검색 함수
+-- ============================================================================
+
+-- 전문 검색 결과와 제목 트라이그램 유사도 결과를 합쳐 순위를 매깁니다.
+-- 마지막 단어는 접두사 검색(:*)으로 처리합니다.
+CREATE OR REPLACE FUNCTION search_catalog(
+    query_text TEXT,
+    result_limit INTEGER DEFAULT 20,
+    include_lessons BOOLEAN DEFAULT true
+)
+RETURNS TABLE (
+    kind TEXT,
+    id UUID,
+    course_id UUID,
+    title TEXT,
+    snippet TEXT,
+    score REAL
+) AS $$
+DECLARE
+    ts_query tsquery;
+BEGIN
+    SELECT to_tsquery('simple', string_agg(quote_literal(word) || ':*', ' & '))
+    INTO ts_query
+    FROM regexp_split_to_table(lower(trim(query_text)), '\s+') AS word
+    WHERE word <> '';
+
+    IF ts_query IS NULL THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT * FROM (
+        SELECT
+            'course'::TEXT,
+            c.id,
+            c.id,
+            c.title::TEXT,
+            COALESCE(c.short_description, left(c.description, 200))::TEXT,
+            (ts_rank_cd(c.search_vector, ts_query) + similarity(c.title, query_text))::REAL AS rank
+        FROM courses c
+        WHERE c.search_vector @@ ts_query OR c.title % query_text
+
+        UNION ALL
+
+        SELECT
+            'lesson'::TEXT,
+            l.id,
+            m.course_id,
+            l.title::TEXT,
+            left(l.content, 200)::TEXT,
+            (ts_rank_cd(l.search_vector, ts_query) + similarity(l.title, query_text))::REAL AS rank
+        FROM lessons l
+        JOIN modules m ON m.id = l.module_id
+        WHERE include_lessons
+          AND (l.search_vector @@ ts_query OR l.title % query_text)
+    ) AS results
+    ORDER BY rank DESC
+    LIMIT result_limit;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- 성공 메시지
+DO $$
+BEGIN
+    RAISE NOTICE '✅ 검색 인덱스가 성공적으로 생성되었습니다!';
+    RAISE NOTICE '🔍 courses.search_vector, lessons.search_vector, search_catalog()';
+END $$;
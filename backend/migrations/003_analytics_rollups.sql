@@ -0,0 +1,406 @@
+-- AI University System - Analytics Rollups
+-- Created: 2026-10-19
+-- Description: 강사 대시보드용 분석 롤업 테이블 및 증분 갱신
+
+-- 수강 데이터 변경은 트리거가 변경 로그(append-only)에 델타만 기록하고,
+-- refresh_analytics_rollups()가 로그를 배치로 소비해 롤업 테이블에 반영합니다.
+-- 학습자 쓰기 경로에서는 롤업 행 잠금이 발생하지 않으며,
+-- 대시보드 조회는 enrollments 대신 롤업 테이블만 읽습니다.
+
+-- ============================================================================
+-- 1. ROLLUP TABLES - 롤업 테이블
+-- ============================================================================
+
+-- 코스별 완료 퍼널, 학습 시간, 퀴즈 점수 분포
+CREATE TABLE IF NOT EXISTS course_analytics (
+    course_id UUID PRIMARY KEY,
+
+    -- 퍼널 단계별 수강생 수
+    enrolled_count INTEGER NOT NULL DEFAULT 0,
+    started_count INTEGER NOT NULL DEFAULT 0,      -- progress > 0
+    halfway_count INTEGER NOT NULL DEFAULT 0,      -- progress >= 50
+    completed_count INTEGER NOT NULL DEFAULT 0,
+
+    -- 학습 통계
+    total_study_minutes BIGINT NOT NULL DEFAULT 0,
+
+    -- 퀴즈 점수 분포 (0-9, 10-19, ..., 90-99, 100 → 11개 구간)
+    quiz_score_buckets INTEGER[] NOT NULL DEFAULT array_fill(0, ARRAY[11]),
+
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- 코스/일자별 활동
+CREATE TABLE IF NOT EXISTS course_daily_analytics (
+    course_id UUID NOT NULL,
+    stat_date DATE NOT NULL,
+
+    new_enrollments INTEGER NOT NULL DEFAULT 0,
+    completions INTEGER NOT NULL DEFAULT 0,
+    study_minutes BIGINT NOT NULL DEFAULT 0,
+    progress_events INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (course_id, stat_date)
+);
+
+-- 모듈별 레슨 완료 수
+CREATE TABLE IF NOT EXISTS module_analytics (
+    module_id UUID PRIMARY KEY REFERENCES modules(id) ON DELETE CASCADE,
+    course_id UUID NOT NULL,
+
+    lesson_completions BIGINT NOT NULL DEFAULT 0,
+
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_module_analytics_course_id ON module_analytics(course_id);
+
+-- ============================================================================
+-- 2. CHANGE LOG - 수강 변경 로그
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS analytics_enrollment_changes (
+    id BIGSERIAL PRIMARY KEY,
+    course_id UUID NOT NULL,
+    changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    -- 퍼널 델타 (+1 / 0 / -1)
+    d_enrolled SMALLINT NOT NULL DEFAULT 0,
+    d_started SMALLINT NOT NULL DEFAULT 0,
+    d_halfway SMALLINT NOT NULL DEFAULT 0,
+    d_completed SMALLINT NOT NULL DEFAULT 0,
+
+    d_study_minutes INTEGER NOT NULL DEFAULT 0,
+
+    -- 변경된 경우에만 기록 (NULL이면 변경 없음)
+    quiz_bucket_delta INTEGER[],
+    lessons_added TEXT[],
+    lessons_removed TEXT[]
+);
+
+-- ============================================================================
+-- 3. HELPER FUNCTIONS - 보조 함수
+-- ============================================================================
+
+-- quiz_scores JSON(숫자 배열, {"score": n} 배열, {"lesson": n} 객체)을 11개 구간 카운트로 변환
+CREATE OR REPLACE FUNCTION quiz_score_buckets(scores JSONB)
+RETURNS INTEGER[] AS $$
+    WITH raw AS (
+        SELECT value FROM jsonb_array_elements(
+            CASE WHEN jsonb_typeof(scores) = 'array' THEN scores ELSE '[]'::jsonb END)
+        UNION ALL
+        SELECT value FROM jsonb_each(
+            CASE WHEN jsonb_typeof(scores) = 'object' THEN scores ELSE '{}'::jsonb END)
+    ),
+    numeric_scores AS (
+        SELECT CASE jsonb_typeof(value)
+                   WHEN 'number' THEN (value #>> '{}')::NUMERIC
+                   WHEN 'object' THEN NULLIF(value ->> 'score', '')::NUMERIC
+               END AS score
+        FROM raw
+    ),
+    counts AS (
+        SELECT LEAST(GREATEST(floor(score / 10), 0), 10)::INTEGER AS bucket, count(*)::INTEGER AS cnt
+        FROM numeric_scores
+        WHERE score IS NOT NULL
+        GROUP BY 1
+    )
+    SELECT array_agg(COALESCE(c.cnt, 0) ORDER BY b)
+    FROM generate_series(0, 10) AS b
+    LEFT JOIN counts c ON c.bucket = b;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 두 정수 배열의 원소별 합/차
+CREATE OR REPLACE FUNCTION int_array_add(a INTEGER[], b INTEGER[], factor INTEGER DEFAULT 1)
+RETURNS INTEGER[] AS $$
+    SELECT array_agg(COALESCE(x, 0) + factor * COALESCE(y, 0) ORDER BY i)
+    FROM unnest(a, b) WITH ORDINALITY AS t(x, y, i);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- JSON 문자열 배열 a에는 있고 b에는 없는 원소
+CREATE OR REPLACE FUNCTION jsonb_text_array_diff(a JSONB, b JSONB)
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(x), '{}')
+    FROM (
+        SELECT jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(a) = 'array' THEN a ELSE '[]'::jsonb END)
+        EXCEPT
+        SELECT jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(b) = 'array' THEN b ELSE '[]'::jsonb END)
+    ) AS diff(x);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- ============================================================================
+-- 4. TRIGGERS - 변경 로그 기록
+-- ============================================================================
+CREATE OR REPLACE FUNCTION log_enrollment_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_course_id UUID;
+    o_exists INTEGER := 0;
+    n_exists INTEGER := 0;
+    o_progress NUMERIC := 0;
+    n_progress NUMERIC := 0;
+    o_completed BOOLEAN := false;
+    n_completed BOOLEAN := false;
+    o_minutes INTEGER := 0;
+    n_minutes INTEGER := 0;
+    o_quiz JSONB;
+    n_quiz JSONB;
+    o_lessons JSONB;
+    n_lessons JSONB;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_course_id := OLD.course_id;
+        o_exists := 1;
+        o_progress := COALESCE(OLD.progress_percentage, 0);
+        o_completed := COALESCE(OLD.is_completed, false);
+        o_minutes := COALESCE(OLD.total_study_time_minutes, 0);
+        o_quiz := OLD.quiz_scores;
+        o_lessons := OLD.completed_lessons;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_course_id := NEW.course_id;
+        n_exists := 1;
+        n_progress := COALESCE(NEW.progress_percentage, 0);
+        n_completed := COALESCE(NEW.is_completed, false);
+        n_minutes := COALESCE(NEW.total_study_time_minutes, 0);
+        n_quiz := NEW.quiz_scores;
+        n_lessons := NEW.completed_lessons;
+    END IF;
+
+    -- 코스 이동(course_id 변경)은 삭제 + 생성으로 기록
+    IF TG_OP = 'UPDATE' AND OLD.course_id IS DISTINCT FROM NEW.course_id THEN
+        INSERT INTO analytics_enrollment_changes (
+            course_id, d_enrolled, d_started, d_halfway, d_completed,
+            d_study_minutes, quiz_bucket_delta, lessons_removed
+        ) VALUES (
+            OLD.course_id, -1, -(o_progress > 0)::INTEGER, -(o_progress >= 50)::INTEGER,
+            -o_completed::INTEGER, -o_minutes,
+            int_array_add(array_fill(0, ARRAY[11]), quiz_score_buckets(o_quiz), -1),
+            jsonb_text_array_diff(o_lessons, '[]'::jsonb)
+        );
+        o_exists := 0;
+        o_progress := 0;
+        o_completed := false;
+        o_minutes := 0;
+        o_quiz := NULL;
+        o_lessons := NULL;
+    END IF;
+
+    INSERT INTO analytics_enrollment_changes (
+        course_id, d_enrolled, d_started, d_halfway, d_completed,
+        d_study_minutes, quiz_bucket_delta, lessons_added, lessons_removed
+    ) VALUES (
+        v_course_id,
+        n_exists - o_exists,
+        (n_progress > 0)::INTEGER - (o_progress > 0)::INTEGER,
+        (n_progress >= 50)::INTEGER - (o_progress >= 50)::INTEGER,
+        n_completed::INTEGER - o_completed::INTEGER,
+        n_minutes - o_minutes,
+        CASE WHEN o_quiz IS DISTINCT FROM n_quiz
+             THEN int_array_add(quiz_score_buckets(n_quiz), quiz_score_buckets(o_quiz), -1)
+        END,
+        CASE WHEN o_lessons IS DISTINCT FROM n_lessons
+             THEN jsonb_text_array_diff(n_lessons, o_lessons)
+        END,
+        CASE WHEN o_lessons IS DISTINCT FROM n_lessons
+             THEN jsonb_text_array_diff(o_lessons, n_lessons)
+        END
+    );
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS enrollments_analytics_insert_delete ON enrollments;
+CREATE TRIGGER enrollments_analytics_insert_delete
+    AFTER INSERT OR DELETE ON enrollments
+    FOR EACH ROW EXECUTE FUNCTION log_enrollment_change();
+
+-- 분석과 무관한 컬럼(current_lesson_id, review 등)만 바뀐 경우는 기록하지 않음
+DROP TRIGGER IF EXISTS enrollments_analytics_update ON enrollments;
+CREATE TRIGGER enrollments_analytics_update
+    AFTER UPDATE ON enrollments
+    FOR EACH ROW
+    WHEN (
+        OLD.course_id IS DISTINCT FROM NEW.course_id OR
+        OLD.progress_percentage IS DISTINCT FROM NEW.progress_percentage OR
+        OLD.is_completed IS DISTINCT FROM NEW.is_completed OR
+        OLD.total_study_time_minutes IS DISTINCT FROM NEW.total_study_time_minutes OR
+        OLD.quiz_scores IS DISTINCT FROM NEW.quiz_scores OR
+        OLD.completed_lessons IS DISTINCT FROM NEW.completed_lessons
+    )
+    EXECUTE FUNCTION log_enrollment_change();
+
+-- ============================================================================
+-- 5. REFRESH FUNCTIONS - 증분 갱신 / 전체 재구성
+-- ============================================================================
+
+-- 변경 로그를 최대 batch_size건 소비해 롤업에 반영하고 처리 건수를 반환
+CREATE OR REPLACE FUNCTION refresh_analytics_rollups(batch_size INTEGER DEFAULT 5000)
+RETURNS INTEGER AS $$
+DECLARE
+    processed INTEGER := 0;
+BEGIN
+    -- 여러 워커가 동시에 호출해도 한 곳에서만 실행
+    IF NOT pg_try_advisory_xact_lock(hashtext('refresh_analytics_rollups')) THEN
+        RETURN 0;
+    END IF;
+
+    WITH picked AS (
+        DELETE FROM analytics_enrollment_changes
+        WHERE id IN (
+            SELECT id FROM analytics_enrollment_changes
+            ORDER BY id
+            LIMIT batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    ),
+    quiz AS (
+        SELECT course_id, array_agg(total ORDER BY idx) AS delta
+        FROM (
+            SELECT p.course_id, b.idx, sum(b.n)::INTEGER AS total
+            FROM picked p, unnest(p.quiz_bucket_delta) WITH ORDINALITY AS b(n, idx)
+            GROUP BY p.course_id, b.idx
+        ) AS per_bucket
+        GROUP BY course_id
+    ),
+    funnel AS (
+        SELECT
+            course_id,
+            sum(d_enrolled)::INTEGER AS enrolled,
+            sum(d_started)::INTEGER AS started,
+            sum(d_halfway)::INTEGER AS halfway,
+            sum(d_completed)::INTEGER AS completed,
+            sum(d_study_minutes)::BIGINT AS minutes
+        FROM picked
+        GROUP BY course_id
+    ),
+    upsert_course AS (
+        INSERT INTO course_analytics AS ca (
+            course_id, enrolled_count, started_count, halfway_count, completed_count,
+            total_study_minutes, quiz_score_buckets, updated_at
+        )
+        SELECT
+            f.course_id, f.enrolled, f.started, f.halfway, f.completed, f.minutes,
+            COALESCE(q.delta, array_fill(0, ARRAY[11])), NOW()
+        FROM funnel f
+        LEFT JOIN quiz q USING (course_id)
+        ON CONFLICT (course_id) DO UPDATE SET
+            enrolled_count = ca.enrolled_count + EXCLUDED.enrolled_count,
+            started_count = ca.started_count + EXCLUDED.started_count,
+            halfway_count = ca.halfway_count + EXCLUDED.halfway_count,
+            completed_count = ca.completed_count + EXCLUDED.completed_count,
+            total_study_minutes = ca.total_study_minutes + EXCLUDED.total_study_minutes,
+            quiz_score_buckets = int_array_add(ca.quiz_score_buckets, EXCLUDED.quiz_score_buckets),
+            updated_at = NOW()
+    ),
+    upsert_daily AS (
+        INSERT INTO course_daily_analytics AS cd (
+            course_id, stat_date, new_enrollments, completions, study_minutes, progress_events
+        )
+        SELECT
+            course_id,
+            changed_at::DATE,
+            sum(GREATEST(d_enrolled, 0))::INTEGER,
+            sum(d_completed)::INTEGER,
+            sum(d_study_minutes)::BIGINT,
+            count(*)::INTEGER
+        FROM picked
+        GROUP BY course_id, changed_at::DATE
+        ON CONFLICT (course_id, stat_date) DO UPDATE SET
+            new_enrollments = cd.new_enrollments + EXCLUDED.new_enrollments,
+            completions = cd.completions + EXCLUDED.completions,
+            study_minutes = cd.study_minutes + EXCLUDED.study_minutes,
+            progress_events = cd.progress_events + EXCLUDED.progress_events
+    ),
+    lesson_deltas AS (
+        SELECT lesson_id, 1 AS delta FROM picked, unnest(lessons_added) AS lesson_id
+        UNION ALL
+        SELECT lesson_id, -1 AS delta FROM picked, unnest(lessons_removed) AS lesson_id
+    ),
+    upsert_module AS (
+        INSERT INTO module_analytics AS ma (module_id, course_id, lesson_completions, updated_at)
+        SELECT m.id, m.course_id, sum(ld.delta), NOW()
+        FROM lesson_deltas ld
+        JOIN lessons l ON l.id::TEXT = ld.lesson_id
+        JOIN modules m ON m.id = l.module_id
+        GROUP BY m.id, m.course_id
+        ON CONFLICT (module_id) DO UPDATE SET
+            lesson_completions = ma.lesson_completions + EXCLUDED.lesson_completions,
+            updated_at = NOW()
+    )
+    SELECT count(*) INTO processed FROM picked;
+
+    RETURN processed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 롤업 전체 재구성 (최초 적용 또는 복구용)
+CREATE OR REPLACE FUNCTION rebuild_analytics_rollups()
+RETURNS VOID AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_analytics_rollups'));
+
+    TRUNCATE analytics_enrollment_changes, course_analytics, course_daily_analytics, module_analytics;
+
+    INSERT INTO course_analytics (
+        course_id, enrolled_count, started_count, halfway_count, completed_count,
+        total_study_minutes, quiz_score_buckets, updated_at
+    )
+    SELECT
+        e.course_id,
+        count(*),
+        count(*) FILTER (WHERE e.progress_percentage > 0),
+        count(*) FILTER (WHERE e.progress_percentage >= 50),
+        count(*) FILTER (WHERE e.is_completed),
+        COALESCE(sum(e.total_study_time_minutes), 0),
+        (
+            SELECT COALESCE(array_agg(total ORDER BY idx), array_fill(0, ARRAY[11]))
+            FROM (
+                SELECT b.idx, sum(b.n)::INTEGER AS total
+                FROM enrollments e2, unnest(quiz_score_buckets(e2.quiz_scores)) WITH ORDINALITY AS b(n, idx)
+                WHERE e2.course_id = e.course_id
+                GROUP BY b.idx
+            ) AS per_bucket
+        ),
+        NOW()
+    FROM enrollments e
+    GROUP BY e.course_id;
+
+    INSERT INTO course_daily_analytics (course_id, stat_date, new_enrollments, completions, study_minutes, progress_events)
+    SELECT course_id, created_at::DATE, count(*), 0, 0, 0
+    FROM enrollments
+    GROUP BY course_id, created_at::DATE;
+
+    INSERT INTO course_daily_analytics AS cd (course_id, stat_date, new_enrollments, completions, study_minutes, progress_events)
+    SELECT course_id, completed_at::DATE, 0, count(*), 0, 0
+    FROM enrollments
+    WHERE is_completed AND completed_at IS NOT NULL
+    GROUP BY course_id, completed_at::DATE
+    ON CONFLICT (course_id, stat_date) DO UPDATE SET completions = EXCLUDED.completions;
+
+    INSERT INTO module_analytics (module_id, course_id, lesson_completions, updated_at)
+    SELECT m.id, m.course_id, count(*), NOW()
+    FROM enrollments e
+    CROSS JOIN LATERAL jsonb_array_elements_text(
+        CASE WHEN jsonb_typeof(e.completed_lessons) = 'array' THEN e.completed_lessons ELSE '[]'::jsonb END
+    ) AS lesson_id
+    JOIN lessons l ON l.id::TEXT = lesson_id
+    JOIN modules m ON m.id = l.module_id
+    GROUP BY m.id, m.course_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 수강 데이터로 초기 롤업 생성
+SELECT rebuild_analytics_rollups();
+
+-- 성공 메시지
+DO $$
+BEGIN
+    RAISE NOTICE '✅ 분석 롤업 테이블이 성공적으로 생성되었습니다!';
+    RAISE NOTICE '📊 course_analytics, course_daily_analytics, module_analytics';
+    RAISE NOTICE '🔄 refresh_analytics_rollups()를 주기적으로 호출하세요 (백엔드가 자동 실행).';
+END $$;
@@ -0,0 +1,112 @@
+-- AI University System - AI Usage Ledger
+-- Created: 2026-10-19
+-- Description: AI 토큰 사용량 원장 (사용자/엔드포인트/모델별 일일 집계 및 비용)
+
+-- 애플리케이션이 Deepseek 응답의 usage 블록을 프로세스 내에서 집계한 뒤
+-- record_ai_usage()로 주기적으로 일괄 반영합니다 (요청 경로에서는 DB 쓰기 없음).
+-- 일일 할당량 검사는 애플리케이션(Redis/메모리 카운터)에서 수행하며,
+-- 이 테이블은 프로세스 재시작 시 당일 사용량 복원과 비용 분석에 사용됩니다.
+
+-- ============================================================================
+-- 1. LEDGER TABLE - 일일 사용량 원장
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS ai_usage_daily (
+    usage_date DATE NOT NULL,
+    user_key VARCHAR(100) NOT NULL,          -- user:<id> 또는 ip:<주소> (비로그인)
+    endpoint VARCHAR(100) NOT NULL,          -- 예: /api/v1/ai/evaluate
+    model VARCHAR(100) NOT NULL,
+
+    role VARCHAR(20) NOT NULL DEFAULT 'anonymous',
+    request_count INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+    completion_tokens BIGINT NOT NULL DEFAULT 0,
+    cost_usd NUMERIC(14, 6) NOT NULL DEFAULT 0,
+
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    PRIMARY KEY (usage_date, user_key, endpoint, model)
+);
+
+-- 사용자별 당일 사용량 조회 (할당량 복원)
+CREATE INDEX IF NOT EXISTS idx_ai_usage_daily_user ON ai_usage_daily(user_key, usage_date);
+
+-- ============================================================================
+-- 2. BULK UPSERT - 일괄 반영
+-- ============================================================================
+
+-- entries: [{"usage_date", "user_key", "endpoint", "model", "role",
+--            "request_count", "prompt_tokens", "completion_tokens", "cost_usd"}, ...]
+CREATE OR REPLACE FUNCTION record_ai_usage(entries JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    INSERT INTO ai_usage_daily AS u (
+        usage_date, user_key, endpoint, model, role,
+        request_count, prompt_tokens, completion_tokens, cost_usd
+    )
+    SELECT
+        e.usage_date, e.user_key, e.endpoint, e.model, COALESCE(e.role, 'anonymous'),
+        e.request_count, e.prompt_tokens, e.completion_tokens, e.cost_usd
+    FROM jsonb_to_recordset(entries) AS e(
+        usage_date DATE,
+        user_key VARCHAR(100),
+        endpoint VARCHAR(100),
+        model VARCHAR(100),
+        role VARCHAR(20),
+        request_count INTEGER,
+        prompt_tokens BIGINT,
+        completion_tokens BIGINT,
+        cost_usd NUMERIC(14, 6)
+    )
+    ON CONFLICT (usage_date, user_key, endpoint, model) DO UPDATE SET
+        role = EXCLUDED.role,
+        request_count = u.request_count + EXCLUDED.request_count,
+        prompt_tokens = u.prompt_tokens + EXCLUDED.prompt_tokens,
+        completion_tokens = u.completion_tokens + EXCLUDED.completion_tokens,
+        cost_usd = u.cost_usd + EXCLUDED.cost_usd,
+        updated_at = NOW();
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- 3. REPORTING VIEWS - 조회용 뷰
+-- ============================================================================
+
+-- 사용자별 일일 합계 (최대 사용자 파악)
+CREATE OR REPLACE VIEW ai_usage_user_daily AS
+SELECT
+    usage_date,
+    user_key,
+    MAX(role) AS role,
+    SUM(request_count) AS request_count,
+    SUM(prompt_tokens) AS prompt_tokens,
+    SUM(completion_tokens) AS completion_tokens,
+    SUM(prompt_tokens + completion_tokens) AS total_tokens,
+    SUM(cost_usd) AS cost_usd
+FROM ai_usage_daily
+GROUP BY usage_date, user_key;
+
+-- 월별 모델/엔드포인트 비용
+CREATE OR REPLACE VIEW ai_usage_monthly_cost AS
+SELECT
+    date_trunc('month', usage_date)::DATE AS month,
+    endpoint,
+    model,
+    SUM(request_count) AS request_count,
+    SUM(prompt_tokens + completion_tokens) AS total_tokens,
+    SUM(cost_usd) AS cost_usd
+FROM ai_usage_daily
+GROUP BY 1, endpoint, model;
+
+-- 성공 메시지
+DO $$
+BEGIN
+    RAISE NOTICE '✅ AI 사용량 원장이 성공적으로 생성되었습니다!';
+    RAISE NOTICE '📊 ai_usage_daily, ai_usage_user_daily, ai_usage_monthly_cost';
+    RAISE NOTICE '🔄 record_ai_usage()는 백엔드가 주기적으로 호출합니다.';
+END $$;
@@ -0,0 +1,179 @@
+-- AI University System - Transactional Outbox
+-- Created: 2026-10-19
+-- Description: 회원가입 후속 작업(프로필 생성, 환영 알림, 기본 수강 등록)용 아웃박스
+
+-- 회원가입 요청은 Supabase Auth 사용자 생성까지만 기다리고,
+-- 후속 작업은 아웃박스 이벤트로 기록되어 백엔드 워커가 배치로 처리합니다.
+-- auth.users INSERT 트리거가 사용자 생성과 같은 트랜잭션에서 이벤트를 기록하며,
+-- 백엔드도 같은 멱등 키로 이벤트를 발행하므로 (트리거 미설치 환경 대비) 중복 없이 한 번만 기록됩니다.
+
+-- ============================================================================
+-- 1. USERS - Supabase Auth가 비밀번호를 관리
+-- ============================================================================
+
+ALTER TABLE users ALTER COLUMN hashed_password DROP NOT NULL;
+
+-- ============================================================================
+-- 2. OUTBOX TABLE - 아웃박스 이벤트
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS outbox_events (
+    id BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(50) NOT NULL,            -- 예: user.profile, user.welcome
+    idempotency_key VARCHAR(200) NOT NULL UNIQUE, -- 예: user.profile:<user_id>
+    payload JSONB NOT NULL DEFAULT '{}',
+
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processing', 'done', 'dead')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),  -- 재시도 백오프
+    locked_until TIMESTAMP WITH TIME ZONE,      -- 처리 중 임대 만료 시각 (워커 장애 시 회수)
+    last_error TEXT,
+
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    processed_at TIMESTAMP WITH TIME ZONE
+);
+
+-- 처리 대기 이벤트 조회 (완료/폐기 이벤트 제외)
+CREATE INDEX IF NOT EXISTS idx_outbox_events_ready
+    ON outbox_events(available_at, id) WHERE status IN ('pending', 'processing');
+
+-- ============================================================================
+-- 3. NOTIFICATIONS TABLE - 사용자 알림
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+
+    kind VARCHAR(50) NOT NULL,                  -- 예: welcome
+    title VARCHAR(200) NOT NULL,
+    message TEXT,
+    is_read BOOLEAN DEFAULT false,
+
+    idempotency_key VARCHAR(200) UNIQUE,        -- 같은 알림 중복 생성 방지
+
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id, created_at DESC);
+
+-- ============================================================================
+-- 4. FUNCTIONS - 발행/임대/완료/실패
+-- ============================================================================
+
+-- events: [{"event_type", "idempotency_key", "payload"}, ...] (이미 있는 멱등 키는 무시)
+CREATE OR REPLACE FUNCTION enqueue_outbox_events(events JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    INSERT INTO outbox_events (event_type, idempotency_key, payload)
+    SELECT e.event_type, e.idempotency_key, COALESCE(e.payload, '{}'::JSONB)
+    FROM jsonb_to_recordset(events) AS e(
+        event_type VARCHAR(50),
+        idempotency_key VARCHAR(200),
+        payload JSONB
+    )
+    ON CONFLICT (idempotency_key) DO NOTHING;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 처리할 이벤트를 임대 (여러 워커가 동시에 호출해도 같은 이벤트를 받지 않음)
+CREATE OR REPLACE FUNCTION claim_outbox_events(batch_size INTEGER DEFAULT 100, lease_seconds INTEGER DEFAULT 60)
+RETURNS SETOF outbox_events AS $$
+    UPDATE outbox_events o SET
+        status = 'processing',
+        attempts = o.attempts + 1,
+        locked_until = NOW() + make_interval(secs => lease_seconds)
+    WHERE o.id IN (
+        SELECT id FROM outbox_events
+        WHERE (status = 'pending' AND available_at <= NOW())
+           OR (status = 'processing' AND locked_until < NOW())
+        ORDER BY id
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING o.*;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION complete_outbox_events(event_ids BIGINT[])
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    UPDATE outbox_events SET
+        status = 'done',
+        processed_at = NOW(),
+        locked_until = NULL,
+        last_error = NULL
+    WHERE id = ANY(event_ids) AND status = 'processing';
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- failures: [{"id", "error"}, ...] (지수 백오프 재시도, max_attempts 초과 시 dead)
+CREATE OR REPLACE FUNCTION fail_outbox_events(failures JSONB, max_attempts INTEGER DEFAULT 8)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    UPDATE outbox_events o SET
+        status = CASE WHEN o.attempts >= max_attempts THEN 'dead' ELSE 'pending' END,
+        available_at = NOW() + make_interval(secs => LEAST(3600, 5 * power(2, o.attempts - 1))),
+        locked_until = NULL,
+        last_error = LEFT(f.error, 1000)
+    FROM jsonb_to_recordset(failures) AS f(id BIGINT, error TEXT)
+    WHERE o.id = f.id AND o.status = 'processing';
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- 5. SIGNUP TRIGGER - 가입과 같은 트랜잭션에서 이벤트 기록 (Supabase)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION enqueue_signup_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO public.outbox_events (event_type, idempotency_key, payload)
+    SELECT
+        t.event_type,
+        t.event_type || ':' || NEW.id,
+        jsonb_build_object(
+            'user_id', NEW.id,
+            'email', NEW.email,
+            'username', NEW.raw_user_meta_data->>'username',
+            'first_name', NEW.raw_user_meta_data->>'first_name',
+            'last_name', NEW.raw_user_meta_data->>'last_name'
+        )
+    FROM unnest(ARRAY['user.profile', 'user.welcome', 'user.default_enrollment']) AS t(event_type)
+    ON CONFLICT (idempotency_key) DO NOTHING;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DO $$
+BEGIN
+    IF to_regclass('auth.users') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS trg_auth_users_outbox ON auth.users;
+        CREATE TRIGGER trg_auth_users_outbox
+            AFTER INSERT ON auth.users
+            FOR EACH ROW EXECUTE FUNCTION enqueue_signup_events();
+    END IF;
+END $$;
+
+-- 성공 메시지
+DO $$
+BEGIN
+    RAISE NOTICE '✅ 아웃박스가 성공적으로 생성되었습니다!';
+    RAISE NOTICE '📮 outbox_events, notifications';
+    RAISE NOTICE '🔄 claim_outbox_events()는 백엔드 워커가 주기적으로 호출합니다.';
+END $$;
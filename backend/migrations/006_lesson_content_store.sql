@@ -0,0 +1,137 @@
+-- AI University System - Lesson Content Store
+-- Created: 2026-10-19
+-- Description: 레슨 본문을 콘텐츠 저장소(해시 주소 zstd 블롭)로 옮기고 행에는 해시만 보관
+
+-- 본문은 sha256(본문) 키의 블롭으로 저장소(로컬/S3·R2/Git)에 있고, 행에는 해시와 미리보기만 남습니다.
+-- 같은 본문(반복 생성된 AI 콘텐츠 등)은 블롭 하나를 공유합니다.
+-- 본문을 쓸 때는 content와 content_hash를 함께 기록합니다. 트리거가 content로 검색 벡터와
+-- 미리보기를 계산하고, 해시가 본문과 일치하면 content를 비웁니다. 본문은 검색 색인에는 남고
+-- 행 크기에는 포함되지 않습니다. 해시 없이 content만 쓰면 종전처럼 행에 저장됩니다.
+-- 기존 행은 `python -m src.services.content_store offload`로 옮깁니다 (옮기기 전에는 content 그대로 사용).
+
+-- ============================================================================
+-- 1. COLUMNS - 해시 및 미리보기
+-- ============================================================================
+
+ALTER TABLE lessons ADD COLUMN IF NOT EXISTS content_hash CHAR(64);         -- sha256(본문 UTF-8) hex
+ALTER TABLE lessons ADD COLUMN IF NOT EXISTS content_preview VARCHAR(200);  -- 검색 결과 스니펫
+
+-- ============================================================================
+-- 2. SEARCH VECTOR TRIGGER - 본문이 행에 없어도 본문 토큰 유지
+-- ============================================================================
+
+-- 레슨: 제목(A) > 본문 마크다운(C)
+CREATE OR REPLACE FUNCTION lessons_search_vector_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.content IS NOT NULL THEN
+        NEW.content_preview := left(NEW.content, 200);
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', COALESCE(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('simple', NEW.content), 'C');
+        IF NEW.content_hash = encode(sha256(convert_to(NEW.content, 'UTF8')), 'hex') THEN
+            -- 본문은 콘텐츠 저장소에 있으므로 행에는 해시만 남김
+            NEW.content := NULL;
+        ELSE
+            -- 해시 없이 본문만 쓴 경우(가져오기 등): 본문을 행에 두고 이전 해시는 무효화
+            NEW.content_hash := NULL;
+        END IF;
+    ELSIF TG_OP = 'UPDATE' AND NEW.content_hash IS NOT NULL
+          AND NEW.content_hash = OLD.content_hash THEN
+        -- 본문은 그대로이고 제목만 바뀐 경우: 기존 본문 토큰(C) 유지
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', COALESCE(NEW.title, '')), 'A') ||
+            COALESCE(ts_filter(OLD.search_vector, '{c}'), ''::tsvector);
+    ELSE
+        NEW.content_preview := NULL;
+        NEW.search_vector := setweight(to_tsvector('simple', COALESCE(NEW.title, '')), 'A');
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS lessons_search_vector_trigger ON lessons;
+CREATE TRIGGER lessons_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content, content_hash ON lessons
+    FOR EACH ROW EXECUTE FUNCTION lessons_search_vector_update();
+
+-- ============================================================================
+-- 3. SEARCH FUNCTION - 스니펫을 미리보기 컬럼에서 읽음 (본문 TOAST 읽기 제거)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION search_catalog(
+    query_text TEXT,
+    result_limit INTEGER DEFAULT 20,
+    include_lessons BOOLEAN DEFAULT true
+)
+RETURNS TABLE (
+    kind TEXT,
+    id UUID,
+    course_id UUID,
+    title TEXT,
+    snippet TEXT,
+    score REAL
+) AS $$
+DECLARE
+    ts_query tsquery;
+BEGIN
+    SELECT to_tsquery('simple', string_agg(quote_literal(word) || ':*', ' & '))
+    INTO ts_query
+    FROM regexp_split_to_table(lower(trim(query_text)), '\s+') AS word
+    WHERE word <> '';
+
+    IF ts_query IS NULL THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT * FROM (
+        SELECT
+            'course'::TEXT,
+            c.id,
+            c.id,
+            c.title::TEXT,
+            COALESCE(c.short_description, left(c.description, 200))::TEXT,
+            (ts_rank_cd(c.search_vector, ts_query) + similarity(c.title, query_text))::REAL AS rank
+        FROM courses c
+        WHERE c.search_vector @@ ts_query OR c.title % query_text
+
+        UNION ALL
+
+        SELECT
+            'lesson'::TEXT,
+            l.id,
+            m.course_id,
+            l.title::TEXT,
+            l.content_preview::TEXT,
+            (ts_rank_cd(l.search_vector, ts_query) + similarity(l.title, query_text))::REAL AS rank
+        FROM lessons l
+        JOIN modules m ON m.id = l.module_id
+        WHERE include_lessons
+          AND (l.search_vector @@ ts_query OR l.title % query_text)
+    ) AS results
+    ORDER BY rank DESC
+    LIMIT result_limit;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- ============================================================================
+-- 4. BACKFILL - 기존 행 미리보기 (트리거 대상 컬럼이 아니므로 검색 벡터는 그대로)
+-- ============================================================================
+
+-- migrate:batch
+UPDATE lessons SET content_preview = left(content, 200)
+WHERE id IN (
+    SELECT id FROM lessons
+    WHERE content IS NOT NULL AND content_preview IS NULL
+    LIMIT 5000
+);
+
+-- migrate:transaction
+-- 성공 메시지
+DO $$
+BEGIN
+    RAISE NOTICE '✅ 레슨 콘텐츠 저장소 컬럼이 성공적으로 추가되었습니다!';
+    RAISE NOTICE '📦 lessons.content_hash, lessons.content_preview';
+    RAISE NOTICE '🔄 기존 본문 이전: python -m src.services.content_store offload';
+END $$;
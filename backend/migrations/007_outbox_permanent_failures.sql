@@ -0,0 +1,26 @@
+-- AI University System - Outbox Permanent Failures
+-- Created: 2026-10-19
+-- Description: 재시도해도 결과가 같은 실패(제약 위반 등)는 백오프 없이 바로 dead로 처리
+
+-- failures: [{"id", "error", "permanent"}, ...]
+-- permanent가 true면 시도 횟수와 관계없이 dead, 그 외에는 지수 백오프 재시도 (max_attempts 초과 시 dead)
+CREATE OR REPLACE FUNCTION fail_outbox_events(failures JSONB, max_attempts INTEGER DEFAULT 8)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    UPDATE outbox_events o SET
+        status = CASE
+            WHEN COALESCE(f.permanent, false) OR o.attempts >= max_attempts THEN 'dead'
+            ELSE 'pending'
+        END,
+        available_at = NOW() + make_interval(secs => LEAST(3600, 5 * power(2, o.attempts - 1))),
+        locked_until = NULL,
+        last_error = LEFT(f.error, 1000)
+    FROM jsonb_to_recordset(failures) AS f(id BIGINT, error TEXT, permanent BOOLEAN)
+    WHERE o.id = f.id AND o.status = 'processing';
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,30 @@
+-- AI University System - Skip Signup Events For Imported Accounts
+-- Created: 2026-10-19
+-- Description: 일괄 가져오기로 만든 로그인 계정(app_metadata.bulk_import = true)은 가입 후속 작업 이벤트를 기록하지 않음
+
+-- 가져오기는 프로필/수강 정보를 직접 적재하므로 환영 알림, 기본 수강 등록, 프로필 생성 이벤트가 필요 없고
+-- 프로필 이벤트는 가져오기의 users upsert와 경합합니다.
+-- app_metadata는 서비스 키로만 설정할 수 있으므로 일반 가입자가 이 표시로 후속 작업을 건너뛸 수 없습니다.
+CREATE OR REPLACE FUNCTION enqueue_signup_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF COALESCE(NEW.raw_app_meta_data->>'bulk_import', 'false') = 'true' THEN
+        RETURN NEW;
+    END IF;
+
+    INSERT INTO public.outbox_events (event_type, idempotency_key, payload)
+    SELECT
+        t.event_type,
+        t.event_type || ':' || NEW.id,
+        jsonb_build_object(
+            'user_id', NEW.id,
+            'email', NEW.email,
+            'username', NEW.raw_user_meta_data->>'username',
+            'first_name', NEW.raw_user_meta_data->>'first_name',
+            'last_name', NEW.raw_user_meta_data->>'last_name'
+        )
+    FROM unnest(ARRAY['user.profile', 'user.welcome', 'user.default_enrollment']) AS t(event_type)
+    ON CONFLICT (idempotency_key) DO NOTHING;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
@@ -1,129 +1,557 @@
 #!/usr/bin/env python3
 """
-데이터베이스 마이그레이션 실행 스크립트
-Usage: python run_migration.py [migration_file]
+데이터베이스 마이그레이션 실행기
+NNN_*.sql 파일을 번호 순서대로 PostgreSQL에 직접 적용하고 schema_migrations에 기록
+
+Usage: python run_migration.py [status|plan|up|baseline VERSION]
+                               [--database-url URL] [--target VERSION] [--dry-run]
+                               [--lock-timeout 5s] [--retries 3] [--allow-changed]
+
+파일은 기본적으로 하나의 트랜잭션으로 실행됩니다 (실패 시 전체 롤백).
+무중단 배포가 필요한 작업은 아래 지시 주석으로 단계를 나눕니다.
+
+    -- migrate:transaction       이후 내용을 하나의 트랜잭션으로 실행 (기본)
+    -- migrate:no-transaction    문장별 자동 커밋 (CREATE INDEX CONCURRENTLY 등)
+    -- migrate:batch             한 문장을 영향받은 행이 0이 될 때까지 반복, 반복마다 커밋
+                                 (예: UPDATE ... WHERE id IN (SELECT id ... LIMIT 10000))
+
+- 완료된 단계 수가 기록되므로 중간에 실패하면 다음 실행에서 그 단계부터 이어집니다.
+  트랜잭션 밖 단계는 다시 실행되어도 안전하게 작성해야 합니다 (IF NOT EXISTS, 남은 행만 갱신).
+- 실패로 남은 INVALID 인덱스는 CREATE INDEX CONCURRENTLY 재시도 전에 자동으로 삭제합니다.
+- 여러 배포 프로세스가 동시에 실행해도 advisory lock으로 한 번만 적용됩니다.
+- lock_timeout을 넘기면 운영 트래픽을 막지 않도록 포기하고 재시도합니다.
+- 적용된 파일의 내용이 바뀌면(체크섬 불일치) 적용을 거부합니다.
 """
+import argparse
+import hashlib
 import os
+import re
 import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
 from dotenv import load_dotenv
-from supabase import create_client, Client
 
 # 환경 변수 로드
 load_dotenv()
 
+MIGRATIONS_DIR = Path(__file__).resolve().parent
 
-def run_migration(sql_file: str) -> bool:
-    """
-    SQL 마이그레이션 파일을 실행합니다.
+# `python migrations/run_migration.py`로 실행해도 src 패키지를 import할 수 있도록
+if str(MIGRATIONS_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(MIGRATIONS_DIR.parent))
+
+FILE_PATTERN = re.compile(r"^(\d{3,})_([\w\-]+)\.sql$")
+DIRECTIVE = re.compile(r"^--\s*migrate:(transaction|no-transaction|batch)\s*$", re.IGNORECASE)
+CONCURRENT_INDEX = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w\".]+)", re.IGNORECASE
+)
+DOLLAR_TAG = re.compile(r"\$[A-Za-z_]?\w*\$")
+LOCK_ID = 0x6D69677261  # pg_advisory_lock 키 ("migra")
+
+SCHEMA_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'applied' CHECK (status IN ('running', 'applied', 'baseline')),
+    steps_done INTEGER NOT NULL DEFAULT 0,
+    started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    applied_at TIMESTAMP WITH TIME ZONE,
+    execution_ms INTEGER
+);
+-- PostgREST(anon/authenticated)에 노출되지 않도록 정책 없이 RLS 활성화
+ALTER TABLE schema_migrations ENABLE ROW LEVEL SECURITY;
+"""
+
+
+# ============================================================================
+# 마이그레이션 파일
+# ============================================================================
+
+@dataclass
+class Step:
+    """실행 단위 (kind: transaction | no-transaction | batch)"""
+    kind: str
+    sql: str
+    line: int
+
+    @property
+    def statements(self) -> List[str]:
+        return split_statements(self.sql)
+
+    def summary(self) -> str:
+        first = next((s for s in self.statements), "")
+        first = " ".join(
+            line.strip() for line in first.splitlines() if line.strip() and not line.strip().startswith("--")
+        )
+        return first[:90] + ("…" if len(first) > 90 else "")
+
+
+@dataclass
+class Migration:
+    version: str
+    name: str
+    path: Path
+    sql: str = field(repr=False)
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+    @property
+    def steps(self) -> List[Step]:
+        return parse_steps(self.sql)
 
-    Args:
-        sql_file: 실행할 SQL 파일 경로
+    @property
+    def label(self) -> str:
+        return f"{self.version}_{self.name}"
 
-    Returns:
-        bool: 성공 여부
+
+def discover(directory: Path) -> List[Migration]:
+    """NNN_*.sql 파일을 번호 순서로 (번호 중복 시 오류)"""
+    migrations: Dict[str, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        version, name = match.groups()
+        if version in migrations:
+            raise SystemExit(f"❌ 마이그레이션 번호 중복: {migrations[version].path.name}, {path.name}")
+        migrations[version] = Migration(version, name, path, path.read_text(encoding="utf-8"))
+    return [migrations[version] for version in sorted(migrations, key=int)]
+
+
+def parse_steps(sql: str) -> List[Step]:
+    """지시 주석(-- migrate:...) 기준으로 단계 분리 (내용 없는 단계는 제외)"""
+    steps: List[Step] = []
+    kind, start, lines = "transaction", 1, []
+
+    def flush() -> None:
+        body = "\n".join(lines)
+        if split_statements(body):
+            steps.append(Step(kind, body, start))
+
+    for number, line in enumerate(sql.splitlines(), start=1):
+        match = DIRECTIVE.match(line.strip())
+        if match:
+            flush()
+            kind, start, lines = match.group(1).lower(), number + 1, []
+        else:
+            lines.append(line)
+    flush()
+
+    for step in steps:
+        if step.kind == "batch" and len(step.statements) != 1:
+            raise SystemExit(f"❌ batch 단계는 문장이 하나여야 합니다 (line {step.line})")
+    return steps
+
+
+def split_statements(sql: str) -> List[str]:
     """
-    # Supabase 클라이언트 생성
-    url = os.getenv('SUPABASE_URL')
-    service_key = os.getenv('SUPABASE_SERVICE_KEY')
+    SQL을 문장 단위로 분리 (문자열, 식별자 따옴표, $태그$ 본문, 주석 안의 ;는 무시)
 
-    if not url or not service_key:
-        print("❌ 환경 변수가 설정되지 않았습니다:")
-        print("   - SUPABASE_URL")
-        print("   - SUPABASE_SERVICE_KEY")
-        return False
+    주석만 있는 조각은 제외합니다.
+    """
+    statements: List[str] = []
+    buffer: List[str] = []
+    i, length = 0, len(sql)
+    has_code = False
+
+    while i < length:
+        char = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = length if end == -1 else end
+            buffer.append(sql[i:end])
+            i = end
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = length if end == -1 else end + 2
+            buffer.append(sql[i:end])
+            i = end
+            continue
+        if char in ("'", '"'):
+            end = i + 1
+            while end < length:
+                if sql[end] == char:
+                    if end + 1 < length and sql[end + 1] == char:  # '' 이스케이프
+                        end += 2
+                        continue
+                    break
+                end += 1
+            buffer.append(sql[i:end + 1])
+            has_code = True
+            i = end + 1
+            continue
+        if char == "$":
+            tag = DOLLAR_TAG.match(sql, i)
+            if tag:
+                end = sql.find(tag.group(0), i + len(tag.group(0)))
+                end = length if end == -1 else end + len(tag.group(0))
+                buffer.append(sql[i:end])
+                has_code = True
+                i = end
+                continue
+        if char == ";":
+            if has_code:
+                statements.append("".join(buffer).strip())
+            buffer, has_code = [], False
+            i += 1
+            continue
+        if not char.isspace():
+            has_code = True
+        buffer.append(char)
+        i += 1
+
+    if has_code:
+        statements.append("".join(buffer).strip())
+    return statements
+
+
+# ============================================================================
+# 실행기
+# ============================================================================
+
+def database_url(url: Optional[str]) -> str:
+    from src.core.database import plain_url
+
+    url = url or os.getenv("DATABASE_URL")
+    if not url:
+        raise SystemExit("❌ DATABASE_URL이 설정되지 않았습니다 (--database-url 또는 환경 변수)")
+    return plain_url(url)
 
-    try:
-        # Service role key 사용 (관리자 권한)
-        supabase: Client = create_client(url, service_key)
-        print(f"✅ Supabase 연결 성공: {url}")
 
-        # SQL 파일 읽기
-        sql_path = Path(sql_file)
-        if not sql_path.exists():
-            print(f"❌ SQL 파일을 찾을 수 없습니다: {sql_file}")
-            return False
+class Migrator:
+    """schema_migrations 기반 마이그레이션 적용"""
 
-        with open(sql_path, 'r', encoding='utf-8') as f:
-            sql_content = f.read()
+    def __init__(self, url: str, args: argparse.Namespace):
+        import psycopg2
 
-        print(f"📖 SQL 파일 읽기 완료: {sql_file}")
-        print(f"📏 SQL 길이: {len(sql_content)} 문자")
+        self.args = args
+        self.conn = psycopg2.connect(url, application_name="run_migration")
+        self.conn.autocommit = True
+        with self.conn.cursor() as cur:
+            cur.execute("SET lock_timeout = %s", (args.lock_timeout,))
 
-        # SQL 실행을 위해 RPC 함수 호출
-        # 직접 SQL 실행은 보안상 제한되므로 개별 쿼리로 분할
-        print("🚀 마이그레이션 실행 시작...")
+    def close(self) -> None:
+        self.conn.close()
 
-        # 간단한 연결 테스트로 대체
-        print("📊 테이블 존재 여부 확인 중...")
+    # ------------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------------
 
-        # 기본 테이블들 확인
-        tables_to_check = ['users', 'courses',
-                           'modules', 'lessons', 'enrollments']
-        existing_tables = []
+    def ensure_table(self) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute(SCHEMA_MIGRATIONS_SQL)
+        del self.conn.notices[:]  # "already exists, skipping"
 
-        for table in tables_to_check:
+    def applied(self) -> Dict[str, Dict[str, object]]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('schema_migrations') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                return {}
+            cur.execute(
+                "SELECT version, name, checksum, status, steps_done, applied_at, execution_ms "
+                "FROM schema_migrations"
+            )
+            columns = [column.name for column in cur.description]
+            return {row[0]: dict(zip(columns, row)) for row in cur.fetchall()}
+
+    def acquire_lock(self) -> None:
+        """다른 프로세스가 적용 중이면 끝날 때까지 대기"""
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_try_advisory_lock(%s)", (LOCK_ID,))
+            if cur.fetchone()[0]:
+                return
+            print("⏳ 다른 프로세스가 마이그레이션을 적용 중입니다. 대기합니다...")
+            cur.execute("SET lock_timeout = 0")
+            cur.execute("SELECT pg_advisory_lock(%s)", (LOCK_ID,))
+            cur.execute("SET lock_timeout = %s", (self.args.lock_timeout,))
+
+    def release_lock(self) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (LOCK_ID,))
+
+    def _print_notices(self) -> None:
+        for notice in self.conn.notices:
+            print("   " + notice.strip().removeprefix("NOTICE:  "))
+        del self.conn.notices[:]
+
+    def _record(self, cur, migration: Migration, status: str, steps_done: int,
+                elapsed_ms: Optional[int] = None) -> None:
+        cur.execute(
+            """
+            INSERT INTO schema_migrations (version, name, checksum, status, steps_done, applied_at, execution_ms)
+            VALUES (%s, %s, %s, %s, %s, CASE WHEN %s = 'running' THEN NULL ELSE NOW() END, %s)
+            ON CONFLICT (version) DO UPDATE SET
+                name = EXCLUDED.name, checksum = EXCLUDED.checksum, status = EXCLUDED.status,
+                steps_done = EXCLUDED.steps_done, applied_at = EXCLUDED.applied_at,
+                execution_ms = COALESCE(EXCLUDED.execution_ms, schema_migrations.execution_ms)
+            """,
+            (migration.version, migration.name, migration.checksum, status, steps_done, status, elapsed_ms),
+        )
+
+    # ------------------------------------------------------------------
+    # 단계 실행
+    # ------------------------------------------------------------------
+
+    def _with_retries(self, label: str, action) -> None:
+        """lock_timeout 초과 시 지수 백오프로 재시도"""
+        from psycopg2 import errors
+
+        for attempt in range(self.args.retries + 1):
             try:
-                # 테이블에 접근해서 존재 여부 확인
-                result = supabase.table(table).select(
-                    "count", count="exact").limit(0).execute()
-                existing_tables.append(table)
-                print(f"   ✅ '{table}' 테이블 존재함")
-            except Exception as e:
-                print(f"   ❌ '{table}' 테이블 없음 또는 접근 불가")
-
-        if len(existing_tables) == len(tables_to_check):
-            print("🎉 모든 필수 테이블이 이미 존재합니다!")
-            print("💡 Supabase 웹 대시보드에서 직접 실행하는 것을 권장합니다.")
-            return True
-        else:
-            print(
-                f"⚠️  {len(tables_to_check) - len(existing_tables)}개 테이블이 누락되었습니다.")
-            print("📖 아래 가이드를 따라 Supabase 웹 대시보드에서 실행하세요:")
-            print(f"   1. https://supabase.com/dashboard/project/giallnpmpicaqwemmjyy 접속")
-            print(f"   2. SQL Editor 메뉴 선택")
-            print(f"   3. {sql_file} 파일 내용 복사 & 붙여넣기")
-            print(f"   4. Run 버튼 클릭")
-            return False
+                return action()
+            except errors.LockNotAvailable:
+                if attempt == self.args.retries:
+                    raise
+                delay = 2 ** attempt
+                print(f"   🔒 {label}: lock_timeout 초과, {delay}s 후 재시도 ({attempt + 1}/{self.args.retries})")
+                time.sleep(delay)
+
+    def _run_transaction(self, migration: Migration, step: Step, steps_done: int, final: bool,
+                         started: float) -> None:
+        def action() -> None:
+            self.conn.autocommit = False
+            try:
+                with self.conn.cursor() as cur:
+                    cur.execute(step.sql)
+                    if final:
+                        self._record(cur, migration, "applied", steps_done,
+                                     int((time.monotonic() - started) * 1000))
+                    else:
+                        self._record(cur, migration, "running", steps_done)
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+            finally:
+                self.conn.autocommit = True
+
+        self._with_retries(f"line {step.line}", action)
+
+    def _drop_invalid_index(self, cur, name: str) -> None:
+        cur.execute(
+            """
+            SELECT i.indexrelid::regclass::text FROM pg_index i
+            WHERE i.indexrelid = to_regclass(%s) AND NOT i.indisvalid
+            """,
+            (name,),
+        )
+        row = cur.fetchone()
+        if row:
+            print(f"   🧹 이전 실패로 남은 INVALID 인덱스 삭제: {row[0]}")
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {row[0]}")
+
+    def _run_autocommit(self, step: Step) -> None:
+        with self.conn.cursor() as cur:
+            for statement in step.statements:
+                index = CONCURRENT_INDEX.search(statement)
+
+                def action(statement=statement, index=index) -> None:
+                    if index:
+                        self._drop_invalid_index(cur, index.group(1))
+                    cur.execute(statement)
+
+                self._with_retries(f"line {step.line}", action)
+
+    def _run_batch(self, step: Step) -> None:
+        statement = step.statements[0]
+        total, iterations = 0, 0
+        with self.conn.cursor() as cur:
+            while True:
+                def action() -> int:
+                    self.conn.autocommit = False
+                    try:
+                        cur.execute(statement)
+                        affected = cur.rowcount
+                        self.conn.commit()
+                        return affected
+                    except BaseException:
+                        self.conn.rollback()
+                        raise
+                    finally:
+                        self.conn.autocommit = True
+
+                affected = self._with_retries(f"line {step.line}", action)
+                iterations += 1
+                if affected <= 0:
+                    break
+                total += affected
+                if iterations % 10 == 0:
+                    print(f"   … {total:,} rows")
+                if self.args.batch_sleep_ms:
+                    time.sleep(self.args.batch_sleep_ms / 1000)
+        print(f"   ✅ batch: {total:,} rows in {iterations - 1} batches")
 
-    except Exception as e:
-        print(f"❌ 마이그레이션 실행 실패: {e}")
-        return False
+    def apply(self, migration: Migration, state: Optional[Dict[str, object]]) -> None:
+        steps = migration.steps
+        first = int(state["steps_done"]) if state and state["status"] == "running" else 0
+        started = time.monotonic()
+        resumed = f" (단계 {first + 1}/{len(steps)}부터 재개)" if first else ""
+        print(f"🚀 {migration.label}{resumed}")
 
+        for index in range(first, len(steps)):
+            step = steps[index]
+            final = index == len(steps) - 1
+            if len(steps) > 1:
+                print(f"   ▶ [{index + 1}/{len(steps)}] {step.kind}: {step.summary()}")
+            if step.kind == "transaction":
+                self._run_transaction(migration, step, index + 1, final, started)
+            else:
+                if step.kind == "no-transaction":
+                    self._run_autocommit(step)
+                else:
+                    self._run_batch(step)
+                with self.conn.cursor() as cur:
+                    if final:
+                        self._record(cur, migration, "applied", index + 1,
+                                     int((time.monotonic() - started) * 1000))
+                    else:
+                        self._record(cur, migration, "running", index + 1)
+            self._print_notices()
 
-def main():
+        print(f"   ✅ {migration.label} ({(time.monotonic() - started) * 1000:.0f}ms)")
+
+
+# ============================================================================
+# 명령
+# ============================================================================
+
+def pending_migrations(
+    migrations: List[Migration],
+    applied: Dict[str, Dict[str, object]],
+    args: argparse.Namespace
+) -> Iterator[Migration]:
+    """적용할 마이그레이션 (체크섬 검사 포함)"""
+    changed = [
+        m for m in migrations
+        if m.version in applied and applied[m.version]["status"] != "baseline"
+        and applied[m.version]["checksum"] != m.checksum
+    ]
+    if changed and not args.allow_changed:
+        names = ", ".join(m.path.name for m in changed)
+        raise SystemExit(f"❌ 적용된 마이그레이션 파일이 변경되었습니다: {names}\n"
+                         f"💡 새 번호의 파일로 변경하거나, 의도한 변경이면 --allow-changed를 사용하세요")
+    for migration in migrations:
+        if args.target and int(migration.version) > int(args.target):
+            break
+        state = applied.get(migration.version)
+        if state is None or state["status"] == "running":
+            yield migration
+
+
+def print_plan(migrations: List[Migration], applied: Dict[str, Dict[str, object]]) -> None:
+    if not migrations:
+        print("✅ 적용할 마이그레이션이 없습니다")
+        return
+    print(f"📋 적용 예정 {len(migrations)}개")
+    for migration in migrations:
+        state = applied.get(migration.version)
+        first = int(state["steps_done"]) if state else 0
+        steps = migration.steps
+        note = f" - 단계 {first + 1}부터 재개" if first else ""
+        print(f"  {migration.label} ({len(steps)}단계, sha256 {migration.checksum[:12]}){note}")
+        for number, step in enumerate(steps, start=1):
+            mark = "✔" if number <= first else "·"
+            print(f"    {mark} {number}. {step.kind:<14} {len(step.statements):>3}문장  line {step.line:<5} {step.summary()}")
+
+
+def print_status(migrations: List[Migration], applied: Dict[str, Dict[str, object]]) -> None:
+    known = {m.version for m in migrations}
+    for migration in migrations:
+        state = applied.get(migration.version)
+        if state is None:
+            print(f"  ⬜ {migration.label:<32} pending")
+        elif state["status"] == "running":
+            print(f"  🟨 {migration.label:<32} running (steps {state['steps_done']}/{len(migration.steps)})")
+        else:
+            changed = state["status"] != "baseline" and state["checksum"] != migration.checksum
+            print(f"  {'🟥' if changed else '✅'} {migration.label:<32} {state['status']} {state['applied_at']:%Y-%m-%d %H:%M}"
+                  + (f" ({state['execution_ms']}ms)" if state["execution_ms"] is not None else "")
+                  + (" - 파일 변경됨" if changed else ""))
+    for version in sorted(set(applied) - known, key=int):
+        print(f"  ❔ {version}_{applied[version]['name']:<28} 적용 기록은 있으나 파일 없음")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Apply SQL migrations to PostgreSQL")
+    parser.add_argument("command", nargs="?", default="plan", choices=["status", "plan", "up", "baseline"])
+    parser.add_argument("version", nargs="?", help="baseline: 이 번호까지 적용된 것으로 기록 (실행하지 않음)")
+    parser.add_argument("--database-url", default=None,
+                        help="기본값: DATABASE_URL (직접 연결, 트랜잭션 모드 풀러 불가)")
+    parser.add_argument("--dir", type=Path, default=MIGRATIONS_DIR, help="마이그레이션 디렉터리")
+    parser.add_argument("--target", default=None, help="이 번호까지만 적용")
+    parser.add_argument("--dry-run", action="store_true", help="up: 실행하지 않고 계획만 출력")
+    parser.add_argument("--lock-timeout", default="5s", help="테이블 잠금 대기 한도 (운영 트래픽 보호)")
+    parser.add_argument("--retries", type=int, default=3, help="lock_timeout 초과 시 재시도 횟수")
+    parser.add_argument("--batch-sleep-ms", type=int, default=0, help="batch 단계 반복 사이 대기 (복제 지연 완화)")
+    parser.add_argument("--allow-changed", action="store_true", help="적용된 파일의 체크섬 불일치 허용")
+    args = parser.parse_args(argv)
+
+    migrations = discover(args.dir)
+    if args.command == "baseline" and not args.version:
+        parser.error("baseline에는 VERSION이 필요합니다 (예: baseline 005)")
+
     print("🗄️  AI University System - Database Migration Runner")
     print("=" * 60)
 
-    # SQL 파일 경로 결정
-    if len(sys.argv) > 1:
-        sql_file = sys.argv[1]
-    else:
-        # 기본값: 001_initial_schema.sql
-        current_dir = Path(__file__).parent
-        sql_file = current_dir / "001_initial_schema.sql"
+    import psycopg2
+
+    try:
+        migrator = Migrator(database_url(args.database_url), args)
+    except psycopg2.Error as e:
+        print(f"❌ 데이터베이스 연결 실패: {e}")
+        return 1
+
+    try:
+        applied = migrator.applied()
+        if args.command == "status":
+            print_status(migrations, applied)
+            return 0
+
+        pending = list(pending_migrations(migrations, applied, args))
+        if args.command == "plan" or args.dry_run:
+            print_plan(pending, applied)
+            return 0
 
-    print(f"📂 마이그레이션 파일: {sql_file}")
+        migrator.acquire_lock()
+        try:
+            migrator.ensure_table()
+            # 대기 중 다른 프로세스가 적용했을 수 있으므로 잠금 후 다시 조회
+            applied = migrator.applied()
+            if args.command == "baseline":
+                with migrator.conn.cursor() as cur:
+                    for migration in migrations:
+                        if int(migration.version) <= int(args.version) and migration.version not in applied:
+                            migrator._record(cur, migration, "baseline", len(migration.steps))
+                            print(f"  📌 {migration.label} baseline")
+                return 0
 
-    # 마이그레이션 실행
-    success = run_migration(str(sql_file))
+            pending = list(pending_migrations(migrations, applied, args))
+            if not pending:
+                print("✅ 적용할 마이그레이션이 없습니다")
+            for migration in pending:
+                migrator.apply(migration, applied.get(migration.version))
+        finally:
+            migrator.release_lock()
 
-    if success:
-        print("\n🎉 마이그레이션이 성공적으로 완료되었습니다!")
-        print("📊 다음 단계:")
-        print("   1. Supabase 대시보드에서 테이블 확인")
-        print("   2. SQLAlchemy 모델 업데이트")
-        print("   3. API 엔드포인트 테스트")
-    else:
-        print("\n❌ 마이그레이션 실행에 문제가 발생했습니다.")
-        print("🔧 트러블슈팅:")
-        print("   1. 환경 변수 확인 (.env 파일)")
-        print("   2. Supabase 프로젝트 상태 확인")
-        print("   3. Supabase 웹 대시보드에서 수동 실행")
+    except psycopg2.Error as e:
+        migrator._print_notices()
+        print(f"❌ 마이그레이션 실행 실패: {type(e).__name__}: {str(e).strip()}")
+        print("💡 원인을 해결한 뒤 다시 실행하면 실패한 단계부터 이어서 적용합니다")
+        return 1
+    finally:
+        migrator.close()
 
-        sys.exit(1)
+    print("\n🎉 마이그레이션이 성공적으로 완료되었습니다!")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
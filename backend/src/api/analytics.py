@@ -0,0 +1,85 @@
+"""
+분석 API 라우터
+강사 대시보드용 코스/모듈 통계 (롤업 테이블 기반, 해당 코스 강사 또는 관리자만)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Dict
+
+from .auth import get_current_user
+
+router = APIRouter(prefix="/analytics", tags=["분석"])
+
+
+async def require_course_instructor(course_id: str, current_user=Depends(get_current_user)):
+    """코스 강사(courses.instructor_id) 또는 관리자만 허용"""
+    from ..services.analytics_service import analytics_service
+
+    if current_user.role == "admin":
+        return current_user
+    try:
+        exists, instructor_id = await analytics_service.get_course_instructor(course_id)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if not exists:
+        raise HTTPException(status_code=404, detail="Course not found")
+    if instructor_id is None or str(instructor_id) != str(current_user.id):
+        raise HTTPException(status_code=403, detail="코스 강사 또는 관리자만 조회할 수 있습니다")
+    return current_user
+
+
+@router.get("/courses/{course_id}", summary="코스 요약 통계")
+async def get_course_analytics(
+    course_id: str,
+    current_user=Depends(require_course_instructor)
+) -> Dict[str, Any]:
+    """
+    코스 완료 퍼널, 평균 학습 시간, 퀴즈 점수 분포를 반환합니다.
+    """
+    from ..services.analytics_service import analytics_service
+
+    try:
+        overview = await analytics_service.get_course_overview(course_id)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    if overview is None:
+        raise HTTPException(status_code=404, detail="Analytics not found for course")
+
+    return {"success": True, "data": overview}
+
+
+@router.get("/courses/{course_id}/daily", summary="코스 일자별 통계")
+async def get_course_daily_analytics(
+    course_id: str,
+    days: int = Query(30, ge=1, le=365, description="조회 기간 (일)"),
+    current_user=Depends(require_course_instructor)
+) -> Dict[str, Any]:
+    """
+    일자별 신규 수강, 수료, 학습 시간을 반환합니다.
+    """
+    from ..services.analytics_service import analytics_service
+
+    try:
+        daily = await analytics_service.get_course_daily(course_id, days=days)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {"success": True, "data": daily, "count": len(daily), "days": days}
+
+
+@router.get("/courses/{course_id}/modules", summary="모듈별 통계")
+async def get_module_analytics(
+    course_id: str,
+    current_user=Depends(require_course_instructor)
+) -> Dict[str, Any]:
+    """
+    모듈별 레슨 완료 수를 반환합니다.
+    """
+    from ..services.analytics_service import analytics_service
+
+    try:
+        modules = await analytics_service.get_module_stats(course_id)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {"success": True, "data": modules, "count": len(modules)}
@@ -2,22 +2,17 @@
 인증 API 라우터
 Supabase Auth를 활용한 회원가입, 로그인, 로그아웃 등
 """
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
-from supabase import Client
-from typing import Optional
-import os
-from dotenv import load_dotenv
+from typing import Any, Callable, Dict, Optional
 
-load_dotenv()
 
-# Supabase 클라이언트 초기화
-from supabase import create_client
+def get_session_service():
+    """세션 서비스 (지연 임포트)"""
+    from ..services.session_service import session_service
+    return session_service
 
-url = os.getenv('SUPABASE_URL')
-key = os.getenv('SUPABASE_KEY')
-supabase: Client = create_client(url, key)
 
 router = APIRouter(prefix="/auth", tags=["인증"])
 security = HTTPBearer()
@@ -39,9 +34,14 @@ class SignInRequest(BaseModel):
     email: EmailStr
     password: str
 
+class RefreshRequest(BaseModel):
+    """토큰 갱신 요청"""
+    refresh_token: str
+
 class AuthResponse(BaseModel):
     """인증 응답"""
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "Bearer"
     user: dict
     expires_in: int
@@ -59,28 +59,91 @@ class UserProfile(BaseModel):
 # 의존성 함수들
 # ============================================================================
 
+async def _with_profile_role(user):
+    """역할은 users.role(UserRole)을 기준으로 함 (프로필이 없으면 토큰의 app_metadata.role)"""
+    from dataclasses import replace
+    from ..services.profile_service import profile_service
+
+    role = await profile_service.get_role(user.id, user.role)
+    return user if role == user.role else replace(user, role=role)
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """현재 로그인된 사용자 정보 가져오기"""
+    """현재 로그인된 사용자 정보 가져오기 (토큰 해시 키로 짧은 TTL 캐시)"""
+    from ..services.session_service import SessionError
+
     try:
-        token = credentials.credentials
-        
-        # Supabase에서 토큰 검증
-        user_response = supabase.auth.get_user(token)
-        
-        if not user_response or not user_response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="유효하지 않은 토큰입니다"
-            )
-        
-        return user_response.user
-        
-    except Exception as e:
+        # Supabase Auth에서 토큰 검증
+        user = await get_session_service().get_user(credentials.credentials)
+        return await _with_profile_role(user)
+
+    except SessionError as e:
+        if e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"토큰 검증 실패: {str(e)}"
         )
 
+
+async def get_websocket_user(websocket: WebSocket):
+    """
+    WebSocket 연결 사용자 (get_current_user와 같은 세션 검증)
+
+    브라우저 WebSocket은 헤더를 지정할 수 없으므로 Authorization 헤더가 없으면
+    access_token 쿼리 파라미터를 사용합니다.
+    """
+    from ..services.session_service import SessionError
+
+    scheme, _, token = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = websocket.query_params.get("access_token", "")
+    if not token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="인증이 필요합니다")
+
+    try:
+        user = await get_session_service().get_user(token)
+        return await _with_profile_role(user)
+
+    except SessionError as e:
+        if e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER, reason=str(e))
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="토큰 검증 실패")
+
+
+def current_profile(*columns: str) -> Callable[..., Any]:
+    """
+    현재 사용자 프로필 의존성 생성 (요청한 컬럼만 조회, 캐시 사용)
+
+    예: profile = Depends(current_profile("username", "current_skill_level"))
+    프로필 행이 아직 없으면 None을 주입합니다.
+    """
+    from ..services.profile_service import normalize_columns
+    projection = normalize_columns(columns)  # 잘못된 컬럼은 라우트 정의 시점에 오류
+
+    async def dependency(current_user = Depends(get_current_user)) -> Optional[Dict[str, Any]]:
+        from ..services.profile_service import profile_service
+        try:
+            return await profile_service.get_profile(current_user.id, projection)
+        except RuntimeError as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"사용자 정보 조회 실패: {str(e)}"
+            )
+
+    return dependency
+
+
+def _auth_response(session: dict) -> AuthResponse:
+    return AuthResponse(
+        access_token=session["access_token"],
+        refresh_token=session.get("refresh_token"),
+        user=session["user"],
+        expires_in=session.get("expires_in") or 3600
+    )
+
 # ============================================================================
 # API 엔드포인트들
 # ============================================================================
@@ -96,55 +159,56 @@ async def sign_up(user_data: SignUpRequest):
     - **first_name**: 이름 (선택)
     - **last_name**: 성 (선택)
     """
+    from ..services.onboarding_service import username_available
+    from ..services.session_service import SessionError
+
+    if not await username_available(user_data.username):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 사용 중인 사용자명입니다"
+        )
+
     try:
         # Supabase Auth로 사용자 생성
-        auth_response = supabase.auth.sign_up({
-            "email": user_data.email,
-            "password": user_data.password,
-            "options": {
-                "data": {
-                    "username": user_data.username,
-                    "first_name": user_data.first_name,
-                    "last_name": user_data.last_name
-                }
+        session = await get_session_service().sign_up(
+            email=user_data.email,
+            password=user_data.password,
+            metadata={
+                "username": user_data.username,
+                "first_name": user_data.first_name,
+                "last_name": user_data.last_name
             }
-        })
+        )
         
-        if not auth_response.user:
+        if not session.get("user"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="회원가입에 실패했습니다"
             )
         
-        # 사용자 테이블에 추가 정보 저장
-        user_profile = {
-            "id": auth_response.user.id,
-            "email": user_data.email,
-            "username": user_data.username,
-            "first_name": user_data.first_name,
-            "last_name": user_data.last_name,
-            "full_name": f"{user_data.first_name or ''} {user_data.last_name or ''}".strip(),
-            "is_active": True,
-            "is_verified": False,
-            "role": "student"
-        }
+        # 프로필 생성, 환영 알림, 기본 수강 등록은 아웃박스 워커가 비동기로 처리
+        from ..services.onboarding_service import publish_signup
+        publish_signup(
+            user_id=session["user"]["id"],
+            email=user_data.email,
+            username=user_data.username,
+            first_name=user_data.first_name,
+            last_name=user_data.last_name
+        )
         
-        # users 테이블에 프로필 저장
-        try:
-            supabase.table("users").insert(user_profile).execute()
-        except Exception as db_error:
-            print(f"사용자 프로필 저장 실패: {db_error}")
-            # Auth는 성공했으므로 계속 진행
+        if not session.get("access_token"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="회원가입 실패: 이메일 확인 후 로그인해주세요"
+            )
         
-        return AuthResponse(
-            access_token=auth_response.session.access_token,
-            user=auth_response.user.model_dump(),
-            expires_in=auth_response.session.expires_in or 3600
-        )
+        return _auth_response(session)
         
-    except Exception as e:
+    except HTTPException:
+        raise
+    except SessionError as e:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE if e.status_code == 503 else status.HTTP_400_BAD_REQUEST,
             detail=f"회원가입 실패: {str(e)}"
         )
 
@@ -156,80 +220,66 @@ async def sign_in(user_data: SignInRequest):
     - **email**: 이메일 주소
     - **password**: 비밀번호
     """
+    from ..services.session_service import SessionError
+
     try:
         # Supabase Auth로 로그인
-        auth_response = supabase.auth.sign_in_with_password({
-            "email": user_data.email,
-            "password": user_data.password
-        })
+        session = await get_session_service().sign_in(user_data.email, user_data.password)
         
-        if not auth_response.user or not auth_response.session:
+        if not session.get("user") or not session.get("access_token"):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="이메일 또는 비밀번호가 잘못되었습니다"
             )
         
-        return AuthResponse(
-            access_token=auth_response.session.access_token,
-            user=auth_response.user.model_dump(),
-            expires_in=auth_response.session.expires_in or 3600
-        )
+        return _auth_response(session)
         
-    except Exception as e:
+    except HTTPException:
+        raise
+    except SessionError as e:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE if e.status_code == 503 else status.HTTP_401_UNAUTHORIZED,
             detail=f"로그인 실패: {str(e)}"
         )
 
 @router.post("/signout", summary="로그아웃")
-async def sign_out(current_user = Depends(get_current_user)):
+async def sign_out(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user = Depends(get_current_user)
+):
     """
     사용자 로그아웃
     
-    현재 세션을 종료합니다.
+    요청한 토큰의 세션을 종료합니다.
     """
+    from ..services.session_service import SessionError
+
     try:
-        supabase.auth.sign_out()
+        await get_session_service().sign_out(credentials.credentials)
         return {"message": "성공적으로 로그아웃되었습니다"}
         
-    except Exception as e:
+    except SessionError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"로그아웃 실패: {str(e)}"
         )
 
 @router.get("/me", response_model=UserProfile, summary="현재 사용자 정보")
-async def get_me(current_user = Depends(get_current_user)):
+async def get_me(
+    current_user = Depends(get_current_user),
+    profile = Depends(current_profile(*UserProfile.model_fields))
+):
     """
     현재 로그인된 사용자의 정보를 가져옵니다.
     """
-    try:
-        # 데이터베이스에서 추가 프로필 정보 가져오기
-        user_profile = supabase.table("users").select("*").eq("id", current_user.id).execute()
-        
-        if user_profile.data:
-            profile_data = user_profile.data[0]
-            return UserProfile(
-                id=profile_data["id"],
-                email=profile_data["email"],
-                username=profile_data.get("username"),
-                first_name=profile_data.get("first_name"),
-                last_name=profile_data.get("last_name"),
-                created_at=profile_data["created_at"]
-            )
-        else:
-            # 기본 Auth 정보만 반환
-            return UserProfile(
-                id=current_user.id,
-                email=current_user.email,
-                created_at=current_user.created_at
-            )
-            
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"사용자 정보 조회 실패: {str(e)}"
-        )
+    if profile:
+        return UserProfile(**profile)
+    # 프로필 생성 전이면 기본 Auth 정보만 반환
+    return UserProfile(
+        id=current_user.id,
+        email=current_user.email,
+        created_at=current_user.created_at
+    )
 
 @router.get("/verify-token", summary="토큰 검증")
 async def verify_token(current_user = Depends(get_current_user)):
@@ -242,28 +292,30 @@ async def verify_token(current_user = Depends(get_current_user)):
         "email": current_user.email
     }
 
-@router.post("/refresh", summary="토큰 갱신")
-async def refresh_token():
+@router.post("/refresh", response_model=AuthResponse, summary="토큰 갱신")
+async def refresh_token(request: RefreshRequest):
     """
-    액세스 토큰을 갱신합니다.
+    리프레시 토큰으로 액세스 토큰을 갱신합니다.
+    
+    - **refresh_token**: 로그인/회원가입/이전 갱신 응답의 refresh_token
     """
+    from ..services.session_service import SessionError
+
     try:
-        auth_response = supabase.auth.refresh_session()
+        session = await get_session_service().refresh(request.refresh_token)
         
-        if not auth_response.session:
+        if not session.get("access_token"):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="토큰 갱신에 실패했습니다"
             )
         
-        return {
-            "access_token": auth_response.session.access_token,
-            "token_type": "Bearer",
-            "expires_in": auth_response.session.expires_in or 3600
-        }
+        return _auth_response(session)
         
-    except Exception as e:
+    except HTTPException:
+        raise
+    except SessionError as e:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE if e.status_code == 503 else status.HTTP_401_UNAUTHORIZED,
             detail=f"토큰 갱신 실패: {str(e)}"
-        ) 
\ No newline at end of file
+        )
@@ -0,0 +1,93 @@
+"""
+레슨 API 라우터
+렌더링된 레슨 본문 (정제된 HTML + 목차, 강한 ETag)
+"""
+import re
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from .auth import get_current_user
+
+router = APIRouter(prefix="/lessons", tags=["레슨"])
+
+_CONTENT_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+# 레슨 ID 경로는 본문이 수정되면 결과가 바뀌므로 항상 재검증, 해시 경로는 불변
+_LESSON_CACHE_CONTROL = "private, no-cache"
+_IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+async def _rendered_response(request: Request, digest: str, cache_control: str) -> Response:
+    """렌더링 결과 응답 (If-None-Match가 맞으면 본문을 읽지 않고 304)"""
+    from ..middleware.response_cache import etag_matches
+    from ..services.render_service import render_service
+
+    headers = {"ETag": render_service.etag(digest), "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        blob = await render_service.rendered(digest)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if blob is None:
+        raise HTTPException(status_code=404, detail="Lesson content not found")
+
+    # 캐시된 렌더링 결과(JSON)를 다시 파싱하지 않고 응답 본문에 그대로 삽입
+    return Response(
+        content=b'{"success":true,"data":' + blob + b"}",
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.get("/highlight.css", summary="코드 하이라이트 스타일시트")
+async def get_highlight_css() -> Response:
+    """
+    렌더링된 코드 블록(.highlight)용 Pygments 스타일시트를 반환합니다.
+    """
+    from ..services.render_service import highlight_css, RENDER_VERSION
+
+    return Response(
+        content=highlight_css(),
+        media_type="text/css",
+        headers={"ETag": f'"highlight.r{RENDER_VERSION}"', "Cache-Control": "public, max-age=86400"},
+    )
+
+
+@router.get("/rendered/{content_hash}", summary="본문 해시로 렌더링된 본문 조회")
+async def get_rendered_content(
+    content_hash: str,
+    request: Request,
+    current_user=Depends(get_current_user)
+) -> Response:
+    """
+    본문 해시(lessons.content_hash)의 렌더링 결과를 반환합니다. 결과는 변하지 않으므로 오래 캐시할 수 있습니다.
+    """
+    if not _CONTENT_HASH.match(content_hash):
+        raise HTTPException(status_code=404, detail="Lesson content not found")
+    return await _rendered_response(request, content_hash, _IMMUTABLE_CACHE_CONTROL)
+
+
+@router.get("/{lesson_id}/html", summary="렌더링된 레슨 본문")
+async def get_lesson_html(
+    lesson_id: str,
+    request: Request,
+    current_user=Depends(get_current_user)
+) -> Response:
+    """
+    레슨 본문을 정제된 HTML과 목차로 반환합니다.
+
+    - data.html: 정제된 HTML (제목에 앵커 id, 코드 블록은 .highlight 클래스)
+    - data.toc: [{level, id, title}] (h1~h3)
+    - ETag는 본문 해시 기반이며 If-None-Match로 304를 받을 수 있습니다.
+    """
+    from ..services.render_service import render_service
+
+    try:
+        digest = await render_service.lesson_hash(lesson_id)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if digest is None:
+        raise HTTPException(status_code=404, detail="Lesson content not found")
+    return await _rendered_response(request, digest, _LESSON_CACHE_CONTROL)
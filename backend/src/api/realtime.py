@@ -0,0 +1,103 @@
+"""
+실시간 API 라우터
+코스 생성/채점 작업 상태, 업로드 완료 알림 푸시 (WebSocket, SSE)
+"""
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketException
+from fastapi.responses import StreamingResponse
+from typing import List
+
+from .auth import get_current_user, get_websocket_user
+
+router = APIRouter(prefix="/realtime", tags=["실시간"])
+
+
+@router.websocket("/ws")
+async def realtime_websocket(
+    websocket: WebSocket,
+    channel: List[str] = Query([]),
+    current_user=Depends(get_websocket_user)
+):
+    """
+    WebSocket 구독 (본인 user 채널은 자동 구독)
+
+    - 연결: /api/v1/realtime/ws?access_token=... (관리자는 &channel=user:<id>로 다른 사용자 채널 추가)
+    - 클라이언트 → 서버: {"type": "subscribe" | "unsubscribe", "channels": [...]}, {"type": "pong"}
+    - 서버 → 클라이언트: event, subscribed, unsubscribed, ping, lagged(버려진 메시지 수), error
+    - ping에 응답하지 않아 REALTIME_IDLE_TIMEOUT_SECONDS 동안 수신이 없으면 연결을 닫습니다.
+    """
+    from ..services.realtime_service import realtime_hub, RealtimeError
+
+    try:
+        connection = realtime_hub.connect(current_user, send=websocket.send_text)
+    except RealtimeError as e:
+        raise WebSocketException(code=e.code, reason=str(e))
+
+    connection.task = asyncio.current_task()
+    try:
+        try:
+            subscribed = await realtime_hub.subscribe(connection, [f"user:{current_user.id}", *channel])
+        except RealtimeError as e:
+            raise WebSocketException(code=e.code, reason=str(e))
+        await websocket.accept()
+        await websocket.send_json({"type": "subscribed", "channels": subscribed})
+
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            raw = message.get("text")
+            if raw is None:
+                raw = (message.get("bytes") or b"").decode("utf-8", "replace")
+            await realtime_hub.handle_message(connection, raw)
+    except asyncio.CancelledError:
+        # 유휴/느린 연결 정리로 취소된 경우만 정상 종료로 처리
+        if not connection.closed:
+            raise
+        asyncio.current_task().uncancel()
+    finally:
+        await realtime_hub.disconnect(connection)
+
+    if websocket.client_state.name == "CONNECTED":
+        try:
+            await asyncio.wait_for(websocket.close(code=1001), timeout=1)
+        except Exception:
+            pass
+
+
+@router.get("/events", summary="이벤트 스트림 구독 (SSE)")
+async def realtime_events(
+    channel: List[str] = Query([], description="추가 구독 채널 (관리자: user:<id>)"),
+    current_user=Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Server-Sent Events 구독 (본인 user 채널은 자동 구독)
+
+    WebSocket을 사용할 수 없는 환경용이며, 구독 채널은 연결 시에만 지정할 수 있습니다.
+    각 이벤트의 data는 WebSocket 메시지와 같은 JSON이며, 하트비트는 주석 줄로 전송됩니다.
+    """
+    from ..services.realtime_service import realtime_hub, PING, RealtimeError
+
+    try:
+        connection = realtime_hub.connect(current_user)
+    except RealtimeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    try:
+        await realtime_hub.subscribe(connection, [f"user:{current_user.id}", *channel])
+    except RealtimeError as e:
+        await realtime_hub.disconnect(connection)
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            async for messages in connection.stream():
+                yield "".join(": ping\n\n" if message is PING else f"data: {message}\n\n" for message in messages)
+        finally:
+            await realtime_hub.disconnect(connection)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
@@ -2,20 +2,33 @@
 API 라우터 설정
 모든 엔드포인트를 중앙 집중식으로 관리
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 from datetime import datetime
+from uuid import UUID, uuid4
+
+from ..core.serialization import rows_to_columnar
 
 # 인증 라우터 임포트
 from .auth import router as auth_router
+from .search import router as search_router
+from .analytics import router as analytics_router
+from .uploads import router as uploads_router
+from .lessons import router as lessons_router
+from .realtime import router as realtime_router
 
 # 라우터 인스턴스 생성
 api_router = APIRouter()
 
 # 인증 라우터 포함
 api_router.include_router(auth_router)
+api_router.include_router(search_router)
+api_router.include_router(analytics_router)
+api_router.include_router(uploads_router)
+api_router.include_router(lessons_router)
+api_router.include_router(realtime_router)
 
 # Request/Response 모델들
 
@@ -25,6 +38,7 @@ class CourseGenerationRequest(BaseModel):
     skill_level: str = "beginner"
     duration_hours: int = 10
     learning_goals: List[str]
+    job_id: Optional[UUID] = None  # 작업 상태 이벤트의 상관 ID (없으면 서버가 발급)
 
 
 class VideoSearchRequest(BaseModel):
@@ -38,6 +52,7 @@ class AIEvaluationRequest(BaseModel):
     user_answer: str
     expected_answer: str
     context: str = ""
+    job_id: Optional[UUID] = None  # 작업 상태 이벤트의 상관 ID (없으면 서버가 발급)
 
 # 임시 엔드포인트들 (Phase 1.1 기본 구조)
 
@@ -55,7 +70,11 @@ async def api_root():
             "courses": "/courses",
             "content": "/content",
             "ai": "/ai",
-            "analytics": "/analytics"
+            "search": "/search",
+            "analytics": "/analytics",
+            "uploads": "/uploads",
+            "lessons": "/lessons",
+            "realtime": "/realtime"
         }
     }
 
@@ -64,16 +83,16 @@ async def api_root():
 async def api_status():
     """API 상태 확인"""
     from ..core.config import settings
-    from supabase import create_client
-    import os
+    from ..core.database import get_pool_status
+    from ..core.supabase import get_supabase_client
+    from ..core.startup import startup_timer
+    from ..services.model_router import model_router
 
     # Supabase 연결 상태 확인
     database_status = "not_connected"
     try:
-        url = os.getenv('SUPABASE_URL')
-        key = os.getenv('SUPABASE_KEY')
-        if url and key:
-            supabase = create_client(url, key)
+        supabase = get_supabase_client()
+        if supabase is not None:
             # 간단한 쿼리로 연결 테스트
             result = supabase.table("users").select(
                 "count", count="exact").limit(0).execute()
@@ -88,10 +107,13 @@ async def api_status():
         "services": {
             "database": database_status,
             "auth": "configured" if database_status == "connected" else "not_configured",
+            "database_pool": get_pool_status(),
             "cache": "not_implemented",
             "ai_service": "configured" if settings.DEEPSEEK_API_KEY else "not_configured",
+            "ai_models": model_router.stats(),
             "youtube_service": "configured" if settings.YOUTUBE_API_KEY else "not_configured"
         },
+        "startup_ms": startup_timer.report(),
         "endpoints": {
             "auth": {
                 "signup": "/auth/signup",
@@ -108,6 +130,14 @@ async def api_status():
             "youtube": {
                 "search": "/youtube/search",
                 "recommend": "/youtube/recommend/{topic}"
+            },
+            "search": {
+                "catalog": "/search?q={query}"
+            },
+            "analytics": {
+                "course": "/analytics/courses/{course_id}",
+                "daily": "/analytics/courses/{course_id}/daily",
+                "modules": "/analytics/courses/{course_id}/modules"
             }
         }
     }
@@ -115,11 +145,47 @@ async def api_status():
 # AI 관련 엔드포인트 (Phase 1.2)
 
 
+async def ai_usage_admission(http_request: Request) -> str:
+    """AI 엔드포인트 입장 제어 (일일 토큰 할당량 검사, 사용량 귀속 정보 설정, 호출자 식별자 반환)"""
+    from ..middleware.rate_limit import resolve_identity
+    from ..services.usage_service import seconds_until_reset, usage_ledger
+
+    user_key, role = await resolve_identity(http_request.scope)
+    status = await usage_ledger.admit(user_key, role, http_request.url.path)
+    if not status.allowed:
+        raise HTTPException(
+            status_code=429,
+            detail=f"일일 AI 토큰 사용량({status.quota:,})을 모두 사용했습니다. 내일 다시 시도해주세요.",
+            headers={"Retry-After": str(seconds_until_reset())}
+        )
+    return user_key
+
+
+async def publish_job_event(caller: str, job_id: UUID, event: str, data: Dict[str, Any]) -> None:
+    """
+    호출자의 user 채널로 작업 상태 이벤트 발행
+
+    인증되지 않은 호출자(ip:<주소>)는 구독할 채널이 없으므로 발행하지 않습니다.
+    """
+    if not caller.startswith("user:"):
+        return
+    from ..services.realtime_service import realtime_hub
+    await realtime_hub.publish(caller, event, {"job_id": str(job_id), **data})
+
+
 @api_router.post("/ai/generate-course")
-async def generate_course_outline(request: CourseGenerationRequest) -> Dict[str, Any]:
-    """AI 기반 코스 개요 생성"""
+async def generate_course_outline(
+    request: CourseGenerationRequest,
+    caller: str = Depends(ai_usage_admission)
+) -> Dict[str, Any]:
+    """AI 기반 코스 개요 생성 (로그인 사용자에게는 user 채널로 작업 상태 푸시)"""
+    from ..middleware.demand import topic_demand
     from ..services.ai_service import ai_service
 
+    topic_demand.note(request.topic, request.skill_level)
+    job_id = request.job_id or uuid4()
+    await publish_job_event(caller, job_id, "job.started", {"kind": "course_outline"})
+
     try:
         async with ai_service:
             result = await ai_service.generate_course_outline(
@@ -130,9 +196,11 @@ async def generate_course_outline(request: CourseGenerationRequest) -> Dict[str,
             )
 
         if result:
+            await publish_job_event(caller, job_id, "job.completed", {"kind": "course_outline", "result": result})
             return {
                 "success": True,
                 "data": result,
+                "job_id": str(job_id),
                 "message": "Course outline generated successfully"
             }
         else:
@@ -142,14 +210,20 @@ async def generate_course_outline(request: CourseGenerationRequest) -> Dict[str,
             )
 
     except Exception as e:
+        await publish_job_event(caller, job_id, "job.failed", {"kind": "course_outline", "detail": str(e)})
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @api_router.post("/ai/evaluate")
-async def evaluate_answer(request: AIEvaluationRequest) -> Dict[str, Any]:
-    """AI 기반 답변 평가"""
+async def evaluate_answer(
+    request: AIEvaluationRequest,
+    caller: str = Depends(ai_usage_admission)
+) -> Dict[str, Any]:
+    """AI 기반 답변 평가 (로그인 사용자에게는 user 채널로 작업 상태 푸시)"""
     from ..services.ai_service import ai_service
 
+    job_id = request.job_id or uuid4()
+    await publish_job_event(caller, job_id, "job.started", {"kind": "evaluation"})
     try:
         async with ai_service:
             evaluation = await ai_service.evaluate_user_response(
@@ -160,9 +234,11 @@ async def evaluate_answer(request: AIEvaluationRequest) -> Dict[str, Any]:
             )
 
         if evaluation:
+            await publish_job_event(caller, job_id, "job.completed", {"kind": "evaluation", "result": evaluation})
             return {
                 "success": True,
                 "data": evaluation,
+                "job_id": str(job_id),
                 "message": "Answer evaluated successfully"
             }
         else:
@@ -172,6 +248,7 @@ async def evaluate_answer(request: AIEvaluationRequest) -> Dict[str, Any]:
             )
 
     except Exception as e:
+        await publish_job_event(caller, job_id, "job.failed", {"kind": "evaluation", "detail": str(e)})
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -209,7 +286,8 @@ async def search_educational_videos(request: VideoSearchRequest) -> Dict[str, An
 async def recommend_videos(
     topic: str,
     skill_level: str = Query("beginner", description="기술 수준"),
-    max_results: int = Query(5, description="최대 결과 수")
+    max_results: int = Query(5, description="최대 결과 수"),
+    format: str = Query("rows", pattern="^(rows|columnar)$", description="응답 형식")
 ) -> Dict[str, Any]:
     """주제와 기술 수준에 맞는 비디오 추천"""
     from ..services.youtube_service import youtube_service
@@ -225,7 +303,7 @@ async def recommend_videos(
         if videos is not None:
             return {
                 "success": True,
-                "data": videos,
+                "data": rows_to_columnar(videos) if format == "columnar" else videos,
                 "count": len(videos),
                 "topic": topic,
                 "skill_level": skill_level,
@@ -246,11 +324,9 @@ async def recommend_videos(
 # from .users import users_router
 # from .courses import courses_router
 # from .content import content_router
-# from .analytics import analytics_router
 
 # 라우터 포함 (Phase 2부터 활성화)
 # api_router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 # api_router.include_router(users_router, prefix="/users", tags=["users"])
 # api_router.include_router(courses_router, prefix="/courses", tags=["courses"])
 # api_router.include_router(content_router, prefix="/content", tags=["content"])
-# api_router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
@@ -0,0 +1,47 @@
+"""
+검색 API 라우터
+코스/레슨 전문 검색
+"""
+from fastapi import APIRouter, HTTPException, Query
+
+from ..core.config import settings
+from ..core.serialization import ORJSONResponse, rows_to_columnar
+
+router = APIRouter(prefix="/search", tags=["검색"])
+
+
+@router.get("", summary="코스/레슨 검색")
+async def search_catalog(
+    q: str = Query(..., min_length=1, description="검색어"),
+    limit: int = Query(20, ge=1, description="최대 결과 수"),
+    include_lessons: bool = Query(True, description="레슨 포함 여부"),
+    format: str = Query("rows", pattern="^(rows|columnar)$", description="응답 형식")
+) -> ORJSONResponse:
+    """
+    코스 제목/설명/태그와 레슨 본문을 검색합니다.
+
+    - 접두사 검색: "pyth" → "python"
+    - 오타 허용: "pythn" → "python"
+    - 한국어: 조사 제거 및 복합명사 부분 일치
+    - format=columnar: {"columns": [...], "rows": [[...]]} 형식으로 반환
+    """
+    from ..services.search_service import search_service, SearchUnavailableError
+
+    try:
+        results = await search_service.search(
+            query=q,
+            limit=min(limit, settings.SEARCH_MAX_RESULTS),
+            include_lessons=include_lessons
+        )
+        # 목록 응답은 jsonable_encoder를 거치지 않도록 응답 객체를 직접 반환
+        return ORJSONResponse({
+            "success": True,
+            "data": rows_to_columnar(results) if format == "columnar" else results,
+            "count": len(results),
+            "query": q,
+        })
+
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,146 @@
+"""
+업로드 API 라우터
+강의 미디어 이어 올리기 업로드 (세션 생성 → PATCH로 청크 전송 → 완료) 및 단일 요청 폼 업로드
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+
+from .auth import get_current_user
+
+router = APIRouter(prefix="/uploads", tags=["업로드"])
+
+_UPLOADER_ROLES = {"instructor", "admin"}
+
+
+class UploadCreateRequest(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str
+    size: int = Field(..., ge=0)
+    sha256: Optional[str] = Field(None, pattern=r"^[0-9a-f]{64}$")
+
+
+def _require_uploader(current_user) -> None:
+    if current_user.role not in _UPLOADER_ROLES:
+        raise HTTPException(status_code=403, detail="강사 또는 관리자만 업로드할 수 있습니다")
+
+
+def _http_error(e) -> HTTPException:
+    return HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers or None)
+
+
+def _offset_headers(session) -> Dict[str, str]:
+    headers = {"Upload-Offset": str(session.offset), "Cache-Control": "no-store"}
+    if session.size is not None:
+        headers["Upload-Length"] = str(session.size)
+    return headers
+
+
+@router.post("", status_code=201, summary="업로드 세션 생성")
+async def create_upload(
+    request: UploadCreateRequest,
+    response: Response,
+    current_user=Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    업로드 세션을 만들고 ID를 반환합니다. 이후 PATCH /uploads/{id}로 본문을 전송합니다.
+    """
+    from ..services.upload_service import upload_service, UploadError
+
+    _require_uploader(current_user)
+    try:
+        session = await upload_service.create(
+            current_user.id, request.filename, request.content_type, request.size, request.sha256
+        )
+    except UploadError as e:
+        raise _http_error(e)
+
+    response.headers["Location"] = f"/api/v1/uploads/{session.id}"
+    response.headers.update(_offset_headers(session))
+    return {"success": True, "data": session.to_public_dict()}
+
+
+@router.head("/{upload_id}", summary="업로드 오프셋 확인")
+async def head_upload(upload_id: str, current_user=Depends(get_current_user)) -> Response:
+    """
+    이어 올릴 위치를 Upload-Offset 헤더로 반환합니다.
+    """
+    from ..services.upload_service import upload_service, UploadError
+
+    try:
+        session = upload_service.get(upload_id, current_user.id)
+    except UploadError as e:
+        raise _http_error(e)
+    return Response(status_code=200, headers=_offset_headers(session))
+
+
+@router.get("/{upload_id}", summary="업로드 상태 조회")
+async def get_upload(upload_id: str, current_user=Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    업로드 진행 상태와 완료 후 저장 위치/썸네일을 반환합니다.
+    """
+    from ..services.upload_service import upload_service, UploadError
+
+    try:
+        session = upload_service.get(upload_id, current_user.id)
+    except UploadError as e:
+        raise _http_error(e)
+    return {"success": True, "data": session.to_public_dict()}
+
+
+@router.patch("/{upload_id}", summary="업로드 청크 전송")
+async def patch_upload(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., ge=0, alias="Upload-Offset"),
+    current_user=Depends(get_current_user)
+) -> Response:
+    """
+    Upload-Offset부터 요청 본문을 이어서 기록합니다.
+
+    본문은 스트림으로 읽어 디스크에 기록하므로 크기에 제한이 없습니다 (파일 크기 제한 제외).
+    연결이 끊기면 받은 부분까지 저장되며, HEAD로 오프셋을 확인한 뒤 이어서 보낼 수 있습니다.
+    """
+    from ..services.upload_service import upload_service, UploadError
+
+    content_length = request.headers.get("content-length")
+    try:
+        session = await upload_service.append(
+            upload_id, current_user.id, upload_offset, request.stream(),
+            length=int(content_length) if content_length else None,
+        )
+    except UploadError as e:
+        raise _http_error(e)
+    return Response(status_code=204, headers=_offset_headers(session))
+
+
+@router.delete("/{upload_id}", status_code=204, summary="업로드 취소")
+async def delete_upload(upload_id: str, current_user=Depends(get_current_user)) -> Response:
+    """
+    진행 중인 업로드를 취소하고 받은 데이터를 삭제합니다.
+    """
+    from ..services.upload_service import upload_service, UploadError
+
+    try:
+        await upload_service.cancel(upload_id, current_user.id)
+    except UploadError as e:
+        raise _http_error(e)
+    return Response(status_code=204)
+
+
+@router.post("/form", status_code=201, summary="단일 요청 업로드 (multipart/form-data)")
+async def form_upload(request: Request, current_user=Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    `file` 필드 하나를 받아 바로 완료합니다. 큰 파일은 이어 올리기 업로드를 사용하세요.
+    """
+    from ..services.upload_service import upload_service, UploadError
+
+    _require_uploader(current_user)
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="multipart/form-data 요청이 필요합니다")
+    try:
+        session = await upload_service.receive_form(current_user.id, content_type, request.stream())
+    except UploadError as e:
+        raise _http_error(e)
+    return {"success": True, "data": session.to_public_dict()}
@@ -0,0 +1,87 @@
+"""
+결과 캐시
+서비스 계산 결과(JSON 직렬화 가능 값)를 저장하는 키-값 캐시 (Redis 우선, 프로세스별 LRU 대체)
+
+HTTP 응답 단위 캐시는 middleware.response_cache를 사용하고,
+POST 엔드포인트 결과나 사전 생성 결과처럼 응답으로 캐시할 수 없는 값에 사용합니다.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import orjson
+from .redis import get_redis, mark_redis_unavailable
+from .serialization import dumps
+
+
+class ResultCache:
+    """TTL이 있는 JSON 결과 캐시"""
+
+    def __init__(self, prefix: str, ttl: int, max_entries: int = 1000):
+        self.prefix = f"result:{prefix}:"
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._max_entries = max_entries
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """인자 조합으로 캐시 키 생성"""
+        return hashlib.blake2b(dumps(parts), digest_size=16).hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        redis = get_redis()
+        if redis is not None:
+            try:
+                data = await redis.get(self.prefix + key)
+                return orjson.loads(data) if data is not None else None
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return orjson.loads(entry[1])
+
+    async def exists(self, key: str) -> bool:
+        redis = get_redis()
+        if redis is not None:
+            try:
+                return bool(await redis.exists(self.prefix + key))
+            except Exception as e:
+                mark_redis_unavailable(e)
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        ttl = ttl or self.ttl
+        data = dumps(value)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.set(self.prefix + key, data, ex=ttl)
+                return
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+        redis = get_redis()
+        if redis is not None and keys:
+            try:
+                await redis.delete(*(self.prefix + key for key in keys))
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+    def clear(self) -> None:
+        """프로세스 내 캐시 초기화"""
+        self._entries.clear()
@@ -0,0 +1,151 @@
+"""
+데이터베이스 연결 관리
+SQLAlchemy 비동기 엔진, 커넥션 풀, 요청 단위 세션
+"""
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+)
+from .config import settings
+
+
+def plain_url(url: str) -> str:
+    """SQLAlchemy 드라이버 표기를 뺀 PostgreSQL URL (asyncpg/psycopg2 직접 연결용)"""
+    for prefix in ("postgresql+asyncpg://", "postgresql+psycopg2://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql://" + url[len(prefix):]
+    return url
+
+
+def _to_async_url(url: str) -> str:
+    """동기 드라이버 URL을 비동기 드라이버 URL로 변환"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """드라이버별 엔진 옵션 (풀 크기, 재활용, 구문 타임아웃)"""
+    if url.startswith("sqlite"):
+        return {"echo": settings.DB_ECHO}
+
+    return {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {
+            # 서버 측 구문 타임아웃 (ms)
+            "server_settings": {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+                "application_name": settings.APP_NAME,
+            },
+            # 클라이언트 측 명령 타임아웃 (초) - 네트워크 단절 대비 여유를 둠
+            "command_timeout": settings.DB_STATEMENT_TIMEOUT_MS / 1000 + 5,
+        },
+    }
+
+
+class Database:
+    """
+    비동기 엔진 및 세션 팩토리
+
+    엔진은 첫 사용 시 생성되어 워커 프로세스 내에서 재사용되므로
+    워커당 커넥션 수는 최대 pool_size + max_overflow로 제한됩니다.
+    읽기 전용 세션은 DATABASE_READ_REPLICA_URL이 설정된 경우 복제본으로 라우팅됩니다.
+    """
+
+    def __init__(self):
+        self._engines: Dict[str, AsyncEngine] = {}
+        self._sessionmakers: Dict[str, async_sessionmaker] = {}
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(settings.DATABASE_URL)
+
+    def _url_for(self, read_only: bool) -> str:
+        if read_only and settings.DATABASE_READ_REPLICA_URL:
+            return settings.DATABASE_READ_REPLICA_URL
+        if not settings.DATABASE_URL:
+            raise RuntimeError("DATABASE_URL is not configured")
+        return settings.DATABASE_URL
+
+    def get_engine(self, read_only: bool = False) -> AsyncEngine:
+        """엔진 반환 (없으면 생성)"""
+        role = "replica" if read_only and settings.DATABASE_READ_REPLICA_URL else "primary"
+        engine = self._engines.get(role)
+        if engine is None:
+            url = _to_async_url(self._url_for(read_only))
+            engine = create_async_engine(url, **_engine_options(url))
+            self._engines[role] = engine
+            self._sessionmakers[role] = async_sessionmaker(
+                engine, expire_on_commit=False, autoflush=False
+            )
+        return engine
+
+    def get_sessionmaker(self, read_only: bool = False) -> async_sessionmaker:
+        """세션 팩토리 반환"""
+        self.get_engine(read_only)
+        role = "replica" if read_only and settings.DATABASE_READ_REPLICA_URL else "primary"
+        return self._sessionmakers[role]
+
+    @asynccontextmanager
+    async def session(self, read_only: bool = False) -> AsyncIterator[AsyncSession]:
+        """
+        세션 컨텍스트
+
+        쓰기 세션은 정상 종료 시 커밋, 예외 시 롤백합니다.
+        읽기 전용 세션은 커밋하지 않고 닫습니다.
+        """
+        async with self.get_sessionmaker(read_only)() as session:
+            try:
+                yield session
+                if not read_only:
+                    await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    def pool_status(self) -> Dict[str, str]:
+        """커넥션 풀 상태 (생성된 엔진만)"""
+        return {role: engine.pool.status() for role, engine in self._engines.items()}
+
+    async def dispose(self) -> None:
+        """모든 엔진의 커넥션 풀 정리 (lifespan 종료 시 호출)"""
+        for engine in self._engines.values():
+            await engine.dispose()
+        self._engines.clear()
+        self._sessionmakers.clear()
+
+
+# 전역 데이터베이스 인스턴스
+database = Database()
+
+
+# ============================================================================
+# FastAPI 의존성 함수들
+# ============================================================================
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """요청 단위 쓰기 세션 (주 DB)"""
+    async with database.session() as session:
+        yield session
+
+
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """요청 단위 읽기 전용 세션 (복제본 설정 시 복제본)"""
+    async with database.session(read_only=True) as session:
+        yield session
+
+
+def get_pool_status() -> Optional[Dict[str, str]]:
+    """상태 점검용 풀 정보"""
+    if not database.is_configured:
+        return None
+    return database.pool_status()
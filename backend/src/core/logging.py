@@ -2,33 +2,185 @@
 구조화된 로깅 시스템 설정
 개발 및 프로덕션 환경별 로깅 구성
 """
+import atexit
 import logging
+import logging.handlers
+import queue
+import random
 import sys
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List, Optional, Set
 import structlog
 from .config import settings
 
+_listener: Optional[logging.handlers.QueueListener] = None
+_structlog_loggers: Set[str] = set()
+
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+    "exception": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+
+def truncate(value: Any, limit: Optional[int] = None) -> Any:
+    """긴 문자열/바이트를 잘라서 반환 (업스트림 오류 본문 등)"""
+    limit = limit or settings.LOG_MAX_FIELD_LENGTH
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="replace")
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]}...[truncated {len(value) - limit} chars]"
+    return value
+
+
+class LogLimiter:
+    """
+    로거별 샘플링 및 초당 한도
+
+    - 샘플링은 INFO 이하 이벤트에만 적용 (경고/오류는 항상 통과 후보)
+    - 초당 한도는 모든 레벨에 적용되며, 버려진 건수는 다음 이벤트에 기록
+    """
+
+    def __init__(self, sample_rates: Dict[str, float], rate_limits: Dict[str, int]):
+        self.sample_rates = sample_rates
+        self.rate_limits = rate_limits
+        self._windows: Dict[str, List[float]] = {}
+
+    def _key(self, name: str) -> Optional[str]:
+        """설정 키 조회 ("src.services.ai_service" → "src.services" → "src" 순)"""
+        while name:
+            if name in self.rate_limits or name in self.sample_rates:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def allow(self, name: str, levelno: int) -> Optional[int]:
+        """통과 시 직전 구간에서 버려진 건수(없으면 0), 차단 시 None 반환"""
+        key = self._key(name or "")
+        if key is None:
+            return 0
+
+        rate = self.sample_rates.get(key)
+        if rate is not None and levelno <= logging.INFO and random.random() >= rate:
+            return None
+
+        limit = self.rate_limits.get(key)
+        if not limit:
+            return 0
+
+        now = time.monotonic()
+        window = self._windows.get(key)
+        dropped = 0
+        if window is None or now - window[0] >= 1.0:
+            dropped = int(window[2]) if window else 0
+            window = [now, 0, 0]
+            self._windows[key] = window
+        if window[1] >= limit:
+            window[2] += 1
+            return None
+        window[1] += 1
+        return dropped
+
+    def processor(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """structlog 프로세서"""
+        dropped = self.allow(event_dict.get("logger", ""), _LEVELS.get(method_name, logging.INFO))
+        if dropped is None:
+            raise structlog.DropEvent
+        if dropped:
+            event_dict["dropped_events"] = dropped
+        return event_dict
+
+
+class _StdlibLimitFilter(logging.Filter):
+    """표준 logging 레코드용 한도/잘라내기 필터 (서비스 모듈 로거)"""
+
+    def __init__(self, limiter: LogLimiter):
+        super().__init__()
+        self.limiter = limiter
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # structlog 로거의 레코드는 프로세서에서 이미 처리됨
+        if record.name in _structlog_loggers:
+            return True
+        if self.limiter.allow(record.name, record.levelno) is None:
+            return False
+        message = record.getMessage()
+        truncated = truncate(message)
+        if truncated is not message:
+            record.msg, record.args = truncated, None
+        return True
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 블로킹 대신 레코드를 버리는 QueueHandler"""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+def _truncate_values(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """structlog 프로세서: 큰 필드 값 잘라내기"""
+    for key, value in event_dict.items():
+        if isinstance(value, (str, bytes)):
+            event_dict[key] = truncate(value)
+    return event_dict
+
 
 def setup_logging() -> None:
-    """애플리케이션 로깅 설정"""
+    """
+    애플리케이션 로깅 설정
+
+    로그 레코드는 호출 스레드에서 큐에 넣기만 하고,
+    실제 stdout 출력은 QueueListener 스레드가 담당합니다 (이벤트 루프 블로킹 방지).
+    큐가 가득 차면 레코드를 버립니다.
+    """
+    global _listener
 
     # 로그 레벨 설정
     log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
 
-    # 기본 로깅 설정
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=log_level,
-    )
+    limiter = LogLimiter(settings.LOG_SAMPLE_RATES, settings.LOG_RATE_LIMITS)
+
+    # 비동기 출력: QueueHandler → (리스너 스레드) → StreamHandler
+    if _listener is None:
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        queue_handler = _DroppingQueueHandler(log_queue)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        _listener = logging.handlers.QueueListener(
+            log_queue, stream_handler, respect_handler_level=False
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+        root_logger = logging.getLogger()
+        for handler in list(root_logger.handlers):
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(queue_handler)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    for handler in root_logger.handlers:
+        handler.filters = [_StdlibLimitFilter(limiter)]
 
     # Structlog 설정
     structlog.configure(
         processors=[
             structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
+            limiter.processor,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
+            _truncate_values,
             structlog.processors.TimeStamper(fmt="ISO"),
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
@@ -42,8 +194,17 @@ def setup_logging() -> None:
     )
 
 
+def shutdown_logging() -> None:
+    """리스너 스레드 종료 및 남은 로그 출력"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     """구조화된 로거 인스턴스 반환"""
+    _structlog_loggers.add(name)
     return structlog.get_logger(name)
 
 
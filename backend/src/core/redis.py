@@ -0,0 +1,60 @@
+"""
+Redis 클라이언트 관리
+설정 기반 지연 생성 및 장애 시 일시 차단 (호출 측은 인메모리 경로로 대체)
+"""
+import logging
+import time
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_unavailable_until = 0.0
+
+
+def get_redis():
+    """
+    비동기 Redis 클라이언트 반환
+
+    REDIS_URL이 비어 있거나, redis 패키지가 없거나, 최근 장애로 차단된 동안에는
+    None을 반환하므로 호출 측은 인메모리 대체 경로를 사용해야 합니다.
+    """
+    global _client
+
+    if not settings.REDIS_URL or time.monotonic() < _unavailable_until:
+        return None
+
+    if _client is None:
+        try:
+            from redis.asyncio import Redis
+        except ImportError:
+            return None
+        timeout = settings.REDIS_SOCKET_TIMEOUT_MS / 1000
+        _client = Redis.from_url(
+            settings.REDIS_URL,
+            password=settings.REDIS_PASSWORD,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout,
+            health_check_interval=30,
+        )
+    return _client
+
+
+def mark_redis_unavailable(error: Exception) -> None:
+    """Redis 오류 기록 후 REDIS_RETRY_AFTER_SECONDS 동안 사용 중지"""
+    global _unavailable_until
+
+    if time.monotonic() >= _unavailable_until:
+        logger.warning(
+            f"Redis unavailable, using in-memory fallback for "
+            f"{settings.REDIS_RETRY_AFTER_SECONDS}s: {error}")
+    _unavailable_until = time.monotonic() + settings.REDIS_RETRY_AFTER_SECONDS
+
+
+async def close_redis() -> None:
+    """Redis 커넥션 풀 정리 (lifespan 종료 시 호출)"""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
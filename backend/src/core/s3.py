@@ -0,0 +1,169 @@
+"""
+S3 호환 객체 저장소 클라이언트
+Cloudflare R2 / MinIO / 로컬 대역 서버용 최소 클라이언트 (httpx + SigV4, 경로 방식 URL)
+
+- 객체 GET/PUT/HEAD와 multipart upload(생성/파트 업로드/완료/취소)만 지원합니다.
+- 본문이 bytes가 아니면(스트림) 서명에 UNSIGNED-PAYLOAD를 사용하고 호출 측이 길이를 지정합니다.
+"""
+import hashlib
+import hmac
+import re
+from datetime import datetime, timezone
+from typing import AsyncIterable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote, urlsplit
+import httpx
+from .config import settings
+
+Content = Union[bytes, AsyncIterable[bytes]]
+
+_UPLOAD_ID = re.compile(r"<UploadId>([^<]+)</UploadId>")
+
+
+class S3Client:
+    """S3 호환 객체 저장소 클라이언트"""
+
+    def __init__(self, endpoint: str, bucket: str, access_key: str, secret_key: str,
+                 region: str = "auto", timeout: float = 30.0):
+        parts = urlsplit(endpoint.rstrip("/"))
+        self.endpoint = endpoint.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.timeout = timeout
+        self._host = parts.netloc
+        self._base_path = parts.path
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP 클라이언트 (첫 사용 시 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    def _path(self, key: str) -> str:
+        return f"{self._base_path}/{self.bucket}/{quote(key, safe='/-_.~')}"
+
+    def _signed_headers(self, method: str, path: str, params: Dict[str, str], payload_hash: str) -> Dict[str, str]:
+        """AWS Signature Version 4 헤더"""
+        amz_date = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        date = amz_date[:8]
+        query = "&".join(
+            f"{quote(name, safe='-_.~')}={quote(value, safe='-_.~')}" for name, value in sorted(params.items())
+        )
+        signed_headers = "host;x-amz-content-sha256;x-amz-date"
+        canonical_request = "\n".join([
+            method, path, query,
+            f"host:{self._host}", f"x-amz-content-sha256:{payload_hash}", f"x-amz-date:{amz_date}", "",
+            signed_headers, payload_hash,
+        ])
+        scope = f"{date}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join([
+            "AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ])
+        key = ("AWS4" + self.secret_key).encode()
+        for part in (date, self.region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        return {
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": amz_date,
+            "Authorization": (
+                f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+                f"SignedHeaders={signed_headers}, Signature={signature}"
+            ),
+        }
+
+    async def request(self, method: str, key: str, params: Optional[Dict[str, str]] = None,
+                      content: Optional[Content] = None,
+                      headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """서명된 요청 (스트림 본문은 headers에 Content-Length 필요)"""
+        params = params or {}
+        path = self._path(key)
+        if content is None or isinstance(content, bytes):
+            payload_hash = hashlib.sha256(content or b"").hexdigest()
+        else:
+            payload_hash = "UNSIGNED-PAYLOAD"
+        request_headers = self._signed_headers(method, path, params, payload_hash)
+        request_headers.update(headers or {})
+        return await self.client.request(
+            method, f"{self.endpoint}/{self.bucket}/{quote(key, safe='/-_.~')}",
+            params=params or None, content=content, headers=request_headers,
+        )
+
+    # ------------------------------------------------------------------
+    # 객체
+    # ------------------------------------------------------------------
+
+    async def get_object(self, key: str) -> Optional[bytes]:
+        response = await self.request("GET", key)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.content
+
+    async def put_object(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        response = await self.request("PUT", key, content=data, headers={"Content-Type": content_type})
+        response.raise_for_status()
+
+    async def head_object(self, key: str) -> bool:
+        response = await self.request("HEAD", key)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    # ------------------------------------------------------------------
+    # multipart upload
+    # ------------------------------------------------------------------
+
+    async def create_multipart_upload(self, key: str, content_type: str) -> str:
+        """multipart upload 시작 (upload ID 반환)"""
+        response = await self.request("POST", key, params={"uploads": ""}, headers={"Content-Type": content_type})
+        response.raise_for_status()
+        match = _UPLOAD_ID.search(response.text)
+        if match is None:
+            raise RuntimeError("CreateMultipartUpload response has no UploadId")
+        return match.group(1)
+
+    async def upload_part(self, key: str, upload_id: str, part_number: int, content: Content, length: int) -> str:
+        """파트 업로드 (ETag 반환, 마지막 파트를 제외하면 5 MiB 이상이어야 함)"""
+        response = await self.request(
+            "PUT", key, params={"partNumber": str(part_number), "uploadId": upload_id},
+            content=content, headers={"Content-Length": str(length)},
+        )
+        response.raise_for_status()
+        return response.headers["ETag"]
+
+    async def complete_multipart_upload(self, key: str, upload_id: str, parts: List[Tuple[int, str]]) -> None:
+        body = "<CompleteMultipartUpload>" + "".join(
+            f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>" for number, etag in parts
+        ) + "</CompleteMultipartUpload>"
+        response = await self.request("POST", key, params={"uploadId": upload_id}, content=body.encode(),
+                                      headers={"Content-Type": "application/xml"})
+        response.raise_for_status()
+        # 처리 중 오류는 200 응답 본문에 담겨 올 수 있음
+        if "<Error>" in response.text:
+            raise RuntimeError(f"CompleteMultipartUpload failed: {response.text[:200]}")
+
+    async def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        response = await self.request("DELETE", key, params={"uploadId": upload_id})
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    async def aclose(self) -> None:
+        """HTTP 클라이언트 정리"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def s3_client_from_settings() -> S3Client:
+    """R2 설정으로 클라이언트 생성"""
+    endpoint = settings.R2_ENDPOINT_URL
+    if not endpoint and settings.R2_ACCOUNT_ID:
+        endpoint = f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
+    if not endpoint or not settings.R2_ACCESS_KEY or not settings.R2_SECRET_KEY:
+        raise RuntimeError("S3 storage requires R2_ENDPOINT_URL (or R2_ACCOUNT_ID) and R2 keys")
+    return S3Client(endpoint, settings.R2_BUCKET_NAME, settings.R2_ACCESS_KEY, settings.R2_SECRET_KEY)
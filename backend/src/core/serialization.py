@@ -0,0 +1,142 @@
+"""
+직렬화 유틸리티
+모델별 사전 컴파일 컬럼 추출기 및 orjson 기반 JSON 응답
+"""
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter, methodcaller
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import orjson
+from fastapi.responses import JSONResponse
+
+# ============================================================================
+# JSON 응답
+# ============================================================================
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """orjson이 기본 지원하지 않는 타입 처리"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "model_dump"):  # Pydantic 모델
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """JSON 직렬화 (datetime, UUID, Enum, dataclass 네이티브 지원)"""
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """orjson 기반 기본 응답 클래스"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# ============================================================================
+# 컬럼 추출기
+# ============================================================================
+
+class RowExtractor:
+    """
+    사전 컴파일된 행 추출기
+
+    `operator.attrgetter`로 모든 필드를 한 번에 읽고,
+    필요한 필드에만 변환 함수(Enum → value, datetime → ISO 문자열)를 적용합니다.
+    """
+
+    __slots__ = ("names", "_getter", "_converters")
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        converters: Optional[Dict[str, Callable[[Any], Any]]] = None
+    ):
+        self.names: Tuple[str, ...] = tuple(names)
+        getter = attrgetter(*self.names)
+        # 필드가 하나면 attrgetter가 튜플 대신 값을 반환하므로 감싸줌
+        self._getter = getter if len(self.names) > 1 else (lambda obj: (getter(obj),))
+        converters = converters or {}
+        self._converters = tuple(
+            (index, converters[name])
+            for index, name in enumerate(self.names)
+            if name in converters
+        )
+
+    def values(self, obj: Any) -> List[Any]:
+        """필드 값 목록"""
+        values = list(self._getter(obj))
+        for index, convert in self._converters:
+            value = values[index]
+            if value is not None:
+                values[index] = convert(value)
+        return values
+
+    def to_dict(self, obj: Any) -> Dict[str, Any]:
+        """단일 객체를 딕셔너리로 변환"""
+        return dict(zip(self.names, self.values(obj)))
+
+    def to_dicts(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        """객체 목록을 딕셔너리 목록으로 변환"""
+        names = self.names
+        return [dict(zip(names, self.values(obj))) for obj in objs]
+
+    def to_columnar(self, objs: Iterable[Any]) -> Dict[str, Any]:
+        """객체 목록을 열 이름 + 행 배열 형식으로 변환 (목록 응답용)"""
+        return {
+            "columns": list(self.names),
+            "rows": [self.values(obj) for obj in objs],
+        }
+
+
+_enum_value = attrgetter("value")
+_isoformat = methodcaller("isoformat")
+
+
+@lru_cache(maxsize=None)
+def _column_converters(model: type) -> Dict[str, Callable[[Any], Any]]:
+    """모델 컬럼 타입에 따른 JSON 변환 함수"""
+    from sqlalchemy import DateTime, Enum
+
+    converters: Dict[str, Callable[[Any], Any]] = {}
+    for column in model.__table__.columns:
+        if isinstance(column.type, Enum):
+            converters[column.key] = _enum_value
+        elif isinstance(column.type, DateTime):
+            converters[column.key] = _isoformat
+    return converters
+
+
+@lru_cache(maxsize=None)
+def get_extractor(
+    model: type,
+    fields: Optional[Tuple[str, ...]] = None,
+    json_ready: bool = False
+) -> RowExtractor:
+    """
+    모델 클래스별 추출기 반환 (프로세스 내 캐시)
+
+    - fields: 추출할 필드 (기본값: 모든 테이블 컬럼). 프로퍼티도 사용 가능
+    - json_ready: Enum/datetime을 JSON 기본 타입으로 변환 (orjson 외 인코더용)
+    """
+    names = fields or tuple(column.key for column in model.__table__.columns)
+    return RowExtractor(names, _column_converters(model) if json_ready else None)
+
+
+def rows_to_columnar(records: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """딕셔너리 목록을 열 이름 + 행 배열 형식으로 변환 (첫 행의 키 기준)"""
+    if not records:
+        return {"columns": [], "rows": []}
+
+    columns = list(records[0])
+    return {
+        "columns": columns,
+        "rows": [[record.get(column) for column in columns] for record in records],
+    }
@@ -0,0 +1,138 @@
+"""
+시작 시간 프로파일러
+모듈 임포트 비용 및 의존성 초기화 시간 측정
+
+Usage: python -m src.core.startup [--budget-ms 600] [--top 20] [--json]
+임포트 시간이 예산을 넘으면 종료 코드 1을 반환합니다 (pytest: tests/test_startup.py).
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from .config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class StartupTimer:
+    """의존성별 초기화 시간 기록 (lifespan 단계, 지연 생성 클라이언트 등)"""
+
+    def __init__(self):
+        self._records: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """초기화 시간 기록 (같은 이름은 처음 측정값 유지)"""
+        self._records.setdefault(name, seconds)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """블록 실행 시간 측정"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def report(self) -> Dict[str, float]:
+        """이름별 초기화 시간 (ms)"""
+        return {name: round(seconds * 1000, 2) for name, seconds in self._records.items()}
+
+
+# 전역 시작 시간 기록기
+startup_timer = StartupTimer()
+
+
+def profile_imports(module: str = "src.main") -> Dict[str, Any]:
+    """
+    새 인터프리터에서 `-X importtime`으로 모듈 임포트 비용 측정
+
+    Returns:
+        dict: total_ms, modules(모듈별 self/cumulative ms), packages(최상위 패키지별 self ms 합계)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}: {result.stderr[-2000:]}")
+
+    modules: List[Dict[str, Any]] = []
+    packages: Dict[str, float] = defaultdict(float)
+    total_ms = 0.0
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        entry = {
+            "module": name,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        }
+        modules.append(entry)
+        packages[name.split(".")[0]] += entry["self_ms"]
+        if name == module:
+            total_ms = entry["cumulative_ms"]
+
+    modules.sort(key=lambda entry: entry["cumulative_ms"], reverse=True)
+    return {
+        "module": module,
+        "total_ms": round(total_ms, 2),
+        "modules": modules,
+        "packages": dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)),
+    }
+
+
+def check_import_budget(
+    budget_ms: Optional[float] = None,
+    module: str = "src.main"
+) -> Dict[str, Any]:
+    """임포트 시간 예산 검사 (report["within_budget"]로 결과 확인)"""
+    budget_ms = budget_ms if budget_ms is not None else settings.STARTUP_IMPORT_BUDGET_MS
+    report = profile_imports(module)
+    report["budget_ms"] = budget_ms
+    report["within_budget"] = report["total_ms"] <= budget_ms
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="Startup import-time profiler")
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--budget-ms", type=float, default=settings.STARTUP_IMPORT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="JSON 형식으로 출력")
+    args = parser.parse_args(argv)
+
+    report = check_import_budget(args.budget_ms, args.module)
+
+    if args.json:
+        report["modules"] = report["modules"][:args.top]
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"📦 import {report['module']}: {report['total_ms']:.1f} ms "
+              f"(budget {report['budget_ms']:.0f} ms)")
+        print("\n🔝 Top modules (cumulative):")
+        for entry in report["modules"][:args.top]:
+            print(f"   {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+        print("\n📊 Packages (self time):")
+        for package, self_ms in list(report["packages"].items())[:args.top]:
+            print(f"   {self_ms:8.1f} ms  {package}")
+
+    if not report["within_budget"]:
+        print(f"\n❌ Import time {report['total_ms']:.1f} ms exceeds budget "
+              f"{report['budget_ms']:.0f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+Supabase 클라이언트 관리
+설정 기반 지연 생성 및 프로세스 내 재사용
+"""
+from typing import Dict, Tuple
+from .config import settings
+
+_clients: Dict[Tuple[str, str], object] = {}
+
+
+def get_supabase_client(service: bool = False, replica: bool = False):
+    """
+    Supabase 클라이언트 반환 (설정되지 않았으면 None)
+
+    - service: SUPABASE_SERVICE_KEY 사용 (관리 작업, 롤업 갱신 등)
+    - replica: SUPABASE_READ_REPLICA_URL이 설정되어 있으면 읽기 전용 복제본 사용
+    """
+    url = settings.SUPABASE_URL
+    if replica and settings.SUPABASE_READ_REPLICA_URL:
+        url = settings.SUPABASE_READ_REPLICA_URL
+    key = settings.SUPABASE_SERVICE_KEY if service else settings.SUPABASE_KEY
+
+    if not url or not key:
+        return None
+
+    client = _clients.get((url, key))
+    if client is None:
+        from supabase import create_client
+        client = create_client(url, key)
+        _clients[(url, key)] = client
+    return client
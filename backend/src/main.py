@@ -6,24 +6,86 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
-import uvicorn
+import sys
 
 from .core.config import settings
 from .core.logging import setup_logging
+from .core.serialization import ORJSONResponse
+from .core.startup import startup_timer
 from .api.routes import api_router
-
-# 로깅 설정
-setup_logging()
+from .middleware import (
+    CompressionMiddleware,
+    RateLimitMiddleware,
+    ResponseCacheMiddleware,
+    TopicDemandMiddleware,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """애플리케이션 생명주기 관리"""
+    """
+    애플리케이션 생명주기 관리
+
+    외부 클라이언트(Supabase, httpx, DB 엔진)는 임포트 시점이 아니라
+    첫 사용 시 생성되며, 여기서는 가벼운 초기화만 수행합니다.
+    """
     # 시작 시 실행
+    with startup_timer.measure("logging"):
+        setup_logging()
     print("🚀 AI University System Backend Starting...")
+
+    from .middleware.rate_limit import check_configuration
+    check_configuration()  # 토큰 검증 시크릿 없이 요청 제한/할당량을 켠 경우 (production은 시작 거부)
+
+    from .services.onboarding_service import outbox_service  # 가입 후속 작업 핸들러 등록
+    outbox_service.check_configuration()  # 서비스 키 없이 가입 이벤트를 발행하는 경우 (production은 시작 거부)
+
+    from .services.analytics_service import analytics_service
+    with startup_timer.measure("analytics_service"):
+        analytics_service.start()
+
+    from .services.usage_service import usage_ledger
+    usage_ledger.start()
+
+    from .services.warming_service import cache_warmer
+    cache_warmer.start(app)
+
+    outbox_service.start()
+
+    from .services.search_service import search_service
+    search_service.start()  # 인메모리 검색 백엔드일 때만 색인 구성
+
+    from .services.realtime_service import realtime_hub
+    realtime_hub.start()
     yield
     # 종료 시 실행
     print("🛑 AI University System Backend Shutting down...")
+    await realtime_hub.stop()  # 연결 종료 (클라이언트는 다른 워커로 재연결)
+    await analytics_service.stop()
+    await search_service.stop()
+    await cache_warmer.stop()
+    await outbox_service.stop()  # 발행 대기 이벤트 기록
+    await usage_ledger.stop()  # 남은 AI 사용량 반영
+
+    # 사용된 클라이언트/커넥션 풀만 정리 (미사용 모듈은 임포트하지 않음)
+    for module_name, attribute in (
+        ("services.ai_service", "ai_service"),
+        ("services.youtube_service", "youtube_service"),
+        ("services.session_service", "session_service"),
+        ("services.render_service", "render_service"),
+        ("services.content_store", "content_store"),
+        ("services.upload_service", "upload_service"),
+    ):
+        module = sys.modules.get(f"{__package__}.{module_name}")
+        if module is not None:
+            await getattr(module, attribute).aclose()
+
+    database_module = sys.modules.get(f"{__package__}.core.database")
+    if database_module is not None:
+        await database_module.database.dispose()
+
+    from .core.redis import close_redis
+    await close_redis()
 
 # FastAPI 앱 인스턴스 생성
 app = FastAPI(
@@ -31,10 +93,23 @@ app = FastAPI(
     description="AI 기반 대학 교육 시스템 백엔드 API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
 )
 
+# 요청 제한 미들웨어 (CORS 안쪽에 두어 429 응답에도 CORS 헤더가 붙도록 함)
+app.add_middleware(RateLimitMiddleware)
+
+# 응답 캐시 미들웨어 (캐시 적중 시 요청 제한/업스트림 호출 없이 응답)
+app.add_middleware(ResponseCacheMiddleware)
+
+# 주제 수요 집계 미들웨어 (응답 캐시 바깥에서 캐시 적중 요청까지 집계, 캐시 예열 대상 선정)
+app.add_middleware(TopicDemandMiddleware)
+
+# 응답 압축 미들웨어 (캐시의 사전 압축본은 Content-Encoding이 있으므로 다시 압축하지 않음)
+app.add_middleware(CompressionMiddleware)
+
 # CORS 미들웨어 설정
 app.add_middleware(
     CORSMiddleware,
@@ -71,6 +146,8 @@ async def health_check():
     return {"status": "healthy", "timestamp": "2024-12-19"}
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "src.main:app",
         host="0.0.0.0",
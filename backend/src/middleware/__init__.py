@@ -0,0 +1,17 @@
+"""
+ASGI 미들웨어 패키지
+요청 제한, 응답 캐시, 압축, 수요 집계 등 라우터 앞단에서 동작하는 미들웨어
+"""
+from .compression import CompressionMiddleware
+from .demand import TopicDemandMiddleware, topic_demand
+from .rate_limit import RateLimitMiddleware
+from .response_cache import ResponseCacheMiddleware, response_cache
+
+__all__ = [
+    "CompressionMiddleware",
+    "RateLimitMiddleware",
+    "ResponseCacheMiddleware",
+    "TopicDemandMiddleware",
+    "response_cache",
+    "topic_demand",
+]
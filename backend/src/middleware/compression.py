@@ -0,0 +1,200 @@
+"""
+응답 압축 미들웨어
+Accept-Encoding 협상(brotli/gzip), 크기 임계값, 스트리밍(SSE/청크) 압축
+
+- 단일 본문 응답: COMPRESSION_MIN_SIZE 이상이고 압축 가능한 Content-Type일 때만 압축
+- 스트리밍 응답: 청크마다 flush하여 SSE 이벤트가 지연 없이 전달되도록 압축
+- 이미 Content-Encoding이 있는 응답(응답 캐시의 사전 압축본 등)은 다시 압축하지 않음
+- brotli 패키지가 없으면 gzip만 사용
+"""
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성
+    brotli = None
+
+# 압축 효과가 있는 Content-Type (이미지/동영상/압축 파일 제외)
+_COMPRESSIBLE_TYPES = (
+    b"text/",
+    b"application/json",
+    b"application/javascript",
+    b"application/xml",
+    b"application/x-ndjson",
+    b"image/svg+xml",
+)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """서버 선호 순서의 지원 인코딩"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding(q 값 포함)에서 사용할 인코딩 선택 (없으면 None)"""
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, quality: Optional[int] = None) -> bytes:
+    """본문 전체 압축 (quality: brotli 0~11 / gzip 1~9, 기본값은 설정값)"""
+    if encoding == "br":
+        return brotli.compress(body, quality=quality if quality is not None else settings.COMPRESSION_BROTLI_QUALITY)
+    if encoding == "gzip":
+        level = quality if quality is not None else settings.COMPRESSION_GZIP_LEVEL
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip 헤더
+        return compressor.compress(body) + compressor.flush()
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def is_compressible(content_type: bytes) -> bool:
+    content_type = content_type.lower()
+    # SSE는 연결이 오래 유지되므로 연결마다 압축기 상태(수백 KB)를 두지 않음
+    return content_type.startswith(_COMPRESSIBLE_TYPES) and not content_type.startswith(b"text/event-stream")
+
+
+class StreamCompressor:
+    """청크 단위 압축기 (청크마다 flush하여 즉시 전송 가능한 바이트 반환)"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _with_encoding(headers: List[Tuple[bytes, bytes]], encoding: str, length: Optional[int]):
+    """Content-Encoding/Vary 추가, Content-Length 갱신 (스트리밍이면 제거)"""
+    result = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+    result.append((b"content-encoding", encoding.encode()))
+    if length is not None:
+        result.append((b"content-length", str(length).encode()))
+    return add_vary(result, b"Accept-Encoding")
+
+
+def add_vary(headers: List[Tuple[bytes, bytes]], value: bytes) -> List[Tuple[bytes, bytes]]:
+    """Vary 헤더에 값 추가 (중복 없이)"""
+    for index, (name, existing) in enumerate(headers):
+        if name.lower() == b"vary":
+            if value.lower() not in existing.lower():
+                headers[index] = (name, existing + b", " + value)
+            return headers
+    headers.append((b"vary", value))
+    return headers
+
+
+class CompressionMiddleware:
+    """brotli/gzip 응답 압축 ASGI 미들웨어"""
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Dict[str, Any] = {}
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal compressor, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = dict((name.lower(), value) for name, value in message.get("headers", ()))
+                if (
+                    b"content-encoding" in headers
+                    or not is_compressible(headers.get(b"content-type", b""))
+                    or message["status"] < 200
+                    or message["status"] in (204, 304)
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                # 첫 본문 메시지를 보고 단일 본문/스트리밍 여부 결정
+                start.update(message)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body:
+                    # 단일 본문: 임계값 미만이면 그대로 전송
+                    if len(body) < self.minimum_size:
+                        passthrough = True
+                        await send(start)
+                        await send(message)
+                        return
+                    compressed = compress(body, encoding)
+                    await send({**start, "headers": _with_encoding(
+                        list(start.get("headers", ())), encoding, len(compressed))})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                compressor = StreamCompressor(encoding)
+                await send({**start, "headers": _with_encoding(
+                    list(start.get("headers", ())), encoding, None)})
+
+            chunk = compressor.compress(body) if body else b""
+            if more_body:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": chunk + compressor.finish()})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,81 @@
+"""
+주제 수요 집계 미들웨어
+추천/검색 요청의 주제를 프로세스 메모리에서 집계 (캐시 예열 대상 선정용)
+
+응답 캐시 바깥에 두어 캐시 적중 요청도 집계하며, 요청당 비용은 딕셔너리 증가 1회입니다.
+집계 결과는 캐시 예열 서비스가 주기적으로 가져가 Redis에 합산합니다.
+"""
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+
+from ..core.config import settings
+
+# 예열 요청 표시 헤더 (수요로 집계하지 않음)
+WARMER_HEADER = b"x-cache-warmer"
+
+_RECOMMEND_PREFIX = "/api/v1/youtube/recommend/"
+_SEARCH_PATH = "/api/v1/search"
+_MAX_TOPIC_LENGTH = 100
+_MAX_KEYS = 10_000
+
+
+def normalize_topic(topic: str) -> Optional[str]:
+    topic = " ".join(topic.strip().lower().split())
+    if not topic or len(topic) > _MAX_TOPIC_LENGTH:
+        return None
+    return topic
+
+
+class TopicDemand:
+    """(주제, 기술 수준)별 요청 수"""
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+
+    def note(self, topic: str, skill_level: str = "beginner") -> None:
+        topic = normalize_topic(topic)
+        if topic is None:
+            return
+        if len(self._counts) >= _MAX_KEYS and (topic, skill_level) not in self._counts:
+            return
+        self._counts[(topic, skill_level)] += 1
+
+    def drain(self) -> Dict[Tuple[str, str], int]:
+        """집계 결과를 가져가고 초기화"""
+        counts, self._counts = self._counts, Counter()
+        return dict(counts)
+
+
+# 전역 수요 집계 인스턴스
+topic_demand = TopicDemand()
+
+
+class TopicDemandMiddleware:
+    """추천/검색 요청 주제 집계 ASGI 미들웨어"""
+
+    def __init__(self, app, demand: Optional[TopicDemand] = None):
+        self.app = app
+        self.demand = demand or topic_demand
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and settings.CACHE_WARM_ENABLED and scope["method"] == "GET":
+            self._observe(scope)
+        await self.app(scope, receive, send)
+
+    def _observe(self, scope) -> None:
+        path = scope["path"]
+        if not (path.startswith(_RECOMMEND_PREFIX) or path == _SEARCH_PATH):
+            return
+        if any(name == WARMER_HEADER for name, _ in scope.get("headers", ())):
+            return
+
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if path == _SEARCH_PATH:
+            topic = (query.get("q") or [""])[0]
+            skill_level = "beginner"
+        else:
+            topic = unquote(path[len(_RECOMMEND_PREFIX):])
+            skill_level = (query.get("skill_level") or ["beginner"])[0]
+        if skill_level in settings.CACHE_WARM_SKILL_LEVELS:
+            self.demand.note(topic, skill_level)
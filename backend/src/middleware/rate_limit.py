@@ -0,0 +1,325 @@
+"""
+요청 제한 미들웨어
+경로별/역할별 GCRA 요청 제한 (Redis 공유 카운터, 장애 시 프로세스별 인메모리 대체)
+
+- 식별: SUPABASE_JWT_SECRET으로 서명이 검증된 액세스 토큰이면 사용자 ID + 역할
+  (캐시된 users.role, 캐시에 없으면 app_metadata.role, 기본값 student), 그 외에는 클라이언트 IP(anonymous)
+- 역할 조회는 Supabase 왕복을 기다리지 않습니다. 캐시 미스는 토큰의 역할로 판단하고 백그라운드에서 채웁니다.
+- 시크릿 없이 요청 제한/할당량을 켜면 모든 사용자가 IP 단위 anonymous로 묶이므로
+  check_configuration()이 시작 시 거부(production)하거나 오류를 기록합니다.
+- 응답 헤더: RateLimit-Limit, RateLimit-Remaining, RateLimit-Reset, RateLimit-Policy
+  (초과 시 429 + Retry-After)
+- 보호 대상이 아닌 경로는 딕셔너리 조회 한 번으로 통과합니다.
+"""
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.redis import get_redis, mark_redis_unavailable
+from ..core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS = "anonymous"
+DEFAULT_ROLE = "student"  # UserRole.STUDENT
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """기간당 허용 횟수 (GCRA: 기간 내 최대 limit회 버스트 허용)"""
+    limit: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """ "10/minute", "100/hour", "20/10minute" 형식 파싱 """
+        match = _LIMIT_PATTERN.match(value)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        count, multiplier, unit = match.groups()
+        return cls(int(count), int(multiplier or 1) * _PERIODS[unit])
+
+    @property
+    def interval(self) -> float:
+        """요청 1회당 배출 간격 (초)"""
+        return self.period / self.limit
+
+    @property
+    def policy(self) -> str:
+        return f"{self.limit};w={int(self.period)}"
+
+
+@dataclass(frozen=True)
+class Decision:
+    """제한 판정 결과"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float  # 한도가 완전히 회복될 때까지 남은 시간 (초)
+    retry_after: float  # 거부 시 다음 요청 가능 시간 (초)
+
+    def headers(self, rate: RateLimit) -> List[Tuple[bytes, bytes]]:
+        headers = [
+            (b"ratelimit-limit", str(self.limit).encode()),
+            (b"ratelimit-remaining", str(self.remaining).encode()),
+            (b"ratelimit-reset", str(math.ceil(self.reset)).encode()),
+            (b"ratelimit-policy", rate.policy.encode()),
+        ]
+        if not self.allowed:
+            headers.append((b"retry-after", str(math.ceil(self.retry_after)).encode()))
+        return headers
+
+
+def _decision(rate: RateLimit, allowed: bool, used: float, retry_after: float) -> Decision:
+    """GCRA 상태(현재 시각 기준 TAT까지의 거리)로부터 남은 횟수 계산"""
+    remaining = max(0, int((rate.period - used) // rate.interval)) if allowed else 0
+    return Decision(allowed, rate.limit, remaining, max(0.0, used), retry_after)
+
+
+# ============================================================================
+# 카운터 저장소
+# ============================================================================
+
+class MemoryRateLimiter:
+    """프로세스별 GCRA 카운터 (단일 노드 또는 Redis 장애 시)"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self._tat: Dict[str, float] = {}
+        self._max_keys = max_keys
+
+    def hit(self, key: str, rate: RateLimit) -> Decision:
+        now = time.monotonic()
+        tat = max(self._tat.get(key, now), now)
+        new_tat = tat + rate.interval
+        allow_at = new_tat - rate.period
+
+        if now < allow_at:
+            return _decision(rate, False, tat - now, allow_at - now)
+
+        if len(self._tat) >= self._max_keys and key not in self._tat:
+            self._prune(now)
+        self._tat[key] = new_tat
+        return _decision(rate, True, new_tat - now, 0.0)
+
+    def _prune(self, now: float) -> None:
+        """한도가 완전히 회복된 키 정리 (그래도 가득 차면 전체 초기화)"""
+        self._tat = {key: tat for key, tat in self._tat.items() if tat > now}
+        if len(self._tat) >= self._max_keys:
+            self._tat.clear()
+
+    def reset(self) -> None:
+        self._tat.clear()
+
+
+# Redis 서버 시각 기준 GCRA (노드 간 시계 차이 무관, 왕복 1회)
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, tostring(tat - now), tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, tostring(new_tat - now), '0'}
+"""
+
+
+class RedisRateLimiter:
+    """Redis 공유 GCRA 카운터"""
+
+    def __init__(self, redis):
+        self._script = redis.register_script(_GCRA_SCRIPT)
+
+    async def hit(self, key: str, rate: RateLimit) -> Decision:
+        allowed, used, retry_after = await self._script(
+            keys=[key], args=[repr(rate.interval), repr(rate.period)]
+        )
+        return _decision(rate, bool(int(allowed)), float(used), float(retry_after))
+
+
+# ============================================================================
+# 식별
+# ============================================================================
+
+_claims_cache: Dict[str, Tuple[Optional[Dict[str, Any]], float]] = {}
+_CLAIMS_CACHE_SIZE = 10_000
+
+
+def verified_claims(token: str) -> Optional[Dict[str, Any]]:
+    """
+    SUPABASE_JWT_SECRET으로 액세스 토큰 서명 검증 (결과는 만료 시각까지 캐시)
+
+    시크릿이 설정되지 않았거나 검증에 실패하면 None을 반환합니다.
+    """
+    if not settings.SUPABASE_JWT_SECRET:
+        return None
+
+    now = time.time()
+    cached = _claims_cache.get(token)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    from jose import JWTError, jwt
+
+    try:
+        claims = jwt.decode(
+            token, settings.SUPABASE_JWT_SECRET, algorithms=["HS256"],
+            options={"verify_aud": False}
+        )
+        expires_at = float(claims.get("exp", now + 60))
+    except JWTError:
+        claims, expires_at = None, now + 60
+
+    if len(_claims_cache) >= _CLAIMS_CACHE_SIZE:
+        _claims_cache.clear()
+    _claims_cache[token] = (claims, expires_at)
+    return claims
+
+
+def _client_ip(scope: Dict[str, Any]) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def resolve_identity(scope: Dict[str, Any]) -> Tuple[str, str]:
+    """요청 식별자와 역할 (user:<id> 또는 ip:<주소>, 역할은 캐시된 프로필 기준, 업스트림 조회 없음)"""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                claims = verified_claims(token)
+                if claims and claims.get("sub"):
+                    from ..services.profile_service import profile_service
+                    token_role = (claims.get("app_metadata") or {}).get("role") or DEFAULT_ROLE
+                    # 제한 판단 중에는 프로필을 조회하지 않음 (캐시 미스는 백그라운드에서 채움)
+                    role = profile_service.cached_role(claims["sub"], token_role)
+                    return f"user:{claims['sub']}", role
+            break
+    return f"ip:{_client_ip(scope)}", ANONYMOUS
+
+
+def check_configuration() -> None:
+    """
+    사용자 식별 설정 점검 (lifespan 시작 시 호출)
+
+    SUPABASE_JWT_SECRET이 없으면 토큰을 검증할 수 없어 모든 요청이 IP 단위 anonymous로 제한됩니다
+    (같은 NAT 뒤의 사용자 전체가 한도 하나를 공유). production에서는 시작을 거부합니다.
+    """
+    quotas_enabled = any(settings.AI_ROLE_DAILY_TOKEN_QUOTAS.values())
+    if settings.SUPABASE_JWT_SECRET or not (settings.RATE_LIMIT_ENABLED or quotas_enabled):
+        return
+    message = ("SUPABASE_JWT_SECRET is not set: rate limits and AI token quotas will treat every "
+               "user as anonymous and key them by client IP")
+    if settings.ENVIRONMENT == "production":
+        raise RuntimeError(message + " (set the secret, or disable RATE_LIMIT_ENABLED and quotas)")
+    logger.error(message)
+
+
+# ============================================================================
+# 미들웨어
+# ============================================================================
+
+def load_policies(config: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, RateLimit]]:
+    """설정(RATE_LIMITS)을 경로 → 역할 → RateLimit으로 변환"""
+    return {
+        path.rstrip("/") or "/": {role: RateLimit.parse(value) for role, value in limits.items()}
+        for path, limits in config.items()
+    }
+
+
+class RateLimitMiddleware:
+    """
+    경로별/역할별 요청 제한 ASGI 미들웨어
+
+    정책에 없는 역할은 anonymous 제한을 사용하고, anonymous도 없으면 제한하지 않습니다.
+    """
+
+    def __init__(self, app, policies: Optional[Dict[str, Dict[str, str]]] = None):
+        self.app = app
+        self.policies = load_policies(settings.RATE_LIMITS if policies is None else policies)
+        self.memory = MemoryRateLimiter()
+        self._redis_limiter: Optional[RedisRateLimiter] = None
+        self._redis_client = None
+
+    def _limiter_for_redis(self) -> Optional[RedisRateLimiter]:
+        redis = get_redis()
+        if redis is None:
+            return None
+        if redis is not self._redis_client:
+            self._redis_client = redis
+            self._redis_limiter = RedisRateLimiter(redis)
+        return self._redis_limiter
+
+    async def check(self, path: str, scope: Dict[str, Any]) -> Optional[Tuple[Decision, RateLimit]]:
+        """제한 판정 (보호 대상이 아니면 None)"""
+        limits = self.policies.get(path)
+        if limits is None:
+            return None
+
+        identity, role = await resolve_identity(scope)
+        rate = limits.get(role) or limits.get(ANONYMOUS)
+        if rate is None:
+            return None
+
+        key = f"ratelimit:{path}:{identity}"
+        limiter = self._limiter_for_redis()
+        if limiter is not None:
+            try:
+                return await limiter.hit(key, rate), rate
+            except Exception as e:  # 연결 실패, 타임아웃 등 → 인메모리 대체
+                mark_redis_unavailable(e)
+        return self.memory.hit(key, rate), rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.check(scope["path"].rstrip("/") or "/", scope)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision, rate = result
+        headers = decision.headers(rate)
+
+        if not decision.allowed:
+            logger.info(f"Rate limit exceeded: {scope['path']} (policy {rate.policy})")
+            body = dumps({
+                "detail": "요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.",
+                "retry_after": math.ceil(decision.retry_after),
+            })
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    *headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), *headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,443 @@
+"""
+응답 캐시 미들웨어
+경로 정책별 GET 응답 캐시, 강한 ETag 및 조건부 요청(If-None-Match → 304)
+
+- 정책(RESPONSE_CACHE_POLICIES): 경로 템플릿 → ttl(초), vary(none/role/user), tags
+  - vary=none: 공개 콘텐츠 (Cache-Control: public, s-maxage로 CDN 캐시 허용)
+  - vary=role/user: 역할/사용자별로 분리 저장 (Cache-Control: private, no-cache + Vary: Authorization)
+- 저장소: Redis(워커 간 공유) 또는 프로세스별 LRU (Redis 장애 시 대체)
+- 무효화: 태그 세대 번호 증가 방식 (`await response_cache.invalidate("youtube")`)
+  - 저장된 항목의 태그 세대가 현재 세대와 다르면 만료로 간주합니다.
+"""
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+import orjson
+
+from ..core.config import settings
+from ..core.redis import get_redis, mark_redis_unavailable
+from .compression import add_vary, compress, is_compressible, negotiate_encoding, supported_encodings
+from .rate_limit import resolve_identity
+
+logger = logging.getLogger(__name__)
+
+# 캐시된 응답에 그대로 저장하지 않는 헤더 (요청마다 달라지거나 미들웨어가 다시 계산)
+_SKIP_HEADERS = {b"content-length", b"date", b"server", b"etag", b"cache-control", b"age", b"x-cache"}
+
+
+def make_etag(body: bytes) -> str:
+    """본문 해시 기반 강한 ETag"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 비교 (약한 비교, RFC 9110 13.1.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+@dataclass
+class CachePolicy:
+    """경로별 캐시 정책"""
+    template: str
+    pattern: Pattern[str]
+    ttl: int
+    vary: str = "none"  # none, role, user
+    tags: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, template: str, config: Dict[str, Any]) -> "CachePolicy":
+        vary = config.get("vary", "none")
+        if vary not in ("none", "role", "user"):
+            raise ValueError(f"Invalid cache vary for {template}: {vary!r}")
+        regex = re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(template.rstrip("/") or "/"))
+        return cls(
+            template=template,
+            pattern=re.compile(f"^{regex}/?$"),
+            ttl=int(config.get("ttl", 60)),
+            vary=vary,
+            tags=tuple(config.get("tags", ())),
+        )
+
+    @property
+    def is_public(self) -> bool:
+        return self.vary == "none"
+
+    def cache_control(self) -> bytes:
+        if self.is_public:
+            # 브라우저는 짧게, CDN은 정책 TTL만큼 캐시 (만료 후에도 ETag로 재검증)
+            return f"public, max-age={min(self.ttl, 60)}, s-maxage={self.ttl}".encode()
+        return b"private, no-cache"
+
+
+@dataclass
+class CachedResponse:
+    """캐시된 응답"""
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+    created_at: float
+    expires_at: float
+    generations: Tuple[int, ...] = ()
+    variants: Dict[str, bytes] = field(default_factory=dict)  # 인코딩 → 사전 압축 본문
+
+    def representation(self, encoding: Optional[str]) -> Tuple[Optional[str], bytes, str]:
+        """협상된 인코딩의 (인코딩, 본문, ETag) - 사전 압축본이 없으면 원본"""
+        if encoding and encoding in self.variants:
+            # 강한 ETag는 콘텐츠 코딩마다 달라야 함
+            return encoding, self.variants[encoding], f'{self.etag[:-1]}-{encoding}"'
+        return None, self.body, self.etag
+
+    def etags(self) -> List[str]:
+        return [self.etag, *(f'{self.etag[:-1]}-{encoding}"' for encoding in self.variants)]
+
+    def pack(self) -> bytes:
+        """Redis 저장 형식 (메타 JSON + 개행 + 원본 본문 + 사전 압축본들)"""
+        meta = {
+            "status": self.status,
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in self.headers],
+            "etag": self.etag,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "generations": self.generations,
+            "variants": [[encoding, len(data)] for encoding, data in self.variants.items()],
+        }
+        return orjson.dumps(meta) + b"\n" + self.body + b"".join(self.variants.values())
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CachedResponse":
+        meta, _, payload = data.partition(b"\n")
+        meta = orjson.loads(meta)
+        variants: Dict[str, bytes] = {}
+        end = len(payload)
+        for encoding, size in reversed(meta.get("variants", ())):
+            variants[encoding] = payload[end - size:end]
+            end -= size
+        return cls(
+            status=meta["status"],
+            headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in meta["headers"]],
+            body=payload[:end],
+            variants=dict(reversed(list(variants.items()))),
+            etag=meta["etag"],
+            created_at=meta["created_at"],
+            expires_at=meta["expires_at"],
+            generations=tuple(meta["generations"]),
+        )
+
+
+# ============================================================================
+# 저장소
+# ============================================================================
+
+class ResponseCache:
+    """응답 캐시 저장소 (Redis 우선, 프로세스별 LRU 대체)"""
+
+    _PREFIX = "respcache:"
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._max_entries = max_entries or settings.RESPONSE_CACHE_MAX_ENTRIES
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "not_modified": 0}
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._PREFIX}tag:{tag}"
+
+    async def lookup(
+        self,
+        key: str,
+        tags: Tuple[str, ...]
+    ) -> Tuple[Optional[CachedResponse], Tuple[int, ...]]:
+        """
+        캐시 항목과 태그별 현재 세대 번호를 함께 조회 (Redis 왕복 1회)
+
+        만료되었거나 저장 시점의 태그 세대가 현재와 다르면 항목은 None입니다.
+        """
+        redis = get_redis()
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.get(self._PREFIX + key)
+                    if tags:
+                        pipe.mget([self._tag_key(tag) for tag in tags])
+                    results = await pipe.execute()
+                current = tuple(int(value or 0) for value in results[1]) if tags else ()
+                if results[0] is None:
+                    return None, current
+                entry = CachedResponse.unpack(results[0])
+                return (entry if entry.generations == current else None), current
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        current = self._local_generations(tags)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, current
+        if entry.expires_at <= time.time() or entry.generations != current:
+            del self._entries[key]
+            return None, current
+        self._entries.move_to_end(key)
+        return entry, current
+
+    def _local_generations(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    async def set(self, key: str, entry: CachedResponse, ttl: int) -> None:
+        """캐시 항목 저장"""
+        self.stats["stores"] += 1
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.set(self._PREFIX + key, entry.pack(), ex=ttl)
+                return
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, *tags: str) -> None:
+        """태그가 붙은 모든 캐시 항목 무효화 (코스/카탈로그 변경 시 호출)"""
+        self._bump_local(tags)
+        await self._bump_redis(tags)
+
+    def invalidate_nowait(self, *tags: str) -> None:
+        """동기 코드용 무효화 (로컬 세대는 즉시 증가, Redis 반영은 이벤트 루프에 예약)"""
+        self._bump_local(tags)
+        try:
+            asyncio.get_running_loop().create_task(self._bump_redis(tags))
+        except RuntimeError:  # 이벤트 루프 밖 (CLI, 스크립트)
+            pass
+
+    def _bump_local(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    async def _bump_redis(self, tags: Tuple[str, ...]) -> None:
+        redis = get_redis()
+        if redis is not None and tags:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for tag in tags:
+                        pipe.incr(self._tag_key(tag))
+                    await pipe.execute()
+            except Exception as e:
+                mark_redis_unavailable(e)
+        logger.info(f"Response cache invalidated: {', '.join(tags)}")
+
+    def clear(self) -> None:
+        """프로세스 내 캐시 초기화"""
+        self._entries.clear()
+
+
+# 전역 응답 캐시 인스턴스
+response_cache = ResponseCache()
+
+
+# ============================================================================
+# 미들웨어
+# ============================================================================
+
+def load_cache_policies(config: Dict[str, Dict[str, Any]]) -> List[CachePolicy]:
+    """설정(RESPONSE_CACHE_POLICIES)을 정책 목록으로 변환"""
+    return [CachePolicy.from_config(template, policy) for template, policy in config.items()]
+
+
+def _precompress(body: bytes, content_type: bytes) -> Dict[str, bytes]:
+    """
+    저장 시 한 번만 압축 (캐시 적중마다 다시 압축하지 않도록)
+
+    저장 빈도가 낮으므로 실시간 압축보다 높은 품질을 사용합니다.
+    """
+    if (
+        not settings.COMPRESSION_ENABLED
+        or len(body) < settings.COMPRESSION_MIN_SIZE
+        or not is_compressible(content_type)
+    ):
+        return {}
+    return {
+        encoding: compress(body, encoding, settings.COMPRESSION_CACHED_BROTLI_QUALITY if encoding == "br" else 9)
+        for encoding in supported_encodings()
+    }
+
+
+def _header(scope: Dict[str, Any], name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ResponseCacheMiddleware:
+    """
+    GET 응답 캐시 ASGI 미들웨어
+
+    정책에 맞는 200 응답을 저장하고 ETag/Cache-Control을 붙입니다.
+    Set-Cookie 또는 Cache-Control: no-store가 있는 응답과 최대 크기를 넘는 본문은 저장하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        app,
+        policies: Optional[Dict[str, Dict[str, Any]]] = None,
+        cache: Optional[ResponseCache] = None
+    ):
+        self.app = app
+        self.policies = load_cache_policies(
+            settings.RESPONSE_CACHE_POLICIES if policies is None else policies
+        )
+        self.cache = cache or response_cache
+
+    def match(self, path: str) -> Optional[CachePolicy]:
+        for policy in self.policies:
+            if policy.pattern.match(path):
+                return policy
+        return None
+
+    async def cache_key(self, scope: Dict[str, Any], policy: CachePolicy) -> str:
+        """경로 + 정렬된 쿼리 + (역할/사용자) 기반 키"""
+        query = "&".join(sorted(scope.get("query_string", b"").decode("latin-1").split("&")))
+        vary = ""
+        if policy.vary != "none":
+            identity, role = await resolve_identity(scope)
+            vary = role if policy.vary == "role" else identity
+        raw = f"{scope['path']}?{query}|{vary}"
+        return hashlib.blake2b(raw.encode(), digest_size=20).hexdigest()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not settings.RESPONSE_CACHE_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.match(scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = await self.cache_key(scope, policy)
+        entry, generations = await self.cache.lookup(key, policy.tags)
+        if entry is not None:
+            self.cache.stats["hits"] += 1
+            await self._send_entry(scope, send, entry, policy, b"HIT")
+            return
+
+        self.cache.stats["misses"] += 1
+        await self._forward_and_store(scope, receive, send, policy, key, generations)
+
+    def _response_headers(
+        self,
+        entry: CachedResponse,
+        policy: CachePolicy,
+        status: bytes,
+        etag: str
+    ) -> List[Tuple[bytes, bytes]]:
+        headers = [
+            *entry.headers,
+            (b"etag", etag.encode()),
+            (b"cache-control", policy.cache_control()),
+            (b"x-cache", status),
+        ]
+        if not policy.is_public:
+            add_vary(headers, b"Authorization")
+        if entry.variants:
+            add_vary(headers, b"Accept-Encoding")
+        if status == b"HIT":
+            headers.append((b"age", str(max(0, int(time.time() - entry.created_at))).encode()))
+        return headers
+
+    async def _send_entry(self, scope, send, entry: CachedResponse, policy: CachePolicy, status: bytes):
+        """캐시 항목 전송 (If-None-Match 일치 시 304, 사전 압축본이 있으면 그대로 전송)"""
+        encoding, body, etag = entry.representation(
+            negotiate_encoding(_header(scope, b"accept-encoding")) if entry.variants else None
+        )
+        headers = self._response_headers(entry, policy, status, etag)
+        if_none_match = _header(scope, b"if-none-match")
+        if if_none_match and any(etag_matches(if_none_match, candidate) for candidate in entry.etags()):
+            self.cache.stats["not_modified"] += 1
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(name, value) for name, value in headers if name != b"content-type"],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if encoding is not None:
+            headers.append((b"content-encoding", encoding.encode()))
+        await send({
+            "type": "http.response.start",
+            "status": entry.status,
+            "headers": [*headers, (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _forward_and_store(self, scope, receive, send, policy, key, generations):
+        """응답을 버퍼링하여 저장 후 전송 (저장 불가 응답은 그대로 전달)"""
+        max_bytes = settings.RESPONSE_CACHE_MAX_BODY_BYTES
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+        size = 0
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal size, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start.update(message)
+                headers = dict(message.get("headers", ()))
+                cacheable = (
+                    message["status"] == 200
+                    and b"set-cookie" not in headers
+                    and b"no-store" not in headers.get(b"cache-control", b"")
+                )
+                if not cacheable:
+                    passthrough = True
+                    await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > max_bytes:
+                # 너무 큰 응답은 저장하지 않고 그대로 흘려보냄
+                passthrough = True
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+                if not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            now = time.time()
+            entry = CachedResponse(
+                status=start["status"],
+                headers=[(name, value) for name, value in start.get("headers", ())
+                         if name.lower() not in _SKIP_HEADERS],
+                body=body,
+                etag=make_etag(body),
+                created_at=now,
+                expires_at=now + policy.ttl,
+                generations=generations,
+                variants=_precompress(body, dict(start.get("headers", ())).get(b"content-type", b"")),
+            )
+            await self.cache.set(key, entry, policy.ttl)
+            await self._send_entry(scope, send, entry, policy, b"MISS")
+
+        await self.app(scope, receive, send_wrapper)
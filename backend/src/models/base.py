@@ -8,6 +8,7 @@ from sqlalchemy.sql import func
 from datetime import datetime
 from typing import Optional
 import uuid
+from ..core.serialization import get_extractor
 
 Base = declarative_base()
 
@@ -30,8 +31,8 @@ class BaseModel(Base, UUIDMixin, TimestampMixin):
     __abstract__ = True
 
     def to_dict(self) -> dict:
-        """모델을 딕셔너리로 변환"""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        """모델을 딕셔너리로 변환 (모델별 사전 컴파일 추출기 사용)"""
+        return get_extractor(type(self)).to_dict(self)
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}({self.id})>"
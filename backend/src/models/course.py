@@ -5,6 +5,7 @@
 from sqlalchemy import Column, String, Boolean, Text, JSON, Enum, Integer, DateTime, ForeignKey, Float
 from sqlalchemy.orm import relationship
 from .base import BaseModel
+from ..core.serialization import get_extractor
 from .user import SkillLevel
 import enum
 
@@ -86,21 +87,31 @@ class Course(BaseModel):
 
     def to_summary_dict(self) -> dict:
         """요약 정보 딕셔너리"""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "slug": self.slug,
-            "short_description": self.short_description,
-            "thumbnail_url": self.thumbnail_url,
-            "difficulty_level": self.difficulty_level.value if self.difficulty_level else None,
-            "estimated_duration_hours": self.estimated_duration_hours,
-            "rating": self.rating,
-            "enrolled_count": self.enrolled_count,
-            "is_free": self.is_free,
-            "price": self.price,
-            "tags": self.tags,
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
+        return _course_summary.to_dict(self)
+
+    @classmethod
+    def to_summary_list(cls, courses, columnar: bool = False):
+        """코스 목록 요약 (columnar=True면 열 이름 + 행 배열 형식)"""
+        if columnar:
+            return _course_summary.to_columnar(courses)
+        return _course_summary.to_dicts(courses)
+
+
+_course_summary = get_extractor(Course, (
+    "id",
+    "title",
+    "slug",
+    "short_description",
+    "thumbnail_url",
+    "difficulty_level",
+    "estimated_duration_hours",
+    "rating",
+    "enrolled_count",
+    "is_free",
+    "price",
+    "tags",
+    "created_at",
+), json_ready=True)
 
 
 class Module(BaseModel):
@@ -133,7 +144,9 @@ class Lesson(BaseModel):
 
     # 기본 정보
     title = Column(String(200), nullable=False)
-    content = Column(Text, nullable=True)  # 마크다운 형식
+    content = Column(Text, nullable=True)  # 마크다운 형식 (콘텐츠 저장소로 이전되면 NULL)
+    content_hash = Column(String(64), nullable=True)  # 콘텐츠 저장소 키 (sha256 hex)
+    content_preview = Column(String(200), nullable=True)  # 검색 스니펫
     order_index = Column(Integer, default=0)
 
     # 연결 정보
@@ -5,6 +5,7 @@
 from sqlalchemy import Column, String, Boolean, Text, JSON, Enum, Integer, DateTime
 from sqlalchemy.orm import relationship
 from .base import BaseModel
+from ..core.serialization import get_extractor
 import enum
 
 
@@ -106,15 +107,25 @@ class User(BaseModel):
 
     def to_public_dict(self) -> dict:
         """공개 정보만 포함한 딕셔너리"""
-        return {
-            "id": self.id,
-            "username": self.username,
-            "display_name": self.display_name,
-            "bio": self.bio,
-            "avatar_url": self.avatar_url,
-            "role": self.role.value if self.role else None,
-            "current_skill_level": self.current_skill_level.value if self.current_skill_level else None,
-            "total_study_hours": self.total_study_hours,
-            "courses_completed": self.courses_completed,
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
+        return _user_public.to_dict(self)
+
+    @classmethod
+    def to_public_list(cls, users, columnar: bool = False):
+        """사용자 목록 공개 정보 (columnar=True면 열 이름 + 행 배열 형식)"""
+        if columnar:
+            return _user_public.to_columnar(users)
+        return _user_public.to_dicts(users)
+
+
+_user_public = get_extractor(User, (
+    "id",
+    "username",
+    "display_name",
+    "bio",
+    "avatar_url",
+    "role",
+    "current_skill_level",
+    "total_study_hours",
+    "courses_completed",
+    "created_at",
+), json_ready=True)
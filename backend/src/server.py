@@ -0,0 +1,120 @@
+"""
+프로덕션 서버 실행기
+Gunicorn 멀티 워커 + Uvicorn 워커 (프리로드, 워커 재시작, 그레이스풀 드레인)
+
+Usage: python -m src.server [--workers N] [--bind 0.0.0.0:8000]
+
+- 워커 수: WEB_CONCURRENCY 또는 사용 가능한 CPU 코어 수
+- 프리로드: 마스터에서 앱을 한 번 임포트한 뒤 fork (읽기 전용 메모리 공유).
+  외부 클라이언트는 첫 사용 시 생성되므로 fork 이전에 소켓이 열리지 않습니다.
+- 워커 재시작: SERVER_MAX_REQUESTS + 0~SERVER_MAX_REQUESTS_JITTER 요청 후 교체 (메모리 누수 억제)
+- 드레인: SIGTERM 수신 시 새 연결을 받지 않고, 진행 중인 요청(LLM 스트림 포함)을
+  SERVER_DRAIN_TIMEOUT_SECONDS까지 기다린 뒤 종료
+"""
+import argparse
+import os
+from typing import Any, Dict, Optional
+from gunicorn.app.base import BaseApplication
+
+from .core.config import settings
+
+try:
+    from uvicorn_worker import UvicornWorker
+except ImportError:  # uvicorn-worker 패키지가 없으면 uvicorn 내장 워커 사용
+    from uvicorn.workers import UvicornWorker
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    """진행 중인 요청을 드레인 기한까지 기다리는 Uvicorn 워커"""
+
+    CONFIG_KWARGS = {
+        "loop": "auto",
+        "http": "auto",
+        "lifespan": "on",
+        "timeout_graceful_shutdown": settings.SERVER_DRAIN_TIMEOUT_SECONDS,
+        # 유휴 WebSocket 연결 비용: permessage-deflate는 연결마다 압축 상태를 유지하므로 끄고,
+        # 프로토콜 ping 대신 실시간 허브의 하트비트/유휴 정리를 사용
+        "ws_per_message_deflate": settings.REALTIME_WS_COMPRESSION,
+        "ws_ping_interval": None,
+    }
+
+
+def available_cpus() -> int:
+    """컨테이너 CPU 제한(cgroup v2)과 CPU affinity를 고려한 코어 수"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="utf-8") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """워커 수 (WEB_CONCURRENCY 우선, 비동기 워커이므로 기본값은 코어당 1개)"""
+    return settings.WEB_CONCURRENCY or available_cpus()
+
+
+def gunicorn_options(
+    workers: Optional[int] = None,
+    bind: Optional[str] = None
+) -> Dict[str, Any]:
+    """Settings 기반 Gunicorn 설정"""
+    return {
+        "bind": bind or f"{settings.HOST}:{settings.PORT}",
+        "workers": workers or worker_count(),
+        "worker_class": DrainingUvicornWorker,
+        "preload_app": settings.SERVER_PRELOAD_APP,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        # Gunicorn의 강제 종료 기한은 Uvicorn 드레인 기한보다 길어야 함
+        "graceful_timeout": settings.SERVER_DRAIN_TIMEOUT_SECONDS + 5,
+        "timeout": settings.SERVER_WORKER_TIMEOUT_SECONDS,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "loglevel": settings.LOG_LEVEL.lower(),
+        "accesslog": None,
+        "errorlog": "-",
+        "proc_name": "ai-university-backend",
+    }
+
+
+class ProductionServer(BaseApplication):
+    """Gunicorn 애플리케이션 래퍼"""
+
+    def __init__(self, options: Dict[str, Any]):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from .main import app
+        return app
+
+
+def main(argv=None) -> None:
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="AI University System production server")
+    parser.add_argument("--workers", type=int, default=None, help="워커 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--bind", default=None, help="바인드 주소 (기본값: HOST:PORT)")
+    args = parser.parse_args(argv)
+
+    options = gunicorn_options(workers=args.workers, bind=args.bind)
+    print(f"🚀 Starting {options['workers']} workers on {options['bind']} "
+          f"(preload={options['preload_app']}, max_requests={options['max_requests']}"
+          f"±{options['max_requests_jitter']}, drain={settings.SERVER_DRAIN_TIMEOUT_SECONDS}s)")
+    ProductionServer(options).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,52 @@
 """
 서비스 패키지
 비즈니스 로직 및 외부 API 연동 서비스
+
+서비스 모듈은 첫 접근 시 임포트됩니다 (시작 시간 단축).
 """
-from .ai_service import DeepseekAIService, ai_service
-from .youtube_service import YouTubeService, youtube_service
-
-__all__ = [
-    "DeepseekAIService",
-    "ai_service",
-    "YouTubeService",
-    "youtube_service",
-]
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "DeepseekAIService": ".ai_service",
+    "ai_service": ".ai_service",
+    "YouTubeService": ".youtube_service",
+    "youtube_service": ".youtube_service",
+    "SearchService": ".search_service",
+    "InMemorySearchIndex": ".search_service",
+    "search_service": ".search_service",
+    "AnalyticsService": ".analytics_service",
+    "analytics_service": ".analytics_service",
+    "ModelRouter": ".model_router",
+    "model_router": ".model_router",
+    "UsageLedger": ".usage_service",
+    "usage_ledger": ".usage_service",
+    "SessionService": ".session_service",
+    "session_service": ".session_service",
+    "ProfileService": ".profile_service",
+    "profile_service": ".profile_service",
+    "OutboxService": ".outbox_service",
+    "outbox_service": ".outbox_service",
+    "CacheWarmer": ".warming_service",
+    "cache_warmer": ".warming_service",
+    "ContentStore": ".content_store",
+    "content_store": ".content_store",
+    "RenderService": ".render_service",
+    "render_service": ".render_service",
+    "UploadService": ".upload_service",
+    "upload_service": ".upload_service",
+    "RealtimeHub": ".realtime_service",
+    "realtime_hub": ".realtime_service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """지연 임포트 (PEP 562)"""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -4,81 +4,179 @@ Deepseek API 연동 및 AI 기반 기능 제공
 """
 import httpx
 import json
-from typing import Optional, List, Dict, Any
+import time
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Tuple
+from ..core.cache import ResultCache
 from ..core.config import settings
+from ..core.logging import truncate
+from ..core.startup import startup_timer
+from .model_router import ModelEndpoint, model_router
+from .usage_service import usage_ledger
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 마지막 응답을 처리한 엔드포인트 (품질 통계 기록용)
+_served_by: ContextVar[Optional[str]] = ContextVar("ai_served_by", default=None)
+
+# 코스 개요 결과 캐시 (캐시 예열 서비스가 인기 주제를 미리 채움)
+outline_cache = ResultCache("course_outline", settings.AI_OUTLINE_CACHE_TTL_SECONDS)
+
 
 class DeepseekAIService:
     """Deepseek AI API 서비스"""
 
     def __init__(self):
-        self.api_key = settings.DEEPSEEK_API_KEY
-        self.base_url = settings.DEEPSEEK_BASE_URL
-        self.model = settings.DEEPSEEK_MODEL
-        self.client = httpx.AsyncClient()
+        self._client: Optional[httpx.AsyncClient] = None
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        # 공유 클라이언트는 요청마다 닫지 않고 lifespan 종료 시 aclose()로 정리
+        return None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP 클라이언트 (첫 사용 시 생성, 커넥션 풀 공유)"""
+        if self._client is None or self._client.is_closed:
+            with startup_timer.measure("ai_service.client"):
+                self._client = httpx.AsyncClient()
+        return self._client
+
+    async def aclose(self) -> None:
+        """HTTP 클라이언트 정리"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def generate_chat_completion(
         self,
         messages: List[Dict[str, str]],
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        task: str = "default",
         **kwargs
     ) -> Optional[str]:
-        """채팅 완성 생성"""
-        if not self.api_key:
-            logger.warning("Deepseek API key not configured")
+        """
+        채팅 완성 생성
+
+        task(작업 유형)에 따라 모델 라우터가 엔드포인트 후보를 정하고,
+        레인이 가득 찼거나 업스트림이 포화(429/5xx/타임아웃)이면 다음 후보로 넘어갑니다.
+        """
+        context = usage_ledger.context
+        plan = model_router.plan(task, messages, max_tokens, context.endpoint if context else None)
+        if not plan:
+            logger.warning(f"No AI model endpoint available for task: {task}")
             return None
 
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                **kwargs
-            }
+        for index, endpoint in enumerate(plan):
+            is_last = index == len(plan) - 1
+            if not await endpoint.acquire(None if is_last else model_router.fallback_wait_seconds()):
+                logger.info(f"AI lane saturated, falling back: {endpoint.name} ({task})")
+                continue
+
+            try:
+                if index > 0:
+                    endpoint.stats.fallbacks += 1
+                content, retryable = await self._call_endpoint(
+                    endpoint, messages, max_tokens, temperature, **kwargs)
+            finally:
+                endpoint.release()
+
+            if content is not None:
+                _served_by.set(endpoint.name)
+                return content
+            if not retryable:
+                return None
+
+        return None
 
+    async def _call_endpoint(
+        self,
+        endpoint: ModelEndpoint,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        **kwargs
+    ) -> Tuple[Optional[str], bool]:
+        """엔드포인트 1회 호출 (응답 내용, 다른 후보로 재시도 가능 여부)"""
+        headers = {
+            "Authorization": f"Bearer {endpoint.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": endpoint.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            **kwargs
+        }
+
+        started = time.perf_counter()
+        try:
             response = await self.client.post(
-                f"{self.base_url}/chat/completions",
+                f"{endpoint.base_url}/chat/completions",
                 headers=headers,
                 json=payload,
-                timeout=30.0
+                timeout=endpoint.timeout_seconds
             )
-
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            else:
-                logger.error(
-                    f"Deepseek API error: {response.status_code} - {response.text}")
-                return None
-
+        except httpx.TimeoutException:
+            endpoint.stats.errors += 1
+            logger.error(f"Deepseek API timeout: {endpoint.name} ({endpoint.timeout_seconds}s)")
+            return None, True
         except Exception as e:
+            endpoint.stats.errors += 1
+            endpoint.cool_down(settings.AI_ROUTER_COOLDOWN_SECONDS)
             logger.error(f"Error generating chat completion: {str(e)}")
+            return None, True
+
+        endpoint.stats.observe((time.perf_counter() - started) * 1000)
+
+        if response.status_code == 200:
+            try:
+                result = response.json()
+                content = result["choices"][0]["message"]["content"]
+            except (ValueError, KeyError, IndexError) as e:
+                endpoint.stats.errors += 1
+                logger.error(f"Invalid Deepseek API response: {str(e)}")
+                return None, True
+            await usage_ledger.record(result.get("model", endpoint.model), result.get("usage"))
+            return content, False
+
+        endpoint.stats.errors += 1
+        logger.error(
+            f"Deepseek API error: {response.status_code} - {truncate(response.text)}")
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("retry-after", "")
+            endpoint.cool_down(
+                float(retry_after) if retry_after.isdigit() else settings.AI_ROUTER_COOLDOWN_SECONDS)
+            return None, True
+        return None, False
+
+    def _parse_json(self, response: Optional[str], label: str) -> Optional[Any]:
+        """JSON 응답 파싱 (결과를 응답한 엔드포인트의 품질 통계에 기록)"""
+        if not response:
+            return None
+        try:
+            parsed = json.loads(response)
+        except json.JSONDecodeError:
+            model_router.record_quality(_served_by.get(), False)
+            logger.error(f"Failed to parse {label} JSON")
             return None
+        model_router.record_quality(_served_by.get(), True)
+        return parsed
 
-    async def generate_course_outline(
+    def build_course_outline_messages(
         self,
         topic: str,
         skill_level: str,
         duration_hours: int,
         learning_goals: List[str]
-    ) -> Optional[Dict[str, Any]]:
-        """AI 기반 코스 개요 생성"""
+    ) -> List[Dict[str, str]]:
+        """코스 개요 생성 프롬프트"""
         prompt = f"""
         Create a comprehensive course outline for "{topic}" with the following requirements:
         - Target skill level: {skill_level}
@@ -95,30 +193,54 @@ class DeepseekAIService:
         Format the response as valid JSON.
         """
 
-        messages = [
+        return [
             {"role": "system", "content": "You are an expert curriculum designer for AI education."},
             {"role": "user", "content": prompt}
         ]
 
-        response = await self.generate_chat_completion(messages, max_tokens=2000)
+    def course_outline_key(
+        self,
+        topic: str,
+        skill_level: str,
+        duration_hours: int,
+        learning_goals: List[str]
+    ) -> str:
+        """코스 개요 캐시 키 (주제/목표는 대소문자, 공백, 순서 무시)"""
+        return outline_cache.make_key(
+            topic.strip().lower(), skill_level, duration_hours,
+            sorted(goal.strip().lower() for goal in learning_goals)
+        )
 
-        if response:
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                logger.error("Failed to parse course outline JSON")
-                return None
+    async def generate_course_outline(
+        self,
+        topic: str,
+        skill_level: str,
+        duration_hours: int,
+        learning_goals: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """AI 기반 코스 개요 생성 (같은 조건의 결과는 캐시/사전 생성본 재사용)"""
+        key = self.course_outline_key(topic, skill_level, duration_hours, learning_goals)
+        cached = await outline_cache.get(key)
+        if cached is not None:
+            return cached
 
-        return None
+        messages = self.build_course_outline_messages(topic, skill_level, duration_hours, learning_goals)
 
-    async def generate_lesson_content(
+        response = await self.generate_chat_completion(messages, max_tokens=2000, task="course_outline")
+
+        outline = self._parse_json(response, "course outline")
+        if outline is not None:
+            await outline_cache.set(key, outline)
+        return outline
+
+    def build_lesson_content_messages(
         self,
         lesson_title: str,
         learning_objectives: List[str],
         difficulty_level: str,
         duration_minutes: int
-    ) -> Optional[str]:
-        """AI 기반 레슨 콘텐츠 생성"""
+    ) -> List[Dict[str, str]]:
+        """레슨 콘텐츠 생성 프롬프트"""
         prompt = f"""
         Create detailed lesson content for "{lesson_title}" with:
         - Learning objectives: {', '.join(learning_objectives)}
@@ -134,20 +256,30 @@ class DeepseekAIService:
         Format in Markdown.
         """
 
-        messages = [
+        return [
             {"role": "system", "content": "You are an expert AI instructor creating educational content."},
             {"role": "user", "content": prompt}
         ]
 
-        return await self.generate_chat_completion(messages, max_tokens=3000)
+    async def generate_lesson_content(
+        self,
+        lesson_title: str,
+        learning_objectives: List[str],
+        difficulty_level: str,
+        duration_minutes: int
+    ) -> Optional[str]:
+        """AI 기반 레슨 콘텐츠 생성"""
+        messages = self.build_lesson_content_messages(lesson_title, learning_objectives, difficulty_level, duration_minutes)
+
+        return await self.generate_chat_completion(messages, max_tokens=3000, task="lesson_content")
 
-    async def personalize_learning_path(
+    def build_learning_path_messages(
         self,
         user_profile: Dict[str, Any],
         available_courses: List[Dict[str, Any]],
         learning_goals: List[str]
-    ) -> Optional[List[str]]:
-        """사용자 맞춤 학습 경로 추천"""
+    ) -> List[Dict[str, str]]:
+        """학습 경로 추천 프롬프트"""
         prompt = f"""
         Based on this user profile:
         - Skill level: {user_profile.get('skill_level', 'beginner')}
@@ -161,30 +293,32 @@ class DeepseekAIService:
         Return as JSON array of course IDs.
         """
 
-        messages = [
+        return [
             {"role": "system", "content": "You are an AI learning advisor specializing in personalized education paths."},
             {"role": "user", "content": prompt}
         ]
 
-        response = await self.generate_chat_completion(messages, max_tokens=1000)
+    async def personalize_learning_path(
+        self,
+        user_profile: Dict[str, Any],
+        available_courses: List[Dict[str, Any]],
+        learning_goals: List[str]
+    ) -> Optional[List[str]]:
+        """사용자 맞춤 학습 경로 추천"""
+        messages = self.build_learning_path_messages(user_profile, available_courses, learning_goals)
 
-        if response:
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                logger.error("Failed to parse learning path JSON")
-                return None
+        response = await self.generate_chat_completion(messages, max_tokens=1000, task="learning_path")
 
-        return None
+        return self._parse_json(response, "learning path")
 
-    async def evaluate_user_response(
+    def build_evaluation_messages(
         self,
         question: str,
         user_answer: str,
         expected_answer: str,
         context: str = ""
-    ) -> Optional[Dict[str, Any]]:
-        """사용자 답변 AI 평가"""
+    ) -> List[Dict[str, str]]:
+        """답변 평가 프롬프트"""
         prompt = f"""
         Evaluate this user's answer:
         
@@ -202,21 +336,24 @@ class DeepseekAIService:
         }}
         """
 
-        messages = [
+        return [
             {"role": "system", "content": "You are an AI tutor providing detailed feedback on student answers."},
             {"role": "user", "content": prompt}
         ]
 
-        response = await self.generate_chat_completion(messages, max_tokens=800)
+    async def evaluate_user_response(
+        self,
+        question: str,
+        user_answer: str,
+        expected_answer: str,
+        context: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """사용자 답변 AI 평가"""
+        messages = self.build_evaluation_messages(question, user_answer, expected_answer, context)
 
-        if response:
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                logger.error("Failed to parse evaluation JSON")
-                return None
+        response = await self.generate_chat_completion(messages, max_tokens=800, task="evaluation")
 
-        return None
+        return self._parse_json(response, "evaluation")
 
 
 # 싱글톤 AI 서비스 인스턴스
@@ -0,0 +1,182 @@
+"""
+분석 서비스
+강사 대시보드용 롤업 조회 및 증분 갱신
+"""
+import asyncio
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from ..core.cache import ResultCache
+from ..core.config import settings
+from ..core.supabase import get_supabase_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+# course_analytics.quiz_score_buckets 구간 라벨
+QUIZ_BUCKET_LABELS = [f"{i * 10}-{i * 10 + 9}" for i in range(10)] + ["100"]
+
+
+class AnalyticsService:
+    """
+    분석 롤업 서비스
+
+    수강 데이터 변경은 DB 트리거가 변경 로그에 기록하고,
+    이 서비스가 주기적으로 `refresh_analytics_rollups` RPC를 호출해 롤업에 반영합니다.
+    조회는 롤업 테이블만 읽으며 (복제본 설정 시 복제본 사용),
+    대시보드 폴링을 흡수하기 위해 짧은 TTL의 결과 캐시(Redis 또는 프로세스별 LRU)를 둡니다.
+    """
+
+    def __init__(self):
+        self.refresh_interval = settings.ANALYTICS_REFRESH_INTERVAL_SECONDS
+        self.batch_size = settings.ANALYTICS_REFRESH_BATCH_SIZE
+        self.cache = ResultCache("analytics", settings.ANALYTICS_CACHE_TTL_SECONDS)
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def _select(self, key: Tuple[Any, ...], build_query) -> List[Dict[str, Any]]:
+        """읽기 복제본에서 조회 (캐시 우선)"""
+        cache_key = ResultCache.make_key(*key)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        client = get_supabase_client(replica=True)
+        if client is None:
+            raise RuntimeError("Supabase is not configured")
+
+        response = await asyncio.to_thread(lambda: build_query(client).execute())
+        rows = response.data or []
+        await self.cache.set(cache_key, rows)
+        return rows
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    async def get_course_instructor(self, course_id: str) -> Tuple[bool, Optional[str]]:
+        """(코스 존재 여부, 강사 ID) - 대시보드 접근 권한 확인용"""
+        rows = await self._select(
+            ("instructor", course_id),
+            lambda client: client.table("courses").select("instructor_id").eq("id", course_id).limit(1)
+        )
+        if not rows:
+            return False, None
+        return True, rows[0].get("instructor_id")
+
+    async def get_course_overview(self, course_id: str) -> Optional[Dict[str, Any]]:
+        """코스 완료 퍼널, 평균 학습 시간, 퀴즈 점수 분포"""
+        rows = await self._select(
+            ("course", course_id),
+            lambda client: client.table("course_analytics").select("*").eq("course_id", course_id)
+        )
+        if not rows:
+            return None
+
+        row = rows[0]
+        enrolled = row["enrolled_count"] or 0
+        buckets = row.get("quiz_score_buckets") or [0] * len(QUIZ_BUCKET_LABELS)
+
+        return {
+            "course_id": course_id,
+            "funnel": {
+                "enrolled": enrolled,
+                "started": row["started_count"],
+                "halfway": row["halfway_count"],
+                "completed": row["completed_count"],
+            },
+            "completion_rate": round(row["completed_count"] / enrolled * 100, 2) if enrolled else 0.0,
+            "total_study_minutes": row["total_study_minutes"],
+            "average_study_minutes": round(row["total_study_minutes"] / enrolled, 1) if enrolled else 0.0,
+            "quiz_score_distribution": dict(zip(QUIZ_BUCKET_LABELS, buckets)),
+            "updated_at": row.get("updated_at"),
+        }
+
+    async def get_course_daily(self, course_id: str, days: int = 30) -> List[Dict[str, Any]]:
+        """코스 일자별 활동 (최근 days일)"""
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        return await self._select(
+            ("daily", course_id, since),
+            lambda client: client.table("course_daily_analytics")
+            .select("stat_date,new_enrollments,completions,study_minutes,progress_events")
+            .eq("course_id", course_id)
+            .gte("stat_date", since)
+            .order("stat_date")
+        )
+
+    async def get_module_stats(self, course_id: str) -> List[Dict[str, Any]]:
+        """모듈별 레슨 완료 수"""
+        rows = await self._select(
+            ("modules", course_id),
+            lambda client: client.table("module_analytics")
+            .select("module_id,lesson_completions,updated_at,modules(title,order_index)")
+            .eq("course_id", course_id)
+        )
+        modules = []
+        for row in rows:
+            module = row.get("modules") or {}
+            modules.append({
+                "module_id": row["module_id"],
+                "title": module.get("title"),
+                "order_index": module.get("order_index"),
+                "lesson_completions": row["lesson_completions"],
+                "updated_at": row.get("updated_at"),
+            })
+        return sorted(modules, key=lambda m: (m["order_index"] is None, m["order_index"]))
+
+    # ------------------------------------------------------------------
+    # 증분 갱신
+    # ------------------------------------------------------------------
+
+    async def refresh(self) -> int:
+        """변경 로그를 배치 단위로 소비해 롤업에 반영 (처리 건수 반환)"""
+        client = get_supabase_client(service=True)
+        if client is None:
+            return 0
+
+        processed = 0
+        while True:
+            response = await asyncio.to_thread(
+                lambda: client.rpc(
+                    "refresh_analytics_rollups", {"batch_size": self.batch_size}
+                ).execute()
+            )
+            count = int(response.data or 0)
+            processed += count
+            if count < self.batch_size:
+                break
+
+        if processed:
+            # Redis에 캐시된 결과는 ANALYTICS_CACHE_TTL_SECONDS 안에 만료됨
+            self.cache.clear()
+        return processed
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                processed = await self.refresh()
+                if processed:
+                    logger.info(f"Analytics rollups refreshed: {processed} changes")
+            except Exception as e:
+                logger.error(f"Error refreshing analytics rollups: {str(e)}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        """백그라운드 갱신 시작 (lifespan에서 호출)"""
+        if self.refresh_interval <= 0 or self._refresh_task is not None:
+            return
+        if not (settings.SUPABASE_URL and settings.SUPABASE_SERVICE_KEY):
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """백그라운드 갱신 중지"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+# 싱글톤 분석 서비스 인스턴스
+analytics_service = AnalyticsService()
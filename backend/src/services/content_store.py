@@ -0,0 +1,517 @@
+"""
+레슨 콘텐츠 저장소
+레슨 본문을 해시 주소 zstd 블롭으로 보관 (로컬 파일 / S3·R2 호환 / Git 저장소 백엔드, 워커별 mmap 캐시)
+
+Usage: python -m src.services.content_store offload [--batch-size 200] [--concurrency 16] [--database-url URL]
+
+- 키는 sha256(본문 UTF-8) hex이므로 같은 본문은 한 번만 저장되고, 블롭은 변경되지 않습니다.
+- lessons 행에는 content_hash만 남습니다 (006_lesson_content_store.sql 트리거가 검색 벡터 계산 후 content를 비움).
+- 읽은 본문은 압축을 푼 상태로 CONTENT_CACHE_DIR에 저장하고 mmap으로 읽습니다.
+  같은 호스트의 워커들은 OS 페이지 캐시를 공유하므로 인기 레슨은 압축 해제/다운로드 없이 응답합니다.
+- 캐시에 있는 블롭은 백엔드에 저장된 것이 확인된 블롭입니다 (저장 성공 또는 백엔드에서 읽은 경우에만 기록).
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import mmap
+import os
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Protocol
+import httpx
+from ..core.config import settings
+from ..core.s3 import S3Client, s3_client_from_settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 이 크기 이상의 본문은 압축/해제를 스레드에서 실행 (이벤트 루프 차단 방지)
+_THREAD_THRESHOLD_BYTES = 64 * 1024
+
+
+def content_hash(text: str) -> str:
+    """본문 해시 (sha256 hex, lessons.content_hash 값)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _compress(data: bytes, level: int) -> bytes:
+    import zstandard
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _decompress(blob: bytes) -> bytes:
+    import zstandard
+    return zstandard.ZstdDecompressor().decompress(blob)
+
+
+class ContentIntegrityError(Exception):
+    """블롭 내용이 해시와 일치하지 않음"""
+    pass
+
+
+# ============================================================================
+# 백엔드
+# ============================================================================
+
+class ContentBackend(Protocol):
+    """블롭 저장 백엔드 (키는 불변 블롭이므로 put은 이미 있어도 성공해야 함)"""
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def put(self, key: str, data: bytes) -> None: ...
+
+    async def exists(self, key: str) -> bool: ...
+
+    async def aclose(self) -> None: ...
+
+
+class LocalBackend:
+    """로컬 파일 시스템 (단일 서버, 개발 환경)"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await asyncio.to_thread(self._path(key).read_bytes)
+        except FileNotFoundError:
+            return None
+
+    async def put(self, key: str, data: bytes) -> None:
+        await asyncio.to_thread(_atomic_write, self._path(key), data)
+
+    async def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    async def aclose(self) -> None:
+        return None
+
+
+class S3Backend:
+    """S3 호환 객체 저장소 (Cloudflare R2, MinIO, 로컬 대역 서버)"""
+
+    def __init__(self, client: S3Client, prefix: str = ""):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get_object(self.prefix + key)
+
+    async def put(self, key: str, data: bytes) -> None:
+        await self.client.put_object(self.prefix + key, data, content_type="application/zstd")
+
+    async def exists(self, key: str) -> bool:
+        return await self.client.head_object(self.prefix + key)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class GitHubBackend:
+    """
+    Git 저장소 (GitHub Contents API, CONTENT_REPO / CONTENT_BRANCH)
+
+    블롭마다 커밋이 하나씩 생기므로 쓰기가 적은 환경(콘텐츠 이전, 소량 발행)에 적합합니다.
+    """
+
+    def __init__(self, repo: str, token: Optional[str], branch: str = "main",
+                 api_url: str = "https://api.github.com", prefix: str = ""):
+        self.repo = repo
+        self.branch = branch
+        self.api_url = api_url.rstrip("/")
+        self.prefix = prefix
+        self._headers = {"Accept": "application/vnd.github.raw", "X-GitHub-Api-Version": "2022-11-28"}
+        if token:
+            self._headers["Authorization"] = f"Bearer {token}"
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=30.0, headers=self._headers)
+        return self._client
+
+    def _url(self, key: str) -> str:
+        return f"{self.api_url}/repos/{self.repo}/contents/{self.prefix}{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        response = await self.client.get(self._url(key), params={"ref": self.branch})
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.content
+
+    async def put(self, key: str, data: bytes) -> None:
+        response = await self.client.put(self._url(key), json={
+            "message": f"Add content blob {key.rsplit('/', 1)[-1]}",
+            "content": base64.b64encode(data).decode(),
+            "branch": self.branch,
+        })
+        # 422: 같은 경로의 파일이 이미 있음 (해시 주소이므로 같은 내용)
+        if response.status_code != 422:
+            response.raise_for_status()
+
+    async def exists(self, key: str) -> bool:
+        response = await self.client.head(self._url(key), params={"ref": self.branch})
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_backend(name: Optional[str] = None) -> ContentBackend:
+    """설정으로 백엔드 생성"""
+    name = name or settings.CONTENT_STORE_BACKEND
+    if name == "local":
+        return LocalBackend(settings.CONTENT_STORE_DIR)
+    if name == "s3":
+        return S3Backend(s3_client_from_settings(), prefix=settings.CONTENT_STORE_PREFIX)
+    if name == "git":
+        return GitHubBackend(settings.CONTENT_REPO, settings.GITHUB_TOKEN, settings.CONTENT_BRANCH,
+                             settings.GITHUB_API_URL, prefix=settings.CONTENT_STORE_PREFIX)
+    raise ValueError(f"Unknown content store backend: {name}")
+
+
+# ============================================================================
+# 워커 로컬 캐시
+# ============================================================================
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """임시 파일에 쓴 뒤 이름 변경 (다른 프로세스가 쓰다 만 파일을 읽지 않도록)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+class MappedCache:
+    """
+    압축 해제된 본문 파일 캐시 (mmap으로 읽음)
+
+    - 파일은 여러 워커가 공유하고, 열린 mmap은 워커별로 max_open개까지 유지합니다.
+    - 크기가 max_bytes를 넘으면 오래된 파일부터 삭제합니다 (삭제된 파일의 열린 mmap은 계속 유효).
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_open: int = 256):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_open = max_open
+        self._maps: "OrderedDict[str, mmap.mmap]" = OrderedDict()
+        self._written = 0
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / digest
+
+    def _map(self, digest: str) -> Optional[Any]:
+        mapped = self._maps.get(digest)
+        if mapped is not None:
+            self._maps.move_to_end(digest)
+            return mapped
+        try:
+            with open(self._path(digest), "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return b""
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        self._maps[digest] = mapped
+        while len(self._maps) > self.max_open:
+            self._maps.popitem(last=False)[1].close()
+        return mapped
+
+    def read(self, digest: str) -> Optional[str]:
+        mapped = self._map(digest)
+        return None if mapped is None else str(mapped, "utf-8")
+
+    def read_bytes(self, digest: str) -> Optional[bytes]:
+        mapped = self._map(digest)
+        return None if mapped is None else bytes(mapped)
+
+    def write(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        if path.exists():
+            return
+        _atomic_write(path, data)
+        self._written += len(data)
+        # 전체 크기 확인은 디렉터리를 훑어야 하므로 한도의 10%를 쓸 때마다 실행
+        if self._written > self.max_bytes // 10:
+            self._written = 0
+            self.prune()
+
+    def prune(self) -> int:
+        """한도를 넘으면 수정 시각이 오래된 파일부터 삭제 (삭제한 파일 수)"""
+        files = []
+        total = 0
+        for subdirectory in self.directory.iterdir() if self.directory.exists() else ():
+            if not subdirectory.is_dir():
+                continue
+            for entry in os.scandir(subdirectory):
+                if entry.name.startswith(".tmp-"):
+                    continue
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        removed = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * 0.9
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                Path(path).unlink(missing_ok=True)
+                total -= size
+                removed += 1
+        return removed
+
+    def close(self) -> None:
+        while self._maps:
+            self._maps.popitem()[1].close()
+
+
+# ============================================================================
+# 콘텐츠 저장소
+# ============================================================================
+
+class ContentStore:
+    """레슨 본문 저장소"""
+
+    def __init__(self, backend: Optional[ContentBackend] = None, cache: Optional[MappedCache] = None):
+        self._backend = backend
+        self.cache = cache or MappedCache(settings.CONTENT_CACHE_DIR, settings.CONTENT_CACHE_MAX_BYTES)
+        self.level = settings.CONTENT_ZSTD_LEVEL
+        self._inflight: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+        self._uploads: Dict[str, "asyncio.Future[None]"] = {}
+        self.stats = {"cache_hits": 0, "backend_reads": 0, "writes": 0, "deduplicated": 0}
+
+    @property
+    def backend(self) -> ContentBackend:
+        """백엔드 (첫 사용 시 생성)"""
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+
+    @staticmethod
+    def _key(digest: str) -> str:
+        return f"{digest[:2]}/{digest}.zst"
+
+    async def put(self, text: str) -> str:
+        """본문 저장 후 해시 반환 (이미 있는 본문은 업로드하지 않음)"""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if self.cache.read(digest) is not None:
+            self.stats["deduplicated"] += 1
+            return digest
+
+        pending = self._uploads.get(digest)
+        if pending is not None:
+            await asyncio.shield(pending)
+            self.stats["deduplicated"] += 1
+            return digest
+
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._uploads[digest] = future
+        try:
+            await self._store(digest, data)
+            future.set_result(None)
+            return digest
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._uploads.pop(digest, None)
+
+    async def _store(self, digest: str, data: bytes) -> None:
+        key = self._key(digest)
+        if await self.backend.exists(key):
+            self.stats["deduplicated"] += 1
+        else:
+            if len(data) >= _THREAD_THRESHOLD_BYTES:
+                blob = await asyncio.to_thread(_compress, data, self.level)
+            else:
+                blob = _compress(data, self.level)
+            await self.backend.put(key, blob)
+            self.stats["writes"] += 1
+        self.cache.write(digest, data)
+
+    async def get(self, digest: str) -> Optional[str]:
+        """해시로 본문 조회 (없으면 None, 같은 해시의 동시 조회는 한 번만 다운로드)"""
+        text = self.cache.read(digest)
+        if text is not None:
+            self.stats["cache_hits"] += 1
+            return text
+
+        pending = self._inflight.get(digest)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: "asyncio.Future[Optional[str]]" = asyncio.get_running_loop().create_future()
+        self._inflight[digest] = future
+        try:
+            text = await self._load(digest)
+            future.set_result(text)
+            return text
+        except asyncio.CancelledError:
+            future.cancel()  # 대기자가 영원히 기다리지 않도록
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없어도 경고가 남지 않도록 예외 조회
+            raise
+        finally:
+            self._inflight.pop(digest, None)
+
+    async def _load(self, digest: str) -> Optional[str]:
+        blob = await self.backend.get(self._key(digest))
+        if blob is None:
+            return None
+        self.stats["backend_reads"] += 1
+        if len(blob) >= _THREAD_THRESHOLD_BYTES // 4:
+            data = await asyncio.to_thread(_decompress, blob)
+        else:
+            data = _decompress(blob)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ContentIntegrityError(f"Content blob {digest} does not match its hash")
+        self.cache.write(digest, data)
+        return data.decode("utf-8")
+
+    async def get_many(self, digests: Iterable[str], concurrency: int = 16) -> Dict[str, Optional[str]]:
+        """여러 본문 조회 (중복 해시는 한 번만)"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(digest: str) -> Optional[str]:
+            async with semaphore:
+                return await self.get(digest)
+
+        unique = list(dict.fromkeys(digests))
+        results = await asyncio.gather(*(fetch(digest) for digest in unique))
+        return dict(zip(unique, results))
+
+    async def put_derived(self, name: str, data: bytes) -> None:
+        """본문에서 만든 산출물(렌더링 결과 등) 저장 (이름에 원본 해시와 산출 버전을 포함해 불변으로 사용)"""
+        if len(data) >= _THREAD_THRESHOLD_BYTES:
+            blob = await asyncio.to_thread(_compress, data, self.level)
+        else:
+            blob = _compress(data, self.level)
+        await self.backend.put(f"derived/{name}.zst", blob)
+
+    async def get_derived(self, name: str) -> Optional[bytes]:
+        """put_derived로 저장한 산출물 조회 (없으면 None)"""
+        blob = await self.backend.get(f"derived/{name}.zst")
+        if blob is None:
+            return None
+        if len(blob) >= _THREAD_THRESHOLD_BYTES // 4:
+            return await asyncio.to_thread(_decompress, blob)
+        return _decompress(blob)
+
+    async def lesson_content(self, lesson: Any) -> Optional[str]:
+        """Lesson 모델(또는 dict)의 본문 (행에 있으면 그대로, 없으면 저장소에서)"""
+        get = lesson.get if isinstance(lesson, dict) else lambda name: getattr(lesson, name, None)
+        content = get("content")
+        if content is not None:
+            return content
+        digest = get("content_hash")
+        return await self.get(digest.strip()) if digest else None
+
+    async def aclose(self) -> None:
+        """백엔드 클라이언트와 열린 mmap 정리"""
+        if self._backend is not None:
+            await self._backend.aclose()
+        self.cache.close()
+
+
+# 싱글톤 콘텐츠 저장소 인스턴스
+content_store = ContentStore()
+
+
+# ============================================================================
+# 기존 본문 이전 (offload)
+# ============================================================================
+
+async def offload(database_url: str, batch_size: int, concurrency: int) -> int:
+    """행에 있는 본문을 저장소로 옮기고 content_hash 기록 (옮긴 행 수)"""
+    import asyncpg
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def put(text: str) -> str:
+        async with semaphore:
+            return await content_store.put(text)
+
+    conn = await asyncpg.connect(database_url)
+    moved, last_id = 0, None
+    started = time.monotonic()
+    try:
+        while True:
+            rows = await conn.fetch(
+                """SELECT id, content FROM lessons
+                   WHERE content IS NOT NULL AND ($1::uuid IS NULL OR id > $1)
+                   ORDER BY id LIMIT $2""",
+                last_id, batch_size,
+            )
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+            hashes: List[str] = await asyncio.gather(*(put(row["content"]) for row in rows))
+            # content도 함께 기록해야 트리거가 검색 벡터를 계산한 뒤 비움 (그 사이 본문이 바뀐 행은 제외)
+            result = await conn.execute(
+                """UPDATE lessons AS l SET content_hash = v.hash, content = l.content
+                   FROM unnest($1::uuid[], $2::text[]) AS v(id, hash)
+                   WHERE l.id = v.id AND encode(sha256(convert_to(l.content, 'UTF8')), 'hex') = v.hash""",
+                [row["id"] for row in rows], hashes,
+            )
+            moved += int(result.split()[-1])
+            rate = moved / max(time.monotonic() - started, 1e-6)
+            print(f"\r  📦 {moved:,} lessons ({rate:,.0f}/s, 업로드 {content_store.stats['writes']:,}, "
+                  f"중복 {content_store.stats['deduplicated']:,})", end="")
+            sys.stdout.flush()
+    finally:
+        await conn.close()
+        await content_store.aclose()
+    print()
+    return moved
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Lesson content store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    offload_parser = commands.add_parser("offload", help="행에 있는 레슨 본문을 저장소로 이전")
+    offload_parser.add_argument("--database-url", help="기본값: DATABASE_URL")
+    offload_parser.add_argument("--batch-size", type=int, default=200)
+    offload_parser.add_argument("--concurrency", type=int, default=16, help="동시 업로드 수")
+    args = parser.parse_args(argv)
+
+    url = args.database_url or settings.DATABASE_URL
+    if not url:
+        parser.error("DATABASE_URL이 설정되지 않았습니다 (--database-url 또는 환경 변수)")
+    from ..core.database import plain_url
+    url = plain_url(url)
+
+    print(f"📦 레슨 본문 이전 ({settings.CONTENT_STORE_BACKEND} 백엔드)")
+    moved = asyncio.run(offload(url, args.batch_size, args.concurrency))
+    print(f"🎉 완료: {moved:,}개 레슨")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+AI 모델 라우팅 서비스
+작업 유형/입력 크기/지연 목표(SLO)에 따른 모델 선택, 레인별 동시성 제한, 포화 시 대체 모델
+
+- 엔드포인트(레인): 모델 + 제공자 URL + 동시 호출 수 제한 (AI_MODEL_ENDPOINTS)
+  짧은 작업(평가)과 긴 생성(코스/레슨)은 서로 다른 레인을 사용하므로
+  긴 생성이 몰려도 짧은 작업이 대기열에 막히지 않습니다.
+- 작업 경로: 작업 유형 → 후보 엔드포인트 순서 (AI_TASK_ROUTES), API 경로별 재정의 (AI_ROUTE_OVERRIDES)
+- 후보 중 입력 크기를 수용하지 못하거나 냉각 중(429/5xx 직후)인 엔드포인트는 제외하고,
+  관측 지연이 SLO를 넘는 엔드포인트는 뒤로 미룹니다.
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+from ..core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_WINDOW = 200  # 백분위 계산용 최근 지연 표본 수
+_EWMA_ALPHA = 0.2
+
+
+def estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """입력 토큰 수 근사 (문자 4개당 1토큰)"""
+    return sum(len(message.get("content", "")) for message in messages) // 4 + 4 * len(messages)
+
+
+@dataclass
+class EndpointStats:
+    """엔드포인트별 지연/품질 통계"""
+    calls: int = 0
+    errors: int = 0
+    saturated: int = 0  # 레인이 가득 차 대체 후보로 넘긴 횟수
+    fallbacks: int = 0  # 다른 엔드포인트 대신 처리한 횟수
+    quality_ok: int = 0
+    quality_failed: int = 0  # 응답 형식 오류 (JSON 파싱 실패 등)
+    ewma_ms: Optional[float] = None
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=_LATENCY_WINDOW))
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.calls += 1
+        self.latencies.append(elapsed_ms)
+        self.ewma_ms = elapsed_ms if self.ewma_ms is None else (
+            _EWMA_ALPHA * elapsed_ms + (1 - _EWMA_ALPHA) * self.ewma_ms)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+
+class ModelEndpoint:
+    """모델 엔드포인트 (하나의 동시성 레인)"""
+
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.model = config.get("model", settings.DEEPSEEK_MODEL)
+        self.base_url = config.get("base_url", settings.DEEPSEEK_BASE_URL).rstrip("/")
+        self.api_key = config.get("api_key", settings.DEEPSEEK_API_KEY)
+        self.max_concurrency = int(config.get("max_concurrency", 8))
+        self.max_input_tokens = int(config.get("max_input_tokens", 60000))
+        self.timeout_seconds = float(config.get("timeout_seconds", 30))
+        self.stats = EndpointStats()
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key) and time.monotonic() >= self.cooldown_until
+
+    async def acquire(self, wait_seconds: Optional[float]) -> bool:
+        """레인 진입 (wait_seconds 내에 자리가 나지 않으면 False, None이면 호출 제한 시간까지 대기)"""
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(),
+                self.timeout_seconds if wait_seconds is None else wait_seconds
+            )
+        except asyncio.TimeoutError:
+            self.stats.saturated += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def cool_down(self, seconds: float) -> None:
+        """업스트림 포화(429/5xx) 후 일정 시간 후보에서 제외"""
+        self.cooldown_until = time.monotonic() + seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = self.stats
+        rated = stats.quality_ok + stats.quality_failed
+        return {
+            "model": self.model,
+            "base_url": self.base_url,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "cooling_down": time.monotonic() < self.cooldown_until,
+            "calls": stats.calls,
+            "errors": stats.errors,
+            "saturated": stats.saturated,
+            "fallbacks": stats.fallbacks,
+            "latency_ms": {
+                "ewma": round(stats.ewma_ms, 1) if stats.ewma_ms is not None else None,
+                "p50": stats.percentile(0.5),
+                "p95": stats.percentile(0.95),
+            },
+            "quality": round(stats.quality_ok / rated, 3) if rated else None,
+        }
+
+
+class ModelRouter:
+    """작업별 모델 선택 및 대체 경로 관리"""
+
+    def __init__(self):
+        self._endpoints: Optional[Dict[str, ModelEndpoint]] = None
+
+    @property
+    def endpoints(self) -> Dict[str, ModelEndpoint]:
+        """엔드포인트 (첫 사용 시 설정에서 생성, 이벤트 루프 안에서 세마포어 생성)"""
+        if self._endpoints is None:
+            self._endpoints = {
+                name: ModelEndpoint(name, config)
+                for name, config in settings.AI_MODEL_ENDPOINTS.items()
+            }
+        return self._endpoints
+
+    def plan(
+        self,
+        task: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        route_path: Optional[str] = None,
+    ) -> List[ModelEndpoint]:
+        """호출 후보 엔드포인트 순서 결정"""
+        route = settings.AI_TASK_ROUTES.get(task) or settings.AI_TASK_ROUTES.get("default", {})
+        names = list(route.get("endpoints") or self.endpoints)
+        override = settings.AI_ROUTE_OVERRIDES.get(route_path) if route_path else None
+        if override:
+            names = [override] + [name for name in names if name != override]
+
+        input_tokens = estimate_tokens(messages)
+        candidates = [
+            self.endpoints[name] for name in names
+            if name in self.endpoints
+            and self.endpoints[name].available
+            and input_tokens + max_tokens <= self.endpoints[name].max_input_tokens
+        ]
+
+        slo_ms = route.get("latency_slo_ms")
+        fastest = route.get("strategy") == "fastest"
+
+        def rank(endpoint: ModelEndpoint):
+            ewma = endpoint.stats.ewma_ms
+            over_slo = bool(slo_ms and ewma is not None and ewma > slo_ms)
+            # 관측되지 않은 엔드포인트는 설정 순서 유지 (fastest에서도 한 번은 시도되도록 0으로 취급)
+            return (over_slo, (ewma or 0.0) if fastest else 0.0)
+
+        return sorted(candidates, key=rank)  # 안정 정렬 (동률이면 설정 순서)
+
+    def fallback_wait_seconds(self) -> float:
+        """다음 후보가 있을 때 레인 자리를 기다리는 최대 시간"""
+        return settings.AI_ROUTER_QUEUE_TIMEOUT_MS / 1000
+
+    def record_quality(self, endpoint_name: Optional[str], ok: bool) -> None:
+        """응답 품질 기록 (호출자가 응답 형식을 검증한 뒤 호출)"""
+        endpoint = self.endpoints.get(endpoint_name) if endpoint_name else None
+        if endpoint is None:
+            return
+        if ok:
+            endpoint.stats.quality_ok += 1
+        else:
+            endpoint.stats.quality_failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """엔드포인트별 통계 (/status 노출용)"""
+        if self._endpoints is None:
+            return {}
+        return {name: endpoint.snapshot() for name, endpoint in self._endpoints.items()}
+
+
+# 싱글톤 모델 라우터 인스턴스
+model_router = ModelRouter()
@@ -0,0 +1,235 @@
+"""
+온보딩 서비스
+회원가입 후속 작업 (프로필 생성, 환영 알림, 기본 수강 등록) 아웃박스 핸들러
+
+모든 쓰기는 배치 upsert(중복 무시)이므로 재시도되어도 결과가 한 번만 반영됩니다.
+배치 쓰기가 실패하면 이벤트별로 다시 시도해 실패한 이벤트만 재시도 대상으로 남기며,
+재시도해도 같은 제약 위반(중복 이메일 등)은 바로 dead로 보고합니다.
+"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..core.config import settings
+from ..core.supabase import get_supabase_client
+from .outbox_service import PermanentFailure, outbox_service
+from .profile_service import profile_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+SIGNUP_EVENTS = ("user.profile", "user.welcome", "user.default_enrollment")
+
+WELCOME_TITLE = "AI University에 오신 것을 환영합니다!"
+WELCOME_MESSAGE = "관심 있는 주제를 검색하거나 AI로 나만의 코스를 만들어 학습을 시작해보세요."
+
+_course_ids: Tuple[float, List[str]] = (0.0, [])
+_COURSE_IDS_TTL_SECONDS = 300
+
+_USERNAME_MAX_LENGTH = 50  # users.username VARCHAR(50)
+
+
+def publish_signup(
+    user_id: str,
+    email: str,
+    username: str,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None
+) -> None:
+    """회원가입 후속 작업 이벤트 발행 (auth.users 트리거와 같은 멱등 키 사용)"""
+    payload = {
+        "user_id": user_id,
+        "email": email,
+        "username": username,
+        "first_name": first_name,
+        "last_name": last_name,
+    }
+    for event_type in SIGNUP_EVENTS:
+        outbox_service.publish(event_type, user_id, payload)
+
+
+def _failure(error: Exception) -> str:
+    """
+    실패 메시지 (재시도해도 같은 제약 위반은 PermanentFailure)
+
+    SQLSTATE 23xxx 중 FK 위반(23503)은 선행 이벤트(프로필 생성) 처리 후 성공할 수 있고,
+    username 중복은 다음 시도에서 접미사를 붙이므로 재시도 대상으로 둡니다.
+    """
+    message = str(error)
+    code = str(getattr(error, "code", "") or "")
+    if code.startswith("23") and code != "23503" and "username" not in message:
+        return PermanentFailure(message)
+    return message
+
+
+async def username_available(username: str) -> bool:
+    """가입 전 사용자명 중복 확인 (조회할 수 없으면 True - 프로필 생성 시 접미사로 해결)"""
+    client = get_supabase_client(service=True) or get_supabase_client()
+    if client is None:
+        return True
+    try:
+        response = await asyncio.to_thread(
+            lambda: client.table("users").select("id").eq("username", username).limit(1).execute()
+        )
+    except Exception as e:
+        logger.warning(f"Username availability check failed: {str(e)}")
+        return True
+    return not response.data
+
+
+async def _write_batch(
+    events: List[Dict[str, Any]],
+    rows_for: Callable[[Dict[str, Any]], List[Dict[str, Any]]],
+    write: Callable[[List[Dict[str, Any]]], Any]
+) -> Dict[int, str]:
+    """이벤트 배치를 한 번에 쓰고, 실패하면 이벤트별로 다시 써서 실패 이벤트만 반환"""
+    rows = [row for event in events for row in rows_for(event)]
+    if not rows:
+        return {}
+    try:
+        await asyncio.to_thread(write, rows)
+        return {}
+    except Exception as e:
+        if len(events) == 1:
+            return {events[0]["id"]: _failure(e)}
+
+    failures: Dict[int, str] = {}
+    for event in events:
+        event_rows = rows_for(event)
+        if not event_rows:
+            continue
+        try:
+            await asyncio.to_thread(write, event_rows)
+        except Exception as e:
+            failures[event["id"]] = _failure(e)
+    return failures
+
+
+def _service_client():
+    client = get_supabase_client(service=True)
+    if client is None:
+        raise RuntimeError("Supabase service client is not configured")
+    return client
+
+
+# ============================================================================
+# 핸들러 (등록 순서 = 처리 순서)
+# ============================================================================
+
+async def _assign_usernames(client, events: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    사용자 ID → 사용할 username
+
+    다른 사용자가 쓰고 있거나 같은 배치에서 겹치는 username에는 사용자 ID 기반 접미사를 붙입니다
+    (재시도해도 같은 값).
+    """
+    desired = {
+        event["payload"]["user_id"]: (
+            event["payload"].get("username") or event["payload"]["email"].split("@")[0]
+        )[:_USERNAME_MAX_LENGTH]
+        for event in events
+    }
+    response = await asyncio.to_thread(
+        lambda: client.table("users").select("id,username").in_("username", list(set(desired.values()))).execute()
+    )
+    owners = {row["username"]: str(row["id"]) for row in response.data or []}
+
+    assigned: Dict[str, str] = {}
+    for user_id, username in desired.items():
+        owner = owners.get(username)
+        if owner is not None and owner != str(user_id):
+            suffix = "_" + str(user_id).replace("-", "")[:8]
+            username = username[:_USERNAME_MAX_LENGTH - len(suffix)] + suffix
+        owners[username] = str(user_id)
+        assigned[user_id] = username
+    return assigned
+
+
+@outbox_service.handler("user.profile")
+async def create_profiles(events: List[Dict[str, Any]]) -> Dict[int, str]:
+    """users 테이블 프로필 생성 (username이 이미 쓰이고 있으면 접미사를 붙여 생성)"""
+    client = _service_client()
+    usernames = await _assign_usernames(client, events)
+
+    def rows_for(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        payload = event["payload"]
+        first_name, last_name = payload.get("first_name"), payload.get("last_name")
+        return [{
+            "id": payload["user_id"],
+            "email": payload["email"],
+            "username": usernames[payload["user_id"]],
+            "first_name": first_name,
+            "last_name": last_name,
+            "full_name": f"{first_name or ''} {last_name or ''}".strip(),
+            "is_active": True,
+            "is_verified": False,
+            "role": "student"
+        }]
+
+    failures = await _write_batch(
+        events, rows_for,
+        lambda rows: client.table("users").upsert(rows, on_conflict="id", ignore_duplicates=True).execute()
+    )
+    await profile_service.invalidate(*(
+        event["payload"]["user_id"] for event in events if event["id"] not in failures
+    ))
+    return failures
+
+
+@outbox_service.handler("user.welcome")
+async def send_welcome_notifications(events: List[Dict[str, Any]]) -> Dict[int, str]:
+    """환영 알림 생성"""
+    client = _service_client()
+
+    def rows_for(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [{
+            "user_id": event["payload"]["user_id"],
+            "kind": "welcome",
+            "title": WELCOME_TITLE,
+            "message": WELCOME_MESSAGE,
+            "idempotency_key": event["idempotency_key"],
+        }]
+
+    return await _write_batch(
+        events, rows_for,
+        lambda rows: client.table("notifications").upsert(
+            rows, on_conflict="idempotency_key", ignore_duplicates=True).execute()
+    )
+
+
+async def default_course_ids() -> List[str]:
+    """ONBOARDING_DEFAULT_COURSE_SLUGS의 코스 ID (짧은 TTL 캐시)"""
+    global _course_ids
+    slugs = settings.ONBOARDING_DEFAULT_COURSE_SLUGS
+    if not slugs:
+        return []
+    if _course_ids[0] > time.monotonic():
+        return _course_ids[1]
+
+    client = _service_client()
+    response = await asyncio.to_thread(
+        lambda: client.table("courses").select("id").in_("slug", slugs).execute()
+    )
+    ids = [row["id"] for row in response.data or []]
+    _course_ids = (time.monotonic() + _COURSE_IDS_TTL_SECONDS, ids)
+    return ids
+
+
+@outbox_service.handler("user.default_enrollment")
+async def enroll_default_courses(events: List[Dict[str, Any]]) -> Dict[int, str]:
+    """기본 코스 수강 등록"""
+    course_ids = await default_course_ids()
+    if not course_ids:
+        return {}
+    client = _service_client()
+
+    def rows_for(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {"user_id": event["payload"]["user_id"], "course_id": course_id}
+            for course_id in course_ids
+        ]
+
+    return await _write_batch(
+        events, rows_for,
+        lambda rows: client.table("enrollments").upsert(
+            rows, on_conflict="user_id,course_id", ignore_duplicates=True).execute()
+    )
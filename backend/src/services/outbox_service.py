@@ -0,0 +1,235 @@
+"""
+아웃박스 서비스
+비동기 후속 작업 이벤트 발행 및 배치 처리 워커 (재시도, 멱등 키)
+
+- 발행: 요청 경로에서는 메모리 버퍼에만 추가하고, 짧은 지연 후 모아서
+  `enqueue_outbox_events` RPC 한 번으로 기록합니다 (같은 멱등 키는 무시).
+  기록에 실패하면 버퍼에 되돌리고 지수 백오프로 다시 기록합니다.
+  서비스 키가 없으면 이벤트를 기록할 수 없으므로 production에서는 시작을 거부합니다.
+- 처리: `claim_outbox_events`로 이벤트를 임대해 유형별 핸들러에 배치로 넘기고,
+  성공은 완료, 실패는 지수 백오프로 재시도합니다 (OUTBOX_MAX_ATTEMPTS 초과 시 dead).
+  핸들러가 PermanentFailure로 보고한 실패(제약 위반 등)는 재시도 없이 바로 dead가 됩니다.
+- 여러 워커가 동시에 처리해도 SKIP LOCKED 임대로 같은 이벤트를 중복 처리하지 않습니다.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from ..core.config import settings
+from ..core.logging import truncate
+from ..core.supabase import get_supabase_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 핸들러: 같은 유형 이벤트 목록 → 실패한 이벤트 ID별 오류 메시지 (빈 딕셔너리면 모두 성공)
+OutboxHandler = Callable[[List[Dict[str, Any]]], Awaitable[Dict[int, str]]]
+
+_FLUSH_RETRY_MAX_SECONDS = 60
+
+
+class PermanentFailure(str):
+    """재시도해도 같은 결과인 실패 메시지 (핸들러가 반환하면 바로 dead)"""
+
+
+class OutboxService:
+    """아웃박스 발행/처리 서비스"""
+
+    def __init__(self):
+        self.poll_interval = settings.OUTBOX_POLL_INTERVAL_SECONDS
+        self.batch_size = settings.OUTBOX_BATCH_SIZE
+        self._handlers: Dict[str, OutboxHandler] = {}
+        self._buffer: List[Dict[str, Any]] = []
+        self._flush_handle: Optional[asyncio.Task] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._flush_failures = 0
+        self.stats = {"published": 0, "processed": 0, "failed": 0}
+
+    # ------------------------------------------------------------------
+    # 핸들러 등록
+    # ------------------------------------------------------------------
+
+    def handler(self, event_type: str):
+        """이벤트 유형별 배치 핸들러 등록 (등록 순서대로 처리)"""
+        def decorator(func: OutboxHandler) -> OutboxHandler:
+            self._handlers[event_type] = func
+            return func
+        return decorator
+
+    # ------------------------------------------------------------------
+    # 발행
+    # ------------------------------------------------------------------
+
+    def publish(self, event_type: str, key: str, payload: Dict[str, Any]) -> None:
+        """
+        이벤트 발행 (버퍼에 추가 후 즉시 반환)
+
+        key는 이벤트 유형 내에서 고유한 값이며, 멱등 키는 "<유형>:<key>"입니다.
+        """
+        self._buffer.append({
+            "event_type": event_type,
+            "idempotency_key": f"{event_type}:{key}",
+            "payload": payload,
+        })
+        self.stats["published"] += 1
+        if self._flush_handle is None or self._flush_handle.done():
+            self._flush_handle = asyncio.get_running_loop().create_task(self._flush_soon())
+
+    async def _flush_soon(self, delay: Optional[float] = None) -> None:
+        # 가입 폭주 시 짧은 지연 동안 모인 이벤트를 한 번에 기록
+        await asyncio.sleep(settings.OUTBOX_PUBLISH_DELAY_MS / 1000 if delay is None else delay)
+        await self.flush()
+
+    async def flush(self, retry: bool = True) -> int:
+        """
+        버퍼의 이벤트를 아웃박스 테이블에 기록
+
+        실패하면 이벤트를 버퍼에 되돌리고, retry=True면 지수 백오프 후 다시 기록하도록 예약합니다.
+        """
+        if not self._buffer:
+            return 0
+        events, self._buffer = self._buffer, []
+
+        client = get_supabase_client(service=True)
+        if client is None:
+            # production은 check_configuration()에서 시작을 거부하므로 개발 환경에서만 도달
+            logger.error(f"Outbox not configured (SUPABASE_SERVICE_KEY), dropping {len(events)} events")
+            return 0
+
+        try:
+            await asyncio.to_thread(
+                lambda: client.rpc("enqueue_outbox_events", {"events": events}).execute()
+            )
+        except asyncio.CancelledError:
+            self._buffer = events + self._buffer  # 같은 멱등 키는 무시되므로 다시 기록해도 안전
+            raise
+        except Exception as e:
+            self._buffer = events + self._buffer
+            self._flush_failures += 1
+            delay = min(_FLUSH_RETRY_MAX_SECONDS, 2 ** (self._flush_failures - 1))
+            logger.error(f"Error enqueuing {len(events)} outbox events (retry in {delay}s): {str(e)}")
+            if retry:
+                self._flush_handle = asyncio.get_running_loop().create_task(self._flush_soon(delay))
+            return 0
+
+        self._flush_failures = 0
+        self._wakeup.set()
+        return len(events)
+
+    # ------------------------------------------------------------------
+    # 처리
+    # ------------------------------------------------------------------
+
+    async def process_once(self) -> int:
+        """이벤트 배치 1회 처리 (임대한 이벤트 수 반환)"""
+        client = get_supabase_client(service=True)
+        if client is None:
+            return 0
+
+        response = await asyncio.to_thread(
+            lambda: client.rpc("claim_outbox_events", {
+                "batch_size": self.batch_size,
+                "lease_seconds": settings.OUTBOX_LEASE_SECONDS,
+            }).execute()
+        )
+        events = response.data or []
+        if not events:
+            return 0
+
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for event in events:
+            grouped.setdefault(event["event_type"], []).append(event)
+
+        failures: Dict[int, str] = {}
+        # 등록 순서대로 처리 (예: 프로필 생성 후 알림/수강 등록)
+        for event_type in sorted(grouped, key=self._order):
+            batch = grouped[event_type]
+            handler = self._handlers.get(event_type)
+            if handler is None:
+                failures.update({event["id"]: f"No handler for {event_type}" for event in batch})
+                continue
+            try:
+                failures.update(await handler(batch))
+            except Exception as e:
+                failures.update({event["id"]: str(e) for event in batch})
+
+        completed = [event["id"] for event in events if event["id"] not in failures]
+        if completed:
+            await asyncio.to_thread(
+                lambda: client.rpc("complete_outbox_events", {"event_ids": completed}).execute()
+            )
+        if failures:
+            for event_id, error in failures.items():
+                logger.warning(f"Outbox event {event_id} failed: {truncate(error)}")
+            await asyncio.to_thread(
+                lambda: client.rpc("fail_outbox_events", {
+                    "failures": [
+                        {"id": event_id, "error": error, "permanent": isinstance(error, PermanentFailure)}
+                        for event_id, error in failures.items()
+                    ],
+                    "max_attempts": settings.OUTBOX_MAX_ATTEMPTS,
+                }).execute()
+            )
+
+        self.stats["processed"] += len(completed)
+        self.stats["failed"] += len(failures)
+        return len(events)
+
+    def _order(self, event_type: str) -> int:
+        handlers = list(self._handlers)
+        return handlers.index(event_type) if event_type in handlers else len(handlers)
+
+    async def _worker_loop(self) -> None:
+        while True:
+            try:
+                claimed = await self.process_once()
+            except Exception as e:
+                logger.error(f"Error in outbox worker: {str(e)}")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue  # 밀린 이벤트가 있으면 바로 다음 배치
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def check_configuration(self) -> None:
+        """
+        발행 설정 점검 (lifespan 시작 시 호출)
+
+        Supabase를 쓰면서 SUPABASE_SERVICE_KEY가 없으면 가입 후속 작업(프로필 생성 등) 이벤트를
+        기록할 수 없어 프로필이 조용히 누락됩니다. production에서는 시작을 거부합니다.
+        """
+        if not settings.SUPABASE_URL or settings.SUPABASE_SERVICE_KEY:
+            return
+        message = ("SUPABASE_SERVICE_KEY is not set: signup follow-up events (profiles, welcome "
+                   "notifications, default enrollments) cannot be recorded")
+        if settings.ENVIRONMENT == "production":
+            raise RuntimeError(message)
+        logger.error(message)
+
+    def start(self) -> None:
+        """처리 워커 시작 (lifespan에서 호출)"""
+        if self.poll_interval <= 0 or self._worker_task is not None:
+            return
+        if not (settings.SUPABASE_URL and settings.SUPABASE_SERVICE_KEY):
+            return
+        self._worker_task = asyncio.create_task(self._worker_loop())
+
+    async def stop(self) -> None:
+        """처리 워커 중지 및 발행 대기 이벤트 기록"""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+        if self._flush_handle is not None and not self._flush_handle.done():
+            self._flush_handle.cancel()
+        if await self.flush(retry=False) == 0 and self._buffer:
+            logger.error(f"Outbox shutdown: {len(self._buffer)} events could not be recorded")
+
+
+# 싱글톤 아웃박스 서비스 인스턴스
+outbox_service = OutboxService()
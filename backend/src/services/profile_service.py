@@ -0,0 +1,199 @@
+"""
+프로필 서비스
+사용자 프로필 조회 (컬럼 프로젝션, 프로세스별 LRU + Redis 2단계 캐시, 쓰기 시 무효화)
+
+- 핸들러는 필요한 컬럼만 요청하며, 캐시는 (사용자 ID, 컬럼 집합) 단위로 저장됩니다.
+- 1단계: 프로세스별 LRU (짧은 TTL, /auth/me 같은 반복 조회는 메모리에서 응답)
+- 2단계: Redis 해시 profile:<user_id> (필드 = 컬럼 집합), 무효화는 키 삭제 한 번
+- 프로필을 쓰는 코드는 invalidate(user_id)를 호출해야 합니다.
+  (다른 워커의 1단계 캐시는 PROFILE_LOCAL_TTL_SECONDS 이내에 만료)
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+import orjson
+from ..core.config import settings
+from ..core.redis import get_redis, mark_redis_unavailable
+from ..core.serialization import dumps
+from ..core.supabase import get_supabase_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 조회 가능한 컬럼 (비밀번호 등 민감 컬럼 제외)
+PROFILE_COLUMNS = frozenset({
+    "id", "email", "username", "first_name", "last_name", "full_name", "bio", "avatar_url",
+    "phone", "location", "timezone", "is_active", "is_verified", "is_premium", "role",
+    "current_skill_level", "learning_goals", "preferred_learning_style",
+    "total_study_hours", "courses_completed", "achievements",
+    "language", "notification_preferences", "ui_preferences",
+    "github_username", "linkedin_profile",
+    "subscription_started_at", "subscription_ends_at",
+    "last_login_at", "last_activity_at", "created_at", "updated_at",
+})
+
+_REDIS_PREFIX = "profile:"
+
+
+def normalize_columns(columns: Iterable[str]) -> Tuple[str, ...]:
+    """컬럼 집합 정규화 (id 포함, 정렬, 허용되지 않은 컬럼은 오류)"""
+    normalized = set(columns) | {"id"}
+    unknown = normalized - PROFILE_COLUMNS
+    if unknown:
+        raise ValueError(f"Unknown profile columns: {', '.join(sorted(unknown))}")
+    return tuple(sorted(normalized))
+
+
+_ROLE_COLUMNS = normalize_columns(("role",))
+
+
+class ProfileService:
+    """사용자 프로필 조회 서비스"""
+
+    def __init__(self):
+        self.local_ttl = settings.PROFILE_LOCAL_TTL_SECONDS
+        self.redis_ttl = settings.PROFILE_CACHE_TTL_SECONDS
+        self._local: "OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._max_entries = settings.PROFILE_LOCAL_MAX_ENTRIES
+        self._role_refreshes: Dict[str, "asyncio.Task[str]"] = {}
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    # ------------------------------------------------------------------
+    # 1단계 캐시
+    # ------------------------------------------------------------------
+
+    def _local_get(self, key: Tuple[str, Tuple[str, ...]]) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return entry[1]
+
+    def _local_set(self, key: Tuple[str, Tuple[str, ...]], profile: Dict[str, Any]) -> None:
+        self._local[key] = (time.monotonic() + self.local_ttl, profile)
+        self._local.move_to_end(key)
+        while len(self._local) > self._max_entries:
+            self._local.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    async def get_profile(self, user_id: str, columns: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        프로필 조회 (요청한 컬럼만, 없으면 None)
+
+        반환값은 캐시와 공유되므로 호출자가 수정하지 않아야 합니다.
+        """
+        projection = normalize_columns(columns)
+        key = (user_id, projection)
+
+        profile = self._local_get(key)
+        if profile is not None:
+            self.stats["local_hits"] += 1
+            return profile
+
+        field = ",".join(projection)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                data = await redis.hget(_REDIS_PREFIX + user_id, field)
+                if data is not None:
+                    self.stats["redis_hits"] += 1
+                    profile = orjson.loads(data)
+                    self._local_set(key, profile)
+                    return profile
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        self.stats["misses"] += 1
+        profile = await self._fetch(user_id, field)
+        if profile is None:
+            return None  # 프로필 생성 전(아웃박스 처리 대기)일 수 있으므로 캐시하지 않음
+
+        self._local_set(key, profile)
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.hset(_REDIS_PREFIX + user_id, field, dumps(profile))
+                    pipe.expire(_REDIS_PREFIX + user_id, self.redis_ttl)
+                    await pipe.execute()
+            except Exception as e:
+                mark_redis_unavailable(e)
+        return profile
+
+    async def _fetch(self, user_id: str, select: str) -> Optional[Dict[str, Any]]:
+        client = get_supabase_client(service=True) or get_supabase_client()
+        if client is None:
+            raise RuntimeError("Supabase is not configured")
+        response = await asyncio.to_thread(
+            lambda: client.table("users").select(select).eq("id", user_id).limit(1).execute()
+        )
+        return response.data[0] if response.data else None
+
+    async def get_role(self, user_id: str, default: str) -> str:
+        """
+        users.role (UserRole) 조회 - 권한/요청 제한/할당량 판단의 기준
+
+        프로필이 아직 없거나 조회할 수 없으면 default(토큰의 app_metadata.role 등)를 반환합니다.
+        """
+        try:
+            profile = await self.get_profile(user_id, ("role",))
+        except RuntimeError:
+            return default  # Supabase 미설정
+        except Exception as e:
+            logger.warning(f"Profile role lookup failed, using token role: {str(e)}")
+            return default
+        return (profile or {}).get("role") or default
+
+    def cached_role(self, user_id: str, default: str) -> str:
+        """
+        1단계 캐시의 users.role만 조회 (요청 제한처럼 업스트림 왕복을 기다리면 안 되는 경로용)
+
+        캐시가 없으면 default를, 만료되었으면 이전 값을 반환하고 백그라운드에서 다시 조회합니다.
+        """
+        entry = self._local.get((user_id, _ROLE_COLUMNS))
+        if entry is None or entry[0] <= time.monotonic():
+            self._refresh_role(user_id, default)
+        if entry is None:
+            return default
+        return entry[1].get("role") or default
+
+    def _refresh_role(self, user_id: str, default: str) -> None:
+        if user_id in self._role_refreshes:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self.get_role(user_id, default))
+        except RuntimeError:  # 이벤트 루프 밖
+            return
+        self._role_refreshes[user_id] = task
+        task.add_done_callback(lambda _: self._role_refreshes.pop(user_id, None))
+
+    # ------------------------------------------------------------------
+    # 무효화
+    # ------------------------------------------------------------------
+
+    async def invalidate(self, *user_ids: str) -> None:
+        """프로필 쓰기 후 호출 (모든 컬럼 집합의 캐시 삭제)"""
+        targets = set(user_ids)
+        for key in [key for key in self._local if key[0] in targets]:
+            del self._local[key]
+
+        redis = get_redis()
+        if redis is not None and targets:
+            try:
+                await redis.delete(*(_REDIS_PREFIX + user_id for user_id in targets))
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+    def clear(self) -> None:
+        """프로세스 내 캐시 초기화"""
+        self._local.clear()
+
+
+# 싱글톤 프로필 서비스 인스턴스
+profile_service = ProfileService()
@@ -0,0 +1,371 @@
+"""
+실시간 푸시 서비스
+채널 구독(WebSocket/SSE) 허브 - 워커 내 팬아웃 + Redis pub/sub 워커 간 전달
+
+- 채널: user:<사용자 ID> (본인/관리자). 작업 상태(job.*)와 업로드 완료 등 모든 이벤트는
+  대상 사용자의 채널로만 발행되므로 다른 사용자가 이벤트를 보거나 끼워 넣을 수 없습니다.
+- 발행은 연결별 대기열에 넣기만 하므로 느린 연결이 발행자나 다른 연결을 막지 않습니다.
+  대기열이 가득 차면 오래된 메시지부터 버리고 다음 전송 때 lagged 알림을 보냅니다.
+- 전송 태스크는 보낼 메시지가 있을 때만 만들어지므로 유휴 연결은 수신 대기 코루틴 하나만 유지합니다.
+- 하트비트/유휴 정리는 허브 태스크 하나가 모든 연결에 대해 수행합니다 (연결별 타이머 없음).
+- Redis가 있으면 발행은 Redis로 보내고, 각 워커는 로컬 구독자가 있는 채널만 SUBSCRIBE해 전달받습니다.
+  Redis 장애 중에는 같은 워커의 구독자에게만 전달됩니다.
+"""
+import asyncio
+import re
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set
+import orjson
+from ..core.config import settings
+from ..core.redis import mark_redis_unavailable
+import logging
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "realtime:"
+_CONTROL_CHANNEL = _REDIS_PREFIX + "_hub"  # 로컬 구독 채널이 없어도 pub/sub 연결 유지
+_CHANNEL = re.compile(r"^(user):(.+)$")
+
+PING = orjson.dumps({"type": "ping"}).decode()
+
+
+class RealtimeError(Exception):
+    """구독 요청 오류 (WebSocket 종료 코드와 HTTP 상태 코드 포함)"""
+
+    def __init__(self, message: str, code: int = 1008, status_code: int = 400):
+        super().__init__(message)
+        self.code = code
+        self.status_code = status_code
+
+
+def encode_event(channel: str, event: str, data: Any = None) -> str:
+    """발행 메시지 직렬화 (모든 구독자가 같은 문자열을 공유)"""
+    return orjson.dumps({"type": "event", "channel": channel, "event": event, "data": data, "ts": time.time()}).decode()
+
+
+def normalize_channel(channel: str) -> str:
+    """채널 이름 검증 및 정규화 (ID는 UUID)"""
+    match = _CHANNEL.match(channel.strip())
+    if match is None:
+        raise RealtimeError(f"알 수 없는 채널입니다: {channel}")
+    try:
+        target = str(uuid.UUID(match.group(2)))
+    except ValueError:
+        raise RealtimeError(f"채널 ID가 올바르지 않습니다: {channel}")
+    return f"{match.group(1)}:{target}"
+
+
+def can_subscribe(user: Any, channel: str) -> bool:
+    """구독 권한 (정규화된 채널 기준, 본인 또는 관리자)"""
+    _, _, target = channel.partition(":")
+    return target == str(user.id) or user.role == "admin"
+
+
+class Connection:
+    """
+    구독 연결 (WebSocket 또는 SSE)
+
+    send가 있으면(WebSocket) 메시지가 들어올 때 전송 태스크를 만들고,
+    없으면(SSE) 응답 스트림이 stream()으로 꺼내 갑니다.
+    """
+
+    __slots__ = ("user", "channels", "send", "task", "last_seen", "dropped", "closed",
+                 "_queue", "_limit", "_wake", "_writer")
+
+    def __init__(self, user: Any, send: Optional[Callable[[str], Awaitable[None]]] = None,
+                 queue_size: int = 64):
+        self.user = user
+        self.channels: Set[str] = set()
+        self.send = send
+        self.task: Optional[asyncio.Task] = None  # 유휴 정리 시 취소할 수신 태스크 (WebSocket)
+        self.last_seen = time.monotonic()
+        self.dropped = 0
+        self.closed = False
+        self._queue: Deque[str] = deque()
+        self._limit = queue_size
+        self._wake: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    def push(self, message: str) -> None:
+        """메시지 대기열 추가 (대기하지 않음, 가득 차면 가장 오래된 메시지를 버림)"""
+        if self.closed:
+            return
+        if len(self._queue) >= self._limit:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(message)
+        if self.send is not None:
+            if self._writer is None:
+                self._writer = asyncio.create_task(self._drain())
+        elif self._wake is not None:
+            self._wake.set()
+
+    def _take(self) -> List[str]:
+        messages = []
+        if self.dropped:
+            messages.append(orjson.dumps({"type": "lagged", "dropped": self.dropped}).decode())
+            self.dropped = 0
+        messages.extend(self._queue)
+        self._queue.clear()
+        return messages
+
+    async def _drain(self) -> None:
+        try:
+            while self._queue and not self.closed:
+                for message in self._take():
+                    await asyncio.wait_for(self.send(message), settings.REALTIME_SEND_TIMEOUT_SECONDS)
+        except Exception as e:
+            # 전송 시간 초과(수신하지 않는 클라이언트) 또는 끊긴 연결
+            logger.info(f"Closing realtime connection for user {self.user.id}: {type(e).__name__}")
+            self.close()
+        finally:
+            self._writer = None
+
+    async def stream(self) -> AsyncIterator[List[str]]:
+        """대기 메시지를 묶음 단위로 반환 (SSE 응답용, 연결이 닫히면 종료)"""
+        self._wake = asyncio.Event()
+        while not self.closed:
+            if not self._queue and not self.dropped:
+                await self._wake.wait()
+                self._wake.clear()
+                continue
+            yield self._take()
+
+    def close(self) -> None:
+        """연결 종료 표시 (WebSocket은 수신 태스크 취소, SSE는 스트림 종료)"""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        if self._wake is not None:
+            self._wake.set()
+        if self.task is not None and self.task is not asyncio.current_task():
+            self.task.cancel()
+
+
+class RealtimeHub:
+    """채널 구독 허브"""
+
+    def __init__(self):
+        self._channels: Dict[str, Set[Connection]] = {}
+        self._connections: Set[Connection] = set()
+        self._pubsub: Any = None
+        self._bridged = False
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self.stats = {"published": 0, "delivered": 0, "evicted": 0}
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    # ------------------------------------------------------------------
+    # 연결 / 구독
+    # ------------------------------------------------------------------
+
+    def connect(self, user: Any, send: Optional[Callable[[str], Awaitable[None]]] = None) -> Connection:
+        """연결 등록 (워커 연결 수 한도 초과 시 RealtimeError)"""
+        if len(self._connections) >= settings.REALTIME_MAX_CONNECTIONS:
+            raise RealtimeError("연결 수가 한도에 도달했습니다. 잠시 후 다시 시도해주세요", 1013, 503)
+        connection = Connection(user, send, settings.REALTIME_SEND_QUEUE_SIZE)
+        self._connections.add(connection)
+        return connection
+
+    async def subscribe(self, connection: Connection, channels: Iterable[str]) -> List[str]:
+        """채널 구독 (권한이 없거나 연결당 채널 수를 넘으면 RealtimeError, 구독한 채널 반환)"""
+        normalized = [normalize_channel(channel) for channel in channels]
+        for channel in normalized:
+            if not can_subscribe(connection.user, channel):
+                raise RealtimeError(f"채널을 구독할 권한이 없습니다: {channel}", status_code=403)
+        if len(connection.channels | set(normalized)) > settings.REALTIME_MAX_SUBSCRIPTIONS:
+            raise RealtimeError(f"연결당 채널은 {settings.REALTIME_MAX_SUBSCRIPTIONS}개까지 구독할 수 있습니다")
+
+        first = []
+        for channel in normalized:
+            subscribers = self._channels.setdefault(channel, set())
+            if not subscribers:
+                first.append(channel)
+            subscribers.add(connection)
+            connection.channels.add(channel)
+        if first and self._pubsub is not None:
+            try:
+                await self._pubsub.subscribe(*(_REDIS_PREFIX + channel for channel in first))
+            except Exception as e:
+                mark_redis_unavailable(e)
+        return normalized
+
+    async def unsubscribe(self, connection: Connection, channels: Iterable[str]) -> None:
+        """채널 구독 해제 (마지막 로컬 구독자가 나가면 Redis 구독도 해제)"""
+        last = []
+        for channel in channels:
+            subscribers = self._channels.get(channel)
+            connection.channels.discard(channel)
+            if subscribers is None:
+                continue
+            subscribers.discard(connection)
+            if not subscribers:
+                del self._channels[channel]
+                last.append(channel)
+        if last and self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(*(_REDIS_PREFIX + channel for channel in last))
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+    async def disconnect(self, connection: Connection) -> None:
+        """연결 해제 (모든 구독 정리)"""
+        connection.close()
+        self._connections.discard(connection)
+        await self.unsubscribe(connection, list(connection.channels))
+
+    async def handle_message(self, connection: Connection, raw: str) -> None:
+        """
+        클라이언트 메시지 처리
+
+        {"type": "subscribe" | "unsubscribe", "channels": [...]}, {"type": "pong"}
+        """
+        connection.last_seen = time.monotonic()
+        try:
+            message = orjson.loads(raw)
+            kind = message.get("type")
+            channels = message.get("channels") or []
+            if kind == "subscribe":
+                subscribed = await self.subscribe(connection, channels)
+                connection.push(orjson.dumps({"type": "subscribed", "channels": subscribed}).decode())
+            elif kind == "unsubscribe":
+                normalized = [normalize_channel(channel) for channel in channels]
+                await self.unsubscribe(connection, normalized)
+                connection.push(orjson.dumps({"type": "unsubscribed", "channels": normalized}).decode())
+            elif kind not in ("pong", "ping"):
+                raise RealtimeError(f"알 수 없는 메시지 유형입니다: {kind}")
+        except RealtimeError as e:
+            connection.push(orjson.dumps({"type": "error", "detail": str(e)}).decode())
+        except (orjson.JSONDecodeError, AttributeError, TypeError):
+            connection.push(orjson.dumps({"type": "error", "detail": "JSON 객체 메시지가 필요합니다"}).decode())
+
+    # ------------------------------------------------------------------
+    # 발행
+    # ------------------------------------------------------------------
+
+    async def publish(self, channel: str, event: str, data: Any = None) -> None:
+        """
+        채널에 이벤트 발행 (모든 워커의 구독자에게 전달)
+
+        구독자가 없으면 버려지는 알림이므로, 놓치면 안 되는 상태는 조회 API로도 제공해야 합니다.
+        """
+        channel = normalize_channel(channel)
+        payload = encode_event(channel, event, data)
+        self.stats["published"] += 1
+        if self._bridged:
+            from ..core.redis import get_redis
+
+            redis = get_redis()
+            if redis is not None:
+                try:
+                    await redis.publish(_REDIS_PREFIX + channel, payload)
+                    return
+                except Exception as e:
+                    mark_redis_unavailable(e)
+        self._deliver(channel, payload)
+
+    def _deliver(self, channel: str, payload: str) -> None:
+        subscribers = self._channels.get(channel)
+        if not subscribers:
+            return
+        for connection in subscribers:
+            connection.push(payload)
+        self.stats["delivered"] += len(subscribers)
+
+    # ------------------------------------------------------------------
+    # 백그라운드 태스크
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """하트비트와 Redis 수신 태스크 시작 (lifespan에서 호출)"""
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        if self._listener_task is None and settings.REDIS_URL:
+            self._listener_task = asyncio.create_task(self._listen_loop())
+
+    async def stop(self) -> None:
+        """백그라운드 태스크 중지 및 모든 연결 종료"""
+        for task in (self._heartbeat_task, self._listener_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._heartbeat_task = self._listener_task = None
+        for connection in list(self._connections):
+            connection.close()
+
+    def sweep(self) -> int:
+        """하트비트 전송 및 유휴 WebSocket 정리 (정리한 연결 수)"""
+        deadline = time.monotonic() - settings.REALTIME_IDLE_TIMEOUT_SECONDS
+        evicted = 0
+        for connection in list(self._connections):
+            if connection.send is not None and connection.last_seen < deadline:
+                connection.close()
+                evicted += 1
+            else:
+                connection.push(PING)
+        self.stats["evicted"] += evicted
+        return evicted
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REALTIME_HEARTBEAT_SECONDS)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Realtime heartbeat failed: {e}")
+
+    async def _listen_loop(self) -> None:
+        """Redis 메시지를 로컬 구독자에게 전달 (연결이 끊기면 REDIS_RETRY_AFTER_SECONDS 후 재연결)"""
+        try:
+            from redis.asyncio import Redis
+        except ImportError:
+            return
+
+        while True:
+            # 요청 경로용 클라이언트는 소켓 타임아웃이 짧으므로 수신 전용 연결을 따로 사용
+            client = Redis.from_url(
+                settings.REDIS_URL,
+                password=settings.REDIS_PASSWORD,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_MS / 1000,
+                health_check_interval=30,
+            )
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                initial = set(self._channels)
+                await pubsub.subscribe(_CONTROL_CHANNEL, *(_REDIS_PREFIX + channel for channel in initial))
+                self._pubsub = pubsub
+                missed = set(self._channels) - initial  # 구독 요청 중에 생긴 채널
+                if missed:
+                    await pubsub.subscribe(*(_REDIS_PREFIX + channel for channel in missed))
+                self._bridged = True
+                logger.info("Realtime hub bridged to Redis pub/sub")
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        channel = message["channel"].decode()[len(_REDIS_PREFIX):]
+                        self._deliver(channel, message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                mark_redis_unavailable(e)
+            finally:
+                self._bridged = False
+                self._pubsub = None
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(settings.REDIS_RETRY_AFTER_SECONDS)
+
+
+# 싱글톤 실시간 허브 인스턴스
+realtime_hub = RealtimeHub()
@@ -0,0 +1,347 @@
+"""
+레슨 렌더링 서비스
+레슨 마크다운을 정제된 HTML(목차, 코드 하이라이트 포함)로 한 번만 렌더링하고 본문 해시 단위로 캐시
+
+Usage: python -m src.services.render_service prerender [--concurrency 8] [--database-url URL]
+
+- 렌더링 결과는 본문 해시와 RENDER_VERSION으로 식별되는 불변 값입니다.
+  같은 본문은 어느 레슨이든 한 번만 렌더링되고, ETag도 해시로 바로 계산합니다 (본문을 읽지 않고 304).
+- 1단계: 워커 로컬 mmap 캐시(RENDER_CACHE_DIR), 2단계: 콘텐츠 저장소의 derived/ 산출물 (호스트 간 공유)
+- 렌더링(마크다운 파싱, Pygments, 정제)은 CPU 작업이므로 프로세스 풀(RENDER_WORKERS)에서 실행합니다.
+- 본문을 쓰는 코드는 prerender(text)로 쓰기 시점에 렌더링할 수 있고, 그렇지 않으면 첫 조회 시 렌더링합니다.
+- 렌더러(마크다운 옵션, 허용 태그, 하이라이트 형식)를 바꾸면 RENDER_VERSION을 올립니다.
+"""
+import argparse
+import asyncio
+import html
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import orjson
+from ..core.cache import ResultCache
+from ..core.config import settings
+from ..core.supabase import get_supabase_client
+from .content_store import ContentStore, MappedCache, content_hash, content_store
+import logging
+
+logger = logging.getLogger(__name__)
+
+RENDER_VERSION = 1
+
+# 정제 후 남기는 태그/속성 (원시 HTML은 파서에서 이미 이스케이프, 정제는 이중 방어)
+_ALLOWED_TAGS = {
+    "p", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6", "strong", "em", "s", "del", "code", "pre",
+    "blockquote", "ul", "ol", "li", "a", "img", "table", "thead", "tbody", "tr", "th", "td", "span",
+}
+_ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title"},
+    "ol": {"start"},
+    "pre": {"class"},
+    "code": {"class"},
+    "span": {"class"},
+    "th": {"style"},
+    "td": {"style"},
+    **{f"h{level}": {"id"} for level in range(1, 7)},
+}
+_TOC_MAX_LEVEL = 3
+
+_parser = None
+_formatter = None
+
+
+# ============================================================================
+# 렌더러 (렌더링 프로세스에서 실행)
+# ============================================================================
+
+def _highlight(code: str, language: str, attrs: str) -> str:
+    """펜스 코드 블록 하이라이트 (알 수 없는 언어는 기본 렌더링)"""
+    from pygments import highlight
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+
+    if not language:
+        return ""
+    try:
+        lexer = get_lexer_by_name(language, stripnl=False)
+    except ClassNotFound:
+        return ""
+    body = highlight(code, lexer, _formatter)
+    return f'<pre class="highlight"><code class="language-{html.escape(language)}">{body}</code></pre>\n'
+
+
+def _get_parser() -> Any:
+    global _parser, _formatter
+    if _parser is None:
+        from markdown_it import MarkdownIt
+        from mdit_py_plugins.anchors import anchors_plugin
+        from pygments.formatters import HtmlFormatter
+
+        _formatter = HtmlFormatter(nowrap=True)
+        _parser = (
+            MarkdownIt("commonmark", {"html": False, "linkify": False, "highlight": _highlight})
+            .enable(["table", "strikethrough"])
+            .use(anchors_plugin, min_level=1, max_level=6)
+        )
+    return _parser
+
+
+def render_markdown(text: str, digest: str) -> bytes:
+    """
+    마크다운 → 렌더링 결과 JSON (content_hash, renderer, html, toc)
+
+    응답 본문에 그대로 넣을 수 있도록 직렬화된 바이트를 반환합니다.
+    """
+    import nh3
+
+    parser = _get_parser()
+    tokens = parser.parse(text)
+    toc: List[Dict[str, Any]] = []
+    for index, token in enumerate(tokens):
+        if token.type == "heading_open" and int(token.tag[1]) <= _TOC_MAX_LEVEL:
+            inline = tokens[index + 1]
+            title = "".join(
+                child.content for child in inline.children or () if child.type in ("text", "code_inline")
+            )
+            toc.append({"level": int(token.tag[1]), "id": token.attrGet("id"), "title": title})
+
+    rendered = nh3.clean(
+        parser.renderer.render(tokens, parser.options, {}),
+        tags=_ALLOWED_TAGS,
+        attributes=_ALLOWED_ATTRIBUTES,
+        url_schemes={"http", "https", "mailto"},
+        filter_style_properties={"text-align"},
+        link_rel="noopener noreferrer nofollow",
+    )
+    return orjson.dumps({"content_hash": digest, "renderer": RENDER_VERSION, "html": rendered, "toc": toc})
+
+
+def highlight_css() -> str:
+    """코드 하이라이트 스타일시트 (.highlight 범위)"""
+    from pygments.formatters import HtmlFormatter
+
+    return HtmlFormatter().get_style_defs(".highlight")
+
+
+# ============================================================================
+# 렌더링 서비스
+# ============================================================================
+
+class RenderService:
+    """레슨 HTML 렌더링 서비스"""
+
+    def __init__(self, store: Optional[ContentStore] = None, cache: Optional[MappedCache] = None):
+        self.store = store or content_store
+        self.cache = cache or MappedCache(settings.RENDER_CACHE_DIR, settings.RENDER_CACHE_MAX_BYTES)
+        self.lesson_hashes = ResultCache("lesson_hash", settings.LESSON_HASH_CACHE_TTL_SECONDS)
+        self._inflight: Dict[str, "asyncio.Future[Optional[bytes]]"] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {"cache_hits": 0, "store_hits": 0, "renders": 0}
+
+    @property
+    def pool(self) -> Optional[ProcessPoolExecutor]:
+        """렌더링 프로세스 풀 (첫 사용 시 생성)"""
+        if self._pool is None and settings.RENDER_WORKERS > 0:
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    @staticmethod
+    def _name(digest: str) -> str:
+        return f"{digest}.r{RENDER_VERSION}"
+
+    @staticmethod
+    def etag(digest: str) -> str:
+        """렌더링 결과의 강한 ETag (본문 해시 + 렌더러 버전)"""
+        return f'"{digest}.r{RENDER_VERSION}"'
+
+    async def _render(self, text: str, digest: str) -> bytes:
+        self.stats["renders"] += 1
+        pool = self.pool
+        if pool is None:
+            return await asyncio.to_thread(render_markdown, text, digest)
+        return await asyncio.get_running_loop().run_in_executor(pool, render_markdown, text, digest)
+
+    async def _save(self, name: str, blob: bytes) -> None:
+        try:
+            await self.store.put_derived(name, blob)
+        except Exception as e:
+            # 공유 저장 실패는 다른 호스트가 다시 렌더링하면 되므로 응답을 실패시키지 않음
+            logger.warning(f"Failed to store rendered lesson {name}: {e}")
+        self.cache.write(name, blob)
+
+    async def prerender(self, text: str) -> str:
+        """쓰기 시점 렌더링 (이미 렌더링된 본문은 건너뜀, 본문 해시 반환)"""
+        digest = content_hash(text)
+        name = self._name(digest)
+        if self.cache.read_bytes(name) is None and await self.store.get_derived(name) is None:
+            await self._save(name, await self._render(text, digest))
+        return digest
+
+    async def rendered(self, digest: str) -> Optional[bytes]:
+        """본문 해시의 렌더링 결과 (없으면 저장소의 본문으로 렌더링, 본문도 없으면 None)"""
+        name = self._name(digest)
+        blob = self.cache.read_bytes(name)
+        if blob is not None:
+            self.stats["cache_hits"] += 1
+            return blob
+
+        pending = self._inflight.get(name)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: "asyncio.Future[Optional[bytes]]" = asyncio.get_running_loop().create_future()
+        self._inflight[name] = future
+        try:
+            blob = await self._load(digest, name)
+            future.set_result(blob)
+            return blob
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(name, None)
+
+    async def _load(self, digest: str, name: str) -> Optional[bytes]:
+        blob = await self.store.get_derived(name)
+        if blob is not None:
+            self.stats["store_hits"] += 1
+            self.cache.write(name, blob)
+            return blob
+        text = await self.store.get(digest)
+        if text is None:
+            return None
+        blob = await self._render(text, digest)
+        await self._save(name, blob)
+        return blob
+
+    # ------------------------------------------------------------------
+    # 레슨 ID → 본문 해시
+    # ------------------------------------------------------------------
+
+    async def lesson_hash(self, lesson_id: str) -> Optional[str]:
+        """
+        레슨 본문 해시 (레슨이 없거나 본문이 비어 있으면 None)
+
+        본문이 아직 행에 있는 레슨(이전 전)은 해시를 계산하고 바로 렌더링해 둡니다.
+        """
+        cached = await self.lesson_hashes.get(lesson_id)
+        if cached is not None:
+            return cached["hash"]
+
+        lesson = await self._fetch_lesson(lesson_id)
+        if lesson is None:
+            return None
+        if lesson.get("content") is not None:
+            digest = await self.prerender(lesson["content"])
+        elif lesson.get("content_hash"):
+            digest = lesson["content_hash"].strip()
+        else:
+            return None
+        await self.lesson_hashes.set(lesson_id, {"hash": digest})
+        return digest
+
+    async def invalidate_lessons(self, *lesson_ids: str) -> None:
+        """
+        레슨 본문 쓰기 후 호출 (캐시된 본문 해시 삭제)
+
+        Redis를 쓰지 않으면 다른 프로세스의 캐시는 LESSON_HASH_CACHE_TTL_SECONDS 후에 갱신됩니다.
+        """
+        await self.lesson_hashes.delete(*(str(lesson_id) for lesson_id in lesson_ids))
+
+    async def _fetch_lesson(self, lesson_id: str) -> Optional[Dict[str, Any]]:
+        client = get_supabase_client(service=True) or get_supabase_client()
+        if client is None:
+            raise RuntimeError("Supabase is not configured")
+        response = await asyncio.to_thread(
+            lambda: client.table("lessons").select("id,content_hash,content").eq("id", lesson_id).limit(1).execute()
+        )
+        return response.data[0] if response.data else None
+
+    async def aclose(self) -> None:
+        """렌더링 프로세스 풀과 열린 mmap 정리"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.cache.close()
+
+
+# 싱글톤 렌더링 서비스 인스턴스
+render_service = RenderService()
+
+
+# ============================================================================
+# 일괄 사전 렌더링 (prerender)
+# ============================================================================
+
+async def prerender_all(database_url: str, concurrency: int, batch_size: int = 500) -> int:
+    """모든 레슨 본문을 렌더링해 저장소에 기록 (렌더링한 본문 수, 이미 렌더링된 본문 제외)"""
+    import asyncpg
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def render(row: Any) -> None:
+        async with semaphore:
+            if row["content"] is not None:
+                await render_service.prerender(row["content"])
+            else:
+                await render_service.rendered(row["content_hash"].strip())
+
+    conn = await asyncpg.connect(database_url)
+    seen, last_id = 0, None
+    started = time.monotonic()
+    try:
+        while True:
+            rows = await conn.fetch(
+                """SELECT id, content_hash, content FROM lessons
+                   WHERE (content IS NOT NULL OR content_hash IS NOT NULL) AND ($1::uuid IS NULL OR id > $1)
+                   ORDER BY id LIMIT $2""",
+                last_id, batch_size,
+            )
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+            await asyncio.gather(*(render(row) for row in rows))
+            seen += len(rows)
+            rate = seen / max(time.monotonic() - started, 1e-6)
+            print(f"\r  🖋️ {seen:,} lessons ({rate:,.0f}/s, 렌더링 {render_service.stats['renders']:,})", end="")
+            sys.stdout.flush()
+    finally:
+        await conn.close()
+        await render_service.aclose()
+        await content_store.aclose()
+    print()
+    return render_service.stats["renders"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Lesson HTML renderer")
+    commands = parser.add_subparsers(dest="command", required=True)
+    prerender_parser = commands.add_parser("prerender", help="모든 레슨 본문을 미리 렌더링")
+    prerender_parser.add_argument("--database-url", help="기본값: DATABASE_URL")
+    prerender_parser.add_argument("--concurrency", type=int, default=8, help="동시 렌더링 수")
+    args = parser.parse_args(argv)
+
+    url = args.database_url or settings.DATABASE_URL
+    if not url:
+        parser.error("DATABASE_URL이 설정되지 않았습니다 (--database-url 또는 환경 변수)")
+    from ..core.database import plain_url
+    url = plain_url(url)
+
+    print(f"🖋️ 레슨 HTML 사전 렌더링 (렌더러 v{RENDER_VERSION}, 프로세스 {settings.RENDER_WORKERS}개)")
+    rendered = asyncio.run(prerender_all(url, args.concurrency))
+    print(f"🎉 완료: {rendered:,}개 본문 렌더링")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
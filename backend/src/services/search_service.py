@@ -0,0 +1,507 @@
+"""
+검색 서비스
+코스/레슨 전문 검색 (PostgreSQL tsvector 또는 DATABASE_URL 기반 인메모리 역색인)
+"""
+import asyncio
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from ..core.config import settings
+from ..core.supabase import get_supabase_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# 토크나이저
+# ============================================================================
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_HANGUL_PATTERN = re.compile(r"[가-힣]")
+
+# 어절 끝에 붙는 조사 (긴 것부터 검사)
+_KOREAN_PARTICLES = sorted([
+    "에서는", "으로는", "에게서", "까지는", "부터는",
+    "에서", "으로", "에게", "까지", "부터", "처럼", "보다", "이나", "이란", "이다",
+    "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만", "나",
+], key=len, reverse=True)
+
+
+def _strip_particle(word: str) -> str:
+    """한국어 어절에서 조사 제거"""
+    for particle in _KOREAN_PARTICLES:
+        if len(word) > len(particle) + 1 and word.endswith(particle):
+            return word[:-len(particle)]
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    검색용 토큰 분리
+
+    영문/숫자는 소문자 단어 단위로, 한국어는 조사를 제거한 어간과
+    음절 바이그램을 함께 생성합니다 (복합명사 "머신러닝" → "머신", "러닝" 매칭).
+    """
+    if not text:
+        return []
+
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    tokens: List[str] = []
+
+    for word in _TOKEN_PATTERN.findall(normalized):
+        if _HANGUL_PATTERN.search(word):
+            stem = _strip_particle(word)
+            tokens.append(stem)
+            if len(stem) > 2:
+                tokens.extend(stem[i:i + 2] for i in range(len(stem) - 1))
+        elif len(word) > 1 or word.isdigit():
+            tokens.append(word)
+
+    return tokens
+
+
+def _deletes(term: str) -> Set[str]:
+    """편집 거리 1의 삭제 변형 생성 (SymSpell 방식)"""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """두 문자열의 Damerau-Levenshtein 거리가 1 이하인지 확인"""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        return (len(diff) == 2 and diff[1] == diff[0] + 1
+                and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]])
+    if la > lb:
+        a, b = b, a
+    # b가 a보다 한 글자 긴 경우: 한 글자 삽입으로 일치하는지 확인
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+# ============================================================================
+# 인메모리 역색인
+# ============================================================================
+
+@dataclass
+class SearchDocument:
+    """검색 대상 문서"""
+    kind: str  # course, lesson
+    id: str
+    title: str
+    snippet: str = ""
+    course_id: Optional[str] = None
+    fields: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.kind, self.id)
+
+
+class InMemorySearchIndex:
+    """
+    BM25 랭킹 기반 인메모리 역색인
+
+    PostgreSQL을 사용할 수 없는 환경(SQLite 테스트, 로컬 개발)에서 사용합니다.
+    접두사 검색과 편집 거리 1 이내의 오타 허용 검색을 지원합니다.
+    """
+
+    # 필드별 가중치 (tsvector setweight A/B/C와 동일한 의도)
+    FIELD_WEIGHTS = {
+        "title": 3.0,
+        "tags": 3.0,
+        "short_description": 2.0,
+        "description": 1.0,
+        "content": 1.0,
+    }
+
+    PREFIX_WEIGHT = 0.7
+    FUZZY_WEIGHT = 0.5
+    MAX_EXPANSIONS = 20
+    MIN_FUZZY_LENGTH = 4
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        """색인 초기화"""
+        self._documents: Dict[Tuple[str, str], SearchDocument] = {}
+        self._postings: Dict[str, Dict[Tuple[str, str], float]] = defaultdict(dict)
+        self._doc_terms: Dict[Tuple[str, str], Set[str]] = {}
+        self._doc_lengths: Dict[Tuple[str, str], float] = {}
+        self._total_length = 0.0
+        self._sorted_terms: Optional[List[str]] = None
+        self._delete_map: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    # ------------------------------------------------------------------
+    # 색인
+    # ------------------------------------------------------------------
+
+    def add(self, document: SearchDocument) -> None:
+        """문서 추가 (같은 키가 있으면 교체)"""
+        key = document.key
+        if key in self._documents:
+            self.remove(*key)
+
+        weighted_tf: Dict[str, float] = defaultdict(float)
+        for field_name, text in document.fields.items():
+            weight = self.FIELD_WEIGHTS.get(field_name, 1.0)
+            for token in tokenize(text):
+                weighted_tf[token] += weight
+
+        for term, tf in weighted_tf.items():
+            if term not in self._postings:
+                self._sorted_terms = None
+                if len(term) >= self.MIN_FUZZY_LENGTH:
+                    for variant in _deletes(term):
+                        self._delete_map[variant].add(term)
+            self._postings[term][key] = tf
+
+        length = sum(weighted_tf.values())
+        self._documents[key] = document
+        self._doc_terms[key] = set(weighted_tf)
+        self._doc_lengths[key] = length
+        self._total_length += length
+
+    def remove(self, kind: str, doc_id: str) -> None:
+        """문서 제거"""
+        key = (kind, doc_id)
+        if key not in self._documents:
+            return
+
+        for term in self._doc_terms.pop(key):
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                self._sorted_terms = None
+
+        self._total_length -= self._doc_lengths.pop(key)
+        del self._documents[key]
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def _expand_term(self, term: str) -> List[Tuple[str, float]]:
+        """질의어를 정확/접두사/오타 허용 후보로 확장"""
+        expansions: List[Tuple[str, float]] = []
+        if term in self._postings:
+            expansions.append((term, 1.0))
+
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+
+        start = bisect_left(self._sorted_terms, term)
+        for candidate in self._sorted_terms[start:start + self.MAX_EXPANSIONS + 1]:
+            if not candidate.startswith(term):
+                break
+            if candidate != term:
+                expansions.append((candidate, self.PREFIX_WEIGHT))
+
+        # 정확히 일치하는 단어가 없을 때만 오타 허용 검색
+        if not expansions and len(term) >= self.MIN_FUZZY_LENGTH:
+            candidates: Set[str] = set(self._delete_map.get(term, ()))
+            for variant in _deletes(term):
+                if variant in self._postings:
+                    candidates.add(variant)
+                candidates.update(self._delete_map.get(variant, ()))
+            for candidate in candidates:
+                if candidate in self._postings and _within_one_edit(term, candidate):
+                    expansions.append((candidate, self.FUZZY_WEIGHT))
+
+        return expansions
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        kinds: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """질의어로 문서 검색 (BM25 점수 내림차순)"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._documents:
+            return []
+
+        allowed_kinds = set(kinds) if kinds else None
+        doc_count = len(self._documents)
+        avg_length = self._total_length / doc_count if doc_count else 1.0
+        scores: Dict[Tuple[str, str], float] = defaultdict(float)
+
+        for term in terms:
+            for candidate, weight in self._expand_term(term):
+                postings = self._postings[candidate]
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, tf in postings.items():
+                    if allowed_kinds and key[0] not in allowed_kinds:
+                        continue
+                    norm = self.K1 * (1 - self.B + self.B * self._doc_lengths[key] / avg_length)
+                    scores[key] += weight * idf * tf * (self.K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        results = []
+        for key, score in ranked:
+            document = self._documents[key]
+            results.append({
+                "kind": document.kind,
+                "id": document.id,
+                "course_id": document.course_id,
+                "title": document.title,
+                "snippet": document.snippet,
+                "score": round(score, 4),
+            })
+        return results
+
+
+# ============================================================================
+# 문서 변환
+# ============================================================================
+
+def course_document(course: Any) -> SearchDocument:
+    """Course 모델(또는 dict)을 검색 문서로 변환"""
+    get = course.get if isinstance(course, dict) else lambda name: getattr(course, name, None)
+    tags = get("tags") or []
+    description = get("description") or ""
+    short_description = get("short_description") or ""
+    return SearchDocument(
+        kind="course",
+        id=str(get("id")),
+        title=get("title") or "",
+        snippet=short_description or description[:200],
+        course_id=str(get("id")),
+        fields={
+            "title": get("title") or "",
+            "tags": " ".join(str(tag) for tag in tags) if isinstance(tags, list) else str(tags),
+            "short_description": short_description,
+            "description": description,
+        },
+    )
+
+
+def lesson_document(lesson: Any, course_id: Optional[str] = None) -> SearchDocument:
+    """Lesson 모델(또는 dict)을 검색 문서로 변환"""
+    get = lesson.get if isinstance(lesson, dict) else lambda name: getattr(lesson, name, None)
+    # 저장소로 이전된 본문은 호출자가 content에 채워 넘김 (못 가져오면 미리보기)
+    content = get("content")
+    if content is None:
+        content = get("content_preview")
+    content = content or ""
+    if course_id is None and not isinstance(lesson, dict):
+        module = getattr(lesson, "module", None)
+        course_id = getattr(module, "course_id", None)
+    return SearchDocument(
+        kind="lesson",
+        id=str(get("id")),
+        title=get("title") or "",
+        snippet=content[:200],
+        course_id=str(course_id) if course_id else None,
+        fields={"title": get("title") or "", "content": content},
+    )
+
+
+# ============================================================================
+# 검색 서비스
+# ============================================================================
+
+def _invalidate_catalog_cache() -> None:
+    """카탈로그 응답 캐시 무효화 (색인 변경 시 검색 결과도 달라지므로)"""
+    from ..middleware.response_cache import response_cache
+    response_cache.invalidate_nowait("catalog")
+
+
+class SearchUnavailableError(RuntimeError):
+    """검색 백엔드를 사용할 수 없음 (RPC 실패 또는 색인 미구성, 503으로 응답)"""
+
+
+class SearchService:
+    """
+    코스/레슨 검색 서비스
+
+    Supabase(PostgreSQL)가 설정되어 있으면 `search_catalog` RPC를 사용하고,
+    그렇지 않으면 DATABASE_URL의 코스/레슨으로 만든 인메모리 역색인을 사용합니다.
+    색인은 시작 시 구성되고 SEARCH_INDEX_REFRESH_SECONDS마다 새로 만들어 교체됩니다.
+    앱에는 코스/레슨 쓰기 경로가 없고 임포터 등 다른 프로세스가 쓰므로, 변경은 다음 재구성 때 반영됩니다.
+    RPC가 실패하거나 색인이 아직 없으면 빈 결과 대신 SearchUnavailableError를 발생시킵니다.
+    """
+
+    def __init__(self):
+        self.backend = settings.SEARCH_BACKEND
+        self.index = InMemorySearchIndex()
+        self.ready = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def uses_postgres(self) -> bool:
+        if self.backend == "memory":
+            return False
+        if self.backend == "postgres":
+            return True
+        return bool(settings.SUPABASE_URL and settings.SUPABASE_KEY)
+
+    # ------------------------------------------------------------------
+    # 인메모리 색인 관리
+    # ------------------------------------------------------------------
+
+    async def rebuild(self) -> int:
+        """
+        DATABASE_URL(PostgreSQL/SQLite)의 코스/레슨으로 새 색인을 만들어 교체
+
+        콘텐츠 저장소로 이전된 본문은 먼저 저장소에서 읽어 전체 본문을 색인합니다.
+        토큰화는 스레드에서 수행하고, 완성된 색인으로 한 번에 교체하므로
+        재구성 중에도 이전 색인으로 검색됩니다.
+        """
+        from sqlalchemy import select
+        from ..core.database import database
+        from ..models import Course, Lesson, Module
+        from .content_store import content_store
+
+        async with database.session(read_only=True) as session:
+            courses = (await session.execute(select(
+                Course.id, Course.title, Course.tags, Course.description, Course.short_description
+            ))).mappings().all()
+            lessons = (await session.execute(select(
+                Lesson.id, Lesson.title, Lesson.content, Lesson.content_hash,
+                Lesson.content_preview, Module.course_id
+            ).join(Module, Lesson.module_id == Module.id))).mappings().all()
+
+        lessons = [dict(lesson) for lesson in lessons]
+        offloaded = [lesson for lesson in lessons if lesson["content"] is None and lesson["content_hash"]]
+        if offloaded:
+            try:
+                bodies = await content_store.get_many(lesson["content_hash"].strip() for lesson in offloaded)
+            except Exception as e:
+                logger.error(f"Search index could not load offloaded lesson bodies: {str(e)}")
+                bodies = {}
+            for lesson in offloaded:
+                lesson["content"] = bodies.get(lesson["content_hash"].strip())
+
+        def build() -> InMemorySearchIndex:
+            index = InMemorySearchIndex()
+            for course in courses:
+                index.add(course_document(dict(course)))
+            for lesson in lessons:
+                index.add(lesson_document(lesson, lesson["course_id"]))
+            return index
+
+        self.index = await asyncio.to_thread(build)
+        self.ready = True
+        _invalidate_catalog_cache()
+        return len(self.index)
+
+    # ------------------------------------------------------------------
+    # 주기적 재구성 (lifespan에서 시작/종료)
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """인메모리 색인을 사용하는 경우 색인 구성 태스크 시작"""
+        from ..core.database import database
+
+        if self.uses_postgres or self._task is not None:
+            return
+        if not database.is_configured:
+            logger.warning("Search index disabled: DATABASE_URL is not configured")
+            return
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                count = await self.rebuild()
+                logger.info(f"Search index built: {count} documents")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Search index build failed: {str(e)}")
+            if settings.SEARCH_INDEX_REFRESH_SECONDS <= 0:
+                return
+            await asyncio.sleep(settings.SEARCH_INDEX_REFRESH_SECONDS)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 20,
+        include_lessons: bool = True
+    ) -> List[Dict[str, Any]]:
+        """코스/레슨 통합 검색"""
+        query = query.strip()[:settings.SEARCH_MAX_QUERY_LENGTH]
+        if not query:
+            return []
+
+        if self.uses_postgres:
+            try:
+                return await self._search_postgres(query, limit, include_lessons)
+            except Exception as e:
+                logger.error(f"Postgres search failed: {str(e)}")
+                raise SearchUnavailableError("Search is temporarily unavailable") from e
+
+        if not self.ready:
+            raise SearchUnavailableError("Search index is not available")
+        kinds = None if include_lessons else ["course"]
+        return self.index.search(query, limit=limit, kinds=kinds)
+
+    async def _search_postgres(
+        self,
+        query: str,
+        limit: int,
+        include_lessons: bool
+    ) -> List[Dict[str, Any]]:
+        """Supabase RPC(search_catalog)로 검색"""
+        client = get_supabase_client(replica=True)
+        if client is None:
+            raise RuntimeError("Supabase is not configured")
+
+        response = await asyncio.to_thread(
+            lambda: client.rpc("search_catalog", {
+                "query_text": query,
+                "result_limit": limit,
+                "include_lessons": include_lessons,
+            }).execute()
+        )
+        return [
+            {
+                "kind": row["kind"],
+                "id": row["id"],
+                "course_id": row.get("course_id"),
+                "title": row["title"],
+                "snippet": row.get("snippet") or "",
+                "score": round(float(row.get("score") or 0.0), 4),
+            }
+            for row in response.data or []
+        ]
+
+
+# 싱글톤 검색 서비스 인스턴스
+search_service = SearchService()
@@ -0,0 +1,263 @@
+"""
+세션 서비스
+Supabase Auth(GoTrue) 무상태 HTTP 호출 및 토큰별 사용자 컨텍스트 캐시
+
+supabase-py 클라이언트의 auth는 프로세스 전체에서 하나의 세션을 보관하므로
+(로그인/갱신/로그아웃이 다른 사용자의 세션을 덮어씀) 인증 API는 이 서비스를 사용합니다.
+
+- 모든 호출은 요청으로 받은 토큰만 사용하며, 공유 커넥션 풀(httpx)로 병렬 처리됩니다.
+- 액세스 토큰 → 사용자 컨텍스트는 토큰 해시 키로 짧은 TTL 동안 캐시됩니다 (Redis 공유, 없으면 프로세스 내).
+- 같은 토큰에 대한 동시 조회는 한 번의 GoTrue 호출로 합쳐집니다.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+import httpx
+from ..core.cache import ResultCache
+from ..core.config import settings
+from ..core.logging import truncate
+from ..core.startup import startup_timer
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SessionError(Exception):
+    """GoTrue 오류 (status_code: 업스트림 HTTP 상태, 연결 실패 시 503)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class SessionUser:
+    """인증된 사용자 컨텍스트"""
+    id: str
+    email: Optional[str] = None
+    role: str = "student"
+    created_at: Optional[str] = None
+    app_metadata: Dict[str, Any] = field(default_factory=dict)
+    user_metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_gotrue(cls, user: Dict[str, Any]) -> "SessionUser":
+        app_metadata = user.get("app_metadata") or {}
+        return cls(
+            id=user["id"],
+            email=user.get("email"),
+            role=app_metadata.get("role") or "student",
+            created_at=user.get("created_at"),
+            app_metadata=app_metadata,
+            user_metadata=user.get("user_metadata") or {},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def token_key(token: str) -> str:
+    """캐시 키용 토큰 해시 (토큰 원문은 저장하지 않음)"""
+    return hashlib.blake2b(token.encode(), digest_size=20).hexdigest()
+
+
+def token_expires_in(token: str) -> Optional[float]:
+    """JWT exp까지 남은 시간 (서명 검증 없이 페이로드만 읽음, 형식이 다르면 None)"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"]) - time.time()
+    except (IndexError, KeyError, ValueError, TypeError):
+        return None
+
+
+class SessionService:
+    """GoTrue 무상태 세션 서비스"""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.user_cache = ResultCache("session", settings.SESSION_CACHE_TTL_SECONDS,
+                                      max_entries=settings.SESSION_CACHE_MAX_ENTRIES)
+
+    @property
+    def auth_url(self) -> str:
+        if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+            raise SessionError("인증 서비스가 설정되지 않았습니다 (SUPABASE_URL/SUPABASE_KEY)", 503)
+        return f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1"
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP 클라이언트 (첫 사용 시 생성, 커넥션 풀 공유)"""
+        if self._client is None or self._client.is_closed:
+            with startup_timer.measure("session_service.client"):
+                self._client = httpx.AsyncClient(
+                    timeout=settings.SESSION_HTTP_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(max_connections=settings.SESSION_HTTP_MAX_CONNECTIONS),
+                )
+        return self._client
+
+    async def aclose(self) -> None:
+        """HTTP 클라이언트 정리"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        access_token: Optional[str] = None,
+        service: bool = False,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        api_key = settings.SUPABASE_KEY
+        if service:
+            if not settings.SUPABASE_SERVICE_KEY:
+                raise SessionError("관리 API에는 SUPABASE_SERVICE_KEY가 필요합니다", 503)
+            api_key = settings.SUPABASE_SERVICE_KEY
+        headers = {"apikey": api_key}
+        headers["Authorization"] = f"Bearer {access_token or api_key}"
+        try:
+            response = await self.client.request(method, f"{self.auth_url}{path}", headers=headers, **kwargs)
+        except httpx.HTTPError as e:
+            logger.error(f"Supabase Auth request failed: {path} - {str(e)}")
+            raise SessionError("인증 서비스에 연결할 수 없습니다", 503)
+
+        if response.status_code == 204 or not response.content:
+            return None
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if response.status_code >= 400:
+            message = (
+                data.get("error_description") or data.get("msg") or data.get("message")
+                or data.get("error") or response.reason_phrase
+            )
+            if response.status_code >= 500:
+                logger.error(f"Supabase Auth error: {response.status_code} - {truncate(response.text)}")
+            raise SessionError(message, response.status_code)
+        return data
+
+    # ------------------------------------------------------------------
+    # 세션 발급
+    # ------------------------------------------------------------------
+
+    async def _remember(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """발급된 세션의 사용자 컨텍스트를 캐시에 미리 저장 (/auth/me 첫 조회 생략)"""
+        if session.get("access_token") and session.get("user"):
+            await self._cache_user(session["access_token"], SessionUser.from_gotrue(session["user"]))
+        return session
+
+    async def sign_up(self, email: str, password: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """회원가입 (이메일 확인이 필요한 프로젝트면 세션 없이 user만 반환됨)"""
+        data = await self._request("POST", "/signup", json={
+            "email": email, "password": password, "data": metadata
+        }) or {}
+        if "access_token" not in data and "id" in data:
+            return {"user": data}
+        return await self._remember(data)
+
+    async def sign_in(self, email: str, password: str) -> Dict[str, Any]:
+        data = await self._request("POST", "/token", params={"grant_type": "password"}, json={
+            "email": email, "password": password
+        })
+        return await self._remember(data or {})
+
+    async def refresh(self, refresh_token: str) -> Dict[str, Any]:
+        """리프레시 토큰으로 새 세션 발급"""
+        data = await self._request("POST", "/token", params={"grant_type": "refresh_token"}, json={
+            "refresh_token": refresh_token
+        })
+        return await self._remember(data or {})
+
+    async def sign_out(self, access_token: str) -> None:
+        """세션 종료 (해당 토큰의 캐시된 사용자 컨텍스트도 삭제)"""
+        await self.user_cache.delete(token_key(access_token))
+        await self._request("POST", "/logout", access_token=access_token)
+
+    # ------------------------------------------------------------------
+    # 관리 API (서비스 키, 대량 가져오기 등)
+    # ------------------------------------------------------------------
+
+    async def admin_create_user(
+        self,
+        email: str,
+        user_metadata: Dict[str, Any],
+        app_metadata: Dict[str, Any],
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        확인된 이메일로 로그인 계정 생성 (비밀번호 없음)
+
+        사용자는 비밀번호 재설정 메일이나 매직 링크로 처음 로그인합니다.
+        user_id를 지정하면 그 ID로 생성합니다.
+        """
+        body: Dict[str, Any] = {
+            "email": email,
+            "email_confirm": True,
+            "user_metadata": user_metadata,
+            "app_metadata": app_metadata,
+        }
+        if user_id:
+            body["id"] = user_id
+        data = await self._request("POST", "/admin/users", service=True, json=body)
+        if not data or "id" not in data:
+            raise SessionError("계정 생성 응답에 사용자 ID가 없습니다", 502)
+        return data
+
+    async def admin_update_app_metadata(self, user_id: str, app_metadata: Dict[str, Any]) -> None:
+        """app_metadata 갱신 (역할 등, 기존 키와 병합됨)"""
+        await self._request("PUT", f"/admin/users/{user_id}", service=True, json={"app_metadata": app_metadata})
+
+    # ------------------------------------------------------------------
+    # 사용자 컨텍스트
+    # ------------------------------------------------------------------
+
+    async def _cache_user(self, access_token: str, user: SessionUser) -> None:
+        ttl = settings.SESSION_CACHE_TTL_SECONDS
+        expires_in = token_expires_in(access_token)
+        if expires_in is not None:
+            ttl = min(ttl, int(expires_in))
+        if ttl > 0:
+            await self.user_cache.set(token_key(access_token), user.to_dict(), ttl=ttl)
+
+    async def get_user(self, access_token: str) -> SessionUser:
+        """액세스 토큰의 사용자 (캐시 우선, 동시 조회는 한 번만 호출)"""
+        key = token_key(access_token)
+        cached = await self.user_cache.get(key)
+        if cached is not None:
+            return SessionUser(**cached)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await self._request("GET", "/user", access_token=access_token)
+            if not data or "id" not in data:
+                raise SessionError("유효하지 않은 토큰입니다", 401)
+            user = SessionUser.from_gotrue(data)
+            await self._cache_user(access_token, user)
+            future.set_result(user)
+            return user
+        except asyncio.CancelledError:
+            future.cancel()  # 대기자가 영원히 기다리지 않도록 함께 취소
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없어도 경고가 남지 않도록 예외 조회
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+
+# 싱글톤 세션 서비스 인스턴스
+session_service = SessionService()
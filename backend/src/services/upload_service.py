@@ -0,0 +1,538 @@
+"""
+업로드 서비스
+강의 미디어 스트리밍 업로드 (청크 단위 디스크 기록, 이어 올리기, 증분 해시, S3 multipart, 썸네일 프로세스 풀)
+
+- 세션 생성(파일 이름, 형식, 크기) → PATCH로 Upload-Offset부터 이어서 전송 → 크기에 도달하면 완료
+  (tus 프로토콜 핵심 부분과 같은 방식, HEAD로 현재 오프셋 확인)
+- 요청 본문은 UPLOAD_BUFFER_SIZE 단위로 스테이징 파일에 기록하므로 요청당 메모리는 파일 크기와 무관합니다.
+- sha256은 받은 순서대로 증분 계산합니다 (다른 워커가 이어 받으면 스테이징 파일로 다시 계산).
+- 크기 제한은 세션 생성 시와 전송 중에 모두 확인하며, 초과하면 즉시 중단하고 세션을 폐기합니다.
+- s3 백엔드는 스테이징된 데이터가 UPLOAD_PART_SIZE에 도달할 때마다 파트를 올리고 완료 시 합칩니다.
+- 세션 상태는 UPLOAD_DIR/.partial/<id>.json에 있으므로 이어 올리기는 같은 호스트(또는 공유 볼륨)에서
+  처리되어야 합니다. 같은 세션에 대한 동시 요청은 파일 잠금으로 거부됩니다.
+"""
+import asyncio
+import fcntl
+import hashlib
+import multiprocessing
+import os
+import re
+import time
+import unicodedata
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import orjson
+from ..core.config import settings
+from ..core.s3 import S3Client, s3_client_from_settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_READ_SIZE = 64 * 1024
+_SWEEP_INTERVAL_SECONDS = 600
+_UNSAFE_FILENAME = re.compile(r"[^\w.\-]+")
+
+
+class UploadError(Exception):
+    """업로드 요청 오류 (HTTP 상태 코드와 응답 헤더 포함)"""
+
+    def __init__(self, message: str, status_code: int = 400, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+@dataclass
+class UploadSession:
+    """업로드 세션 상태"""
+    id: str
+    owner_id: str
+    filename: str
+    content_type: str
+    size: Optional[int]  # None이면 전송이 끝날 때 완료 (폼 업로드)
+    key: str  # 완료 후 저장 위치 (UPLOAD_DIR 또는 버킷 기준)
+    offset: int = 0
+    status: str = "uploading"  # uploading | complete
+    expected_sha256: Optional[str] = None
+    sha256: Optional[str] = None
+    thumbnail_key: Optional[str] = None
+    s3_upload_id: Optional[str] = None
+    parts: List[List[Any]] = field(default_factory=list)  # [파트 번호, ETag, 끝 오프셋]
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def to_public_dict(self) -> Dict[str, Any]:
+        """API 응답용 (소유자, multipart 내부 상태 제외)"""
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "content_type": self.content_type,
+            "size": self.size,
+            "offset": self.offset,
+            "status": self.status,
+            "sha256": self.sha256,
+            "key": self.key if self.status == "complete" else None,
+            "thumbnail_key": self.thumbnail_key,
+        }
+
+
+def safe_filename(filename: str) -> str:
+    """경로 구분자와 특수문자를 제거한 파일 이름 (한글 유지)"""
+    name = unicodedata.normalize("NFC", filename).replace("\\", "/").rsplit("/", 1)[-1]
+    name = _UNSAFE_FILENAME.sub("_", name).strip("._") or "file"
+    stem, dot, extension = name.rpartition(".")
+    if dot and len(extension) <= 10:
+        return f"{stem[:90]}.{extension}"
+    return name[:100]
+
+
+def content_type_allowed(content_type: str) -> bool:
+    """UPLOAD_ALLOWED_CONTENT_TYPES 확인 (image/* 형식 와일드카드 지원)"""
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    for allowed in settings.UPLOAD_ALLOWED_CONTENT_TYPES:
+        if allowed.endswith("/*") and content_type.startswith(allowed[:-1]):
+            return True
+        if content_type == allowed:
+            return True
+    return False
+
+
+def make_thumbnail(source: str, target: str, size: int) -> Tuple[int, int]:
+    """
+    이미지 썸네일 생성 (프로세스 풀에서 실행, JPEG, 생성된 크기 반환)
+
+    JPEG는 draft 모드로 축소 디코딩하므로 원본 전체를 메모리에 풀지 않습니다.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image.draft("RGB", (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(target, "JPEG", quality=85, optimize=True)
+        return image.size
+
+
+def _write_and_hash(fd: int, data: bytearray, offset: int, hasher: Any) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+    hasher.update(data)
+
+
+def _hash_file(path: Path, length: int) -> Any:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as file:
+        remaining = length
+        while remaining > 0:
+            chunk = file.read(min(_READ_SIZE * 16, remaining))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            remaining -= len(chunk)
+    return hasher
+
+
+async def _read_range(fd: int, start: int, length: int) -> AsyncIterator[bytes]:
+    """파일 구간을 고정 크기로 읽는 스트림 (파트 업로드 본문)"""
+    end = start + length
+    while start < end:
+        chunk = await asyncio.to_thread(os.pread, fd, min(_READ_SIZE, end - start), start)
+        if not chunk:
+            raise IOError("staged upload is shorter than expected")
+        start += len(chunk)
+        yield chunk
+
+
+class UploadService:
+    """미디어 업로드 서비스"""
+
+    def __init__(self):
+        self.root = Path(settings.UPLOAD_DIR)
+        self.partial_dir = self.root / ".partial"
+        self.backend = settings.UPLOAD_BACKEND
+        self.max_size = settings.MAX_FILE_SIZE
+        self.buffer_size = settings.UPLOAD_BUFFER_SIZE
+        self.part_size = max(settings.UPLOAD_PART_SIZE, 5 * 1024 * 1024)
+        self._hashers: Dict[str, Tuple[int, Any]] = {}  # 세션 ID → (오프셋, 증분 sha256)
+        self._s3: Optional[S3Client] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._last_sweep = 0.0
+
+    @property
+    def s3(self) -> S3Client:
+        if self._s3 is None:
+            self._s3 = s3_client_from_settings()
+        return self._s3
+
+    @property
+    def pool(self) -> Optional[ProcessPoolExecutor]:
+        """썸네일 프로세스 풀 (첫 사용 시 생성, spawn으로 시작해 워커의 스레드/루프 상태를 복제하지 않음)"""
+        if self._pool is None and settings.UPLOAD_THUMBNAIL_WORKERS > 0:
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.UPLOAD_THUMBNAIL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    # ------------------------------------------------------------------
+    # 세션 저장
+    # ------------------------------------------------------------------
+
+    def _session_path(self, upload_id: str) -> Path:
+        return self.partial_dir / f"{upload_id}.json"
+
+    def _data_path(self, upload_id: str) -> Path:
+        return self.partial_dir / f"{upload_id}.part"
+
+    def _save(self, session: UploadSession) -> None:
+        session.updated_at = time.time()
+        path = self._session_path(session.id)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_bytes(orjson.dumps(asdict(session)))
+        os.replace(temp_path, path)
+
+    def get(self, upload_id: str, owner_id: str) -> UploadSession:
+        """세션 조회 (다른 사용자의 세션은 없는 것으로 처리)"""
+        try:
+            uuid.UUID(upload_id)
+            data = orjson.loads(self._session_path(upload_id).read_bytes())
+        except (ValueError, FileNotFoundError):
+            raise UploadError("업로드를 찾을 수 없습니다", 404)
+        session = UploadSession(**data)
+        if session.owner_id != owner_id:
+            raise UploadError("업로드를 찾을 수 없습니다", 404)
+        return session
+
+    # ------------------------------------------------------------------
+    # 생성 / 취소
+    # ------------------------------------------------------------------
+
+    async def create(self, owner_id: str, filename: str, content_type: str, size: Optional[int],
+                     sha256: Optional[str] = None) -> UploadSession:
+        """업로드 세션 생성"""
+        if not content_type_allowed(content_type):
+            raise UploadError(f"허용되지 않는 파일 형식입니다: {content_type}", 415)
+        if size is not None and size > self.max_size:
+            raise UploadError(f"파일 크기 제한({self.max_size} bytes)을 초과했습니다", 413)
+        await self._sweep_if_due()
+
+        upload_id = str(uuid.uuid4())
+        session = UploadSession(
+            id=upload_id, owner_id=owner_id, filename=filename, content_type=content_type, size=size,
+            key=f"media/{upload_id}/{safe_filename(filename)}", expected_sha256=sha256,
+        )
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+        self._data_path(upload_id).touch()
+        if self.backend == "s3":
+            session.s3_upload_id = await self.s3.create_multipart_upload(session.key, content_type)
+        self._save(session)
+        return session
+
+    async def cancel(self, upload_id: str, owner_id: str) -> None:
+        """업로드 취소 (완료된 업로드는 기록만 삭제)"""
+        session = self.get(upload_id, owner_id)
+        await self._discard(session)
+
+    async def _discard(self, session: UploadSession) -> None:
+        self._hashers.pop(session.id, None)
+        if session.status != "complete" and session.s3_upload_id:
+            try:
+                await self.s3.abort_multipart_upload(session.key, session.s3_upload_id)
+            except Exception as e:
+                logger.warning(f"Failed to abort multipart upload {session.id}: {e}")
+        self._data_path(session.id).unlink(missing_ok=True)
+        self._session_path(session.id).unlink(missing_ok=True)
+
+    async def _sweep_if_due(self) -> None:
+        """만료된 세션 정리 (세션 생성 시 주기적으로)"""
+        now = time.time()
+        if now - self._last_sweep < _SWEEP_INTERVAL_SECONDS:
+            return
+        self._last_sweep = now
+        expires_before = now - settings.UPLOAD_SESSION_TTL_SECONDS
+        for path in self.partial_dir.glob("*.json") if self.partial_dir.exists() else ():
+            try:
+                session = UploadSession(**orjson.loads(path.read_bytes()))
+            except (ValueError, TypeError, FileNotFoundError):
+                continue
+            if session.updated_at < expires_before:
+                await self._discard(session)
+
+    # ------------------------------------------------------------------
+    # 전송
+    # ------------------------------------------------------------------
+
+    def _lock(self, upload_id: str) -> int:
+        """스테이징 파일 열기 + 배타 잠금 (다른 요청이 같은 세션을 전송 중이면 409)"""
+        try:
+            fd = os.open(self._data_path(upload_id), os.O_RDWR)
+        except FileNotFoundError:
+            raise UploadError("업로드를 찾을 수 없습니다", 404)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            raise UploadError("같은 업로드에 대한 다른 요청이 진행 중입니다", 409)
+        return fd
+
+    async def _hasher(self, session: UploadSession) -> Any:
+        cached = self._hashers.pop(session.id, None)
+        if cached is not None and cached[0] == session.offset:
+            return cached[1]
+        # 다른 워커/재시작 후 이어 받는 경우: 받은 부분을 다시 해시
+        return await asyncio.to_thread(_hash_file, self._data_path(session.id), session.offset)
+
+    async def append(self, upload_id: str, owner_id: str, offset: int, chunks: AsyncIterator[bytes],
+                     length: Optional[int] = None, finalize: bool = False) -> UploadSession:
+        """
+        offset부터 본문 스트림을 이어서 기록
+
+        length는 요청의 Content-Length(있으면 읽기 전에 크기 제한 확인),
+        finalize는 크기를 미리 모르는 업로드에서 스트림 끝을 파일 끝으로 처리할 때 사용합니다.
+        """
+        session = self.get(upload_id, owner_id)
+        if session.status == "complete":
+            if offset == session.offset and not length:
+                return session
+            raise UploadError("이미 완료된 업로드입니다", 409)
+        if offset != session.offset:
+            raise UploadError("업로드 오프셋이 일치하지 않습니다", 409, {"Upload-Offset": str(session.offset)})
+
+        limit = session.size if session.size is not None else self.max_size
+        if length is not None and offset + length > limit:
+            raise UploadError(f"파일 크기({limit} bytes)를 초과하는 요청입니다", 413)
+
+        fd = self._lock(upload_id)
+        try:
+            # 저장되지 않은 이전 요청의 기록분(비정상 종료) 제거
+            os.ftruncate(fd, session.offset)
+            hasher = await self._hasher(session)
+            buffer = bytearray()
+            written = session.offset
+
+            async def flush() -> None:
+                nonlocal written
+                if buffer:
+                    await asyncio.to_thread(_write_and_hash, fd, buffer, written, hasher)
+                    written += len(buffer)
+                    buffer.clear()
+
+            try:
+                async for chunk in chunks:
+                    if written + len(buffer) + len(chunk) > limit:
+                        await self._discard(session)
+                        raise UploadError(f"파일 크기 제한({limit} bytes)을 초과했습니다", 413)
+                    buffer += chunk
+                    if len(buffer) >= self.buffer_size:
+                        await flush()
+                await flush()
+            except UploadError:
+                raise
+            except BaseException:
+                # 연결 끊김 등: 받은 만큼 기록하고 다음 요청에서 이어 받음
+                await flush()
+                session.offset = written
+                self._hashers[session.id] = (written, hasher)
+                self._save(session)
+                raise
+
+            session.offset = written
+            if finalize and session.size is None:
+                session.size = written
+            self._hashers[session.id] = (written, hasher)
+            self._save(session)
+
+            complete = session.size is not None and written == session.size
+            if self.backend == "s3":
+                await self._upload_parts(session, fd, final=complete)
+            if complete:
+                await self._complete(session, hasher)
+            return session
+        finally:
+            os.close(fd)
+
+    async def _upload_parts(self, session: UploadSession, fd: int, final: bool) -> None:
+        """스테이징된 데이터를 파트 크기 단위로 업로드 (final이면 남은 부분까지)"""
+        start = session.parts[-1][2] if session.parts else 0
+        while True:
+            remaining = session.offset - start
+            if remaining <= 0 or (remaining < self.part_size and not final):
+                return
+            length = min(self.part_size, remaining)
+            number = len(session.parts) + 1
+            etag = await self.s3.upload_part(
+                session.key, session.s3_upload_id, number, _read_range(fd, start, length), length,
+            )
+            start += length
+            session.parts.append([number, etag, start])
+            self._save(session)
+
+    async def _complete(self, session: UploadSession, hasher: Any) -> None:
+        digest = hasher.hexdigest()
+        if session.expected_sha256 and digest != session.expected_sha256:
+            await self._discard(session)
+            raise UploadError("sha256이 일치하지 않습니다", 422)
+
+        staged = self._data_path(session.id)
+        thumbnail_key = f"media/{session.id}/thumbnail.jpg"
+        if self.backend == "s3":
+            if session.parts:
+                await self.s3.complete_multipart_upload(
+                    session.key, session.s3_upload_id, [(number, etag) for number, etag, _ in session.parts],
+                )
+            else:  # 빈 파일은 파트 없이 완료할 수 없음
+                await self.s3.abort_multipart_upload(session.key, session.s3_upload_id)
+                await self.s3.put_object(session.key, b"", session.content_type)
+            thumbnail_path = self.partial_dir / f"{session.id}.thumbnail.jpg"
+            if await self._thumbnail(session, staged, thumbnail_path):
+                await self.s3.put_object(thumbnail_key, thumbnail_path.read_bytes(), "image/jpeg")
+                thumbnail_path.unlink(missing_ok=True)
+                session.thumbnail_key = thumbnail_key
+            staged.unlink(missing_ok=True)
+        else:
+            target = self.root / session.key
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, target)
+            if await self._thumbnail(session, target, self.root / thumbnail_key):
+                session.thumbnail_key = thumbnail_key
+
+        session.status = "complete"
+        session.sha256 = digest
+        self._hashers.pop(session.id, None)
+        self._save(session)
+        logger.info(f"Upload {session.id} complete ({session.offset} bytes, {session.content_type})")
+
+        from .realtime_service import realtime_hub
+        try:
+            await realtime_hub.publish(f"user:{session.owner_id}", "upload.completed", session.to_public_dict())
+        except Exception as e:
+            logger.warning(f"Failed to publish upload completion {session.id}: {e}")
+
+    async def _thumbnail(self, session: UploadSession, source: Path, target: Path) -> bool:
+        if not session.content_type.startswith("image/") or self.pool is None:
+            return False
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self.pool, make_thumbnail, str(source), str(target), settings.UPLOAD_THUMBNAIL_SIZE,
+            )
+            return True
+        except Exception as e:
+            # 썸네일 실패(Pillow 미설치, 손상된 이미지 등)는 업로드 자체를 실패시키지 않음
+            logger.warning(f"Thumbnail generation failed for upload {session.id}: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # multipart/form-data (단일 요청 업로드)
+    # ------------------------------------------------------------------
+
+    async def receive_form(self, owner_id: str, content_type: str, stream: AsyncIterator[bytes]) -> UploadSession:
+        """
+        multipart/form-data 본문의 `file` 필드를 스트리밍으로 받아 업로드 완료
+
+        UploadFile처럼 본문을 임시 파일에 먼저 모으지 않고 파서 출력을 바로 세션에 기록합니다.
+        """
+        from python_multipart.multipart import MultipartParser, parse_options_header
+
+        _, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise UploadError("multipart boundary가 없습니다", 400)
+
+        # 파서 콜백은 동기이므로 이벤트를 모았다가 write() 후에 처리 (이벤트 크기 ≤ 받은 청크 크기)
+        events: List[Tuple[str, Any]] = []
+        header: Dict[str, bytearray] = {"field": bytearray(), "value": bytearray()}
+        headers: Dict[bytes, bytes] = {}
+
+        def on_header_field(data: bytes, start: int, end: int) -> None:
+            header["field"] += data[start:end]
+
+        def on_header_value(data: bytes, start: int, end: int) -> None:
+            header["value"] += data[start:end]
+
+        def on_header_end() -> None:
+            headers[bytes(header["field"]).lower()] = bytes(header["value"])
+            header["field"].clear()
+            header["value"].clear()
+
+        def on_headers_finished() -> None:
+            events.append(("part", dict(headers)))
+            headers.clear()
+
+        parser = MultipartParser(boundary, callbacks={
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+            "on_part_end": lambda: events.append(("end", None)),
+        })
+
+        source = stream.__aiter__()
+        in_file = False
+        file_session: Optional[UploadSession] = None
+
+        async def file_chunks() -> AsyncIterator[bytes]:
+            """file 필드 데이터만 내보내는 스트림 (필드가 끝나면 종료)"""
+            nonlocal in_file
+            while True:
+                while events:
+                    kind, value = events.pop(0)
+                    if kind == "data":
+                        yield value
+                    elif kind == "end":
+                        in_file = False
+                        return
+                try:
+                    parser.write(await source.__anext__())
+                except StopAsyncIteration:
+                    raise UploadError("multipart 본문이 중간에 끝났습니다", 400)
+
+        while file_session is None:
+            while events and file_session is None:
+                kind, value = events.pop(0)
+                if kind != "part":
+                    continue
+                _, disposition = parse_options_header(value.get(b"content-disposition", b""))
+                if disposition.get(b"name") == b"file" and disposition.get(b"filename"):
+                    part_type = value.get(b"content-type", b"application/octet-stream").decode("latin-1")
+                    filename = disposition[b"filename"].decode("utf-8", "replace")
+                    file_session = await self.create(owner_id, filename, part_type, None)
+                    in_file = True
+            if file_session is None:
+                try:
+                    parser.write(await source.__anext__())
+                except StopAsyncIteration:
+                    raise UploadError("file 필드가 없습니다", 400)
+
+        try:
+            return await self.append(file_session.id, owner_id, 0, file_chunks(), finalize=True)
+        except UploadError:
+            raise
+        except BaseException:
+            # 단일 요청 업로드는 이어 올릴 수 없으므로 실패 시 폐기
+            await self._discard(file_session)
+            raise
+
+    # ------------------------------------------------------------------
+    # 정리
+    # ------------------------------------------------------------------
+
+    async def aclose(self) -> None:
+        """S3 클라이언트와 썸네일 프로세스 풀 정리"""
+        if self._s3 is not None:
+            await self._s3.aclose()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# 싱글톤 업로드 서비스 인스턴스
+upload_service = UploadService()
@@ -0,0 +1,308 @@
+"""
+AI 사용량 서비스
+토큰 사용량 원장, 비용 계산, 사용자/역할별 일일 토큰 할당량
+"""
+import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+from ..core.config import settings
+from ..core.logging import log_ai_interaction
+from ..core.redis import get_redis, mark_redis_unavailable
+from ..core.supabase import get_supabase_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS_ROLE = "anonymous"
+_COUNTER_TTL_SECONDS = 2 * 86400  # 일일 카운터 보존 기간
+
+
+@dataclass(frozen=True)
+class UsageContext:
+    """사용량 귀속 정보 (요청 단위)"""
+    user_key: str  # user:<id> 또는 ip:<주소>
+    role: str
+    endpoint: str
+
+
+@dataclass(frozen=True)
+class QuotaStatus:
+    """일일 할당량 검사 결과 (quota가 0이면 무제한)"""
+    allowed: bool
+    used: int
+    quota: int
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.quota <= 0 else max(0, self.quota - self.used)
+
+
+# 현재 요청의 귀속 정보 (AI 엔드포인트 의존성이 설정)
+_current_context: ContextVar[Optional[UsageContext]] = ContextVar("ai_usage_context", default=None)
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def seconds_until_reset() -> int:
+    """할당량이 초기화되는 UTC 자정까지 남은 시간 (초)"""
+    now = datetime.now(timezone.utc)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+    return max(1, int((midnight - now).total_seconds()))
+
+
+class UsageLedger:
+    """
+    AI 사용량 원장
+
+    - 호출마다 Deepseek 응답의 usage 블록을 (날짜, 사용자, 엔드포인트, 모델) 단위로 메모리에 집계하고,
+      AI_USAGE_FLUSH_INTERVAL_SECONDS마다 `record_ai_usage` RPC로 일괄 반영합니다.
+    - 일일 사용량 카운터는 Redis(워커 간 공유) 또는 프로세스 메모리에 두며,
+      프로세스가 처음 보는 사용자는 원장 테이블에서 당일 사용량을 복원합니다.
+    """
+
+    def __init__(self):
+        self.flush_interval = settings.AI_USAGE_FLUSH_INTERVAL_SECONDS
+        self._pending: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+        self._daily: Dict[Tuple[str, str], int] = {}
+        self._restored: Set[Tuple[str, str]] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # 귀속 정보
+    # ------------------------------------------------------------------
+
+    def bind(self, context: UsageContext) -> None:
+        """현재 요청의 사용량 귀속 정보 설정"""
+        _current_context.set(context)
+
+    @property
+    def context(self) -> Optional[UsageContext]:
+        return _current_context.get()
+
+    # ------------------------------------------------------------------
+    # 할당량
+    # ------------------------------------------------------------------
+
+    def quota_for(self, user_key: str, role: str) -> int:
+        """사용자 개별 할당량 우선, 없으면 역할별 할당량 (0 이하면 무제한)"""
+        user_id = user_key.split(":", 1)[1] if user_key.startswith("user:") else None
+        if user_id and user_id in settings.AI_USER_DAILY_TOKEN_QUOTAS:
+            return settings.AI_USER_DAILY_TOKEN_QUOTAS[user_id]
+        quotas = settings.AI_ROLE_DAILY_TOKEN_QUOTAS
+        return quotas.get(role, quotas.get(ANONYMOUS_ROLE, 0))
+
+    async def used_today(self, user_key: str) -> int:
+        """당일 사용 토큰 수"""
+        today = _today()
+        redis = get_redis()
+        if redis is not None:
+            counter = f"aiusage:{today}:{user_key}"
+            try:
+                value = await redis.get(counter)
+                if value is not None:
+                    return int(value)
+                # 카운터가 없으면(재시작, 만료) 원장 + 미반영분으로 채운 뒤 INCRBY가 이어서 누적
+                # (여러 워커가 동시에 채우면 NX로 먼저 쓴 값 사용)
+                stored = await self._ledger_tokens(today, user_key)
+                if stored is not None:
+                    await redis.set(counter, stored + self._pending_tokens(today, user_key),
+                                    nx=True, ex=_COUNTER_TTL_SECONDS)
+                    value = await redis.get(counter)
+                    if value is not None:
+                        return int(value)
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        if (today, user_key) not in self._restored:
+            await self._restore(today, user_key)
+        return self._daily.get((today, user_key), 0)
+
+    async def admit(self, user_key: str, role: str, endpoint: str) -> QuotaStatus:
+        """
+        업스트림 호출 전 입장 제어
+
+        할당량 이내이면 귀속 정보를 설정하고 allowed=True를 반환합니다.
+        """
+        quota = self.quota_for(user_key, role)
+        used = await self.used_today(user_key) if quota > 0 else 0
+        if quota > 0 and used >= quota:
+            return QuotaStatus(False, used, quota)
+        self.bind(UsageContext(user_key, role, endpoint))
+        return QuotaStatus(True, used, quota)
+
+    async def _restore(self, today: str, user_key: str) -> None:
+        """원장 테이블에서 당일 사용량 복원 (프로세스당 사용자별 1회)"""
+        self._restored.add((today, user_key))
+        stored = await self._ledger_tokens(today, user_key)
+        if stored:
+            self._daily[(today, user_key)] = self._daily.get((today, user_key), 0) + stored
+
+    async def _ledger_tokens(self, today: str, user_key: str) -> Optional[int]:
+        """원장 테이블의 당일 사용 토큰 수 (원장 미설정 시 0, 조회 실패 시 None)"""
+        client = get_supabase_client(service=True)
+        if client is None:
+            return 0
+        try:
+            response = await asyncio.to_thread(
+                lambda: client.table("ai_usage_user_daily").select("total_tokens")
+                .eq("usage_date", today).eq("user_key", user_key).execute()
+            )
+            return sum(int(row.get("total_tokens") or 0) for row in response.data or [])
+        except Exception as e:
+            logger.error(f"Error restoring AI usage for quota: {str(e)}")
+            return None
+
+    def _pending_tokens(self, today: str, user_key: str) -> int:
+        """아직 원장에 반영하지 않은 이 프로세스의 당일 사용 토큰 수"""
+        return sum(
+            entry["prompt_tokens"] + entry["completion_tokens"]
+            for (date, key, _, _), entry in self._pending.items()
+            if date == today and key == user_key
+        )
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """모델 단가(USD / 1M 토큰) 기준 비용"""
+        prices = settings.AI_MODEL_PRICES.get(model) or {}
+        return (
+            prompt_tokens * prices.get("prompt", 0.0)
+            + completion_tokens * prices.get("completion", 0.0)
+        ) / 1_000_000
+
+    async def record(self, model: str, usage: Optional[Dict[str, Any]], action: str = "chat_completion") -> None:
+        """응답의 usage 블록 기록 (집계 + 일일 카운터 증가)"""
+        if not usage:
+            return
+
+        prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        completion_tokens = int(usage.get("completion_tokens") or 0)
+        total_tokens = int(usage.get("total_tokens") or prompt_tokens + completion_tokens)
+        context = self.context or UsageContext("system", ANONYMOUS_ROLE, action)
+        today = _today()
+
+        key = (today, context.user_key, context.endpoint, model)
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = self._pending[key] = {
+                "usage_date": today,
+                "user_key": context.user_key,
+                "endpoint": context.endpoint,
+                "model": model,
+                "role": context.role,
+                "request_count": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost_usd": 0.0,
+            }
+        entry["request_count"] += 1
+        entry["prompt_tokens"] += prompt_tokens
+        entry["completion_tokens"] += completion_tokens
+        entry["cost_usd"] += self.cost(model, prompt_tokens, completion_tokens)
+
+        self._daily[(today, context.user_key)] = self._daily.get((today, context.user_key), 0) + total_tokens
+        redis = get_redis()
+        if redis is not None:
+            try:
+                counter = f"aiusage:{today}:{context.user_key}"
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.incrby(counter, total_tokens)
+                    pipe.expire(counter, _COUNTER_TTL_SECONDS)
+                    await pipe.execute()
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        log_ai_interaction(
+            action, model, tokens_used=total_tokens,
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+            user_key=context.user_key, endpoint=context.endpoint,
+        )
+
+    # ------------------------------------------------------------------
+    # 일괄 반영
+    # ------------------------------------------------------------------
+
+    async def flush(self) -> int:
+        """집계된 사용량을 원장 테이블에 일괄 반영 (반영 행 수 반환)"""
+        if not self._pending:
+            return 0
+
+        entries, self._pending = list(self._pending.values()), {}
+        for entry in entries:
+            entry["cost_usd"] = round(entry["cost_usd"], 6)
+
+        client = get_supabase_client(service=True)
+        if client is None:
+            # 원장 미설정 시에는 일일 카운터(할당량)만 유지
+            return 0
+
+        try:
+            await asyncio.to_thread(
+                lambda: client.rpc("record_ai_usage", {"entries": entries}).execute()
+            )
+        except Exception as e:
+            logger.error(f"Error flushing AI usage ledger: {str(e)}")
+            self._merge_back(entries)
+            return 0
+
+        return len(entries)
+
+    def _merge_back(self, entries) -> None:
+        """반영 실패한 항목을 다음 주기에 다시 시도하도록 되돌림"""
+        for entry in entries:
+            key = (entry["usage_date"], entry["user_key"], entry["endpoint"], entry["model"])
+            current = self._pending.get(key)
+            if current is None:
+                self._pending[key] = entry
+                continue
+            for field_name in ("request_count", "prompt_tokens", "completion_tokens", "cost_usd"):
+                current[field_name] += entry[field_name]
+
+    def _prune_daily(self) -> None:
+        """지난 날짜의 일일 카운터 정리"""
+        today = _today()
+        self._daily = {key: value for key, value in self._daily.items() if key[0] == today}
+        self._restored = {key for key in self._restored if key[0] == today}
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                started = time.perf_counter()
+                flushed = await self.flush()
+                if flushed:
+                    logger.info(
+                        f"AI usage ledger flushed: {flushed} rows "
+                        f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+            except Exception as e:
+                logger.error(f"Error in AI usage flush loop: {str(e)}")
+            # 원장 반영 실패/미설정과 무관하게 날짜가 바뀐 카운터는 정리
+            self._prune_daily()
+
+    def start(self) -> None:
+        """주기적 반영 시작 (lifespan에서 호출)"""
+        if self.flush_interval <= 0 or self._flush_task is not None:
+            return
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """주기적 반영 중지 및 남은 사용량 반영"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+
+# 싱글톤 사용량 원장 인스턴스
+usage_ledger = UsageLedger()
@@ -0,0 +1,289 @@
+"""
+캐시 예열 서비스
+인기 주제 선정 및 추천/검색 응답 캐시, 코스 개요 사전 생성
+
+- 인기 주제: 요청 수요(TopicDemandMiddleware 집계, 최근 2일) + 공개 코스 태그(수강생 수 가중치)
+  + 설정의 고정 주제(CACHE_WARM_SEED_TOPICS)
+- 배포 직후: 추천/검색 응답 캐시만 예열 (YouTube 호출 한도 내)
+- 비혼잡 시간대(CACHE_WARM_OFFPEAK_HOURS): 코스 개요까지 사전 생성 (일일 토큰 예산 내)
+- 응답 캐시는 앱을 통해(ASGI 내부 호출) 채우므로 캐시 키/사전 압축이 실제 요청과 동일합니다.
+- Redis 사용 시 예열 1회당 한 워커만 실행합니다 (인메모리 캐시는 워커별로 예열).
+"""
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+from zoneinfo import ZoneInfo
+from ..core.config import settings
+from ..core.redis import get_redis, mark_redis_unavailable
+from ..core.supabase import get_supabase_client
+from ..middleware.demand import WARMER_HEADER, normalize_topic, topic_demand
+from .usage_service import UsageContext, usage_ledger
+import logging
+
+logger = logging.getLogger(__name__)
+
+WARMER_USER_KEY = "system:cache-warmer"
+_DEMAND_PREFIX = "warm:demand:"
+_LOCK_KEY = "warm:lock"
+_DEFAULT_DURATION_HOURS = 10  # CourseGenerationRequest 기본값
+
+
+def _internal_base_url() -> str:
+    """ASGI 내부 호출 URL (TrustedHostMiddleware가 허용하는 호스트 사용)"""
+    for host in settings.ALLOWED_HOSTS:
+        if host == "*":
+            return "http://localhost"
+        if host.startswith("*."):
+            return f"http://warmer.{host[2:]}"
+        return f"http://{host}"
+    return "http://localhost"
+
+
+class CacheWarmer:
+    """인기 주제 캐시 예열 스케줄러"""
+
+    def __init__(self):
+        self.interval = settings.CACHE_WARM_INTERVAL_SECONDS
+        self._local_demand: Dict[str, Counter] = {}
+        self._app = None
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # 인기 주제
+    # ------------------------------------------------------------------
+
+    async def collect_demand(self) -> None:
+        """미들웨어 집계분을 날짜별 수요에 합산 (Redis 공유, 없으면 프로세스 내)"""
+        counts = topic_demand.drain()
+        if not counts:
+            return
+        today = datetime.now(timezone.utc).date().isoformat()
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                key = _DEMAND_PREFIX + today
+                async with redis.pipeline(transaction=False) as pipe:
+                    for (topic, skill_level), count in counts.items():
+                        pipe.zincrby(key, count, f"{skill_level}|{topic}")
+                    pipe.expire(key, 3 * 86400)
+                    await pipe.execute()
+                return
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        bucket = self._local_demand.setdefault(today, Counter())
+        for (topic, skill_level), count in counts.items():
+            bucket[f"{skill_level}|{topic}"] += count
+        for day in sorted(self._local_demand)[:-2]:
+            del self._local_demand[day]
+
+    async def _recent_demand(self, limit: int) -> Counter:
+        """최근 2일 (기술 수준|주제) 수요"""
+        today = datetime.now(timezone.utc).date()
+        days = [today.isoformat(), (today - timedelta(days=1)).isoformat()]
+        demand: Counter = Counter()
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for day in days:
+                        pipe.zrevrange(_DEMAND_PREFIX + day, 0, limit * 4 - 1, withscores=True)
+                    results = await pipe.execute()
+                for rows in results:
+                    for member, score in rows:
+                        member = member.decode() if isinstance(member, bytes) else member
+                        demand[member] += int(score)
+                return demand
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        for day in days:
+            demand.update(self._local_demand.get(day, Counter()))
+        return demand
+
+    async def _catalog_topics(self, limit: int) -> Counter:
+        """공개 코스 태그 (수강생 수 가중치)"""
+        client = get_supabase_client(replica=True)
+        if client is None:
+            return Counter()
+        try:
+            response = await asyncio.to_thread(
+                lambda: client.table("courses").select("tags, enrolled_count")
+                .eq("status", "published").order("enrolled_count", desc=True)
+                .limit(limit * 5).execute()
+            )
+        except Exception as e:
+            logger.error(f"Error loading catalog topics for cache warming: {str(e)}")
+            return Counter()
+
+        topics: Counter = Counter()
+        for row in response.data or []:
+            for tag in row.get("tags") or []:
+                topic = normalize_topic(str(tag))
+                if topic:
+                    topics[topic] += 1 + int(row.get("enrolled_count") or 0)
+        return topics
+
+    async def hot_topics(self, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """예열 대상 (주제, 기술 수준) 목록 (인기순)"""
+        limit = limit or settings.CACHE_WARM_TOP_TOPICS
+        levels = settings.CACHE_WARM_SKILL_LEVELS
+        scores: Counter = Counter()
+
+        for member, count in (await self._recent_demand(limit)).items():
+            skill_level, _, topic = member.partition("|")
+            if skill_level in levels:
+                scores[(topic, skill_level)] += count
+
+        # 카탈로그/고정 주제는 기술 수준 구분 없이 모든 수준을 예열
+        seeds = await self._catalog_topics(limit)
+        for topic in settings.CACHE_WARM_SEED_TOPICS:
+            topic = normalize_topic(topic)
+            if topic:
+                seeds[topic] += 1
+        for topic, count in seeds.items():
+            for skill_level in levels:
+                scores[(topic, skill_level)] += count
+
+        return [key for key, _ in scores.most_common(limit * len(levels))]
+
+    # ------------------------------------------------------------------
+    # 예열
+    # ------------------------------------------------------------------
+
+    def in_offpeak_window(self, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(ZoneInfo(settings.CACHE_WARM_TIMEZONE))
+        return now.hour in settings.CACHE_WARM_OFFPEAK_HOURS
+
+    async def _acquire_lock(self) -> bool:
+        """워커 간 중복 예열 방지 (Redis 없으면 워커별 실행)"""
+        redis = get_redis()
+        if redis is None:
+            return True
+        try:
+            return bool(await redis.set(_LOCK_KEY, "1", nx=True, ex=max(60, self.interval - 5)))
+        except Exception as e:
+            mark_redis_unavailable(e)
+            return True
+
+    async def warm_once(self, generate: bool = False) -> Dict[str, Any]:
+        """
+        예열 1회 실행
+
+        generate=True이면 일일 토큰 예산 내에서 코스 개요도 사전 생성합니다.
+        """
+        if self._app is None:
+            return {}
+        await self.collect_demand()
+        if not await self._acquire_lock():
+            return {}
+
+        report = {"topics": 0, "cache_hits": 0, "youtube_calls": 0, "outlines": 0, "skipped": 0, "failed": 0}
+        topics = await self.hot_topics()
+        report["topics"] = len(topics)
+
+        import httpx
+
+        transport = httpx.ASGITransport(app=self._app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url=_internal_base_url(),
+            headers={WARMER_HEADER.decode(): "1", "accept-encoding": "br, gzip"},
+            timeout=60.0
+        ) as client:
+            for topic, skill_level in topics:
+                if report["youtube_calls"] >= settings.CACHE_WARM_YOUTUBE_BUDGET:
+                    report["skipped"] += 1
+                    continue
+                response = await client.get(
+                    f"/api/v1/youtube/recommend/{quote(topic, safe='')}",
+                    params={"skill_level": skill_level}
+                )
+                # 실패 응답은 캐시되지 않으므로 예산에 넣지 않음
+                if not response.is_success:
+                    report["failed"] += 1
+                    logger.warning(f"Cache warming request failed ({response.status_code}): {topic}")
+                elif response.headers.get("x-cache") == "HIT":
+                    report["cache_hits"] += 1
+                else:
+                    report["youtube_calls"] += 1
+
+            # 검색은 기술 수준과 무관하므로 주제별 1회
+            for topic in dict.fromkeys(topic for topic, _ in topics):
+                response = await client.get("/api/v1/search", params={"q": topic})
+                if not response.is_success:
+                    report["failed"] += 1
+
+        if generate:
+            report["outlines"] = await self._pregenerate_outlines(topics)
+
+        self.last_run = {"at": datetime.now(timezone.utc).isoformat(), "generate": generate, **report}
+        logger.info(f"Cache warming finished: {report}")
+        return report
+
+    async def _pregenerate_outlines(self, topics: List[Tuple[str, str]]) -> int:
+        """코스 개요 사전 생성 (기본 조건: 기본 학습 시간, 학습 목표 없음)"""
+        from .ai_service import ai_service, outline_cache
+
+        usage_ledger.bind(UsageContext(WARMER_USER_KEY, "admin", "cache-warmer"))
+        generated = 0
+        for topic, skill_level in topics:
+            if await usage_ledger.used_today(WARMER_USER_KEY) >= settings.CACHE_WARM_DAILY_TOKEN_BUDGET:
+                logger.info("Cache warming token budget exhausted")
+                break
+            key = ai_service.course_outline_key(topic, skill_level, _DEFAULT_DURATION_HOURS, [])
+            if await outline_cache.exists(key):
+                continue
+            outline = await ai_service.generate_course_outline(
+                topic=topic,
+                skill_level=skill_level,
+                duration_hours=_DEFAULT_DURATION_HOURS,
+                learning_goals=[]
+            )
+            if outline is not None:
+                generated += 1
+        return generated
+
+    async def _loop(self) -> None:
+        if settings.CACHE_WARM_STARTUP_DELAY_SECONDS > 0:
+            # 배포 직후 응답 캐시 예열
+            await asyncio.sleep(settings.CACHE_WARM_STARTUP_DELAY_SECONDS)
+            try:
+                await self.warm_once(generate=False)
+            except Exception as e:
+                logger.error(f"Error in startup cache warming: {str(e)}")
+
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if self.in_offpeak_window():
+                    await self.warm_once(generate=True)
+                else:
+                    await self.collect_demand()
+            except Exception as e:
+                logger.error(f"Error in cache warming loop: {str(e)}")
+
+    def start(self, app) -> None:
+        """예열 스케줄러 시작 (lifespan에서 호출)"""
+        if not settings.CACHE_WARM_ENABLED or self.interval <= 0 or self._task is not None:
+            return
+        self._app = app
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """예열 스케줄러 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# 싱글톤 캐시 예열 서비스 인스턴스
+cache_warmer = CacheWarmer()
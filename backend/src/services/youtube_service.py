@@ -2,27 +2,48 @@
 YouTube 서비스
 YouTube Data API v3 연동 및 교육 콘텐츠 검색
 """
+import re
 import httpx
 from typing import Optional, List, Dict, Any
 from ..core.config import settings
+from ..core.logging import truncate
+from ..core.startup import startup_timer
 import logging
 
 logger = logging.getLogger(__name__)
 
+# ISO 8601 지속시간 (PT1H2M3S)
+_DURATION_PATTERN = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
+
 
 class YouTubeService:
     """YouTube Data API 서비스"""
     
     def __init__(self):
         self.api_key = settings.YOUTUBE_API_KEY
-        self.base_url = "https://www.googleapis.com/youtube/v3"
-        self.client = httpx.AsyncClient()
+        self.base_url = settings.YOUTUBE_API_URL
+        self._client: Optional[httpx.AsyncClient] = None
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        # 공유 클라이언트는 요청마다 닫지 않고 lifespan 종료 시 aclose()로 정리
+        return None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP 클라이언트 (첫 사용 시 생성, 커넥션 풀 공유)"""
+        if self._client is None or self._client.is_closed:
+            with startup_timer.measure("youtube_service.client"):
+                self._client = httpx.AsyncClient()
+        return self._client
+
+    async def aclose(self) -> None:
+        """HTTP 클라이언트 정리"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def search_educational_videos(
         self,
@@ -58,38 +79,15 @@ class YouTubeService:
             
             if response.status_code == 200:
                 data = response.json()
-                videos = []
-                
+                items = data.get("items", [])
+
                 # 비디오 상세 정보 가져오기
-                video_ids = [item["id"]["videoId"] for item in data.get("items", [])]
+                video_ids = [item["id"]["videoId"] for item in items]
                 detailed_videos = await self.get_videos_details(video_ids)
-                
-                for i, item in enumerate(data.get("items", [])):
-                    video_info = {
-                        "id": item["id"]["videoId"],
-                        "title": item["snippet"]["title"],
-                        "description": item["snippet"]["description"],
-                        "thumbnail": item["snippet"]["thumbnails"]["medium"]["url"],
-                        "channel_title": item["snippet"]["channelTitle"],
-                        "published_at": item["snippet"]["publishedAt"],
-                        "url": f"https://www.youtube.com/watch?v={item['id']['videoId']}"
-                    }
-                    
-                    # 상세 정보 추가
-                    if detailed_videos and i < len(detailed_videos):
-                        detail = detailed_videos[i]
-                        video_info.update({
-                            "duration": detail.get("duration"),
-                            "view_count": detail.get("view_count"),
-                            "like_count": detail.get("like_count"),
-                            "comment_count": detail.get("comment_count")
-                        })
-                    
-                    videos.append(video_info)
-                
-                return videos
+
+                return self.shape_videos(items, detailed_videos)
             else:
-                logger.error(f"YouTube API error: {response.status_code} - {response.text}")
+                logger.error(f"YouTube API error: {response.status_code} - {truncate(response.text)}")
                 return None
                 
         except Exception as e:
@@ -129,19 +127,50 @@ class YouTubeService:
                 
                 return details
             else:
-                logger.error(f"YouTube API error: {response.status_code} - {response.text}")
+                logger.error(f"YouTube API error: {response.status_code} - {truncate(response.text)}")
                 return None
                 
         except Exception as e:
             logger.error(f"Error getting video details: {str(e)}")
             return None
     
+    def shape_videos(
+        self,
+        items: List[Dict[str, Any]],
+        details: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """검색 결과 항목과 상세 정보를 응답 형식으로 변환"""
+        videos = []
+        for i, item in enumerate(items):
+            video_id = item["id"]["videoId"]
+            snippet = item["snippet"]
+            video_info = {
+                "id": video_id,
+                "title": snippet["title"],
+                "description": snippet["description"],
+                "thumbnail": snippet["thumbnails"]["medium"]["url"],
+                "channel_title": snippet["channelTitle"],
+                "published_at": snippet["publishedAt"],
+                "url": f"https://www.youtube.com/watch?v={video_id}"
+            }
+
+            # 상세 정보 추가
+            if details and i < len(details):
+                detail = details[i]
+                video_info.update({
+                    "duration": detail.get("duration"),
+                    "view_count": detail.get("view_count"),
+                    "like_count": detail.get("like_count"),
+                    "comment_count": detail.get("comment_count")
+                })
+
+            videos.append(video_info)
+
+        return videos
+
     def parse_duration(self, duration: str) -> int:
         """YouTube 지속시간 형식을 초로 변환 (PT4M13S -> 253초)"""
-        import re
-        
-        pattern = r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?"
-        match = re.match(pattern, duration)
+        match = _DURATION_PATTERN.match(duration)
         
         if not match:
             return 0
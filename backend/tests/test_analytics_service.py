@@ -0,0 +1,68 @@
+"""
+분석 서비스 테스트
+롤업 조회 결과 캐시 (TTL, 항목 수 상한, 롤업 갱신 시 초기화)
+"""
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+from src.core import cache as cache_module
+from src.services.analytics_service import AnalyticsService
+
+# src.services가 같은 이름의 싱글톤을 다시 내보내므로 모듈은 직접 가져옴
+analytics_module = importlib.import_module("src.services.analytics_service")
+
+
+class CoursesTable:
+    """courses 조회와 롤업 갱신 RPC만 흉내 내는 Supabase 클라이언트"""
+
+    def __init__(self):
+        self.queries = 0
+
+    def table(self, name):
+        assert name == "courses"
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.course_id = value
+        return self
+
+    def limit(self, count):
+        return self
+
+    def rpc(self, name, params):
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=1))
+
+    def execute(self):
+        self.queries += 1
+        return SimpleNamespace(data=[{"instructor_id": f"owner-of-{self.course_id}"}])
+
+
+def test_rollup_reads_are_cached_in_a_bounded_result_cache(monkeypatch):
+    client = CoursesTable()
+    monkeypatch.setattr(analytics_module, "get_supabase_client", lambda **kwargs: client)
+    monkeypatch.setattr(cache_module, "get_redis", lambda: None)
+    service = AnalyticsService()
+    service.cache._max_entries = 2
+    service.batch_size = 10
+
+    async def run():
+        first = await service.get_course_instructor("c1")
+        await service.get_course_instructor("c1")
+        assert client.queries == 1
+
+        await service.get_course_instructor("c2")
+        await service.get_course_instructor("c3")  # c1이 밀려남
+        assert len(service.cache._entries) == 2
+        await service.get_course_instructor("c1")
+        assert client.queries == 4
+
+        assert await service.refresh() == 1
+        await service.get_course_instructor("c1")
+        assert client.queries == 5
+        return first
+
+    assert asyncio.run(run()) == (True, "owner-of-c1")
@@ -0,0 +1,80 @@
+"""
+온보딩 서비스 테스트
+프로필 username 충돌 처리와 재시도하지 않을 실패 분류
+"""
+import asyncio
+from types import SimpleNamespace
+
+from src.services.onboarding_service import _assign_usernames, _failure
+from src.services.outbox_service import PermanentFailure
+
+
+class UsersTable:
+    """users 조회만 흉내 내는 Supabase 클라이언트 (select → in_ → execute)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def table(self, name):
+        assert name == "users"
+        return self
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.values = set(values)
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=[row for row in self.rows if row["username"] in self.values])
+
+
+def profile_event(user_id: str, username: str = None, email: str = None):
+    return {"payload": {"user_id": user_id, "username": username, "email": email or f"{user_id}@example.com"}}
+
+
+def test_taken_and_duplicate_usernames_get_a_stable_suffix():
+    client = UsersTable([{"id": "existing", "username": "alice"}])
+    events = [
+        profile_event("11111111-aaaa", "alice"),
+        profile_event("22222222-bbbb", "bob"),
+        profile_event("33333333-cccc", "bob"),
+        profile_event("existing", "alice"),  # 재시도된 자기 프로필은 그대로
+    ]
+
+    assigned = asyncio.run(_assign_usernames(client, events))
+    assert assigned == {
+        "11111111-aaaa": "alice_11111111",
+        "22222222-bbbb": "bob",
+        "33333333-cccc": "bob_33333333",
+        "existing": "alice",
+    }
+    assert asyncio.run(_assign_usernames(client, events)) == assigned
+
+
+def test_suffixed_username_fits_the_column():
+    events = [profile_event("44444444-dddd", "x" * 60)]
+    client = UsersTable([{"id": "existing", "username": "x" * 50}])
+
+    username = asyncio.run(_assign_usernames(client, events))["44444444-dddd"]
+    assert len(username) == 50 and username.endswith("_44444444")
+
+
+def test_email_local_part_is_the_default_username():
+    events = [profile_event("55555555-eeee", email="carol@example.com")]
+    assert asyncio.run(_assign_usernames(UsersTable([]), events)) == {"55555555-eeee": "carol"}
+
+
+def test_constraint_violations_are_permanent_except_fk_and_username():
+    def error(code: str, message: str) -> Exception:
+        e = Exception(message)
+        e.code = code
+        return e
+
+    assert isinstance(_failure(error("23505", 'duplicate key value violates "users_email_key"')), PermanentFailure)
+    assert isinstance(_failure(error("23514", 'violates check constraint "users_role_check"')), PermanentFailure)
+    assert not isinstance(_failure(error("23503", 'violates foreign key constraint')), PermanentFailure)
+    assert not isinstance(_failure(error("23505", 'duplicate key value violates "users_username_key"')),
+                          PermanentFailure)
+    assert not isinstance(_failure(ConnectionError("timed out")), PermanentFailure)
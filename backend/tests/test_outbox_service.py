@@ -0,0 +1,59 @@
+"""
+아웃박스 서비스 테스트
+발행 기록 실패 시 재시도 예약과 서비스 키 누락 시 시작 거부
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import src.services.outbox_service as outbox_module
+from src.core.config import settings
+from src.services.outbox_service import OutboxService
+
+
+class FlakyRpc:
+    """처음 failures회는 실패하고 이후 기록된 이벤트를 보관하는 클라이언트"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.recorded = []
+
+    def rpc(self, name, params):
+        def execute():
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("PostgREST unavailable")
+            self.recorded.extend(params["events"])
+            return SimpleNamespace(data=len(params["events"]))
+        return SimpleNamespace(execute=execute)
+
+
+def test_failed_flush_is_retried_without_another_publish(monkeypatch):
+    client = FlakyRpc(failures=1)
+    monkeypatch.setattr(outbox_module, "get_supabase_client", lambda service=False: client)
+    monkeypatch.setattr(settings, "OUTBOX_PUBLISH_DELAY_MS", 1)
+    service = OutboxService()
+
+    async def scenario():
+        service.publish("user.profile", "u1", {"user_id": "u1"})
+        for _ in range(300):
+            if client.recorded:
+                break
+            await asyncio.sleep(0.01)
+        await service.stop()
+
+    asyncio.run(scenario())
+    assert [event["idempotency_key"] for event in client.recorded] == ["user.profile:u1"]
+    assert service._buffer == []
+
+
+def test_missing_service_key_refuses_production_start(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setattr(settings, "SUPABASE_SERVICE_KEY", "")
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    with pytest.raises(RuntimeError, match="SUPABASE_SERVICE_KEY"):
+        OutboxService().check_configuration()
+
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    OutboxService().check_configuration()  # 개발 환경은 오류 로그만 남김
@@ -0,0 +1,66 @@
+"""
+요청 제한 식별 테스트
+역할 조회가 요청 제한 경로에서 Supabase 왕복을 기다리지 않는지 확인
+"""
+import asyncio
+import importlib
+
+from jose import jwt
+
+from src.core.config import settings
+from src.middleware import rate_limit
+from src.services.profile_service import ProfileService
+
+# src.services가 같은 이름의 싱글톤을 다시 내보내므로 모듈은 직접 가져옴
+profile_module = importlib.import_module("src.services.profile_service")
+
+SECRET = "test-jwt-secret"
+
+
+def bearer_scope(user_id: str, role: str = None) -> dict:
+    claims = {"sub": user_id, "exp": 4102444800}
+    if role:
+        claims["app_metadata"] = {"role": role}
+    token = jwt.encode(claims, SECRET, algorithm="HS256")
+    return {"headers": [(b"authorization", f"Bearer {token}".encode())], "client": ("10.0.0.1", 1234)}
+
+
+def test_role_cache_miss_uses_the_token_role_and_refreshes_in_background(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", SECRET)
+    monkeypatch.setattr(profile_module, "get_redis", lambda: None)
+    service = ProfileService()
+    monkeypatch.setattr(profile_module, "profile_service", service)
+
+    lookups = []
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def fetch(user_id, select):
+            lookups.append(user_id)
+            await gate.wait()  # 느린 Supabase 응답
+            return {"id": user_id, "role": "instructor"}
+
+        monkeypatch.setattr(service, "_fetch", fetch)
+        scope = bearer_scope("user-1")
+
+        first = await asyncio.wait_for(rate_limit.resolve_identity(scope), timeout=1)
+        again = await rate_limit.resolve_identity(scope)
+        gate.set()
+        await asyncio.gather(*service._role_refreshes.values())
+        return first, again, await rate_limit.resolve_identity(scope)
+
+    first, again, refreshed = asyncio.run(run())
+
+    assert first == ("user:user-1", "student")
+    assert again == ("user:user-1", "student")
+    assert refreshed == ("user:user-1", "instructor")
+    assert lookups == ["user-1"]  # 진행 중인 갱신은 한 번만
+
+
+def test_unverified_tokens_are_limited_by_ip(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", "")
+
+    identity = asyncio.run(rate_limit.resolve_identity(bearer_scope("user-1", "admin")))
+
+    assert identity == ("ip:10.0.0.1", rate_limit.ANONYMOUS)
@@ -0,0 +1,58 @@
+"""
+실시간 푸시 서비스 테스트
+채널 구독 권한과 작업 상태 이벤트의 발행 대상
+"""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from src.api.routes import publish_job_event
+from src.services.realtime_service import RealtimeError, RealtimeHub, can_subscribe, normalize_channel
+
+
+def make_user(role: str = "student") -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), role=role)
+
+
+def test_only_user_channels_exist():
+    user_id = uuid.uuid4()
+    assert normalize_channel(f" user:{str(user_id).upper()} ") == f"user:{user_id}"
+    for channel in (f"job:{uuid.uuid4()}", f"course:{uuid.uuid4()}", "user:not-a-uuid"):
+        with pytest.raises(RealtimeError):
+            normalize_channel(channel)
+
+
+def test_user_channel_is_owner_or_admin_only():
+    owner, other = make_user(), make_user()
+    channel = f"user:{owner.id}"
+    assert can_subscribe(owner, channel)
+    assert not can_subscribe(other, channel)
+    assert can_subscribe(make_user("admin"), channel)
+
+
+def test_job_events_reach_only_the_callers_channel(monkeypatch):
+    import src.services.realtime_service as realtime_service
+
+    hub = RealtimeHub()
+    monkeypatch.setattr(realtime_service, "realtime_hub", hub)
+    caller, other = make_user(), make_user()
+    job_id = uuid.uuid4()
+
+    async def scenario():
+        caller_connection, other_connection = hub.connect(caller), hub.connect(other)
+        await hub.subscribe(caller_connection, [f"user:{caller.id}"])
+        await hub.subscribe(other_connection, [f"user:{other.id}"])
+        await publish_job_event(f"user:{caller.id}", job_id, "job.started", {"kind": "evaluation"})
+        await publish_job_event("ip:203.0.113.7", job_id, "job.started", {"kind": "evaluation"})
+        return caller_connection._take(), other_connection._take()
+
+    caller_messages, other_messages = asyncio.run(scenario())
+    assert other_messages == []
+    assert len(caller_messages) == 1
+    message = orjson.loads(caller_messages[0])
+    assert message["channel"] == f"user:{caller.id}"
+    assert message["event"] == "job.started"
+    assert message["data"] == {"job_id": str(job_id), "kind": "evaluation"}
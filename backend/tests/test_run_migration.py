@@ -0,0 +1,146 @@
+"""
+마이그레이션 실행기 테스트
+적용, baseline, 실패한 CONCURRENTLY 단계 재개, 체크섬 불일치 거부
+
+DATABASE_URL의 서버에 임시 데이터베이스를 만들어 실행합니다 (DATABASE_URL이 없으면 건너뜀).
+"""
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+from migrations.run_migration import database_url, main
+
+pytestmark = pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="DATABASE_URL이 설정되지 않았습니다")
+
+
+@pytest.fixture
+def dsn():
+    """테스트마다 새 데이터베이스 (끝나면 삭제)"""
+    import psycopg2
+    from psycopg2.extensions import make_dsn
+
+    server = database_url(None)
+    name = f"migration_test_{uuid.uuid4().hex[:12]}"
+    admin = psycopg2.connect(server)
+    admin.autocommit = True
+    try:
+        with admin.cursor() as cur:
+            cur.execute(f"CREATE DATABASE {name}")
+    except psycopg2.Error as e:
+        admin.close()
+        pytest.skip(f"임시 데이터베이스를 만들 수 없습니다: {e}")
+
+    yield make_dsn(server, dbname=name)
+
+    with admin.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+    admin.close()
+
+
+def write(directory: Path, name: str, sql: str) -> Path:
+    path = directory / name
+    path.write_text(sql, encoding="utf-8")
+    return path
+
+
+def migrate(dsn: str, directory: Path, *args: str) -> int:
+    return main([*args, "--database-url", dsn, "--dir", str(directory), "--retries", "0"])
+
+
+def query(dsn: str, sql: str):
+    import psycopg2
+
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cur:
+        cur.execute(sql)
+        rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def recorded(dsn: str):
+    return query(dsn, "SELECT version, status, steps_done FROM schema_migrations ORDER BY version")
+
+
+def test_up_applies_pending_files_in_order(dsn, tmp_path, capsys):
+    write(tmp_path, "001_items.sql", "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT);")
+    write(tmp_path, "002_seed.sql", """
+INSERT INTO items VALUES (1, 'a'), (2, 'b');
+
+-- migrate:no-transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS items_name_idx ON items (name);
+""")
+
+    assert migrate(dsn, tmp_path, "up") == 0
+    assert recorded(dsn) == [("001", "applied", 1), ("002", "applied", 2)]
+    assert query(dsn, "SELECT count(*) FROM items") == [(2,)]
+    assert query(dsn, "SELECT to_regclass('items_name_idx') IS NOT NULL") == [(True,)]
+
+    capsys.readouterr()
+    assert migrate(dsn, tmp_path, "up") == 0
+    assert "적용할 마이그레이션이 없습니다" in capsys.readouterr().out
+    assert query(dsn, "SELECT count(*) FROM items") == [(2,)]
+
+
+def test_baseline_records_without_running(dsn, tmp_path):
+    write(tmp_path, "001_legacy.sql", "CREATE TABLE legacy (id INTEGER);")
+    write(tmp_path, "002_legacy_more.sql", "ALTER TABLE legacy ADD COLUMN name TEXT;")
+    write(tmp_path, "003_new.sql", "CREATE TABLE fresh (id INTEGER);")
+
+    assert migrate(dsn, tmp_path, "baseline", "002") == 0
+    assert recorded(dsn) == [("001", "baseline", 1), ("002", "baseline", 1)]
+    assert query(dsn, "SELECT to_regclass('legacy') IS NULL") == [(True,)]
+
+    assert migrate(dsn, tmp_path, "up") == 0
+    assert recorded(dsn) == [("001", "baseline", 1), ("002", "baseline", 1), ("003", "applied", 1)]
+    assert query(dsn, "SELECT to_regclass('legacy') IS NULL, to_regclass('fresh') IS NOT NULL") == [(True, True)]
+
+
+def test_resumes_after_failed_concurrent_index(dsn, tmp_path):
+    write(tmp_path, "001_tags.sql", """
+CREATE TABLE tags (id SERIAL PRIMARY KEY, name TEXT NOT NULL);
+INSERT INTO tags (name) VALUES ('x'), ('x'), ('y');
+
+-- migrate:no-transaction
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS tags_name_key ON tags (name);
+
+-- migrate:transaction
+ALTER TABLE tags ADD COLUMN slug TEXT;
+""")
+
+    # 중복 값 때문에 인덱스 생성이 실패하고 INVALID 인덱스가 남음
+    assert migrate(dsn, tmp_path, "up") == 1
+    assert recorded(dsn) == [("001", "running", 1)]
+    assert query(dsn, """
+        SELECT i.indisvalid FROM pg_index i WHERE i.indexrelid = to_regclass('tags_name_key')
+    """) == [(False,)]
+
+    query(dsn, "DELETE FROM tags WHERE id = 2 RETURNING id")
+
+    # 첫 단계(CREATE TABLE)는 다시 실행하지 않고, INVALID 인덱스를 지운 뒤 이어서 적용
+    assert migrate(dsn, tmp_path, "up") == 0
+    assert recorded(dsn) == [("001", "applied", 3)]
+    assert query(dsn, """
+        SELECT i.indisvalid FROM pg_index i WHERE i.indexrelid = to_regclass('tags_name_key')
+    """) == [(True,)]
+    assert query(dsn, "SELECT count(*) FROM tags") == [(2,)]
+    assert query(dsn, """
+        SELECT count(*) FROM information_schema.columns WHERE table_name = 'tags' AND column_name = 'slug'
+    """) == [(1,)]
+
+
+def test_refuses_changed_applied_file(dsn, tmp_path):
+    path = write(tmp_path, "001_items.sql", "CREATE TABLE items (id INTEGER);")
+    assert migrate(dsn, tmp_path, "up") == 0
+
+    path.write_text("CREATE TABLE items (id BIGINT);", encoding="utf-8")
+    write(tmp_path, "002_more.sql", "CREATE TABLE more_items (id INTEGER);")
+
+    with pytest.raises(SystemExit) as excinfo:
+        migrate(dsn, tmp_path, "up")
+    assert "001_items.sql" in str(excinfo.value)
+    assert query(dsn, "SELECT to_regclass('more_items') IS NULL") == [(True,)]
+
+    assert migrate(dsn, tmp_path, "up", "--allow-changed") == 0
+    assert query(dsn, "SELECT to_regclass('more_items') IS NOT NULL") == [(True,)]
@@ -0,0 +1,129 @@
+"""
+검색 서비스 테스트
+인메모리 색인의 BM25 랭킹/접두사/오타 허용/한국어 토큰화와 SQLite 색인 재구성 (이전된 본문 포함)
+"""
+import asyncio
+import importlib
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.core import database as database_module
+from src.core.config import settings
+from src.models import Base, Course, Lesson, Module
+from src.services.content_store import ContentStore, LocalBackend, MappedCache
+from src.services.search_service import InMemorySearchIndex, SearchDocument, SearchService, tokenize
+
+# src.services가 같은 이름의 싱글톤을 다시 내보내므로 모듈은 직접 가져옴
+content_store_module = importlib.import_module("src.services.content_store")
+
+
+def document(doc_id: str, title: str, content: str = "", kind: str = "lesson") -> SearchDocument:
+    return SearchDocument(kind=kind, id=doc_id, title=title, fields={"title": title, "content": content})
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+def test_bm25_ranks_title_and_frequent_matches_first():
+    index = InMemorySearchIndex()
+    index.add(document("body", "Introduction", "python appears once in a long body about many other topics"))
+    index.add(document("title", "Python basics", "variables and loops"))
+    index.add(document("other", "Statistics", "mean and variance"))
+
+    results = index.search("python")
+
+    assert ids(results) == ["title", "body"]
+    assert results[0]["score"] > results[1]["score"]
+
+
+def test_prefix_matches_score_below_exact_matches():
+    index = InMemorySearchIndex()
+    index.add(document("exact", "learn", ""))
+    index.add(document("prefix", "learning", ""))
+
+    results = index.search("learn")
+
+    assert ids(results) == ["exact", "prefix"]
+
+
+def test_one_edit_typos_match_but_two_do_not():
+    index = InMemorySearchIndex()
+    index.add(document("ml", "Machine learning", ""))
+
+    assert ids(index.search("machnie")) == ["ml"]  # 인접 문자 교환
+    assert ids(index.search("machne")) == ["ml"]   # 한 글자 누락
+    assert index.search("mchne") == []
+
+
+def test_korean_particles_are_stripped_and_compounds_split_into_bigrams():
+    assert tokenize("파이썬으로") == ["파이썬", "파이", "이썬"]
+
+    index = InMemorySearchIndex()
+    index.add(document("ml", "머신러닝 입문", "딥러닝과 머신러닝의 차이"))
+    index.add(document("web", "웹 개발", "프론트엔드와 백엔드"))
+
+    assert ids(index.search("러닝")) == ["ml"]
+    assert ids(index.search("머신러닝을")) == ["ml"]
+
+
+def test_replacing_and_removing_documents_updates_postings():
+    index = InMemorySearchIndex()
+    index.add(document("a", "Pandas tutorial", ""))
+    index.add(document("a", "NumPy tutorial", ""))
+
+    assert index.search("pandas") == []
+    assert ids(index.search("numpy")) == ["a"]
+
+    index.remove("lesson", "a")
+    assert len(index) == 0
+    assert index.search("tutorial") == []
+
+
+def test_rebuild_indexes_courses_and_lessons_from_sqlite(tmp_path, monkeypatch):
+    store = ContentStore(LocalBackend(str(tmp_path / "blobs")), MappedCache(str(tmp_path / "cache"), 1 << 20))
+    offloaded_hash = asyncio.run(store.put("attention heads and transformer layers " * 20))
+    store.cache.close()
+    store = ContentStore(store.backend, MappedCache(str(tmp_path / "cold-cache"), 1 << 20))
+    monkeypatch.setattr(content_store_module, "content_store", store)
+
+    path = tmp_path / "catalog.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        course = Course(title="Deep Learning", slug="deep-learning", tags=["pytorch"],
+                        short_description="신경망 기초")
+        module = Module(title="Basics", course=course)
+        session.add_all([
+            course,
+            module,
+            Lesson(title="Backpropagation", content="gradient descent step by step", module=module),
+            # 저장소로 이전된 본문 (미리보기에 없는 단어도 검색되어야 함)
+            Lesson(title="Attention", content=None, content_hash=offloaded_hash,
+                   content_preview="attention heads", module=module),
+        ])
+        session.commit()
+        course_id = course.id
+    engine.dispose()
+
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{path}")
+    monkeypatch.setattr(settings, "DATABASE_READ_REPLICA_URL", "")
+    monkeypatch.setattr(database_module, "database", database_module.Database())
+    service = SearchService()
+
+    async def run():
+        try:
+            return await service.rebuild()
+        finally:
+            await database_module.database.dispose()
+
+    assert asyncio.run(run()) == 3
+    assert service.ready
+
+    courses = service.index.search("pytorch")
+    assert [(r["kind"], r["id"]) for r in courses] == [("course", course_id)]
+    lessons = service.index.search("gradient")
+    assert [(r["kind"], r["course_id"]) for r in lessons] == [("lesson", course_id)]
+    assert [r["title"] for r in service.index.search("transformer")] == ["Attention"]
+    assert store.stats["backend_reads"] == 1
@@ -0,0 +1,30 @@
+"""
+세션 서비스 테스트
+액세스 토큰 사용자 조회의 단일 비행(single-flight) 처리
+"""
+import asyncio
+
+import pytest
+
+from src.services.session_service import SessionService
+
+
+def test_cancelled_leader_does_not_strand_waiters(monkeypatch):
+    service = SessionService()
+
+    async def slow_request(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(service, "_request", slow_request)
+
+    async def scenario():
+        leader = asyncio.create_task(service.get_user("token"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(service.get_user("token"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1)
+        assert not service._inflight
+
+    asyncio.run(scenario())
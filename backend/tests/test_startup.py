@@ -0,0 +1,30 @@
+"""
+시작 시간 테스트
+src.main 임포트 시간 예산(STARTUP_IMPORT_BUDGET_MS)과 지연 임포트 회귀 검사
+"""
+import subprocess
+import sys
+
+from src.core.startup import BACKEND_DIR, check_import_budget
+
+# 첫 사용 시에만 임포트해야 하는 무거운 의존성
+DEFERRED_MODULES = ("uvicorn", "sqlalchemy", "supabase", "httpx", "asyncpg", "redis", "pygments", "jose")
+
+
+def test_import_within_budget():
+    report = check_import_budget()
+    top = ", ".join(f"{entry['module']} {entry['cumulative_ms']:.0f}ms" for entry in report["modules"][1:6])
+    assert report["within_budget"], (
+        f"import src.main: {report['total_ms']:.0f} ms > {report['budget_ms']:.0f} ms ({top})"
+    )
+
+
+def test_heavy_dependencies_are_deferred():
+    code = (
+        "import sys, src.main; "
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "", f"src.main 임포트 시 로드됨: {result.stdout.strip()}"
@@ -0,0 +1,187 @@
+"""
+업로드 서비스 테스트
+이어 올리기 오프셋/크기 제한/sha256 검증, 대역 서버 대상 S3 multipart 완료, multipart/form-data 스트리밍 파싱
+"""
+import asyncio
+import hashlib
+import importlib
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.standins import StandinConfig, UpstreamProfile, create_app
+from src.api.auth import get_current_user
+from src.api.uploads import router
+from src.core.config import settings
+from src.core.s3 import S3Client
+from src.services.upload_service import UploadError, UploadService
+
+# src.services가 같은 이름의 싱글톤을 다시 내보내므로 모듈은 직접 가져옴
+upload_module = importlib.import_module("src.services.upload_service")
+
+OWNER_ID = "instructor-1"
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "UPLOAD_BACKEND", "local")
+    monkeypatch.setattr(settings, "UPLOAD_BUFFER_SIZE", 1024)
+    monkeypatch.setattr(settings, "UPLOAD_THUMBNAIL_WORKERS", 0)
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 1024 * 1024)
+    service = UploadService()
+    monkeypatch.setattr(upload_module, "upload_service", service)
+    return service
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=OWNER_ID, role="instructor")
+    return TestClient(app)
+
+
+def create_upload(client, size: int, sha256: str = None) -> str:
+    body = {"filename": "lecture.pdf", "content_type": "application/pdf", "size": size}
+    if sha256:
+        body["sha256"] = sha256
+    response = client.post("/api/v1/uploads", json=body)
+    assert response.status_code == 201
+    return response.json()["data"]["id"]
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+# ============================================================================
+# 이어 올리기 (PATCH)
+# ============================================================================
+
+def test_patch_at_a_stale_offset_is_rejected_with_the_current_offset(client):
+    upload_id = create_upload(client, 10)
+
+    response = client.patch(f"/api/v1/uploads/{upload_id}", content=b"abcd", headers={"Upload-Offset": "0"})
+    assert response.status_code == 204
+    assert response.headers["Upload-Offset"] == "4"
+
+    # 재전송한 클라이언트가 이미 기록된 구간을 다시 보냄
+    response = client.patch(f"/api/v1/uploads/{upload_id}", content=b"abcd", headers={"Upload-Offset": "0"})
+    assert response.status_code == 409
+    assert response.headers["Upload-Offset"] == "4"
+
+    response = client.patch(f"/api/v1/uploads/{upload_id}", content=b"efghij", headers={"Upload-Offset": "4"})
+    assert response.status_code == 204
+    assert client.get(f"/api/v1/uploads/{upload_id}").json()["data"]["status"] == "complete"
+
+
+def test_exceeding_the_size_mid_stream_is_413_and_discards_the_session(client, service):
+    upload_id = create_upload(client, 10)
+
+    # Content-Length 없이 (chunked) 보내므로 읽는 도중에야 초과를 알 수 있음
+    response = client.patch(
+        f"/api/v1/uploads/{upload_id}", content=iter([b"0123456", b"789abc"]), headers={"Upload-Offset": "0"},
+    )
+    assert response.status_code == 413
+    assert client.head(f"/api/v1/uploads/{upload_id}").status_code == 404
+    assert list(service.partial_dir.iterdir()) == []
+
+
+def test_sha256_mismatch_is_422_and_discards_the_upload(client, service):
+    upload_id = create_upload(client, 5, sha256=hashlib.sha256(b"hello").hexdigest())
+
+    response = client.patch(f"/api/v1/uploads/{upload_id}", content=b"jello", headers={"Upload-Offset": "0"})
+    assert response.status_code == 422
+    assert client.get(f"/api/v1/uploads/{upload_id}").status_code == 404
+    assert not (service.root / "media" / upload_id).exists()
+
+
+# ============================================================================
+# S3 multipart (benchmarks.standins 대역 서버)
+# ============================================================================
+
+def test_s3_upload_is_assembled_from_parts_on_the_standin(service):
+    transport = httpx.ASGITransport(app=create_app(StandinConfig(storage=UpstreamProfile())))
+    s3 = S3Client("http://standins/s3", "media", "access-key", "secret-key")
+    s3._client = httpx.AsyncClient(transport=transport)
+    service.backend = "s3"
+    service._s3 = s3
+    service.max_size = 16 * 1024 * 1024
+    service.part_size = 5 * 1024 * 1024  # S3 최소 파트 크기
+
+    data = bytes(range(256)) * (6 * 1024 * 1024 // 256 + 3)  # 파트 크기(5 MiB)보다 커서 두 파트로 나뉨
+    first = 3 * 1024 * 1024
+
+    async def run():
+        try:
+            session = await service.create(OWNER_ID, "lecture.mp4", "video/mp4", len(data))
+            session = await service.append(session.id, OWNER_ID, 0, chunked(data[:first], 64 * 1024))
+            assert session.parts == []  # 아직 파트 크기에 못 미침
+            session = await service.append(session.id, OWNER_ID, first, chunked(data[first:], 64 * 1024))
+            return session, await s3.get_object(session.key)
+        finally:
+            await s3.aclose()
+
+    session, stored = asyncio.run(run())
+
+    assert session.status == "complete"
+    assert [part[0] for part in session.parts] == [1, 2]
+    assert session.parts[0][2] == service.part_size
+    assert stored == data
+    assert session.sha256 == hashlib.sha256(data).hexdigest()
+
+
+# ============================================================================
+# multipart/form-data (단일 요청 업로드)
+# ============================================================================
+
+BOUNDARY = "----test-boundary"
+
+
+def form_body(content: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="title"\r\n\r\n'
+        "Week 1\r\n"
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="../notes.md"\r\n'
+        "Content-Type: text/markdown\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def test_form_upload_is_parsed_from_small_stream_chunks(service):
+    content = ("# 강의 노트\n" * 500).encode()
+
+    async def run():
+        # 청크가 경계 문자열/헤더 중간에서 잘려도 파싱되어야 함
+        return await service.receive_form(
+            OWNER_ID, f"multipart/form-data; boundary={BOUNDARY}", chunked(form_body(content), 7),
+        )
+
+    session = asyncio.run(run())
+
+    assert session.status == "complete"
+    assert session.size == len(content)
+    assert session.key.endswith("/notes.md")
+    assert (service.root / session.key).read_bytes() == content
+    assert session.sha256 == hashlib.sha256(content).hexdigest()
+
+
+def test_form_upload_without_a_file_field_is_rejected(service):
+    body = (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="title"\r\n\r\n'
+        f"Week 1\r\n--{BOUNDARY}--\r\n"
+    ).encode()
+
+    async def run():
+        await service.receive_form(OWNER_ID, f"multipart/form-data; boundary={BOUNDARY}", chunked(body, 16))
+
+    with pytest.raises(UploadError) as error:
+        asyncio.run(run())
+    assert error.value.status_code == 400
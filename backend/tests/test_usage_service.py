@@ -0,0 +1,35 @@
+"""
+AI 사용량 서비스 테스트
+원장 반영 결과와 무관한 일일 카운터 정리
+"""
+import asyncio
+import importlib
+
+from src.services.usage_service import UsageLedger, _today
+
+# src.services가 같은 이름의 싱글톤을 다시 내보내므로 모듈은 직접 가져옴
+usage_module = importlib.import_module("src.services.usage_service")
+
+
+def test_flush_loop_prunes_stale_counters_even_when_the_ledger_is_unavailable(monkeypatch):
+    monkeypatch.setattr(usage_module, "get_supabase_client", lambda service=False: None)
+    ledger = UsageLedger()
+    ledger.flush_interval = 0
+    today = _today()
+    ledger._daily = {("2000-01-01", "user:a"): 500, (today, "user:a"): 20}
+    ledger._restored = {("2000-01-01", "user:a"), (today, "user:a")}
+    ledger._pending = {("2000-01-01", "user:a", "/ai", "model"): {
+        "usage_date": "2000-01-01", "user_key": "user:a", "endpoint": "/ai", "model": "model",
+        "request_count": 1, "prompt_tokens": 1, "completion_tokens": 1, "cost_usd": 0.0,
+    }}
+
+    async def run():
+        task = asyncio.create_task(ledger._flush_loop())
+        for _ in range(5):
+            await asyncio.sleep(0)
+        task.cancel()
+
+    asyncio.run(run())
+
+    assert ledger._daily == {(today, "user:a"): 20}
+    assert ledger._restored == {(today, "user:a")}